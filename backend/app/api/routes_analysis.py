@@ -4,26 +4,115 @@ import logging
 import traceback
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 
-from app.core.engine import run_analysis
+from app.core.batch import group_by_dataset, run_batch
+from app.core.calendar import signal_series
+from app.core.engine import run_analysis, run_analysis_streaming
+from app.core.preview import PreviewSuperseded, preview_signals
+from app.core.profiling import ProfileInProgress, load_profile, profile_analysis, save_profile
+from app.core.stats import BIN_METHODS, build_histogram, outcome_changes
+from app.db import history
 from app.db import repositories as repo
-from app.models.results import AnalysisResult
+from app.db import result_store
+from app.models.batch import BatchRunItem, BatchRunRequest, BatchRunResponse
+from app.models.history import RunHistoryEntry, StatSeries
+from app.models.profiling import ProfileReport
+from app.models.results import AnalysisResult, DistributionResponse, SignalPreview, TargetCalendarStats
+from app.models.scenario import PreviewRequest
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 
 
+@router.post("/preview", response_model=SignalPreview)
+def preview_scenario(payload: PreviewRequest):
+    """
+    Signal count, date span and density for an unsaved scenario.
+
+    A plain ``def`` so FastAPI runs it in the threadpool: a newer request from
+    the same ``session_id`` can then supersede one that is still computing,
+    which answers 409.
+    """
+    try:
+        return preview_signals(payload.scenario, payload.session_id)
+    except PreviewSuperseded:
+        raise HTTPException(status_code=409, detail="Superseded by a newer preview request")
+    except (ValueError, ImportError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Preview failed: %s", traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
+
+
+@router.post("/batch", response_model=BatchRunResponse)
+def run_batch_analysis(payload: BatchRunRequest):
+    """
+    Run several scenarios, loading each shared dataset once, and save all results together.
+
+    A plain ``def`` so the CPU-bound batch runs in the threadpool instead of
+    blocking the event loop.
+    """
+    requested = list(dict.fromkeys(payload.scenario_ids))
+    scenarios = repo.get_scenarios(requested)
+    found = {s.id for s in scenarios}
+    missing = [
+        BatchRunItem(scenario_id=sid, ok=False, error=f"Scenario '{sid}' not found")
+        for sid in requested if sid not in found
+    ]
+
+    results, items = run_batch(scenarios)
+    result_store.save_results(results)
+
+    return BatchRunResponse(datasets_loaded=len(group_by_dataset(scenarios)), items=items + missing)
+
+
 @router.post("/{scenario_id}/run", response_model=AnalysisResult)
-async def run_scenario_analysis(scenario_id: str):
-    """Run the analysis engine for a scenario and cache the result."""
+async def run_scenario_analysis(
+    scenario_id: str,
+    response: Response,
+    profile: bool = Query(False, description="Capture a profile artifact for this run"),
+    stream: bool = Query(False, description="Produce and store signals in chunks; the response omits signals"),
+    include_signals: bool = Query(True, description="Return the signals with the stats"),
+):
+    """
+    Run the analysis engine for a scenario and cache the result.
+
+    With ``stream``, signals are persisted chunk by chunk as they are produced
+    and the response carries the stats only; ``/last`` reassembles the signals.
+    Without ``include_signals`` the full result is still stored but the
+    response carries the stats only.
+    """
     scenario = repo.get_scenario(scenario_id)
     if scenario is None:
         raise HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' not found")
 
+    if stream and profile:
+        raise HTTPException(status_code=400, detail="stream and profile cannot be combined")
+    if stream:
+        writer = result_store.ResultChunkWriter(scenario_id)
+        try:
+            result = run_analysis_streaming(scenario, writer.write)
+        except (ValueError, ImportError) as e:
+            writer.abort()
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            writer.abort()
+            logger.error("Analysis failed for scenario %s: %s", scenario_id, traceback.format_exc())
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        return writer.commit(result)
+
     try:
-        result = run_analysis(scenario)
+        if profile:
+            result, report = profile_analysis(scenario)
+            save_profile(report)
+            response.headers["X-Profile-Url"] = f"{router.prefix}/{scenario_id}/profile"
+        else:
+            result = run_analysis(scenario)
+    except ProfileInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except ImportError as e:
@@ -33,17 +122,127 @@ async def run_scenario_analysis(scenario_id: str):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
     # Cache the result
-    repo.save_result(result)
+    result_store.save_result(result)
 
-    return result
+    return result if include_signals else result.model_copy(update={"signals": []})
 
 
 @router.get("/{scenario_id}/last", response_model=Optional[AnalysisResult])
-async def get_last_result(scenario_id: str):
+async def get_last_result(
+    scenario_id: str,
+    include_signals: bool = Query(True, description="Return the signals with the stats"),
+):
     """Get the last cached analysis result for a scenario."""
     scenario = repo.get_scenario(scenario_id)
     if scenario is None:
         raise HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' not found")
 
-    result = repo.get_result(scenario_id)
+    result = result_store.get_result(scenario_id, include_signals=include_signals)
+    return result
+
+
+@router.get("/{scenario_id}/history", response_model=list[RunHistoryEntry])
+async def get_run_history(scenario_id: str):
+    """Every stored run of a scenario, oldest first."""
+    if repo.get_scenario(scenario_id) is None:
+        raise HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' not found")
+    return history.list_runs(scenario_id)
+
+
+@router.get("/{scenario_id}/history/series", response_model=list[StatSeries])
+async def get_stat_series(
+    scenario_id: str,
+    target_id: Optional[str] = Query(None, description="Only this target (default: all targets)"),
+    stat: list[str] = Query(
+        ["hit_rate_pct", "avg_change_pct", "total_evaluable"], description="TargetStats fields to chart"
+    ),
+):
+    """How selected target stats drifted across runs."""
+    if repo.get_scenario(scenario_id) is None:
+        raise HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' not found")
+    return history.stat_series(scenario_id, target_id, stat)
+
+
+@router.get("/{scenario_id}/history/{run_id}", response_model=AnalysisResult)
+async def get_history_run(scenario_id: str, run_id: int):
+    """A past run rebuilt in full."""
+    try:
+        result = history.get_run(scenario_id, run_id)
+    except history.SignalsNotStored as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} of scenario '{scenario_id}' not found")
     return result
+
+
+@router.get("/{scenario_id}/calendar", response_model=list[TargetCalendarStats])
+async def get_calendar_stats(
+    scenario_id: str,
+    target_id: Optional[str] = Query(None, description="Only this target (default: all targets)"),
+    series: bool = Query(False, description="Also return per-signal outcome columns (loads the signals)"),
+):
+    """Year/quarter/month/weekday stats of the last result, computed when the analysis ran."""
+    result = result_store.get_result(scenario_id, include_signals=series)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No results for scenario '{scenario_id}'. Run the analysis first.")
+    if not result.calendar and result.target_stats:
+        raise HTTPException(
+            status_code=404, detail="The last result has no calendar stats. Run the analysis again."
+        )
+    stats = [c for c in result.calendar if target_id is None or c.target_id == target_id]
+    if target_id is not None and not stats:
+        raise HTTPException(status_code=404, detail=f"Target '{target_id}' not found in the last result")
+    if series:
+        for calendar in stats:
+            calendar.series = signal_series(result, calendar.target_id)
+    return stats
+
+
+@router.get("/{scenario_id}/distribution", response_model=DistributionResponse)
+async def get_distribution(
+    scenario_id: str,
+    target_id: str,
+    method: str = Query("freedman-diaconis", description=f"One of {', '.join(BIN_METHODS)}"),
+    bins: Optional[int] = Query(None, ge=1, le=200, description="Bin count for fixed-count"),
+    width: Optional[float] = Query(None, gt=0, description="Bin width in % for fixed-width"),
+    raw: bool = Query(False, description="Also return every change value"),
+):
+    """Re-bin a target's change distribution from the last result; raw values only on request."""
+    result = result_store.get_result(scenario_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No results for scenario '{scenario_id}'. Run the analysis first.")
+    if not any(ts.target_id == target_id for ts in result.target_stats):
+        raise HTTPException(status_code=404, detail=f"Target '{target_id}' not found in the last result")
+
+    changes = outcome_changes(result.signals, target_id)
+    try:
+        histogram = build_histogram(changes, method, bins=bins, width=width)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DistributionResponse(
+        target_id=target_id,
+        total=len(changes),
+        histogram=histogram,
+        values=[round(float(c), 4) for c in changes] if raw else None,
+    )
+
+
+@router.get("/{scenario_id}/profile", response_model=ProfileReport)
+async def get_profile(scenario_id: str):
+    """Get the latest profile artifact captured with ``run?profile=true``."""
+    report = load_profile(scenario_id)
+    if report is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No profile found for scenario '{scenario_id}'. Run the analysis with profile=true first.",
+        )
+    return report
+
+
+@router.get("/{scenario_id}/profile/folded", response_class=PlainTextResponse)
+async def get_profile_folded(scenario_id: str):
+    """Latest profile as folded stacks, ready for flamegraph.pl or speedscope."""
+    report = load_profile(scenario_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"No profile found for scenario '{scenario_id}'.")
+    return PlainTextResponse("\n".join(report.folded_stacks) + "\n")
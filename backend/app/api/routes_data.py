@@ -1,11 +1,12 @@
-"""Data access API routes (search, preview, OHLCV, indicators)."""
+"""Data access API routes (search, preview, OHLCV, indicators, cache stats)."""
 
 import logging
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException, Query
 
-from app.core.data_loader import load_data
+from app.core.cache import cache_stats
+from app.core.datasets import load_dataset
 from app.core.indicators import compute_indicator
 from app.core.conditions import get_column_name
 from app.models.scenario import DataSource
@@ -39,14 +40,20 @@ async def search_tickers(q: str = Query(min_length=1, description="Search query"
 
 
 @router.get("/preview")
-async def preview_data(
+def preview_data(
     ticker: str = Query(min_length=1),
     source: DataSource = DataSource.YAHOO,
     csv_path: Optional[str] = None,
 ):
-    """Preview data availability for a ticker/source."""
+    """
+    Preview data availability for a ticker/source.
+
+    The data routes are sync (run in the threadpool) and load through the
+    shared dataset cache, so the chart, indicator and run requests a page
+    fires together share one fetch.
+    """
     try:
-        df = load_data(ticker=ticker, source=source, csv_path=csv_path)
+        df = load_dataset(ticker=ticker, source=source, csv_path=csv_path)
     except (ValueError, ImportError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -72,7 +79,7 @@ async def preview_data(
 
 
 @router.get("/ohlcv")
-async def get_ohlcv(
+def get_ohlcv(
     ticker: str = Query(min_length=1),
     source: DataSource = DataSource.YAHOO,
     start: Optional[str] = None,
@@ -81,7 +88,7 @@ async def get_ohlcv(
 ):
     """Get OHLCV data for charting."""
     try:
-        df = load_data(ticker=ticker, source=source, start=start, end=end, csv_path=csv_path)
+        df = load_dataset(ticker=ticker, source=source, start=start, end=end, csv_path=csv_path)
     except (ValueError, ImportError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -101,7 +108,7 @@ async def get_ohlcv(
 
 
 @router.get("/indicators")
-async def get_indicators(
+def get_indicators(
     ticker: str = Query(min_length=1),
     source: DataSource = DataSource.YAHOO,
     start: Optional[str] = None,
@@ -111,7 +118,7 @@ async def get_indicators(
 ):
     """Compute indicators on the fly for chart overlay."""
     try:
-        df = load_data(ticker=ticker, source=source, start=start, end=end, csv_path=csv_path)
+        df = load_dataset(ticker=ticker, source=source, start=start, end=end, csv_path=csv_path)
     except (ValueError, ImportError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -139,6 +146,12 @@ async def get_indicators(
     }
 
 
+@router.get("/cache")
+def get_cache_stats():
+    """Occupancy and hit/miss counters of the shared in-process caches."""
+    return cache_stats()
+
+
 def _parse_indicator_spec(spec: str) -> tuple[str, dict]:
     """
     Parse a spec like 'SMA_200' or 'RSI_14' into (indicator_name, params).
@@ -1,24 +1,50 @@
-"""Export API routes (CSV, Excel download)."""
+"""Export API routes (CSV, Excel, Parquet and Arrow download)."""
 
 import io
 import logging
 from typing import Optional
 
 import pandas as pd
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 
-from app.db import repositories as repo
+from app.core.columnar import MEDIA_TYPES, stream_export
+from app.db import result_store
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/export", tags=["export"])
 
 
+@router.get("/batch/{fmt}")
+def export_batch_columnar(
+    fmt: str,
+    scenario_id: list[str] = Query(..., min_length=1),
+    table: str = Query("outcomes"),
+):
+    """
+    Download several scenarios' results as one Parquet/Arrow table.
+
+    Results are read from the database one at a time while the file streams
+    out; scenarios without a stored result are skipped.
+    """
+    if not any(result_store.has_result(sid) for sid in scenario_id):
+        raise HTTPException(status_code=404, detail="None of the requested scenarios has analysis results.")
+
+    def results():
+        for sid in scenario_id:
+            result = result_store.get_result(sid)
+            if result is not None:
+                yield result
+
+    indicator_columns = result_store.indicator_columns(scenario_id) if table == "outcomes" else None
+    return _columnar_response(results, fmt, table, f"retrocast_{table}", indicator_columns)
+
+
 @router.get("/{scenario_id}/csv")
 async def export_csv(scenario_id: str):
     """Download analysis results as a CSV file."""
-    result = repo.get_result(scenario_id)
+    result = result_store.get_result(scenario_id)
     if result is None:
         raise HTTPException(
             status_code=404,
@@ -43,7 +69,7 @@ async def export_csv(scenario_id: str):
 @router.get("/{scenario_id}/excel")
 async def export_excel(scenario_id: str):
     """Download analysis results as an Excel file."""
-    result = repo.get_result(scenario_id)
+    result = result_store.get_result(scenario_id)
     if result is None:
         raise HTTPException(
             status_code=404,
@@ -86,6 +112,36 @@ async def export_excel(scenario_id: str):
     )
 
 
+@router.get("/{scenario_id}/{fmt}")
+def export_columnar(scenario_id: str, fmt: str, table: str = Query("outcomes")):
+    """Download one scenario's outcomes or target stats as a typed Parquet/Arrow table."""
+    if fmt not in MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown export format '{fmt}'")
+    result = result_store.get_result(scenario_id)
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No analysis results found for scenario '{scenario_id}'. Run the analysis first.",
+        )
+    name = f"{result.scenario_name.replace(' ', '_')}_{table}"
+    return _columnar_response(lambda: [result], fmt, table, name)
+
+
+def _columnar_response(
+    results, fmt: str, table: str, name: str, indicator_columns: Optional[list[str]] = None
+) -> StreamingResponse:
+    try:
+        chunks = stream_export(results, fmt, table, indicator_columns)
+    except (ValueError, ImportError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    extension = "parquet" if fmt == "parquet" else "arrow"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
 def _result_to_dataframe(result) -> pd.DataFrame:
     """Convert analysis signals to a flat DataFrame for export."""
     rows = []
@@ -1,11 +1,18 @@
 """Scenario CRUD API routes."""
 
 import logging
+import zipfile
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
+from app.core.prefetch import prefetcher
 from app.db import repositories as repo
-from app.models.scenario import ScenarioCreate, ScenarioInDB, ScenarioSummary, ScenarioUpdate
+from app.db.transfer import export_lines, gzip_stream, import_bundle
+from app.models.scenario import (
+    ImportMode, ScenarioCreate, ScenarioImportResponse, ScenarioInDB, ScenarioSummary, ScenarioUpdate,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +23,7 @@ router = APIRouter(prefix="/api/scenarios", tags=["scenarios"])
 async def create_scenario(payload: ScenarioCreate):
     """Create a new scenario."""
     scenario = repo.create_scenario(payload)
+    prefetcher.enqueue([scenario])
     return scenario
 
 
@@ -25,6 +33,49 @@ async def list_scenarios():
     return repo.list_scenarios()
 
 
+@router.post("/import", response_model=ScenarioImportResponse)
+async def import_scenarios(
+    request: Request,
+    mode: ImportMode = ImportMode.KEEP,
+    include_results: bool = True,
+):
+    """
+    Bulk-import scenarios from a JSON Lines file sent as the request body
+    (plain, gzip-compressed or a zip of ``.jsonl`` files).
+
+    Every line is validated first; valid ones are written in one transaction
+    and invalid ones are reported per line.
+    """
+    data = await request.body()
+    if not data.strip():
+        raise HTTPException(status_code=400, detail="Empty import file")
+    try:
+        return import_bundle(data, mode, include_results)
+    except (ValueError, OSError, zipfile.BadZipFile) as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable import file: {e}")
+
+
+@router.get("/export")
+def export_scenarios(
+    scenario_id: Optional[list[str]] = Query(None),
+    include_results: bool = False,
+    compress: bool = False,
+):
+    """Stream scenarios (optionally with cached results) as JSON Lines, gzip-compressed on request."""
+    lines = export_lines(scenario_id, include_results)
+    if compress:
+        return StreamingResponse(
+            gzip_stream(lines),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="retrocast_scenarios.jsonl.gz"'},
+        )
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="retrocast_scenarios.jsonl"'},
+    )
+
+
 @router.get("/{scenario_id}", response_model=ScenarioInDB)
 async def get_scenario(scenario_id: str):
     """Get a single scenario by ID."""
@@ -40,6 +91,7 @@ async def update_scenario(scenario_id: str, payload: ScenarioUpdate):
     updated = repo.update_scenario(scenario_id, payload)
     if updated is None:
         raise HTTPException(status_code=404, detail=f"Scenario '{scenario_id}' not found")
+    prefetcher.enqueue([updated])
     return updated
 
 
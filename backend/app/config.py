@@ -7,9 +7,31 @@ class Settings(BaseSettings):
     db_path: str = "./data/scenarios.db"
     data_dir: str = "./data"
     csv_import_dir: str = "./data/csv"
+    fixture_data_dir: str = "./data/fixtures"  # <TICKER>.csv files served by the FIXTURE source
     norgate_available: bool = False  # Auto-detected at startup
     host: str = "127.0.0.1"
     port: int = 8000
+    significance_resamples: int = 2000  # Random entry sets per target; 0 disables
+    significance_seed: int = 0
+    histogram_method: str = "freedman-diaconis"
+    histogram_max_bins: int = 200
+    sketch_relative_accuracy: float = 0.01
+    threshold_curve_points: int = 101
+    mask_cache_bytes: int = 64 * 1024 * 1024
+    indicator_cache_bytes: int = 256 * 1024 * 1024
+    indicator_state_cache_bytes: int = 128 * 1024 * 1024  # Snapshots for extending indicators over new bars
+    dataset_cache_bytes: int = 512 * 1024 * 1024
+    dataset_cache_ttl_s: int = 6 * 3600  # Reload network sources (Yahoo, Norgate) after this long
+    prefetch_enabled: bool = True  # Warm datasets and indicators in the background
+    prefetch_startup_scenarios: int = 20  # Most recently updated scenarios warmed at startup
+    prefetch_idle_s: float = 0.5  # Foreground must be idle this long before each prefetch step
+    preview_sparkline_bins: int = 60
+    preview_budget_ms: int = 1000  # Previews give up (timed_out) past this; 0 disables
+    stream_chunk_signals: int = 5000  # Signals per chunk in streaming runs
+    history_max_runs: int = 100  # Runs kept per scenario; 0 keeps all
+    history_max_age_days: int = 0  # Drop runs older than this; 0 keeps all
+    history_snapshot_interval: int = 20  # Store signals in full every N runs to bound delta chains
+    include_raw_distribution: bool = False  # Ship every change in TargetStats.distribution
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -0,0 +1,184 @@
+"""
+Per-target stats folded chunk by chunk, for streamed runs.
+
+Nothing here grows with the number of signals: means and standard
+deviations come from running moments, percentiles, medians and the histogram
+from ``QuantileSketch`` buckets (within the sketch's relative accuracy), and
+the median time to hit from a count per day of the target window.
+"""
+
+import logging
+import math
+
+import numpy as np
+
+from app.config import settings
+from app.core.sketch import QuantileSketch
+from app.core.stats import NUMPY_BIN_METHODS, outcome_arrays, target_stats_from_arrays
+from app.models.results import Histogram, Signal, TargetStats
+from app.models.scenario import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+
+class RunningMoments:
+    """Count, mean, sum of squared deviations, min and max, merged a chunk at a time (Chan et al.)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        n, mean = len(values), float(values.mean())
+        delta = mean - self.mean
+        total = self.count + n
+        self.m2 += float(((values - mean) ** 2).sum()) + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def std(self, ddof: int = 1) -> float:
+        return math.sqrt(self.m2 / (self.count - ddof)) if self.count > ddof else 0.0
+
+
+class TargetStatsAccumulator:
+    """
+    Folds chunks of evaluated signals into per-target stats in constant
+    memory, so the Signal objects of a chunk can be dropped once added.
+
+    Counts, extremes and averages match an in-memory run; medians,
+    percentiles and the histogram are read off the quantile sketch, and the
+    raw ``distribution`` is never kept.
+    """
+
+    def __init__(self, targets: list[TargetConfig]) -> None:
+        self.targets = targets
+        self.hit_count = {t.id: 0 for t in targets}
+        self.anytime_hit_count = {t.id: 0 for t in targets}
+        self.changes = {t.id: RunningMoments() for t in targets}
+        self.mfe = {t.id: RunningMoments() for t in targets}
+        self.mae = {t.id: RunningMoments() for t in targets}
+        accuracy = settings.sketch_relative_accuracy
+        self.change_sketch = {t.id: QuantileSketch(accuracy) for t in targets}
+        self.mfe_sketch = {t.id: QuantileSketch(accuracy) for t in targets}
+        self.mae_sketch = {t.id: QuantileSketch(accuracy) for t in targets}
+        self.days_to_hit = {t.id: np.zeros(t.days_forward + 1, dtype=np.int64) for t in targets}
+
+    def add(self, signals: list[Signal]) -> None:
+        for target in self.targets:
+            changes, hits, anytime_hits, mfe, mae, days_to_hit = outcome_arrays(signals, target.id)
+            self.hit_count[target.id] += hits
+            self.anytime_hit_count[target.id] += anytime_hits
+            for moments, sketch, values in (
+                (self.changes, self.change_sketch, changes),
+                (self.mfe, self.mfe_sketch, mfe),
+                (self.mae, self.mae_sketch, mae),
+            ):
+                moments[target.id].add(values)
+                sketch[target.id].add(values)
+            self.days_to_hit[target.id] += np.bincount(days_to_hit, minlength=target.days_forward + 1)
+
+    def result(self) -> list[TargetStats]:
+        return [self._target_stats(target) for target in self.targets]
+
+    def _target_stats(self, target: TargetConfig) -> TargetStats:
+        changes = self.changes[target.id]
+        if changes.count == 0:
+            empty = np.array([])
+            return target_stats_from_arrays(target, empty, 0, 0, empty, empty, empty.astype(np.int64))
+
+        sketch = self.change_sketch[target.id]
+        total, hits, anytime_hits = changes.count, self.hit_count[target.id], self.anytime_hit_count[target.id]
+        return TargetStats(
+            target_id=target.id,
+            days_forward=target.days_forward,
+            threshold_pct=target.threshold_pct,
+            direction=target.direction.value,
+            total_evaluable=total,
+            hit_count=hits,
+            miss_count=total - hits,
+            hit_rate_pct=round(hits / total * 100, 2),
+            anytime_hit_count=anytime_hits,
+            anytime_hit_rate_pct=round(anytime_hits / total * 100, 2),
+            avg_change_pct=round(changes.mean, 4),
+            median_change_pct=round(sketch.quantile(0.5), 4),
+            max_change_pct=round(changes.max, 4),
+            min_change_pct=round(changes.min, 4),
+            std_dev=round(changes.std(), 4),
+            percentile_5=round(sketch.quantile(0.05), 4),
+            percentile_25=round(sketch.quantile(0.25), 4),
+            percentile_75=round(sketch.quantile(0.75), 4),
+            percentile_95=round(sketch.quantile(0.95), 4),
+            histogram=sketch_histogram(sketch, changes.std(ddof=0), settings.histogram_method,
+                                       max_bins=settings.histogram_max_bins),
+            sketch=sketch.to_model(),
+            **self._path_stats(target),
+        )
+
+    def _path_stats(self, target: TargetConfig) -> dict:
+        """Like ``stats._path_stats``, from the running moments, sketches and day counts."""
+        out: dict = {}
+        days = self.days_to_hit[target.id]
+        if days.sum():
+            out["avg_days_to_hit"] = round(float(np.arange(len(days)) @ days / days.sum()), 2)
+            out["median_days_to_hit"] = _bincount_median(days)
+        mfe, mae = self.mfe[target.id], self.mae[target.id]
+        if mfe.count:
+            out["avg_mfe_pct"] = round(mfe.mean, 4)
+            out["median_mfe_pct"] = round(self.mfe_sketch[target.id].quantile(0.5), 4)
+        if mae.count:
+            out["avg_mae_pct"] = round(mae.mean, 4)
+            out["median_mae_pct"] = round(self.mae_sketch[target.id].quantile(0.5), 4)
+            out["worst_mae_pct"] = round(mae.max if target.direction.value == "BELOW" else mae.min, 4)
+        return out
+
+
+def sketch_histogram(sketch: QuantileSketch, std: float, method: str, max_bins: int = 200) -> Histogram:
+    """
+    ``stats.build_histogram`` for sketched values: the same bin edges numpy's
+    estimators would pick (with the IQR from the sketch and ``std`` being the
+    population standard deviation), filled with the sketch's bucket counts.
+    """
+    if sketch.count == 0:
+        return Histogram(method=method)
+    lo, hi, n = sketch.min, sketch.max, sketch.count
+    if hi == lo:
+        edges = np.array([lo, lo + 1.0])
+    elif method in ("fixed-count", "fixed-width"):
+        edges = np.linspace(lo, hi, min(20, max_bins) + 1)
+    else:
+        estimator = NUMPY_BIN_METHODS[method]
+        iqr = sketch.quantile(0.75) - sketch.quantile(0.25)
+        if estimator == "fd" and iqr == 0:
+            estimator = "sturges"
+        width = {
+            "fd": lambda: 2.0 * iqr * n ** (-1.0 / 3.0),
+            "sturges": lambda: (hi - lo) / (np.log2(n) + 1.0),
+            "scott": lambda: (24.0 * np.pi ** 0.5 / n) ** (1.0 / 3.0) * std,
+            "sqrt": lambda: (hi - lo) / np.sqrt(n),
+        }[estimator]()
+        bins = int(np.ceil((hi - lo) / width)) if width > 0 else 1
+        edges = np.linspace(lo, hi, min(bins, max_bins) + 1)
+
+    values, counts = sketch.buckets()
+    binned, edges = np.histogram(np.clip(values, lo, hi), bins=edges, weights=counts)
+    return Histogram(
+        method=method,
+        edges=[round(float(e), 4) for e in edges],
+        counts=binned.astype(np.int64).tolist(),
+    )
+
+
+def _bincount_median(counts: np.ndarray) -> float:
+    """Median of the values ``0..len(counts) - 1`` occurring ``counts`` times each."""
+    total = int(counts.sum())
+    cumulative = np.cumsum(counts)
+    lower = int(np.searchsorted(cumulative, (total - 1) // 2, side="right"))
+    upper = int(np.searchsorted(cumulative, total // 2, side="right"))
+    return (lower + upper) / 2
@@ -0,0 +1,72 @@
+"""Batch analysis: run many scenarios while loading each shared dataset once."""
+
+import logging
+from collections import defaultdict
+
+from app.core.data_loader import DatasetKey, dataset_key
+from app.core.datasets import load_scenario_datasets
+from app.core.engine import analyze_frame
+from app.core.metrics import RunTimer
+from app.models.batch import BatchRunItem
+from app.models.results import AnalysisResult
+from app.models.scenario import ScenarioInDB
+
+logger = logging.getLogger(__name__)
+
+
+def group_by_dataset(scenarios: list[ScenarioInDB]) -> dict[DatasetKey, list[ScenarioInDB]]:
+    groups: dict[DatasetKey, list[ScenarioInDB]] = defaultdict(list)
+    for scenario in scenarios:
+        groups[dataset_key(scenario)].append(scenario)
+    return dict(groups)
+
+
+def run_batch(scenarios: list[ScenarioInDB]) -> tuple[list[AnalysisResult], list[BatchRunItem]]:
+    """
+    Run every scenario, grouping by (underlying, source, timeframe, date range).
+
+    Each group's data is loaded once — all groups up front, fetched in
+    parallel per data source — and its indicator columns are shared by all
+    scenarios in the group (an indicator needed by several scenarios is
+    computed once). Failures are reported per scenario and do not stop the batch.
+    """
+    results: list[AnalysisResult] = []
+    items: list[BatchRunItem] = []
+    groups = group_by_dataset(scenarios)
+
+    load_timer = RunTimer()
+    with load_timer.stage("load"):
+        frames = load_scenario_datasets([members[0] for members in groups.values()])
+    logger.info("Batch: %d dataset(s) loaded in %.2fs", len(frames), load_timer.stages["load"])
+
+    for key, members in groups.items():
+        df = frames[key]
+        if isinstance(df, (ValueError, ImportError)):
+            logger.warning("Batch load failed for %s: %s", key, str(df))
+            items.extend(BatchRunItem(scenario_id=s.id, ok=False, error=str(df)) for s in members)
+            continue
+        if isinstance(df, Exception):
+            logger.error("Batch load failed for %s: %r", key, df)
+            error = f"Failed to load data: {str(df)}"
+            items.extend(BatchRunItem(scenario_id=s.id, ok=False, error=error) for s in members)
+            continue
+
+        logger.info("Batch: %d scenario(s) on %s/%s, %d bars", len(members), key[1], key[0], len(df))
+        for i, scenario in enumerate(members):
+            timer = RunTimer()
+            if i == 0:
+                # The dataset's fetch time is attributed to the first scenario only
+                timer.stages["load"] = df.attrs.get("data_source_latency_s") or 0.0
+            try:
+                result = analyze_frame(scenario, df, timer)
+            except (ValueError, ImportError) as e:
+                items.append(BatchRunItem(scenario_id=scenario.id, ok=False, error=str(e)))
+                continue
+            except Exception as e:
+                logger.exception("Batch analysis failed for scenario %s", scenario.id)
+                items.append(BatchRunItem(scenario_id=scenario.id, ok=False, error=f"Analysis failed: {str(e)}"))
+                continue
+            results.append(result)
+            items.append(BatchRunItem(scenario_id=scenario.id, ok=True, total_signals=result.total_signals))
+
+    return results, items
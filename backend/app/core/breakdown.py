@@ -0,0 +1,118 @@
+"""Regime breakdown: target stats split by a secondary indicator's bucket at each signal."""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from app.core.forward import OPPOSITE, ForwardReturns, hit_mask
+from app.core.stats import target_stats_from_arrays
+from app.models.results import RegimeBreakdown, RegimeBucket, TargetStats
+from app.models.scenario import BreakdownConfig, TargetConfig
+
+logger = logging.getLogger(__name__)
+
+
+def bucket_edges(config: BreakdownConfig, values: np.ndarray) -> list[float]:
+    """The configured edges, or quantile edges of ``values`` (duplicates merged)."""
+    if config.edges is not None:
+        return list(config.edges)
+    defined = values[~np.isnan(values)]
+    if len(defined) == 0:
+        return []
+    quantiles = np.quantile(defined, np.arange(1, config.quantiles) / config.quantiles)
+    return [round(float(q), 4) for q in np.unique(quantiles)]
+
+
+def compute_breakdown(
+    column: str,
+    values: np.ndarray,
+    forward: ForwardReturns,
+    signal_indices: np.ndarray,
+    targets: list[TargetConfig],
+    config: BreakdownConfig,
+    start_idx: int = 0,
+) -> RegimeBreakdown:
+    """
+    Per-bucket TargetStats of the signal set, bucketed by ``values`` (the
+    indicator over every bar) at each signal bar.
+
+    Outcomes come straight from the forward-return arrays, so no condition is
+    re-evaluated and no Signal object is needed (streamed runs work too).
+    Signals are grouped with one stable sort by bucket id; each target's
+    outcome arrays are then sliced per bucket. Quantile edges are taken over
+    the scanned bars (``start_idx`` onwards).
+    """
+    edges = bucket_edges(config, values[start_idx:])
+    at_signal = values[signal_indices]
+    assigned = ~np.isnan(at_signal)
+    bucket_ids = np.where(assigned, np.searchsorted(edges, np.nan_to_num(at_signal), side="right"), -1)
+
+    order = np.argsort(bucket_ids, kind="stable")
+    sorted_ids = bucket_ids[order]
+    n_buckets = len(edges) + 1
+    bounds = np.searchsorted(sorted_ids, np.arange(-1, n_buckets + 1))  # bucket b: bounds[b+1]:bounds[b+2]
+
+    per_bucket: list[list[TargetStats]] = [[] for _ in range(n_buckets)]
+    for target in targets:
+        arrays = _outcome_arrays(forward, signal_indices[order], target)
+        for bucket in range(n_buckets):
+            rows = slice(bounds[bucket + 1], bounds[bucket + 2])
+            per_bucket[bucket].append(_bucket_stats(target, arrays, rows))
+
+    buckets = []
+    for bucket in range(n_buckets):
+        lower = edges[bucket - 1] if bucket > 0 else None
+        upper = edges[bucket] if bucket < len(edges) else None
+        buckets.append(RegimeBucket(
+            label=_label(lower, upper),
+            lower=lower,
+            upper=upper,
+            signal_count=int(bounds[bucket + 2] - bounds[bucket + 1]),
+            target_stats=per_bucket[bucket],
+        ))
+    return RegimeBreakdown(
+        column=column, edges=edges, buckets=buckets, unassigned_signals=int((~assigned).sum())
+    )
+
+
+def _outcome_arrays(forward: ForwardReturns, signal_indices: np.ndarray, target: TargetConfig) -> dict:
+    """Per-signal outcome values of one target, rounded like SignalOutcome fields."""
+    direction = target.direction.value
+    days = target.days_forward
+    changes = forward.change_pct(days)[signal_indices]
+    excursions = forward.excursion_pct(days, direction)[signal_indices]
+    return {
+        "evaluable": signal_indices + days < len(forward.close),
+        "changes": np.round(changes, 4),
+        "hits": hit_mask(changes, target.threshold_pct, direction),
+        "anytime_hits": hit_mask(excursions, target.threshold_pct, direction),
+        "mfe": np.round(excursions, 4),
+        "mae": np.round(forward.excursion_pct(days, OPPOSITE[direction])[signal_indices], 4),
+        "days_to_hit": forward.first_passage(signal_indices, days, target.threshold_pct, direction),
+    }
+
+
+def _bucket_stats(target: TargetConfig, arrays: dict, rows: slice) -> TargetStats:
+    evaluable = arrays["evaluable"][rows]
+    days_to_hit = arrays["days_to_hit"][rows][evaluable]
+    return target_stats_from_arrays(
+        target,
+        arrays["changes"][rows][evaluable],
+        int(arrays["hits"][rows][evaluable].sum()),
+        int(arrays["anytime_hits"][rows][evaluable].sum()),
+        arrays["mfe"][rows][evaluable],
+        arrays["mae"][rows][evaluable],
+        days_to_hit[~np.isnan(days_to_hit)].astype(np.int64),
+        detail=False,
+    )
+
+
+def _label(lower: Optional[float], upper: Optional[float]) -> str:
+    if lower is None and upper is None:
+        return "all"
+    if lower is None:
+        return f"< {upper:g}"
+    if upper is None:
+        return f"≥ {lower:g}"
+    return f"{lower:g} – {upper:g}"
@@ -0,0 +1,204 @@
+"""
+Built-in data providers: Yahoo Finance, local CSV files, Norgate Data and
+``FixtureProvider``, which serves ``<TICKER>.csv`` files from a directory for
+offline runs and tests. ``register_builtin_providers`` registers each for its
+``DataSource``.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pandas as pd
+
+from app.config import settings
+from app.core.providers import DataProvider, FetchOutcome, FetchRequest, fetch_outcome, register_provider
+from app.models.scenario import DataSource
+
+logger = logging.getLogger(__name__)
+
+
+class YahooProvider(DataProvider):
+    """Yahoo Finance via yfinance; batches download up to ``batch_size`` tickers per request."""
+
+    name = "yahoo"
+    max_concurrency = 4
+    rate_per_s = 2.0
+    max_retries = 3
+    retryable = (OSError,)
+    batch_size = 50
+
+    def fetch(self, request: FetchRequest) -> pd.DataFrame:
+        import yfinance as yf
+
+        df = yf.download(request.ticker, start=request.start, end=request.end, auto_adjust=True, progress=False)
+        if df.empty:
+            raise ValueError(f"No data returned from Yahoo Finance for ticker '{request.ticker}'")
+        # Handle multi-level columns from recent yfinance versions
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        return df
+
+    def fetch_batch(self, requests: list[FetchRequest]) -> dict[FetchRequest, FetchOutcome]:
+        # One multi-ticker download per date range and chunk; chunks run concurrently
+        by_range: dict[tuple, list[FetchRequest]] = {}
+        for request in requests:
+            by_range.setdefault((request.start, request.end), []).append(request)
+        chunks = [
+            group[i:i + self.batch_size] for group in by_range.values() for i in range(0, len(group), self.batch_size)
+        ]
+        outcomes: dict[FetchRequest, FetchOutcome] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(chunks)))) as pool:
+            for chunk, result in zip(chunks, pool.map(lambda c: fetch_outcome(self._download_chunk, c), chunks)):
+                if isinstance(result, Exception):
+                    outcomes.update(dict.fromkeys(chunk, result))
+                else:
+                    outcomes.update(result)
+        return outcomes
+
+    def _download_chunk(self, chunk: list[FetchRequest]) -> dict[FetchRequest, FetchOutcome]:
+        import yfinance as yf
+
+        if len(chunk) == 1:
+            return {chunk[0]: fetch_outcome(self.load, chunk[0])}
+        tickers = [request.ticker for request in chunk]
+        df = self.call(
+            lambda: yf.download(tickers, start=chunk[0].start, end=chunk[0].end, auto_adjust=True,
+                                progress=False, group_by="ticker", threads=False)
+        )
+        outcomes: dict[FetchRequest, FetchOutcome] = {}
+        for request in chunk:
+            frame = df[request.ticker].dropna(how="all") if request.ticker in df.columns.get_level_values(0) else None
+            if frame is None or frame.empty:
+                outcomes[request] = ValueError(f"No data returned from Yahoo Finance for ticker '{request.ticker}'")
+            else:
+                outcomes[request] = frame
+        return outcomes
+
+
+class CSVProvider(DataProvider):
+    """A local CSV file per request; the ticker is only a label."""
+
+    name = "csv"
+    max_concurrency = 8
+
+    def fetch(self, request: FetchRequest) -> pd.DataFrame:
+        if not request.csv_path:
+            raise ValueError("csv_path is required when data_source is CSV")
+        return read_ohlcv_csv(request.csv_path)
+
+
+class NorgateProvider(DataProvider):
+    """Norgate Data (requires a local installation)."""
+
+    name = "norgate"
+    max_concurrency = 2
+
+    def fetch(self, request: FetchRequest) -> pd.DataFrame:
+        try:
+            import norgatedata
+        except ImportError:
+            raise ImportError(
+                "Norgate Data is not installed. "
+                "Install the norgatedata package and Norgate Data Updater to use this source."
+            )
+
+        data = norgatedata.price_timeseries(
+            request.ticker,
+            stock_price_adjustment_setting=norgatedata.StockPriceAdjustmentType.TOTALRETURN,
+            padding_setting=norgatedata.PaddingType.NONE,
+        )
+        if data is None or len(data) == 0:
+            raise ValueError(f"No data returned from Norgate for ticker '{request.ticker}'")
+
+        # Norgate returns a numpy recarray, convert to DataFrame
+        df = pd.DataFrame(data)
+        # Norgate includes a 'Date' column in the recarray, set it as index
+        if "Date" in df.columns:
+            df["Date"] = pd.to_datetime(df["Date"])
+            df = df.set_index("Date")
+            df.index.name = "date"
+        return df
+
+
+class FixtureProvider(DataProvider):
+    """
+    Offline provider serving ``<directory>/<TICKER>.csv``.
+
+    ``latency_s`` and ``fail_first`` (transient ConnectionErrors before the
+    first success, per ticker) let tests exercise the concurrency and retry paths.
+    """
+
+    name = "fixture"
+    max_concurrency = 8
+    backoff_s = 0.01
+    max_retries = 2
+
+    def __init__(self, directory: Optional[str] = None, latency_s: float = 0.0, fail_first: int = 0) -> None:
+        super().__init__()
+        self.directory = directory
+        self.latency_s = latency_s
+        self.fail_first = fail_first
+        self.attempts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, request: FetchRequest) -> pd.DataFrame:
+        ticker = request.ticker.upper()
+        with self._lock:
+            attempt = self.attempts[ticker] = self.attempts.get(ticker, 0) + 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        if attempt <= self.fail_first:
+            raise ConnectionError(f"Simulated outage fetching '{ticker}'")
+        path = os.path.join(self.directory or settings.fixture_data_dir, f"{ticker}.csv")
+        if not os.path.exists(path):
+            raise ValueError(f"No fixture data for ticker '{ticker}'")
+        return read_ohlcv_csv(path)
+
+
+def read_ohlcv_csv(csv_path: str) -> pd.DataFrame:
+    """Read a CSV and index it by its (auto-detected) date column."""
+    df = pd.read_csv(csv_path)
+
+    # Try to auto-detect date column (common names)
+    date_candidates = ["date", "Date", "DATE", "datetime", "Datetime", "timestamp"]
+    date_col = None
+    for col in date_candidates:
+        if col in df.columns:
+            date_col = col
+            break
+
+    if date_col is None:
+        # Try the first column if it looks like dates
+        first_col = df.columns[0]
+        try:
+            pd.to_datetime(df[first_col].head())
+            date_col = first_col
+        except (ValueError, TypeError):
+            raise ValueError(
+                f"Could not auto-detect date column in CSV. "
+                f"Available columns: {list(df.columns)}"
+            )
+
+    df[date_col] = pd.to_datetime(df[date_col])
+    df = df.set_index(date_col)
+    df.index.name = "date"
+
+    return df
+
+
+BUILTIN_PROVIDERS: dict[DataSource, type[DataProvider]] = {
+    DataSource.YAHOO: YahooProvider,
+    DataSource.CSV: CSVProvider,
+    DataSource.NORGATE: NorgateProvider,
+    DataSource.FIXTURE: FixtureProvider,
+}
+
+
+def register_builtin_providers() -> None:
+    """Register the built-in providers, keeping any provider already registered for a source."""
+    for source, provider in BUILTIN_PROVIDERS.items():
+        register_provider(source, provider(), replace=False)
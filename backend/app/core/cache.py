@@ -0,0 +1,233 @@
+"""
+In-process caches shared across analysis runs.
+
+- ``LRUCache``: thread-safe, evicts least-recently-used entries once the sum
+  of entry sizes exceeds a byte budget; hits and misses are counted in the
+  metrics registry under ``cache=<name>``.
+- ``frame_memo``: values derived from one DataFrame object, kept for as long
+  as that frame is alive.
+- ``dataset_cache``: loaded OHLCV frames, so repeat runs, prefetched
+  scenarios and the chart endpoints skip the data source.
+- ``SingleFlight``: coalesces concurrent identical loads into one in-flight
+  call; ``dataset_loads`` guards the data-source fetches behind ``dataset_cache``.
+- ``indicator_states``: incremental-kernel snapshots per dataset and column,
+  so a reload with a few new bars extends indicators instead of recomputing.
+- ``dataset_fingerprint``: content hash of a frame's OHLCV data, so caches
+  keyed by it stay valid across reloads of the same data and miss as soon as
+  the data changes.
+"""
+
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class LRUCache:
+    """Byte-budgeted LRU map. Entries larger than the whole budget are not stored."""
+
+    def __init__(self, name: str, max_bytes: int) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        registry.inc("retrocast_cache_misses_total" if entry is None else "retrocast_cache_hits_total", cache=self.name)
+        return None if entry is None else entry[0]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Like ``get``, without counting a hit or miss or refreshing the entry's recency."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            evictions = 0
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                evictions += 1
+        if evictions:
+            registry.inc("retrocast_cache_evictions_total", evictions, cache=self.name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller (the leader)
+    runs the load, callers arriving while it is in flight wait for its result
+    (or exception) instead of repeating it. Nothing is kept once the call ends,
+    so results must be cached by the caller.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.coalesced = 0
+        self._in_flight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: Hashable) -> tuple[Future, bool]:
+        """The key's in-flight future and whether the caller leads (and must ``resolve``) it."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = Future()
+                return future, True
+            self.coalesced += 1
+        registry.inc("retrocast_cache_coalesced_total", cache=self.name)
+        return future, False
+
+    def resolve(self, key: Hashable, future: Future, value: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def run(self, key: Hashable, load: Callable[[], Any]) -> tuple[Any, bool]:
+        """``(load(), True)`` for the leader; ``(leader's result, False)`` for coalesced callers."""
+        future, leader = self.claim(key)
+        if not leader:
+            return future.result(), False
+        try:
+            value = load()
+        except BaseException as e:
+            self.resolve(key, future, error=e)
+            raise
+        self.resolve(key, future, value)
+        return value, True
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+
+# ---------------------------------------------------------------------------
+# Per-frame memo — keyed by id(df); entries are dropped when the frame is
+# garbage-collected. (DataFrames are unhashable, so a WeakKeyDictionary cannot be used.)
+# ---------------------------------------------------------------------------
+
+_frame_memo: dict[int, dict[str, Any]] = {}
+_frame_memo_lock = threading.Lock()
+
+
+def frame_memo(df: pd.DataFrame, name: str, factory: Callable[[pd.DataFrame], Any]) -> Any:
+    """Return ``factory(df)``, computed once per frame object and name."""
+    key = id(df)
+    with _frame_memo_lock:
+        memo = _frame_memo.get(key)
+        if memo is None:
+            memo = _frame_memo[key] = {}
+            weakref.finalize(df, _frame_memo.pop, key, None)
+        if name in memo:
+            return memo[name]
+    value = factory(df)
+    with _frame_memo_lock:
+        return memo.setdefault(name, value)
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the frame's dates and OHLCV columns (memoised per frame)."""
+    return frame_memo(df, "fingerprint", _fingerprint)
+
+
+def prefix_fingerprint(df: pd.DataFrame, bars: int) -> str:
+    """``dataset_fingerprint`` of the frame's first ``bars`` rows, e.g. a previous load of a growing dataset (memoised)."""
+    if bars == len(df):
+        return dataset_fingerprint(df)
+    return frame_memo(df, f"fingerprint:{bars}", lambda frame: _fingerprint(frame.iloc[:bars]))
+
+
+def _fingerprint(df: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df))))
+    for column in OHLCV_COLUMNS:
+        if column in df.columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=float)))
+    return digest.hexdigest()
+
+
+# Raw OHLCV frames keyed by (dataset key, CSV mtime); values are (frame, monotonic load time)
+dataset_cache = LRUCache("dataset", settings.dataset_cache_bytes)
+# In-flight data-source loads behind dataset_cache, keyed like it
+dataset_loads = SingleFlight("dataset")
+# Boolean condition masks keyed by (dataset fingerprint, canonical condition key)
+mask_cache = LRUCache("condition_mask", settings.mask_cache_bytes)
+# Indicator columns keyed by (dataset fingerprint, column name)
+indicator_cache = LRUCache("indicator_series", settings.indicator_cache_bytes)
+# IndicatorSnapshots keyed by (dataset key, column name); they outlive content changes of the dataset
+indicator_states = LRUCache("indicator_state", settings.indicator_state_cache_bytes)
+
+
+def cache_stats() -> list[dict]:
+    """Occupancy and hit/miss counters of the shared caches (for ``/api/data/cache``)."""
+    stats = [cache.stats() for cache in (dataset_cache, indicator_cache, indicator_states, mask_cache)]
+    stats[0]["coalesced_loads"] = dataset_loads.coalesced
+    stats[0]["loads_in_flight"] = dataset_loads.in_flight()
+    return stats
+
+
+def clear_caches() -> None:
+    """Empty the shared cross-run caches, so the next run starts cold (benchmarks, tests)."""
+    for cache in (dataset_cache, indicator_cache, indicator_states, mask_cache):
+        cache.clear()
@@ -0,0 +1,111 @@
+"""Calendar and time-resolution aggregation of signal outcomes."""
+
+import logging
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.core.forward import ForwardReturns, hit_mask
+from app.models.results import AnalysisResult, CalendarBucket, SignalSeries, TargetCalendarStats
+from app.models.scenario import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def compute_calendar_stats(
+    dates: pd.DatetimeIndex,
+    forward: ForwardReturns,
+    signal_indices: np.ndarray,
+    targets: list[TargetConfig],
+) -> list[TargetCalendarStats]:
+    """
+    Group each target's outcomes by year, quarter, month and weekday.
+
+    Outcomes come straight from the forward-return arrays (like the regime
+    breakdown), so streamed runs get the same groups. Each resolution is an
+    integer period code per signal, and every column is summed per code with
+    one ``np.bincount``. Periods are returned oldest first; weekdays Monday
+    first. Signals without enough future data are left out.
+    """
+    at_signal = dates[signal_indices]
+    year = np.asarray(at_signal.year, dtype=np.int64)
+    keys = {
+        "year": (year, lambda k: f"{k}"),
+        "quarter": (year * 4 + np.asarray(at_signal.quarter) - 1, lambda k: f"{k // 4}-Q{k % 4 + 1}"),
+        "month": (year * 12 + np.asarray(at_signal.month) - 1, lambda k: f"{k // 12}-{k % 12 + 1:02d}"),
+        "weekday": (np.asarray(at_signal.weekday, dtype=np.int64), lambda k: WEEKDAY_NAMES[k]),
+    }
+
+    out: list[TargetCalendarStats] = []
+    for target in targets:
+        direction = target.direction.value
+        days = target.days_forward
+        evaluable = signal_indices + days < len(forward.close)
+        changes = forward.change_pct(days)[signal_indices][evaluable]
+        excursions = forward.excursion_pct(days, direction)[signal_indices][evaluable]
+        columns = (
+            hit_mask(changes, target.threshold_pct, direction),
+            hit_mask(excursions, target.threshold_pct, direction),
+            np.round(changes, 4),
+        )
+        groups = {
+            name: _group(key[evaluable], label, *columns) for name, (key, label) in keys.items()
+        }
+        out.append(
+            TargetCalendarStats(
+                target_id=target.id,
+                days_forward=days,
+                by_year=groups["year"],
+                by_quarter=groups["quarter"],
+                by_month=groups["month"],
+                by_weekday=groups["weekday"],
+            )
+        )
+    return out
+
+
+def _group(
+    key: np.ndarray, label: Callable[[int], str], hits: np.ndarray, anytime_hits: np.ndarray, changes: np.ndarray
+) -> list[CalendarBucket]:
+    if len(key) == 0:
+        return []
+    offset = int(key.min())
+    codes = key - offset
+    count = np.bincount(codes)
+    present = np.flatnonzero(count)
+    count = count[present]
+    hit_count = np.bincount(codes, weights=hits)[present].astype(np.int64)
+    anytime_count = np.bincount(codes, weights=anytime_hits)[present].astype(np.int64)
+    avg_change = np.bincount(codes, weights=changes)[present] / count
+    return [
+        CalendarBucket(
+            label=label(k + offset),
+            count=n,
+            hits=h,
+            anytime_hits=a,
+            hit_rate_pct=round(h / n * 100, 2),
+            anytime_hit_rate_pct=round(a / n * 100, 2),
+            avg_change_pct=round(avg, 4),
+        )
+        for k, n, h, a, avg in zip(
+            present.tolist(), count.tolist(), hit_count.tolist(), anytime_count.tolist(), avg_change.tolist()
+        )
+    ]
+
+
+def signal_series(result: AnalysisResult, target_id: str) -> SignalSeries:
+    """Per-signal outcome columns of one target; nulls where there was not enough future data."""
+    position = next((i for i, ts in enumerate(result.target_stats) if ts.target_id == target_id), None)
+    if position is None:
+        raise ValueError(f"Target '{target_id}' not found in the result")
+    outcomes = [s.outcomes[position] for s in result.signals]
+    return SignalSeries(
+        dates=[s.date for s in result.signals],
+        prices=[s.price for s in result.signals],
+        actual_change_pct=[o.actual_change_pct for o in outcomes],
+        max_change_pct=[o.max_change_pct for o in outcomes],
+        hit=[o.hit for o in outcomes],
+    )
@@ -0,0 +1,286 @@
+"""
+Typed columnar export of analysis results (Parquet and Arrow IPC).
+
+Two tables per export:
+
+- ``outcomes``: one row per (signal, target) with real dates, booleans and
+  floats, plus one ``ind_<column>`` float column per indicator value.
+- ``stats``: one row per target with every scalar of ``TargetStats`` and its
+  ``baseline_*`` / ``significance_*`` comparisons.
+
+Rows are written in record batches and handed to the caller as byte chunks, so
+an export of a whole universe streams out while only one result is in memory.
+pyarrow is optional; exports raise ImportError without it.
+"""
+
+import logging
+import typing
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.models.results import AnalysisResult, TargetBaseline, TargetSignificance, TargetStats
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("parquet", "arrow")
+TABLES = ("outcomes", "stats")
+MEDIA_TYPES = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+# Outcome rows per record batch (and Parquet row group)
+ROWS_PER_BATCH = 65_536
+
+ResultSource = Callable[[], Iterable[AnalysisResult]]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is not installed. Install pyarrow to export Parquet or Arrow files.")
+    return pyarrow
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are drained after every batch."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_export(
+    results: ResultSource, fmt: str, table: str = "outcomes", indicator_columns: Optional[list[str]] = None
+) -> Iterator[bytes]:
+    """
+    Yield a Parquet or Arrow IPC file for ``results`` chunk by chunk.
+
+    The outcome schema is fixed before writing, so it needs every indicator
+    column up front: pass ``indicator_columns`` when ``results`` loads from
+    storage (see ``result_store.indicator_columns``), otherwise ``results``
+    is called twice and the first pass collects them.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    if table not in TABLES:
+        raise ValueError(f"Unknown export table '{table}'. Choose from: {', '.join(TABLES)}")
+    pa = _require_pyarrow()
+
+    if table == "outcomes":
+        # The IPC file format allows one dictionary per field, so Arrow labels are plain strings
+        if indicator_columns is None:
+            indicator_columns = _indicator_columns(results())
+        schema = outcome_schema(indicator_columns, dictionary_labels=fmt == "parquet")
+        batches = (b for result in results() for b in outcome_batches(result, schema))
+    else:
+        schema = stats_schema()
+        batches = (stats_batch(result, schema) for result in results())
+    return _write(pa, fmt, schema, batches)
+
+
+def _write(pa, fmt: str, schema, batches: Iterable) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+    rows = 0
+    with writer:
+        for batch in batches:
+            if batch.num_rows:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+                yield sink.drain()
+    yield sink.drain()
+    logger.info("Exported %d rows as %s", rows, fmt)
+
+
+# ---------------------------------------------------------------------------
+# Outcomes table
+# ---------------------------------------------------------------------------
+
+_OUTCOME_VALUES = ("future_price", "actual_change_pct", "max_change_pct", "mae_pct", "hit", "anytime_hit", "days_to_hit")
+
+
+def _indicator_columns(results: Iterable[AnalysisResult]) -> list[str]:
+    columns: dict[str, None] = {}
+    for result in results:
+        for signal in result.signals:
+            columns.update(dict.fromkeys(signal.indicator_values))
+    return list(columns)
+
+
+def outcome_schema(indicator_columns: list[str], dictionary_labels: bool = True):
+    """
+    Outcome table schema. Label columns are dictionary-encoded per batch
+    unless ``dictionary_labels`` is off (Arrow IPC files, where every batch
+    would have to share one dictionary).
+    """
+    pa = _require_pyarrow()
+    label = pa.dictionary(pa.int32(), pa.string()) if dictionary_labels else pa.string()
+    fields = [
+        pa.field("scenario_id", label),
+        pa.field("underlying", label),
+        pa.field("signal_date", pa.date32()),
+        pa.field("signal_price", pa.float64()),
+        pa.field("target_id", label),
+        pa.field("days_forward", pa.int32()),
+        pa.field("threshold_pct", pa.float64()),
+        pa.field("direction", label),
+        pa.field("future_date", pa.date32()),
+        pa.field("future_price", pa.float64()),
+        pa.field("actual_change_pct", pa.float64()),
+        pa.field("max_change_pct", pa.float64()),
+        pa.field("mae_pct", pa.float64()),
+        pa.field("hit", pa.bool_()),
+        pa.field("anytime_hit", pa.bool_()),
+        pa.field("days_to_hit", pa.int32()),
+    ]
+    fields += [pa.field(f"ind_{name}", pa.float64()) for name in indicator_columns]
+    return pa.schema(fields)
+
+
+def outcome_batches(result: AnalysisResult, schema, rows_per_batch: int = ROWS_PER_BATCH) -> Iterator:
+    """Record batches of one result's (signal, target) rows, ``rows_per_batch`` at a time."""
+    pa = _require_pyarrow()
+    columns, labels = _outcome_columns(result, [name[4:] for name in schema.names if name.startswith("ind_")])
+    n = len(columns["signal_date"])
+    for start in range(0, n, rows_per_batch):
+        rows = slice(start, min(start + rows_per_batch, n))
+        arrays = []
+        for field in schema:
+            if field.name in labels:
+                codes, values = labels[field.name]
+                arrays.append(_labels(pa, codes[rows], values, field.type))
+            else:
+                arrays.append(_array(pa, columns[field.name][rows], field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _outcome_columns(
+    result: AnalysisResult, indicator_names: list[str]
+) -> tuple[dict[str, np.ndarray], dict[str, tuple[np.ndarray, list[str]]]]:
+    """
+    Every outcome column of ``result`` as a numpy array, plus the label
+    columns as (codes, values). The engine appends one outcome per target to
+    each signal in target order, so per-target columns are tiled from
+    ``target_stats`` and per-signal ones repeated; only the outcome values
+    are read off the models, in a single pass.
+    """
+    signals, targets = result.signals, result.target_stats
+    n_signals, n_targets = len(signals), len(targets)
+    if sum(len(signal.outcomes) for signal in signals) != n_signals * n_targets:
+        raise ValueError(f"Result of scenario '{result.scenario_id}' does not have one outcome per target")
+
+    values = np.array(
+        [
+            (o.future_price, o.actual_change_pct, o.max_change_pct, o.mae_pct, o.hit, o.anytime_hit, o.days_to_hit)
+            for signal in signals for o in signal.outcomes
+        ],
+        dtype=float,
+    ).reshape(-1, len(_OUTCOME_VALUES))  # None -> NaN
+    columns = dict(zip(_OUTCOME_VALUES, values.T))
+    columns["future_date"] = np.array(
+        [o.future_date for signal in signals for o in signal.outcomes], dtype="datetime64[D]"
+    )
+    columns["signal_date"] = np.repeat(np.array([s.date for s in signals], dtype="datetime64[D]"), n_targets)
+    columns["signal_price"] = np.repeat(np.fromiter((s.price for s in signals), float, n_signals), n_targets)
+    for name in indicator_names:
+        indicator = np.fromiter((s.indicator_values.get(name, np.nan) for s in signals), float, n_signals)
+        columns[f"ind_{name}"] = np.repeat(indicator, n_targets)
+    columns["days_forward"] = np.tile(np.array([t.days_forward for t in targets], dtype=float), n_signals)
+    columns["threshold_pct"] = np.tile(np.array([t.threshold_pct for t in targets], dtype=float), n_signals)
+
+    rows = n_signals * n_targets
+    target_codes = np.tile(np.arange(n_targets, dtype=np.int32), n_signals)
+    directions = list(dict.fromkeys(t.direction for t in targets))
+    direction_codes = np.array([directions.index(t.direction) for t in targets], dtype=np.int32)
+    labels = {
+        "scenario_id": (np.zeros(rows, dtype=np.int32), [result.scenario_id]),
+        "underlying": (np.zeros(rows, dtype=np.int32), [result.underlying]),
+        "target_id": (target_codes, [t.target_id for t in targets]),
+        "direction": (np.tile(direction_codes, n_signals), directions),
+    }
+    return columns, labels
+
+
+def _array(pa, values: np.ndarray, type_):
+    """Arrow array of ``type_`` from a float (NaN = null) or datetime64 (NaT = null) column."""
+    if pa.types.is_date32(type_) or pa.types.is_floating(type_):
+        return pa.array(values, type=type_, from_pandas=True)
+    missing = np.isnan(values)
+    filled = np.where(missing, 0, values)
+    if pa.types.is_boolean(type_):
+        return pa.array(filled.astype(bool), type=type_, mask=missing)
+    return pa.array(filled.astype(np.int64), type=type_, mask=missing)
+
+
+def _labels(pa, codes: np.ndarray, values: list[str], type_):
+    if pa.types.is_dictionary(type_):
+        return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), pa.array(values, type=pa.string()))
+    return pa.array(np.array(values, dtype=object)[codes], type=pa.string())
+
+
+# ---------------------------------------------------------------------------
+# Stats table
+# ---------------------------------------------------------------------------
+
+def _scalar_fields(model: type[BaseModel]) -> list[tuple[str, type]]:
+    """(name, python type) of every int/float/str/bool field, unwrapping Optional."""
+    fields = []
+    for name, info in model.model_fields.items():
+        annotation = info.annotation
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+            annotation = args[0]
+        if annotation in (int, float, str, bool):
+            fields.append((name, annotation))
+    return fields
+
+
+_STATS_SOURCES: list[tuple[str, type[BaseModel]]] = [
+    ("", TargetStats), ("baseline_", TargetBaseline), ("significance_", TargetSignificance),
+]
+
+
+def stats_schema():
+    pa = _require_pyarrow()
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string(), bool: pa.bool_()}
+    fields = [pa.field("scenario_id", pa.string()), pa.field("underlying", pa.string())]
+    for prefix, model in _STATS_SOURCES:
+        fields += [pa.field(prefix + name, arrow_types[py]) for name, py in _scalar_fields(model)]
+    return pa.schema(fields)
+
+
+def stats_batch(result: AnalysisResult, schema):
+    """One row per target of ``result``."""
+    pa = _require_pyarrow()
+    rows = []
+    for ts in result.target_stats:
+        row: dict[str, Optional[object]] = {"scenario_id": result.scenario_id, "underlying": result.underlying}
+        for prefix, model in _STATS_SOURCES:
+            source = ts if not prefix else getattr(ts, prefix.rstrip("_"))
+            for name, _py in _scalar_fields(model):
+                row[prefix + name] = getattr(source, name) if source is not None else None
+        rows.append(row)
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
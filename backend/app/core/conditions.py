@@ -1,12 +1,12 @@
 """Condition evaluation logic with AND/OR grouping."""
 
 import logging
-import math
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
-from app.models.scenario import CompareTo, ConditionConfig, Connector, Operator
+from app.models.scenario import CompareTo, ConditionConfig, ConditionTimeframe, Connector, Operator
 
 logger = logging.getLogger(__name__)
 
@@ -54,36 +54,18 @@ def get_column_name(indicator: str, params: dict) -> str:
         return "_".join(parts)
 
 
-def evaluate_conditions(
-    df: pd.DataFrame,
-    idx: int,
-    conditions: list[ConditionConfig],
-) -> bool:
+def indicator_column(indicator: str, params: dict, timeframe: Optional[ConditionTimeframe] = None) -> str:
     """
-    Evaluate all conditions for a given row index.
-
-    Logic:
-        - Split conditions into groups at OR boundaries.
-        - Example: [C1 AND, C2 AND, C3 OR, C4 AND, C5]
-          → Group 1: [C1, C2, C3], Group 2: [C4, C5]
-          → Result: (C1 AND C2 AND C3) OR (C4 AND C5)
-        - All conditions within a group must be True (AND).
-        - At least one group must be True (OR).
+    Column name of an indicator, suffixed with its timeframe when it is
+    computed on higher-timeframe bars, e.g. "SMA_40@WEEKLY". PRICE stays "close".
     """
-    if not conditions:
-        return False
+    column = get_column_name(indicator, params)
+    if timeframe is None or column == "close":
+        return column
+    return f"{column}@{timeframe.value}"
 
-    # Build groups: split at OR connectors
-    groups = _build_groups(conditions)
 
-    # Evaluate: any group fully satisfied → True
-    for group in groups:
-        if all(_evaluate_single(df, idx, cond) for cond in group):
-            return True
-    return False
-
-
-def _build_groups(conditions: list[ConditionConfig]) -> list[list[ConditionConfig]]:
+def build_groups(conditions: list[ConditionConfig]) -> list[list[ConditionConfig]]:
     """
     Split conditions into AND-groups separated by OR connectors.
 
@@ -104,91 +86,106 @@ def _build_groups(conditions: list[ConditionConfig]) -> list[list[ConditionConfi
     return groups
 
 
-def _evaluate_single(df: pd.DataFrame, idx: int, condition: ConditionConfig) -> bool:
-    """Evaluate a single condition at the given row index."""
-    # === GET LEFT SIDE VALUE ===
+def condition_columns(condition: ConditionConfig) -> list[tuple[str, str, dict]]:
+    """
+    Indicator columns a condition reads, as (column, indicator, params) tuples.
+
+    Left side first, then the compare indicator. A PRICE left side is not listed.
+    """
+    columns: list[tuple[str, str, dict]] = []
+    if condition.indicator != "PRICE":
+        columns.append((
+            indicator_column(condition.indicator.value, condition.params, condition.timeframe),
+            condition.indicator.value,
+            condition.params,
+        ))
+    if condition.compare_to == CompareTo.INDICATOR and condition.compare_indicator:
+        params = condition.compare_indicator_params or {}
+        columns.append((
+            indicator_column(condition.compare_indicator.value, params, condition.timeframe),
+            condition.compare_indicator.value,
+            params,
+        ))
+    return columns
+
+
+def condition_key(condition: ConditionConfig) -> str:
+    """
+    Canonical identity of a condition's logic, independent of id and connector.
+
+    Two conditions with the same key always produce the same mask, e.g.
+    "SMA_50|CROSSES_ABOVE|SMA_200" or "RSI_14|BELOW|=30.0".
+    """
     if condition.indicator == "PRICE":
-        left_col = "close"
+        left = "close"
+    else:
+        left = indicator_column(condition.indicator.value, condition.params, condition.timeframe)
+
+    if condition.compare_to == CompareTo.PRICE:
+        right = "close"
+    elif condition.compare_to == CompareTo.VALUE:
+        right = "=" + (repr(float(condition.compare_value)) if condition.compare_value is not None else "None")
+    elif condition.compare_indicator is not None and condition.compare_indicator_params is not None:
+        right = indicator_column(
+            condition.compare_indicator.value, condition.compare_indicator_params, condition.timeframe
+        )
     else:
-        left_col = get_column_name(condition.indicator.value, condition.params)
+        right = "None"
+
+    return f"{left}|{condition.operator.value}|{right}"
 
+
+def evaluate_condition_mask(df: pd.DataFrame, condition: ConditionConfig) -> np.ndarray:
+    """
+    Evaluate a single condition on every row at once.
+
+    Returns a boolean array with the same semantics as ``rowwise.evaluate_conditions``:
+    NaN on either side (or on the previous bar for CROSSES) yields False.
+    """
+    n = len(df)
+    false_mask = np.zeros(n, dtype=bool)
+
+    left_col = "close" if condition.indicator == "PRICE" else indicator_column(
+        condition.indicator.value, condition.params, condition.timeframe
+    )
     if left_col not in df.columns:
         logger.warning("Indicator column '%s' not found in DataFrame", left_col)
-        return False
-
-    left_val = df.iloc[idx][left_col]
+        return false_mask
+    left = df[left_col].to_numpy(dtype=float)
 
-    # === GET RIGHT SIDE VALUE ===
     if condition.compare_to == CompareTo.PRICE:
-        right_col = "close"
-        right_val = df.iloc[idx]["close"]
+        right = df["close"].to_numpy(dtype=float)
     elif condition.compare_to == CompareTo.VALUE:
-        right_col = None  # No column, fixed value
-        right_val = condition.compare_value
+        if condition.compare_value is None:
+            return false_mask
+        right = np.full(n, float(condition.compare_value))
     elif condition.compare_to == CompareTo.INDICATOR:
         if condition.compare_indicator is None or condition.compare_indicator_params is None:
             logger.warning("compare_indicator or params missing for INDICATOR comparison")
-            return False
-        right_col = get_column_name(condition.compare_indicator.value, condition.compare_indicator_params)
+            return false_mask
+        right_col = indicator_column(
+            condition.compare_indicator.value, condition.compare_indicator_params, condition.timeframe
+        )
         if right_col not in df.columns:
             logger.warning("Compare indicator column '%s' not found", right_col)
-            return False
-        right_val = df.iloc[idx][right_col]
+            return false_mask
+        right = df[right_col].to_numpy(dtype=float)
     else:
-        return False
-
-    # === CHECK FOR NaN ===
-    if _is_nan(left_val) or _is_nan(right_val):
-        return False
+        return false_mask
 
-    left_val = float(left_val)
-    right_val = float(right_val)
-
-    # === EVALUATE OPERATOR ===
+    # Comparisons involving NaN are False, which matches the row-wise NaN checks.
     if condition.operator == Operator.ABOVE:
-        return left_val > right_val
-
-    elif condition.operator == Operator.BELOW:
-        return left_val < right_val
-
-    elif condition.operator == Operator.CROSSES_ABOVE:
-        if idx < 1:
-            return False
-        prev_left = df.iloc[idx - 1][left_col]
-        if condition.compare_to == CompareTo.VALUE:
-            prev_right = condition.compare_value
-        elif condition.compare_to == CompareTo.PRICE:
-            prev_right = df.iloc[idx - 1]["close"]
-        else:
-            prev_right = df.iloc[idx - 1][right_col]
-
-        if _is_nan(prev_left) or _is_nan(prev_right):
-            return False
-
-        return float(prev_left) <= float(prev_right) and left_val > right_val
-
+        return left > right
+    if condition.operator == Operator.BELOW:
+        return left < right
+
+    mask = false_mask
+    if n < 2:
+        return mask
+    prev_left, prev_right = left[:-1], right[:-1]
+    cur_left, cur_right = left[1:], right[1:]
+    if condition.operator == Operator.CROSSES_ABOVE:
+        mask[1:] = (prev_left <= prev_right) & (cur_left > cur_right)
     elif condition.operator == Operator.CROSSES_BELOW:
-        if idx < 1:
-            return False
-        prev_left = df.iloc[idx - 1][left_col]
-        if condition.compare_to == CompareTo.VALUE:
-            prev_right = condition.compare_value
-        elif condition.compare_to == CompareTo.PRICE:
-            prev_right = df.iloc[idx - 1]["close"]
-        else:
-            prev_right = df.iloc[idx - 1][right_col]
-
-        if _is_nan(prev_left) or _is_nan(prev_right):
-            return False
-
-        return float(prev_left) >= float(prev_right) and left_val < right_val
-
-    return False
-
-
-def _is_nan(val) -> bool:
-    """Check if a value is NaN (works for float and numpy types)."""
-    try:
-        return math.isnan(float(val))
-    except (ValueError, TypeError):
-        return True
+        mask[1:] = (prev_left >= prev_right) & (cur_left < cur_right)
+    return mask
@@ -1,15 +1,42 @@
-"""Load OHLCV data from various sources (Yahoo Finance, CSV, Norgate)."""
+"""Load OHLCV data through the registered data providers (Yahoo Finance, CSV, Norgate, fixtures)."""
 
 import logging
 import time
-from typing import Optional
+from typing import Optional, Union
 
 import pandas as pd
 
-from app.models.scenario import DataSource
+from app.core.builtin_providers import register_builtin_providers
+from app.core.metrics import registry
+from app.core.providers import FetchRequest, get_provider
+from app.models.scenario import DataSource, ScenarioCreate, ScenarioPreview
 
 logger = logging.getLogger(__name__)
 
+register_builtin_providers()
+
+# (underlying, source, csv_path, timeframe, start, end)
+DatasetKey = tuple[str, str, Optional[str], str, Optional[str], Optional[str]]
+
+
+def dataset_key(spec: Union[ScenarioCreate, ScenarioPreview]) -> DatasetKey:
+    """Scenarios with the same key run on an identical OHLCV frame."""
+    return make_dataset_key(
+        spec.underlying, spec.data_source, spec.csv_path, spec.timeframe.value, spec.date_range_start,
+        spec.date_range_end,
+    )
+
+
+def make_dataset_key(
+    ticker: str,
+    source: DataSource,
+    csv_path: Optional[str],
+    timeframe: str,
+    start: Optional[str],
+    end: Optional[str],
+) -> DatasetKey:
+    return (ticker.upper(), source.value, csv_path, timeframe, start, end)
+
 
 def load_data(
     ticker: str,
@@ -26,19 +53,54 @@ def load_data(
     and a DatetimeIndex named 'date'. Sorted ascending by date.
     """
     # TODO: Implement weekly/intraday resampling for other timeframes
-    t0 = time.time()
-
-    if source == DataSource.YAHOO:
-        df = _load_yahoo(ticker, start, end)
-    elif source == DataSource.CSV:
-        if not csv_path:
-            raise ValueError("csv_path is required when data_source is CSV")
-        df = _load_csv(csv_path)
-    elif source == DataSource.NORGATE:
-        df = _load_norgate(ticker)
-    else:
-        raise ValueError(f"Unsupported data source: {source}")
+    t0 = time.perf_counter()
+    df = get_provider(source).load(FetchRequest(ticker, start, end, csv_path))
+    source_latency = time.perf_counter() - t0
+    registry.observe("retrocast_data_source_latency_seconds", source_latency, source=source.value)
+    return standardize(df, ticker, source, start, end, source_latency)
+
+
+def load_many(
+    source: DataSource, requests: list[FetchRequest]
+) -> dict[FetchRequest, Union[pd.DataFrame, Exception]]:
+    """
+    Load many tickers from one source with the provider's batch fetch.
 
+    Failures are returned per request rather than raised. Each frame's
+    ``data_source_latency_s`` is the batch's wall time, shared by its tickers.
+    """
+    t0 = time.perf_counter()
+    raw = get_provider(source).load_batch(requests)
+    source_latency = time.perf_counter() - t0
+    registry.observe("retrocast_data_source_latency_seconds", source_latency, source=source.value)
+
+    frames: dict[FetchRequest, Union[pd.DataFrame, Exception]] = {}
+    for request, outcome in raw.items():
+        if isinstance(outcome, Exception):
+            frames[request] = outcome
+            continue
+        try:
+            frames[request] = standardize(
+                outcome, request.ticker, source, request.start, request.end, source_latency
+            )
+        except ValueError as e:
+            frames[request] = e
+    logger.info(
+        "Loaded %d/%d tickers from %s in %.2fs",
+        sum(not isinstance(f, Exception) for f in frames.values()), len(frames), source.value, source_latency,
+    )
+    return frames
+
+
+def standardize(
+    df: pd.DataFrame,
+    ticker: str,
+    source: DataSource,
+    start: Optional[str],
+    end: Optional[str],
+    source_latency: float,
+) -> pd.DataFrame:
+    """Bring a provider's raw frame to the common OHLCV shape and date range."""
     # Standardize column names to lowercase
     df.columns = [c.lower() for c in df.columns]
 
@@ -74,90 +136,13 @@ def load_data(
     if end:
         df = df[df.index <= pd.Timestamp(end)]
 
-    elapsed = time.time() - t0
+    df.attrs["data_source_latency_s"] = source_latency
+
     logger.info(
         "Loaded %d bars for %s from %s (%s to %s) in %.2fs",
         len(df), ticker, source.value,
         df.index[0].strftime("%Y-%m-%d") if len(df) > 0 else "N/A",
         df.index[-1].strftime("%Y-%m-%d") if len(df) > 0 else "N/A",
-        elapsed,
+        source_latency,
     )
     return df
-
-
-def _load_yahoo(ticker: str, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
-    """Load data via yfinance."""
-    import yfinance as yf
-
-    df = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
-
-    if df.empty:
-        raise ValueError(f"No data returned from Yahoo Finance for ticker '{ticker}'")
-
-    # Handle multi-level columns from recent yfinance versions
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
-
-    return df
-
-
-def _load_csv(csv_path: str) -> pd.DataFrame:
-    """Load data from a local CSV file."""
-    df = pd.read_csv(csv_path)
-
-    # Try to auto-detect date column (common names)
-    date_candidates = ["date", "Date", "DATE", "datetime", "Datetime", "timestamp"]
-    date_col = None
-    for col in date_candidates:
-        if col in df.columns:
-            date_col = col
-            break
-
-    if date_col is None:
-        # Try the first column if it looks like dates
-        first_col = df.columns[0]
-        try:
-            pd.to_datetime(df[first_col].head())
-            date_col = first_col
-        except (ValueError, TypeError):
-            raise ValueError(
-                f"Could not auto-detect date column in CSV. "
-                f"Available columns: {list(df.columns)}"
-            )
-
-    df[date_col] = pd.to_datetime(df[date_col])
-    df = df.set_index(date_col)
-    df.index.name = "date"
-
-    return df
-
-
-def _load_norgate(ticker: str) -> pd.DataFrame:
-    """Load data from Norgate Data (requires local installation)."""
-    try:
-        import norgatedata
-    except ImportError:
-        raise ImportError(
-            "Norgate Data is not installed. "
-            "Install the norgatedata package and Norgate Data Updater to use this source."
-        )
-
-    data = norgatedata.price_timeseries(
-        ticker,
-        stock_price_adjustment_setting=norgatedata.StockPriceAdjustmentType.TOTALRETURN,
-        padding_setting=norgatedata.PaddingType.NONE,
-    )
-
-    if data is None or len(data) == 0:
-        raise ValueError(f"No data returned from Norgate for ticker '{ticker}'")
-
-    # Norgate returns a numpy recarray, convert to DataFrame
-    df = pd.DataFrame(data)
-    
-    # Norgate includes a 'Date' column in the recarray, set it as index
-    if "Date" in df.columns:
-        df["Date"] = pd.to_datetime(df["Date"])
-        df = df.set_index("Date")
-        df.index.name = "date"
-
-    return df
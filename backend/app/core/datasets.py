@@ -0,0 +1,206 @@
+"""
+Dataset loading for the analysis pipeline.
+
+Frames come from ``load_data`` through the shared dataset cache: CSV entries
+are keyed by the file's mtime, network sources expire after
+``dataset_cache_ttl_s``, and concurrent misses for one dataset are
+single-flight. Cached frames carry their ``dataset_key`` so indicator kernel
+snapshots can be extended when a dataset gains bars.
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.core.cache import dataset_cache, dataset_fingerprint, dataset_loads, frame_memo, indicator_states
+from app.core.data_loader import DatasetKey, dataset_key, load_data, load_many, make_dataset_key
+from app.core.forward import get_forward_returns
+from app.core.incremental import advance
+from app.core.indicators import compute_indicator
+from app.core.providers import FetchRequest
+from app.models.scenario import DataSource, ScenarioCreate, ScenarioPreview
+
+logger = logging.getLogger(__name__)
+
+# Anything that names a dataset and the conditions to scan it with
+SignalSpec = Union[ScenarioCreate, ScenarioPreview]
+
+
+def load_scenario_data(scenario: SignalSpec) -> pd.DataFrame:
+    """Load the OHLCV frame a scenario runs on, through the shared dataset cache (see ``load_dataset``)."""
+    return load_dataset(
+        ticker=scenario.underlying,
+        source=scenario.data_source,
+        start=scenario.date_range_start,
+        end=scenario.date_range_end,
+        timeframe=scenario.timeframe.value,
+        csv_path=scenario.csv_path,
+    )
+
+
+def load_dataset(
+    ticker: str,
+    source: DataSource,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    timeframe: str = "DAILY",
+    csv_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    ``load_data`` through the shared dataset cache.
+
+    Hits return a shallow copy, so indicator columns added by a run never
+    touch the cached frame. CSV entries are keyed by the file's mtime and
+    network sources expire after ``dataset_cache_ttl_s``. Concurrent misses
+    for the same dataset are single-flight: one caller fetches, the others
+    wait for its frame (and report no source latency of their own).
+    """
+    key = make_dataset_key(ticker, source, csv_path, timeframe, start, end)
+    cache_key = dataset_cache_key(key)
+    cached = _cache_lookup(source, cache_key)
+    if cached is not None:
+        return cached
+
+    def fetch() -> tuple[pd.DataFrame, Optional[float]]:
+        fresh = _fresh(source, dataset_cache.peek(cache_key))  # stored by a load that just finished
+        if fresh is not None:
+            return fresh, 0.0
+        df = load_data(ticker=ticker, source=source, start=start, end=end, timeframe=timeframe, csv_path=csv_path)
+        _cache_store(cache_key, df)
+        return df, df.attrs.get("data_source_latency_s")
+
+    (df, latency), leader = dataset_loads.run(cache_key, fetch)
+    return cached_copy(df, latency=latency if leader else 0.0)
+
+
+def load_scenario_datasets(scenarios: list[SignalSpec]) -> dict[DatasetKey, Union[pd.DataFrame, Exception]]:
+    """
+    Frames for many scenarios' datasets at once, keyed by ``dataset_key``.
+
+    Cache misses are fetched per data source with the provider's batch fetch,
+    which runs up to its concurrency limit in parallel; hits, fetched frames
+    and loads already in flight are handled exactly like ``load_dataset``.
+    Errors are returned per dataset.
+    """
+    frames: dict[DatasetKey, Union[pd.DataFrame, Exception]] = {}
+    # Per source: fetch request -> (cache key, in-flight future) of the datasets it serves
+    missing: dict[DataSource, dict[FetchRequest, list[tuple]]] = defaultdict(lambda: defaultdict(list))
+    joined: dict[DatasetKey, Future] = {}
+    for scenario in scenarios:
+        key = dataset_key(scenario)
+        if key in frames:
+            continue
+        cache_key = dataset_cache_key(key)
+        frames[key] = _cache_lookup(scenario.data_source, cache_key)
+        if frames[key] is not None:
+            continue
+        future, leader = dataset_loads.claim(cache_key)
+        if not leader:
+            joined[key] = future
+            continue
+        fresh = _fresh(scenario.data_source, dataset_cache.peek(cache_key))
+        if fresh is not None:
+            dataset_loads.resolve(cache_key, future, (fresh, 0.0))
+            frames[key] = cached_copy(fresh)
+            continue
+        request = FetchRequest(scenario.underlying, scenario.date_range_start, scenario.date_range_end, scenario.csv_path)
+        missing[scenario.data_source][request].append((cache_key, future))
+
+    try:
+        for source, requests in missing.items():
+            for request, outcome in load_many(source, list(requests)).items():
+                for cache_key, future in requests.pop(request):
+                    if isinstance(outcome, Exception):
+                        frames[cache_key[:-1]] = outcome
+                        dataset_loads.resolve(cache_key, future, error=outcome)
+                    else:
+                        frames[cache_key[:-1]] = _cache_store(cache_key, outcome)
+                        dataset_loads.resolve(cache_key, future, (outcome, outcome.attrs.get("data_source_latency_s")))
+    finally:
+        # Never leave a claimed load unresolved, or its waiters would block forever
+        for requests in missing.values():
+            for served in requests.values():
+                for cache_key, future in served:
+                    if not future.done():
+                        dataset_loads.resolve(cache_key, future, error=RuntimeError("Batch load aborted"))
+
+    for key, future in joined.items():
+        try:
+            frames[key] = cached_copy(future.result()[0])
+        except Exception as e:
+            frames[key] = e
+    return frames
+
+
+def _fresh(source: DataSource, entry: Optional[tuple]) -> Optional[pd.DataFrame]:
+    """The cached frame, unless a network source's entry has outlived ``dataset_cache_ttl_s``."""
+    if entry is None:
+        return None
+    frame, loaded_at = entry
+    return frame if is_fresh(source, loaded_at) else None
+
+
+def is_fresh(source: DataSource, loaded_at: float) -> bool:
+    """Whether a frame loaded at ``loaded_at`` (monotonic) is still current; CSV frames are keyed by mtime instead."""
+    return source == DataSource.CSV or time.monotonic() - loaded_at < settings.dataset_cache_ttl_s
+
+
+def _cache_lookup(source: DataSource, key: tuple) -> Optional[pd.DataFrame]:
+    frame = _fresh(source, dataset_cache.get(key))
+    return None if frame is None else cached_copy(frame)
+
+
+def _cache_store(key: tuple, df: pd.DataFrame) -> pd.DataFrame:
+    df.attrs["dataset_key"] = key[:-1]  # lineage for incremental indicators across reloads
+    dataset_cache.put(key, (df, time.monotonic()), int(df.memory_usage(index=True).sum()))
+    return cached_copy(df, latency=df.attrs.get("data_source_latency_s"))
+
+
+def dataset_cache_key(key: DatasetKey) -> tuple:
+    """``dataset_key`` plus the CSV file's mtime (None for other sources)."""
+    _, source, csv_path, *_ = key
+    mtime = None
+    if source == DataSource.CSV.value and csv_path and os.path.exists(csv_path):
+        mtime = os.path.getmtime(csv_path)
+    return (*key, mtime)
+
+
+def cached_copy(frame: pd.DataFrame, latency: Optional[float] = 0.0) -> pd.DataFrame:
+    """
+    Shallow copy of a cached frame for one run.
+
+    The copy shares the cached frame's fingerprint and ``ForwardReturns``, so
+    forward arrays and baselines are built once per cached dataset rather
+    than once per run.
+    """
+    df = frame.copy(deep=False)
+    df.attrs["data_source_latency_s"] = latency
+    frame_memo(df, "fingerprint", lambda _df: dataset_fingerprint(frame))
+    frame_memo(df, "forward_returns", lambda _df: get_forward_returns(frame))
+    return df
+
+
+def advance_indicator(df: pd.DataFrame, col_name: str, indicator: str, params: dict) -> tuple[np.ndarray, int]:
+    """
+    The indicator over ``df`` and how many bars were computed for it.
+
+    Frames from the dataset cache carry their ``dataset_key``; the kernel
+    snapshot kept for that dataset and column is extended over any bars
+    appended since (a CSV that gained rows, a network source past its TTL)
+    instead of recomputing the whole series.
+    """
+    lineage = df.attrs.get("dataset_key")
+    if lineage is None:
+        return compute_indicator(df, indicator, params).to_numpy(dtype=float), len(df)
+    key = (lineage, col_name)
+    values, snapshot, computed = advance(df, indicator, params, indicator_states.get(key))
+    if snapshot is not None:
+        indicator_states.put(key, snapshot, snapshot.nbytes)
+    return values, computed
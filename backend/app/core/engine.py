@@ -1,17 +1,29 @@
 """Main analysis engine — the heart of Retrocast."""
 
 import logging
-import time
 from datetime import datetime, timezone
+from typing import Callable, Optional
 
 import numpy as np
 import pandas as pd
 
-from app.core.conditions import evaluate_conditions, get_column_name
-from app.core.data_loader import load_data
-from app.core.indicators import compute_indicator
-from app.models.results import AnalysisResult, Signal, SignalOutcome, TargetStats
-from app.models.scenario import CompareTo, ScenarioInDB
+from app.config import settings
+from app.core.accumulator import TargetStatsAccumulator
+from app.core.breakdown import compute_breakdown
+from app.core.calendar import compute_calendar_stats
+from app.core.conditions import indicator_column
+from app.core.datasets import load_scenario_data
+from app.core.event_study import compute_event_study
+from app.core.forward import ForwardReturns, get_forward_returns
+from app.core.horizons import compute_horizon_curve
+from app.core.metrics import RunTimer, registry
+from app.core.outcomes import evaluate_targets
+from app.core.scan import build_signals, ensure_column, find_signal_indices, scan_start
+from app.core.sensitivity import compute_threshold_curve
+from app.core.significance import compute_significance
+from app.core.stats import compute_target_stats
+from app.models.results import AnalysisResult, RegimeBreakdown, RunMetadata, Signal, TargetStats, ThresholdCurve
+from app.models.scenario import ScenarioInDB
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +31,7 @@ logger = logging.getLogger(__name__)
 MIN_BARS = 252
 
 
-def run_analysis(scenario: ScenarioInDB) -> AnalysisResult:
+def run_analysis(scenario: ScenarioInDB, timer: Optional[RunTimer] = None) -> AnalysisResult:
     """
     Main analysis pipeline:
     1. Load data
@@ -28,188 +40,168 @@ def run_analysis(scenario: ScenarioInDB) -> AnalysisResult:
     4. Evaluate targets
     5. Compute statistics
     6. Return AnalysisResult
+
+    Stage durations and counters are captured with a monotonic clock and
+    returned in ``AnalysisResult.metadata``; they are also aggregated in the
+    process-wide metrics registry served at ``/metrics``. A custom ``timer``
+    (e.g. the profiler's) can be passed to hook into stage boundaries.
     """
-    pipeline_start = time.time()
+    timer = timer if timer is not None else RunTimer()
 
     # -------------------------------------------------------------------------
     # 1. LOAD DATA
     # -------------------------------------------------------------------------
-    t0 = time.time()
-    df = load_data(
-        ticker=scenario.underlying,
-        source=scenario.data_source,
-        start=scenario.date_range_start,
-        end=scenario.date_range_end,
-        timeframe=scenario.timeframe.value,
-        csv_path=scenario.csv_path,
-    )
+    with timer.stage("load"):
+        df = load_scenario_data(scenario)
+    logger.info("Step 1 — Data loaded in %.2fs", timer.stages["load"])
 
-    if len(df) < MIN_BARS:
-        raise ValueError(
-            f"Not enough data: got {len(df)} bars, need at least {MIN_BARS}. "
-            f"Try a wider date range or different ticker."
-        )
+    return analyze_frame(scenario, df, timer)
 
-    logger.info("Step 1 — Data loaded in %.2fs", time.time() - t0)
 
-    # -------------------------------------------------------------------------
-    # 2. COMPUTE INDICATORS
-    # -------------------------------------------------------------------------
-    t0 = time.time()
-    indicator_columns: list[str] = []
-
-    # Compute indicators for ALL conditions (both left and right side)
-    for condition in scenario.conditions:
-        # LEFT side indicator
-        if condition.indicator != "PRICE":
-            col_name = get_column_name(condition.indicator.value, condition.params)
-            if col_name not in df.columns:
-                df[col_name] = compute_indicator(df, condition.indicator.value, condition.params)
-            indicator_columns.append(col_name)
-
-        # RIGHT side indicator (if comparing to another indicator)
-        if condition.compare_to == CompareTo.INDICATOR and condition.compare_indicator:
-            compare_col = get_column_name(condition.compare_indicator.value, condition.compare_indicator_params)
-            if compare_col not in df.columns:
-                df[compare_col] = compute_indicator(df, condition.compare_indicator.value, condition.compare_indicator_params)
-            indicator_columns.append(compare_col)
-
-    # Deduplicate
-    indicator_columns = list(dict.fromkeys(indicator_columns))
-    logger.info("Step 2 — %d indicators computed in %.2fs", len(indicator_columns), time.time() - t0)
+def analyze_frame(scenario: ScenarioInDB, df: pd.DataFrame, timer: Optional[RunTimer] = None) -> AnalysisResult:
+    """
+    Run steps 2–6 on an already-loaded frame.
+
+    Indicator columns are added to ``df`` in place, so several scenarios
+    analysed against the same frame share every indicator they have in common.
+    """
+    timer = timer if timer is not None else RunTimer()
+
+    _check_frame(df, timer)
 
     # -------------------------------------------------------------------------
-    # 3. FIND SIGNALS
+    # 2 + 3. FIND SIGNALS (indicators are computed lazily, timed as "indicators")
     # -------------------------------------------------------------------------
-    t0 = time.time()
-
-    # Determine minimum lookback — start scanning after enough data exists
-    min_lookback = _compute_min_lookback(scenario)
-    start_idx = max(min_lookback, 1)  # At least 1 for CROSSES operators
-
-    signals: list[Signal] = []
-    for idx in range(start_idx, len(df)):
-        if evaluate_conditions(df, idx, scenario.conditions):
-            row = df.iloc[idx]
-            signal_date = df.index[idx]
-
-            # Record indicator values at signal point
-            ind_values = {}
-            for condition in scenario.conditions:
-                if condition.indicator != "PRICE":
-                    col = get_column_name(condition.indicator.value, condition.params)
-                    val = row[col]
-                    if pd.notna(val):
-                        ind_values[col] = round(float(val), 4)
-                if condition.compare_to == CompareTo.INDICATOR and condition.compare_indicator:
-                    col = get_column_name(condition.compare_indicator.value, condition.compare_indicator_params)
-                    val = row[col]
-                    if pd.notna(val):
-                        ind_values[col] = round(float(val), 4)
-
-            signals.append(
-                Signal(
-                    date=signal_date.strftime("%Y-%m-%d"),
-                    price=round(float(row["close"]), 4),
-                    indicator_values=ind_values,
-                    outcomes=[],  # Filled in step 4
-                )
-            )
-
-    logger.info("Step 3 — Found %d signals in %.2fs", len(signals), time.time() - t0)
+    with timer.stage("signals"):
+        signal_indices = find_signal_indices(df, scenario, timer)
+        signals = build_signals(df, scenario, signal_indices, timer)
+    logger.info(
+        "Step 2 — %d indicators computed in %.2fs",
+        timer.counters.get("indicators_computed", 0), timer.stages.get("indicators", 0.0),
+    )
+    logger.info("Step 3 — Found %d signals in %.2fs", len(signals), timer.stages["signals"])
 
     # -------------------------------------------------------------------------
     # 4. EVALUATE TARGETS
     # -------------------------------------------------------------------------
-    t0 = time.time()
-
-    # Build a date-to-index mapping for fast forward lookups
-    date_to_idx = {date: i for i, date in enumerate(df.index)}
-
-    for signal in signals:
-        signal_date = pd.Timestamp(signal.date)
-        signal_idx = date_to_idx[signal_date]
-        signal_close = signal.price
-
-        for target in scenario.targets:
-            future_idx = signal_idx + target.days_forward
-
-            if future_idx >= len(df):
-                # Not enough future data
-                signal.outcomes.append(
-                    SignalOutcome(
-                        target_id=target.id,
-                        days_forward=target.days_forward,
-                        threshold_pct=target.threshold_pct,
-                        direction=target.direction.value,
-                        future_date=None,
-                        future_price=None,
-                        actual_change_pct=None,
-                        max_change_pct=None,
-                        hit=None,
-                    )
-                )
-                continue
-
-            future_row = df.iloc[future_idx]
-            future_close = float(future_row["close"])
-            future_date = df.index[future_idx]
-            change_pct = (future_close - signal_close) / signal_close * 100
-
-            # Max % move during the window (slice already in memory — negligible cost)
-            window_slice = df.iloc[signal_idx + 1 : future_idx + 1]
-            if len(window_slice) > 0 and target.direction.value == "ABOVE":
-                # Best case during window: max high
-                max_val = float(window_slice["high"].max())
-                max_change_pct = round((max_val - signal_close) / signal_close * 100, 4)
-            elif len(window_slice) > 0:  # BELOW — worst drop
-                min_val = float(window_slice["low"].min())
-                max_change_pct = round((min_val - signal_close) / signal_close * 100, 4)
-            else:
-                max_change_pct = None
-
-            if target.direction.value == "BELOW":
-                # If the user says BELOW 5%, they usually mean "lost 5% or more", which is <= -5%
-                # We treat positive thresholds as the magnitude of loss for the BELOW direction.
-                effective_threshold = -target.threshold_pct if target.threshold_pct > 0 else target.threshold_pct
-                hit = change_pct <= effective_threshold
-            else:  # ABOVE
-                hit = change_pct >= target.threshold_pct
-
-            # Anytime hit: target was touched at any point during the window
-            if target.direction.value == "BELOW":
-                anytime_effective = -target.threshold_pct if target.threshold_pct > 0 else target.threshold_pct
-                anytime_hit = (max_change_pct is not None) and (max_change_pct <= anytime_effective)
-            else:  # ABOVE
-                anytime_hit = (max_change_pct is not None) and (max_change_pct >= target.threshold_pct)
-
-            signal.outcomes.append(
-                SignalOutcome(
-                    target_id=target.id,
-                    days_forward=target.days_forward,
-                    threshold_pct=target.threshold_pct,
-                    direction=target.direction.value,
-                    future_date=future_date.strftime("%Y-%m-%d"),
-                    future_price=round(future_close, 4),
-                    actual_change_pct=round(change_pct, 4),
-                    max_change_pct=max_change_pct,
-                    hit=hit,
-                    anytime_hit=anytime_hit,
-                )
-            )
-
-    logger.info("Step 4 — Targets evaluated in %.2fs", time.time() - t0)
+    with timer.stage("targets"):
+        forward = get_forward_returns(df)
+        evaluate_targets(df, forward, signals, signal_indices, scenario.targets)
+    logger.info("Step 4 — Targets evaluated in %.2fs", timer.stages["targets"])
 
     # -------------------------------------------------------------------------
     # 5. COMPUTE STATISTICS
     # -------------------------------------------------------------------------
-    t0 = time.time()
-    target_stats = _compute_target_stats(signals, scenario.targets)
-    logger.info("Step 5 — Statistics computed in %.2fs", time.time() - t0)
+    with timer.stage("stats"):
+        target_stats = compute_target_stats(signals, scenario.targets)
+    return _finish(scenario, df, forward, signal_indices, target_stats, signals, timer)
+
+
+def run_analysis_streaming(
+    scenario: ScenarioInDB,
+    on_chunk: Callable[[list[Signal]], None],
+    chunk_size: Optional[int] = None,
+    timer: Optional[RunTimer] = None,
+) -> AnalysisResult:
+    """
+    Run the pipeline producing signals ``chunk_size`` at a time.
+
+    Each chunk is built, evaluated against every target, folded into the stats
+    accumulators and handed to ``on_chunk`` (e.g. to persist it) before the next
+    one is built, so peak memory depends on the chunk size rather than the
+    signal count. Returns the result without signals. Counts, extremes and
+    averages match ``run_analysis``; medians, percentiles and the histogram
+    come from quantile sketches (see ``TargetStatsAccumulator``).
+    """
+    timer = timer if timer is not None else RunTimer()
+    chunk_size = max(chunk_size or settings.stream_chunk_signals, 1)
+
+    with timer.stage("load"):
+        df = load_scenario_data(scenario)
+    _check_frame(df, timer)
+
+    with timer.stage("signals"):
+        signal_indices = find_signal_indices(df, scenario, timer)
+    forward = get_forward_returns(df)
+    accumulator = TargetStatsAccumulator(scenario.targets)
+    for start in range(0, len(signal_indices), chunk_size):
+        chunk_indices = signal_indices[start:start + chunk_size]
+        with timer.stage("signals"):
+            chunk = build_signals(df, scenario, chunk_indices, timer)
+        with timer.stage("targets"):
+            evaluate_targets(df, forward, chunk, chunk_indices, scenario.targets)
+        with timer.stage("stats"):
+            accumulator.add(chunk)
+        with timer.stage("persist"):
+            on_chunk(chunk)
+        timer.count("chunks")
+    logger.info("Streamed %d signals in %d chunks", len(signal_indices), timer.counters.get("chunks", 0))
+
+    with timer.stage("stats"):
+        target_stats = accumulator.result()
+    return _finish(scenario, df, forward, signal_indices, target_stats, [], timer)
+
+
+def _check_frame(df: pd.DataFrame, timer: RunTimer) -> None:
+    if len(df) < MIN_BARS:
+        raise ValueError(
+            f"Not enough data: got {len(df)} bars, need at least {MIN_BARS}. "
+            f"Try a wider date range or different ticker."
+        )
+    timer.data_source_latency = df.attrs.get("data_source_latency_s")
+
+
+def _finish(
+    scenario: ScenarioInDB,
+    df: pd.DataFrame,
+    forward: ForwardReturns,
+    signal_indices: np.ndarray,
+    target_stats: list[TargetStats],
+    signals: list[Signal],
+    timer: RunTimer,
+) -> AnalysisResult:
+    """Steps 5–6 shared by the in-memory and streaming pipelines."""
+    with timer.stage("stats"):
+        for ts, target in zip(target_stats, scenario.targets):
+            ts.baseline = forward.baseline(target)
+            ts.threshold_curve = _threshold_curve(forward, signal_indices, target.days_forward)
+    logger.info("Step 5 — Statistics computed in %.2fs", timer.stages["stats"])
+
+    if settings.significance_resamples > 0 and len(signal_indices) > 0:
+        with timer.stage("significance"):
+            compute_significance(
+                forward, signal_indices, scan_start(scenario),
+                scenario.targets, target_stats,
+                n_resamples=settings.significance_resamples, seed=settings.significance_seed,
+            )
+        logger.info("Step 5b — Significance vs random entries in %.2fs", timer.stages["significance"])
+
+    horizon_curve = None
+    options = scenario.analysis
+    if options.horizon_curve_max:
+        with timer.stage("horizons"):
+            horizon_curve = compute_horizon_curve(
+                forward, signal_indices, options.horizon_curve_max, options.horizon_curve_threshold_pct
+            )
+    breakdown = None
+    if options.breakdown is not None:
+        with timer.stage("breakdown"):
+            breakdown = _breakdown(scenario, df, forward, signal_indices, timer)
+    with timer.stage("calendar"):
+        calendar = compute_calendar_stats(df.index, forward, signal_indices, scenario.targets)
+    event_study = None
+    if options.event_study_horizon:
+        with timer.stage("event_study"):
+            event_study = compute_event_study(
+                forward, signal_indices, options.event_study_horizon, options.event_study_lookback
+            )
 
     # -------------------------------------------------------------------------
     # 6. BUILD RESULT
     # -------------------------------------------------------------------------
+    metadata = _build_metadata(timer, total_bars=len(df), total_signals=len(signal_indices))
+    _publish_metrics(metadata)
+
     result = AnalysisResult(
         scenario_id=scenario.id,
         scenario_name=scenario.name,
@@ -218,118 +210,76 @@ def run_analysis(scenario: ScenarioInDB) -> AnalysisResult:
         data_start=df.index[0].strftime("%Y-%m-%d"),
         data_end=df.index[-1].strftime("%Y-%m-%d"),
         total_bars=len(df),
-        total_signals=len(signals),
+        total_signals=len(signal_indices),
         target_stats=target_stats,
         signals=signals,
+        horizon_curve=horizon_curve,
+        event_study=event_study,
+        breakdown=breakdown,
+        calendar=calendar,
+        metadata=metadata,
     )
 
-    total_elapsed = time.time() - pipeline_start
     hit_summary = ", ".join(
         f"target {ts.target_id[:8]}...: {ts.hit_rate_pct:.1f}%"
         for ts in target_stats
     )
     logger.info(
         "Analysis complete in %.2fs: %d signals. %s",
-        total_elapsed, len(signals), hit_summary,
+        metadata.total_duration_ms / 1000, len(signal_indices), hit_summary,
     )
 
     return result
 
 
-def _compute_min_lookback(scenario: ScenarioInDB) -> int:
-    """Determine the minimum lookback period across all indicators."""
-    max_period = 0
-    for cond in scenario.conditions:
-        period = cond.params.get("period", 0)
-        slow = cond.params.get("slow", 0)
-        max_period = max(max_period, period, slow)
-
-        if cond.compare_indicator_params:
-            cp = cond.compare_indicator_params.get("period", 0)
-            cs = cond.compare_indicator_params.get("slow", 0)
-            max_period = max(max_period, cp, cs)
-
-    return max_period
-
-
-def _compute_target_stats(signals: list[Signal], targets) -> list[TargetStats]:
-    """Compute aggregate statistics per target from signal outcomes."""
-    stats_list: list[TargetStats] = []
-
-    for target in targets:
-        changes: list[float] = []
-        hit_count = 0
-        miss_count = 0
-        anytime_hit_count = 0
-
-        for signal in signals:
-            for outcome in signal.outcomes:
-                if outcome.target_id != target.id:
-                    continue
-                if outcome.hit is None:
-                    continue  # No future data
-                changes.append(outcome.actual_change_pct)
-                if outcome.hit:
-                    hit_count += 1
-                else:
-                    miss_count += 1
-                
-                if outcome.anytime_hit:
-                    anytime_hit_count += 1
-
-        total_evaluable = len(changes)
-
-        if total_evaluable == 0:
-            stats_list.append(
-                TargetStats(
-                    target_id=target.id,
-                    days_forward=target.days_forward,
-                    threshold_pct=target.threshold_pct,
-                    direction=target.direction.value,
-                    total_evaluable=0,
-                    hit_count=0,
-                    miss_count=0,
-                    hit_rate_pct=0.0,
-                    anytime_hit_count=0,
-                    anytime_hit_rate_pct=0.0,
-                    avg_change_pct=0.0,
-                    median_change_pct=0.0,
-                    max_change_pct=0.0,
-                    min_change_pct=0.0,
-                    std_dev=0.0,
-                    percentile_5=0.0,
-                    percentile_25=0.0,
-                    percentile_75=0.0,
-                    percentile_95=0.0,
-                    distribution=[],
-                )
-            )
-            continue
-
-        arr = np.array(changes)
-        stats_list.append(
-            TargetStats(
-                target_id=target.id,
-                days_forward=target.days_forward,
-                threshold_pct=target.threshold_pct,
-                direction=target.direction.value,
-                total_evaluable=total_evaluable,
-                hit_count=hit_count,
-                miss_count=miss_count,
-                hit_rate_pct=round(hit_count / total_evaluable * 100, 2),
-                anytime_hit_count=anytime_hit_count,
-                anytime_hit_rate_pct=round(anytime_hit_count / total_evaluable * 100, 2),
-                avg_change_pct=round(float(np.mean(arr)), 4),
-                median_change_pct=round(float(np.median(arr)), 4),
-                max_change_pct=round(float(np.max(arr)), 4),
-                min_change_pct=round(float(np.min(arr)), 4),
-                std_dev=round(float(np.std(arr, ddof=1)) if total_evaluable > 1 else 0.0, 4),
-                percentile_5=round(float(np.percentile(arr, 5)), 4),
-                percentile_25=round(float(np.percentile(arr, 25)), 4),
-                percentile_75=round(float(np.percentile(arr, 75)), 4),
-                percentile_95=round(float(np.percentile(arr, 95)), 4),
-                distribution=[round(float(c), 4) for c in changes],
-            )
-        )
+def _breakdown(
+    scenario: ScenarioInDB, df: pd.DataFrame, forward: ForwardReturns, signal_indices: np.ndarray, timer: RunTimer
+) -> RegimeBreakdown:
+    """Target stats by the breakdown indicator's bucket, reusing the frame's and cache's indicator columns."""
+    config = scenario.analysis.breakdown
+    col_name = indicator_column(config.indicator.value, config.params, config.timeframe)
+    ensure_column(df, col_name, config.indicator.value, config.params, config.timeframe, timer)
+    return compute_breakdown(
+        col_name, df[col_name].to_numpy(dtype=float), forward, signal_indices, scenario.targets, config,
+        start_idx=scan_start(scenario),
+    )
+
+
+def _threshold_curve(forward: ForwardReturns, signal_indices: np.ndarray, days: int) -> ThresholdCurve:
+    """Threshold sensitivity over the signals that have a full forward window."""
+    changes = forward.change_pct(days)[signal_indices]
+    evaluable = signal_indices[~np.isnan(changes)]
+    return compute_threshold_curve(
+        forward.change_pct(days)[evaluable],
+        forward.excursion_pct(days, "ABOVE")[evaluable],
+        forward.excursion_pct(days, "BELOW")[evaluable],
+        points=settings.threshold_curve_points,
+    )
+
+
+def _build_metadata(timer: RunTimer, total_bars: int, total_signals: int) -> RunMetadata:
+    """Freeze the run timer into the serialisable metadata attached to results."""
+    latency = timer.data_source_latency
+    return RunMetadata(
+        stage_durations_ms={name: round(secs * 1000, 3) for name, secs in timer.stages.items()},
+        total_duration_ms=round(timer.elapsed() * 1000, 3),
+        bars=total_bars,
+        signals=total_signals,
+        indicators_computed=timer.counters.get("indicators_computed", 0),
+        indicators_extended=timer.counters.get("indicators_extended", 0),
+        cache_hits=timer.counters.get("cache_hits", 0),
+        mask_cache_hits=timer.counters.get("mask_cache_hits", 0),
+        data_source_latency_ms=round(latency * 1000, 3) if latency is not None else None,
+    )
+
 
-    return stats_list
+def _publish_metrics(metadata: RunMetadata) -> None:
+    """Aggregate one run's metadata into the process-wide metrics registry."""
+    for stage, ms in metadata.stage_durations_ms.items():
+        registry.observe("retrocast_stage_duration_seconds", ms / 1000, stage=stage)
+    registry.observe("retrocast_stage_duration_seconds", metadata.total_duration_ms / 1000, stage="total")
+    registry.inc("retrocast_analysis_runs_total")
+    registry.inc("retrocast_signals_total", metadata.signals)
+    registry.inc("retrocast_indicators_computed_total", metadata.indicators_computed)
+    registry.inc("retrocast_indicators_extended_total", metadata.indicators_extended)
+    registry.inc("retrocast_cache_hits_total", metadata.cache_hits, cache="indicator_column")
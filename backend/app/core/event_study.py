@@ -0,0 +1,40 @@
+"""Event study: the average close path around the signals, with confidence and percentile bands."""
+
+import logging
+
+import numpy as np
+
+from app.core.forward import ForwardReturns
+from app.core.paths import path_stats, series
+from app.models.results import EventStudy
+
+logger = logging.getLogger(__name__)
+
+Z_95 = 1.959964
+
+
+def compute_event_study(
+    forward: ForwardReturns, signal_indices: np.ndarray, horizon: int, lookback: int = 0
+) -> EventStudy:
+    """
+    Mean, median, 95% CI of the mean and percentile bands of the close path at
+    t = -lookback..horizon, relative to each signal's close.
+
+    Column stats come from ``path_stats``, which gathers the path matrix in
+    bounded blocks of columns.
+    """
+    stats = path_stats(forward, signal_indices, horizon, lookback)
+    half_width = np.where(stats.count > 1, Z_95 * stats.std / np.sqrt(np.maximum(stats.count, 1)), np.nan)
+    percentiles = stats.percentiles
+    return EventStudy(
+        offsets=list(range(-lookback, horizon + 1)),
+        count=stats.count.tolist(),
+        mean_pct=series(stats.mean),
+        median_pct=series(percentiles[50]),
+        mean_ci_low_pct=series(stats.mean - half_width),
+        mean_ci_high_pct=series(stats.mean + half_width),
+        percentile_5=series(percentiles[5]),
+        percentile_25=series(percentiles[25]),
+        percentile_75=series(percentiles[75]),
+        percentile_95=series(percentiles[95]),
+    )
@@ -0,0 +1,230 @@
+"""
+Boolean expression trees over conditions, evaluated on whole-column masks.
+
+A scenario's conditions form a tree of AND/OR groups. Flat scenarios (no
+``condition_tree``) map to OR-of-AND-groups using the connectors, exactly like
+``build_groups``. Evaluation:
+
+- Identical sub-expressions (same canonical key) are evaluated once.
+- Children of each group are ordered by estimated cost and selectivity so
+  cheap, selective children run first and can short-circuit the group before
+  expensive indicators (e.g. ADX) are ever computed.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.cache import LRUCache
+from app.core.conditions import build_groups, condition_columns, condition_key, evaluate_condition_mask
+from app.models.scenario import CompareTo, ConditionConfig, ConditionGroup, Connector, Operator
+
+logger = logging.getLogger(__name__)
+
+# Relative cost of computing an indicator series (SMA = 1). Rough timings of
+# the 'ta' implementations on daily data; only the ordering matters.
+INDICATOR_COST: dict[str, float] = {
+    "PRICE": 0.0,
+    "SMA": 1.0, "HIGHEST": 1.0, "LOWEST": 1.0, "PRICE_CHANGE": 0.5, "VOLUME_RATIO": 1.0,
+    "EMA": 1.5, "RSI": 3.0,
+    "BBANDS_UPPER": 3.0, "BBANDS_MIDDLE": 3.0, "BBANDS_LOWER": 3.0,
+    "MACD": 4.0, "MACD_SIGNAL": 4.0, "MACD_HIST": 4.0,
+    "STOCH_K": 4.0, "STOCH_D": 4.0,
+    "ATR": 20.0, "ADX": 60.0,
+}
+# Cost of comparing two already-computed columns
+MASK_COST = 0.1
+# Oscillators bounded to [0, 100]: selectivity of a VALUE comparison is estimated as uniform
+BOUNDED_INDICATORS = {"RSI", "STOCH_K", "STOCH_D", "ADX"}
+
+
+@dataclass(frozen=True)
+class Leaf:
+    condition: ConditionConfig
+    key: str
+
+
+@dataclass(frozen=True)
+class Group:
+    operator: Connector
+    children: tuple["Node", ...]
+    key: str
+
+
+Node = Union[Leaf, Group]
+
+
+def build_expression(
+    conditions: list[ConditionConfig], tree: Optional[ConditionGroup] = None
+) -> Node:
+    """Build a normalized expression tree from a scenario's conditions."""
+    if tree is None:
+        groups = build_groups(conditions)
+        return _normalize(Connector.OR, [
+            _normalize(Connector.AND, [_leaf(c) for c in group]) for group in groups
+        ])
+    by_id = {c.id: c for c in conditions}
+    return _from_model(tree, by_id)
+
+
+def _from_model(group: ConditionGroup, by_id: dict[str, ConditionConfig]) -> Node:
+    children = [
+        _leaf(by_id[child]) if isinstance(child, str) else _from_model(child, by_id)
+        for child in group.children
+    ]
+    return _normalize(group.operator, children)
+
+
+def _leaf(condition: ConditionConfig) -> Leaf:
+    return Leaf(condition=condition, key=condition_key(condition))
+
+
+def _normalize(operator: Connector, children: list[Node]) -> Node:
+    """Flatten same-operator nesting, drop duplicate children, unwrap single children."""
+    flat: dict[str, Node] = {}
+    for child in children:
+        if isinstance(child, Group) and child.operator == operator:
+            for grandchild in child.children:
+                flat.setdefault(grandchild.key, grandchild)
+        else:
+            flat.setdefault(child.key, child)
+    if len(flat) == 1:
+        return next(iter(flat.values()))
+    key = f"{operator.value}(" + ",".join(sorted(flat)) + ")"
+    return Group(operator=operator, children=tuple(flat.values()), key=key)
+
+
+def leaves(node: Node) -> list[Leaf]:
+    """All leaves of a tree (duplicates included once)."""
+    if isinstance(node, Leaf):
+        return [node]
+    seen: dict[str, Leaf] = {}
+    for child in node.children:
+        for leaf in leaves(child):
+            seen.setdefault(leaf.key, leaf)
+    return list(seen.values())
+
+
+def estimate_selectivity(node: Node) -> float:
+    """Prior estimate of the fraction of bars on which a node is True."""
+    if isinstance(node, Group):
+        selectivities = [estimate_selectivity(c) for c in node.children]
+        if node.operator == Connector.AND:
+            return float(np.prod(selectivities))
+        return 1.0 - float(np.prod([1.0 - s for s in selectivities]))
+
+    cond = node.condition
+    if cond.operator in (Operator.CROSSES_ABOVE, Operator.CROSSES_BELOW):
+        return 0.05
+    if (
+        cond.compare_to == CompareTo.VALUE
+        and cond.compare_value is not None
+        and cond.indicator.value in BOUNDED_INDICATORS
+    ):
+        below = min(max(cond.compare_value / 100.0, 0.01), 0.99)
+        return below if cond.operator == Operator.BELOW else 1.0 - below
+    return 0.5
+
+
+class ExpressionEvaluator:
+    """
+    Evaluates expression trees against one DataFrame, memoizing masks by key.
+
+    ``ensure_columns`` is called before a leaf is evaluated so indicator columns
+    are computed lazily — leaves pruned by short-circuiting never pay for them.
+
+    With a ``mask_cache`` and ``dataset_key`` (the frame's fingerprint), leaf
+    masks are also looked up in and stored to the shared cache, so re-running
+    an edited scenario only evaluates the conditions that changed.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        ensure_columns: Callable[[ConditionConfig], None],
+        start_idx: int = 0,
+        mask_cache: Optional[LRUCache] = None,
+        dataset_key: Optional[str] = None,
+    ) -> None:
+        self.df = df
+        self.ensure_columns = ensure_columns
+        self.start_idx = start_idx
+        self.mask_cache = mask_cache if dataset_key is not None else None
+        self.dataset_key = dataset_key
+        self.leaves_evaluated = 0
+        self.masks_reused = 0
+        self._memo: dict[str, np.ndarray] = {}
+
+    def evaluate(self, node: Node) -> np.ndarray:
+        cached = self._memo.get(node.key)
+        if cached is not None:
+            return cached
+        if isinstance(node, Leaf):
+            mask = self._evaluate_leaf(node)
+        else:
+            mask = self._evaluate_group(node)
+        self._memo[node.key] = mask
+        return mask
+
+    def _evaluate_leaf(self, leaf: Leaf) -> np.ndarray:
+        if self.mask_cache is not None:
+            cached = self.mask_cache.get((self.dataset_key, leaf.key))
+            if cached is not None:
+                self.masks_reused += 1
+                return cached
+
+        self.ensure_columns(leaf.condition)
+        self.leaves_evaluated += 1
+        mask = evaluate_condition_mask(self.df, leaf.condition)
+        if self.mask_cache is not None:
+            mask.flags.writeable = False
+            self.mask_cache.put((self.dataset_key, leaf.key), mask, mask.nbytes)
+        return mask
+
+    def _evaluate_group(self, group: Group) -> np.ndarray:
+        is_and = group.operator == Connector.AND
+        ordered = sorted(group.children, key=lambda child: self._rank(child, is_and))
+
+        result: Optional[np.ndarray] = None
+        for child in ordered:
+            child_mask = self.evaluate(child)
+            if result is None:
+                result = child_mask.copy()
+            elif is_and:
+                result &= child_mask
+            else:
+                result |= child_mask
+
+            active = result[self.start_idx:]
+            if is_and and not active.any():
+                break  # nothing left to match — skip remaining (costlier) children
+            if not is_and and active.all():
+                break  # everything already matches
+        return result
+
+    def estimate_cost(self, node: Node) -> float:
+        """Estimated cost of evaluating a node given what is already computed."""
+        if node.key in self._memo:
+            return 0.0
+        if self.mask_cache is not None and (self.dataset_key, node.key) in self.mask_cache:
+            return 0.0
+        if isinstance(node, Group):
+            return sum(self.estimate_cost(child) for child in node.children)
+        cost = MASK_COST
+        for column, indicator, _params in condition_columns(node.condition):
+            if column not in self.df.columns:
+                cost += INDICATOR_COST.get(indicator, 5.0)
+        return cost
+
+    def _rank(self, node: Node, is_and: bool) -> float:
+        """
+        Classic short-circuit ordering: for AND sort by cost / P(False),
+        for OR by cost / P(True). Lower rank runs first.
+        """
+        cost = self.estimate_cost(node)
+        selectivity = estimate_selectivity(node)
+        prune_probability = (1.0 - selectivity) if is_and else selectivity
+        return cost / max(prune_probability, 1e-6)
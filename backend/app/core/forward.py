@@ -0,0 +1,185 @@
+"""
+Vectorised forward returns over a price frame.
+
+Forward arrays depend only on the OHLC columns, so they are cached per frame
+(see ``get_forward_returns``) and shared by target evaluation, baseline stats
+and significance testing — by every scenario of a batch run on one frame, and
+by every run's copy of a frame from the dataset cache (see ``cached_copy``).
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.cache import frame_memo
+from app.models.results import TargetBaseline
+from app.models.scenario import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on path elements (signals × window bars) gathered per batch
+MAX_PATH_ELEMENTS = 4_000_000
+
+OPPOSITE = {"ABOVE": "BELOW", "BELOW": "ABOVE"}
+
+
+class ForwardReturns:
+    """
+    Forward % changes for every bar of a frame, per horizon.
+
+    ``change_pct(d)[i]`` is the % change from close[i] to close[i + d], or NaN
+    when fewer than ``d`` bars follow bar ``i``. ``excursion_pct(d, direction)``
+    is the best (ABOVE: highest high) or worst (BELOW: lowest low) % move over
+    bars i+1..i+d. Arrays are computed once per horizon and kept read-only.
+    """
+
+    def __init__(self, close: np.ndarray, high: Optional[np.ndarray] = None, low: Optional[np.ndarray] = None) -> None:
+        self.close = np.asarray(close, dtype=float)
+        self.high = self.close if high is None else np.asarray(high, dtype=float)
+        self.low = self.close if low is None else np.asarray(low, dtype=float)
+        self.n = len(self.close)
+        self._change: dict[int, np.ndarray] = {}
+        self._excursion: dict[tuple[int, str], np.ndarray] = {}
+        self._baselines: dict[tuple[int, float, str], TargetBaseline] = {}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ForwardReturns":
+        return cls(
+            df["close"].to_numpy(dtype=float),
+            df["high"].to_numpy(dtype=float) if "high" in df.columns else None,
+            df["low"].to_numpy(dtype=float) if "low" in df.columns else None,
+        )
+
+    def change_pct(self, days: int) -> np.ndarray:
+        cached = self._change.get(days)
+        if cached is not None:
+            return cached
+        out = np.full(self.n, np.nan)
+        if days < self.n:
+            base = self.close[: self.n - days]
+            out[: self.n - days] = (self.close[days:] - base) / base * 100
+        out.flags.writeable = False
+        self._change[days] = out
+        return out
+
+    def excursion_pct(self, days: int, direction: str) -> np.ndarray:
+        key = (days, direction)
+        cached = self._excursion.get(key)
+        if cached is not None:
+            return cached
+        out = np.full(self.n, np.nan)
+        if days < self.n:
+            # Rolling extreme ending at bar j covers j-days+1..j, i.e. i+1..i+days for j = i+days
+            if direction == "BELOW":
+                extreme = pd.Series(self.low).rolling(days).min().to_numpy()
+            else:
+                extreme = pd.Series(self.high).rolling(days).max().to_numpy()
+            base = self.close[: self.n - days]
+            out[: self.n - days] = (extreme[days:] - base) / base * 100
+        out.flags.writeable = False
+        self._excursion[key] = out
+        return out
+
+    def first_passage(
+        self, signal_indices: np.ndarray, days: int, threshold_pct: float, direction: str
+    ) -> np.ndarray:
+        """
+        Bars from entry until the window first touches the target (1..days).
+
+        NaN when the target is never touched or the window runs past the data.
+        Paths of high (ABOVE) or low (BELOW) are gathered as a signals × days
+        matrix in batches and searched for the first crossing with argmax.
+        """
+        out = np.full(len(signal_indices), np.nan)
+        valid = np.flatnonzero(signal_indices + days < self.n)
+        prices = self.low if direction == "BELOW" else self.high
+        offsets = np.arange(1, days + 1)
+        per_batch = max(1, MAX_PATH_ELEMENTS // days)
+
+        for start in range(0, len(valid), per_batch):
+            rows = valid[start : start + per_batch]
+            entry = signal_indices[rows]
+            base = self.close[entry][:, None]
+            path = (prices[entry[:, None] + offsets] - base) / base * 100
+            crossed = hit_mask(path, threshold_pct, direction)
+            touched = crossed.any(axis=1)
+            out[rows[touched]] = crossed[touched].argmax(axis=1) + 1
+        return out
+
+    def path_pct(
+        self, signal_indices: np.ndarray, horizon: int, lookback: int = 0, columns: slice = slice(None)
+    ) -> np.ndarray:
+        """
+        % change of close relative to each signal's entry close, t = -lookback..horizon.
+
+        Returns a signals × (lookback + horizon + 1) matrix; column ``lookback``
+        is t=0 (all zeros). Bars outside the data are NaN. Windows come from a
+        strided view over the NaN-padded close array, so only the gathered
+        signal rows (restricted to ``columns``, if given) are materialised.
+        """
+        padded = np.concatenate([np.full(lookback, np.nan), self.close, np.full(horizon, np.nan)])
+        windows = sliding_window_view(padded, lookback + horizon + 1)[:, columns]
+        rows = windows[signal_indices]  # window k starts at bar k - lookback
+        base = self.close[signal_indices][:, None]
+        return (rows - base) / base * 100
+
+    def baseline(self, target: TargetConfig) -> TargetBaseline:
+        """Unconditional ("all days") stats for a target, memoised per (days, threshold, direction)."""
+        direction = target.direction.value
+        key = (target.days_forward, target.threshold_pct, direction)
+        cached = self._baselines.get(key)
+        if cached is not None:
+            return cached
+
+        changes = self.change_pct(target.days_forward)
+        valid = ~np.isnan(changes)
+        arr = changes[valid]
+        if len(arr) == 0:
+            baseline = TargetBaseline(total_bars=0)
+        else:
+            excursions = self.excursion_pct(target.days_forward, direction)[valid]
+            p5, p25, median, p75, p95 = np.percentile(arr, [5, 25, 50, 75, 95])
+            baseline = TargetBaseline(
+                total_bars=len(arr),
+                hit_rate_pct=round(float(hit_mask(arr, target.threshold_pct, direction).mean() * 100), 2),
+                anytime_hit_rate_pct=round(
+                    float(hit_mask(excursions, target.threshold_pct, direction).mean() * 100), 2
+                ),
+                avg_change_pct=round(float(arr.mean()), 4),
+                median_change_pct=round(float(median), 4),
+                std_dev=round(float(arr.std(ddof=1)) if len(arr) > 1 else 0.0, 4),
+                percentile_5=round(float(p5), 4),
+                percentile_25=round(float(p25), 4),
+                percentile_75=round(float(p75), 4),
+                percentile_95=round(float(p95), 4),
+            )
+        self._baselines[key] = baseline
+        return baseline
+
+
+def get_forward_returns(df: pd.DataFrame) -> ForwardReturns:
+    """ForwardReturns for a frame, built once and reused for the frame's lifetime."""
+    return frame_memo(df, "forward_returns", ForwardReturns.from_frame)
+
+
+def effective_threshold(threshold_pct: float, direction: str) -> float:
+    """
+    Threshold on the signed % change for a target.
+
+    For BELOW, a positive threshold is the magnitude of loss: BELOW 5% means
+    a change of -5% or lower.
+    """
+    if direction == "BELOW" and threshold_pct > 0:
+        return -threshold_pct
+    return threshold_pct
+
+
+def hit_mask(changes: np.ndarray, threshold_pct: float, direction: str) -> np.ndarray:
+    """Element-wise hit test for a target direction (NaN changes are never hits)."""
+    threshold = effective_threshold(threshold_pct, direction)
+    if direction == "BELOW":
+        return changes <= threshold
+    return changes >= threshold
@@ -0,0 +1,39 @@
+"""Forward-return surface across every holding period (horizon curve)."""
+
+import logging
+
+import numpy as np
+
+from app.core.forward import ForwardReturns
+from app.core.paths import path_stats, series
+from app.models.results import HorizonCurve
+
+logger = logging.getLogger(__name__)
+
+
+def compute_horizon_curve(
+    forward: ForwardReturns, signal_indices: np.ndarray, max_horizon: int, threshold_pct: float = 0.0
+) -> HorizonCurve:
+    """
+    Mean, median, hit rate and percentiles of the forward change at horizons 1..max_horizon.
+
+    Column stats of the signals' forward paths come from ``path_stats`` (the
+    t=0 column is dropped); signals too close to the end of the data only
+    count at the horizons they reach.
+    """
+    stats = path_stats(forward, signal_indices, max_horizon, threshold_pct=threshold_pct)
+    count = stats.count[1:]
+    hit_rate = np.where(count > 0, stats.hits[1:] / np.maximum(count, 1) * 100, np.nan)
+    percentiles = {q: values[1:] for q, values in stats.percentiles.items()}
+    return HorizonCurve(
+        horizons=list(range(1, max_horizon + 1)),
+        threshold_pct=threshold_pct,
+        count=count.tolist(),
+        mean_pct=series(stats.mean[1:]),
+        median_pct=series(percentiles[50]),
+        hit_rate_pct=series(hit_rate, 2),
+        percentile_5=series(percentiles[5]),
+        percentile_25=series(percentiles[25]),
+        percentile_75=series(percentiles[75]),
+        percentile_95=series(percentiles[95]),
+    )
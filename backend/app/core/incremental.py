@@ -0,0 +1,132 @@
+"""
+Incremental indicators: compute a series together with a small state
+snapshot, then extend it over newly appended bars in O(new bars).
+
+Each kernel mirrors the ``ta`` implementation behind ``compute_indicator``,
+so a full compute gives the same series and an extension matches a full
+recompute of the longer data. Recursive indicators (EMA, RSI, MACD, ATR, ADX)
+keep their running averages (see ``app.core.kernels``); windowed ones (SMA,
+Bollinger bands, stochastics, highest/lowest, volume ratio, price change)
+keep the trailing input rows their window needs.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.cache import dataset_fingerprint, prefix_fingerprint
+from app.core.indicators import compute_indicator
+from app.core.kernels import ADXKernel, ATRKernel, Arrays, EMAKernel, Kernel, MACDKernel, RSIKernel
+
+logger = logging.getLogger(__name__)
+
+OHLCV = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    """An indicator series over the first ``bars`` bars of a dataset and the kernel state after them."""
+
+    bars: int
+    fingerprint: str  # dataset_fingerprint of those bars
+    values: np.ndarray
+    state: dict
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + 8 * _state_size(self.state)
+
+
+# ---------------------------------------------------------------------------
+# Windowed indicators: recompute over the trailing rows plus the new bars
+# ---------------------------------------------------------------------------
+
+class WindowKernel(Kernel):
+    """An indicator whose value depends only on the last ``lookback`` bars."""
+
+    def __init__(self, indicator: str, params: dict, lookback: int) -> None:
+        self.indicator, self.params = indicator, params
+        self.lookback = self.min_bars = lookback
+
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        return self._run(data), self._tail(data)
+
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        window = {col: np.concatenate((np.asarray(state[col], dtype=float), data[col])) for col in OHLCV}
+        return self._run(window)[-len(data["close"]):], self._tail(window)
+
+    def _run(self, data: Arrays) -> np.ndarray:
+        return compute_indicator(pd.DataFrame(data), self.indicator, self.params).to_numpy(dtype=float)
+
+    def _tail(self, data: Arrays) -> dict:
+        keep = self.lookback - 1
+        return {col: data[col][len(data[col]) - keep:].tolist() for col in OHLCV}
+
+
+def make_kernel(indicator: str, params: dict) -> Optional[Kernel]:
+    """The kernel computing ``indicator`` like ``compute_indicator`` does, or None if there is none."""
+    indicator = indicator.upper()
+    if indicator == "EMA":
+        return EMAKernel(params["period"])
+    if indicator == "RSI":
+        return RSIKernel(params["period"])
+    if indicator in ("MACD", "MACD_SIGNAL", "MACD_HIST"):
+        return MACDKernel(indicator, params.get("fast", 12), params.get("slow", 26), params.get("signal", 9))
+    if indicator == "ATR":
+        return ATRKernel(params["period"])
+    if indicator == "ADX":
+        return ADXKernel(params["period"])
+    if indicator in ("SMA", "BBANDS_UPPER", "BBANDS_MIDDLE", "BBANDS_LOWER", "HIGHEST", "LOWEST", "VOLUME_RATIO"):
+        return WindowKernel(indicator, params, params["period"])
+    if indicator == "PRICE_CHANGE":
+        return WindowKernel(indicator, params, params["period"] + 1)
+    if indicator in ("STOCH_K", "STOCH_D"):
+        k = params.get("k", 14)
+        return WindowKernel(indicator, params, k if indicator == "STOCH_K" else k + params.get("d", 3) - 1)
+    return None
+
+
+def advance(
+    df: pd.DataFrame, indicator: str, params: dict, snapshot: Optional[IndicatorSnapshot] = None
+) -> tuple[np.ndarray, Optional[IndicatorSnapshot], int]:
+    """
+    The indicator over every bar of ``df``, the snapshot to keep for the next
+    call, and how many bars were computed.
+
+    When ``snapshot`` covers a prefix of ``df`` (same bars, same OHLCV values),
+    only the bars after it are computed; otherwise the whole series is. Data
+    too short for a kernel (or indicators without one) get no snapshot.
+    """
+    kernel = make_kernel(indicator, params)
+    if kernel is None or len(df) < kernel.min_bars:
+        return compute_indicator(df, indicator, params).to_numpy(dtype=float), None, len(df)
+
+    if (
+        snapshot is not None
+        and snapshot.bars <= len(df)
+        and prefix_fingerprint(df, snapshot.bars) == snapshot.fingerprint
+    ):
+        if snapshot.bars == len(df):
+            return snapshot.values, snapshot, 0
+        extension, state = kernel.extend(snapshot.state, _arrays(df.iloc[snapshot.bars:]))
+        values = np.concatenate((snapshot.values, extension))
+        computed = len(extension)
+    else:
+        values, state = kernel.compute(_arrays(df))
+        computed = len(df)
+    return values, IndicatorSnapshot(len(df), dataset_fingerprint(df), values, state), computed
+
+
+def _arrays(df: pd.DataFrame) -> Arrays:
+    return {col: df[col].to_numpy(dtype=float) for col in OHLCV}
+
+
+def _state_size(state) -> int:
+    if isinstance(state, dict):
+        return sum(_state_size(v) for v in state.values())
+    if isinstance(state, list):
+        return sum(_state_size(v) for v in state)
+    return 1
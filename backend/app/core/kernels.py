@@ -0,0 +1,258 @@
+"""
+Recursive indicator kernels (EMA, RSI, MACD, ATR, ADX).
+
+Each mirrors the ``ta`` implementation behind ``compute_indicator``
+operation for operation and keeps its running averages as the state, so
+extending a state over new bars matches a full recompute bit for bit.
+States are plain dicts of floats and lists.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+Arrays = dict[str, np.ndarray]
+
+
+class Kernel(ABC):
+    """``compute`` a whole series with its end state; ``extend`` a state over new bars."""
+
+    # Bars needed before a state is worth keeping (shorter data is left to compute_indicator)
+    min_bars = 1
+
+    @abstractmethod
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        """The series over every bar of ``data`` and the state after the last one."""
+
+    @abstractmethod
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        """The series over the bars of ``data``, continuing from ``state``, and the new state."""
+
+
+# ---------------------------------------------------------------------------
+# Exponential weighting, as pandas' ewm(adjust=False).mean() computes it
+# ---------------------------------------------------------------------------
+
+def _ewm_alpha(span: Optional[float] = None, alpha: Optional[float] = None) -> float:
+    """The smoothing factor pandas applies; it round-trips through the centre of mass."""
+    com = (span - 1) / 2 if span is not None else (1 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+def _ewm(values: np.ndarray, min_periods: int, **weighting: float) -> tuple[np.ndarray, list]:
+    """``ewm(..., min_periods, adjust=False).mean()`` and its [weighted, old_wt, nobs] end state."""
+    raw = pd.Series(values).ewm(adjust=False, **weighting).mean().to_numpy()
+    observed = ~np.isnan(values)
+    nobs = np.cumsum(observed)
+    out = np.where(nobs >= min_periods, raw, np.nan)
+
+    weighted, old_wt = float(raw[-1]), 1.0
+    if not np.isnan(weighted):
+        # Missing values after the last observation keep decaying the old weight
+        factor = 1.0 - _ewm_alpha(**weighting)
+        for _ in range(len(values) - 1 - int(np.flatnonzero(observed)[-1])):
+            old_wt *= factor
+    return out, [weighted, old_wt, int(nobs[-1])]
+
+
+def _ewm_step(state: list, x: float, alpha: float, min_periods: int) -> float:
+    """Advance an ``_ewm`` state by one value (in place) and return the output for it."""
+    weighted, old_wt, nobs = state
+    observed = x == x
+    nobs += observed
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if observed:
+            if weighted != x:
+                weighted = (old_wt * weighted + alpha * x) / (old_wt + alpha)
+            old_wt = 1.0
+    elif observed:
+        weighted = x
+    state[:] = [weighted, old_wt, nobs]
+    return weighted if nobs >= min_periods else np.nan
+
+
+class EMAKernel(Kernel):
+    def __init__(self, period: int) -> None:
+        self.period = period
+
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        values, ema = _ewm(data["close"], self.period, span=self.period)
+        return values, {"ema": ema}
+
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        ema, alpha = list(state["ema"]), _ewm_alpha(span=self.period)
+        values = [_ewm_step(ema, x, alpha, self.period) for x in data["close"].tolist()]
+        return np.array(values, dtype=float), {"ema": ema}
+
+
+class RSIKernel(Kernel):
+    """Wilder RSI: exponentially weighted average gains and losses of the close."""
+
+    min_bars = 2
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        close = pd.Series(data["close"])
+        diff = close.diff(1)
+        gains, gain = _ewm(diff.where(diff > 0, 0.0).to_numpy(), self.period, alpha=1 / self.period)
+        losses, loss = _ewm((-diff.where(diff < 0, 0.0)).to_numpy(), self.period, alpha=1 / self.period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(losses == 0, 100, 100 - (100 / (1 + gains / losses)))
+        return values, {"close": float(data["close"][-1]), "gain": gain, "loss": loss}
+
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        gain, loss, previous = list(state["gain"]), list(state["loss"]), state["close"]
+        alpha = _ewm_alpha(alpha=1 / self.period)
+        values = []
+        for close in data["close"].tolist():
+            diff = close - previous
+            up = _ewm_step(gain, diff if diff > 0 else 0.0, alpha, self.period)
+            down = _ewm_step(loss, -(diff if diff < 0 else 0.0), alpha, self.period)
+            values.append(100.0 if down == 0 else 100 - (100 / (1 + up / down)))
+            previous = close
+        return np.array(values, dtype=float), {"close": previous, "gain": gain, "loss": loss}
+
+
+class MACDKernel(Kernel):
+    """MACD line, signal line or histogram, from three exponential averages."""
+
+    def __init__(self, output: str, fast: int, slow: int, signal: int) -> None:
+        self.output, self.fast, self.slow, self.signal = output, fast, slow, signal
+
+    def _select(self, macd, signal):
+        if self.output == "MACD":
+            return macd
+        return signal if self.output == "MACD_SIGNAL" else macd - signal
+
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        fast_values, fast = _ewm(data["close"], self.fast, span=self.fast)
+        slow_values, slow = _ewm(data["close"], self.slow, span=self.slow)
+        macd = fast_values - slow_values
+        signal_values, signal = _ewm(macd, self.signal, span=self.signal)
+        return self._select(macd, signal_values), {"fast": fast, "slow": slow, "signal": signal}
+
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        fast, slow, signal = list(state["fast"]), list(state["slow"]), list(state["signal"])
+        alphas = _ewm_alpha(span=self.fast), _ewm_alpha(span=self.slow), _ewm_alpha(span=self.signal)
+        values = []
+        for close in data["close"].tolist():
+            macd = _ewm_step(fast, close, alphas[0], self.fast) - _ewm_step(slow, close, alphas[1], self.slow)
+            values.append(self._select(macd, _ewm_step(signal, macd, alphas[2], self.signal)))
+        return np.array(values, dtype=float), {"fast": fast, "slow": slow, "signal": signal}
+
+
+# ---------------------------------------------------------------------------
+# Wilder-smoothed range indicators
+# ---------------------------------------------------------------------------
+
+def _true_range(high: np.ndarray, low: np.ndarray, previous_close: np.ndarray) -> np.ndarray:
+    """Row-wise max of the three ranges, skipping a missing previous close."""
+    return np.fmax(np.fmax(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+
+
+def _shifted(values: np.ndarray, first: float) -> np.ndarray:
+    return np.concatenate(([first], values[:-1]))
+
+
+class ATRKernel(Kernel):
+    """Average true range: the first ``period`` bars' mean, then Wilder smoothing (zero before)."""
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.min_bars = period + 1
+
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        window, close = self.period, data["close"]
+        true_range = _true_range(data["high"], data["low"], _shifted(close, np.nan))
+        atr = np.zeros(len(close))
+        current = pd.Series(true_range[:window]).mean()
+        atr[window - 1] = current
+        for i, tr in enumerate(true_range[window:].tolist(), start=window):
+            current = (current * (window - 1) + tr) / float(window)
+            atr[i] = current
+        return atr, {"atr": float(current), "close": float(close[-1])}
+
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        window, current, close = self.period, state["atr"], data["close"]
+        values = []
+        for tr in _true_range(data["high"], data["low"], _shifted(close, state["close"])).tolist():
+            current = (current * (window - 1) + tr) / float(window)
+            values.append(current)
+        return np.array(values, dtype=float), {"atr": current, "close": float(close[-1])}
+
+
+class ADXKernel(Kernel):
+    """
+    Average directional index, as ``ta.trend.ADXIndicator`` computes it:
+    Wilder sums of the true range and of the +/- directional movement, the
+    directional index from their ratios, then its Wilder average.
+    """
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.min_bars = 2 * period + 2
+
+    @staticmethod
+    def _movements(high, low, close, previous: tuple[float, float, float]):
+        """True range and +/- directional movement of each bar, given the bar before the first."""
+        prev_high, prev_low, prev_close = (_shifted(v, p) for v, p in zip((high, low, close), previous))
+        true_range = np.amax([high, prev_close], axis=0) - np.amin([low, prev_close], axis=0)
+        up, down = high - prev_high, prev_low - low
+        plus = np.abs(((up > down) & (up > 0)) * up)
+        minus = np.abs(((down > up) & (down > 0)) * down)
+        return true_range, plus, minus
+
+    @staticmethod
+    def _dx(trs: float, plus: float, minus: float) -> float:
+        plus_di = 100 * (plus / trs) if trs != 0 else 0.0
+        minus_di = 100 * (minus / trs) if trs != 0 else 0.0
+        total = plus_di + minus_di
+        return 100 * abs((plus_di - minus_di) / total) if total != 0 else 0.0
+
+    def compute(self, data: Arrays) -> tuple[np.ndarray, dict]:
+        window = self.period
+        high, low, close = data["high"], data["low"], data["close"]
+        moves = self._movements(high, low, close, (np.nan, np.nan, np.nan))
+
+        # Wilder sums at bar window + i; the first is the plain sum of the first window bars
+        length = len(close) - (window - 1)
+        sums = np.zeros((3, length))
+        for row, move in enumerate(moves):
+            sums[row, 0] = current = pd.Series(move).dropna().iloc[0:window].sum()
+            for i, value in enumerate(move[window + 1:window + length - 1].tolist(), start=1):
+                current = current - (current / float(window)) + value
+                sums[row, i] = current
+
+        dx = np.array([self._dx(*column) for column in sums.T.tolist()])
+        adx = np.zeros(length)
+        adx[window] = current = dx[0:window].mean()
+        for i in range(window + 1, length):
+            current = ((current * (window - 1)) + dx[i - 1]) / float(window)
+            adx[i] = current
+        state = {
+            "sums": sums[:, length - 2].tolist(),
+            "adx": float(current),
+            "bar": [float(high[-1]), float(low[-1]), float(close[-1])],
+        }
+        return np.concatenate((np.zeros(window - 1), adx)), state
+
+    def extend(self, state: dict, data: Arrays) -> tuple[np.ndarray, dict]:
+        window = self.period
+        high, low, close = data["high"], data["low"], data["close"]
+        moves = np.array(self._movements(high, low, close, tuple(state["bar"]))).T.tolist()
+        sums, current = list(state["sums"]), state["adx"]
+        values = []
+        for move in moves:
+            sums = [s - (s / float(window)) + m for s, m in zip(sums, move)]
+            current = ((current * (window - 1)) + self._dx(*sums)) / float(window)
+            values.append(current)
+        state = {"sums": sums, "adx": current, "bar": [float(high[-1]), float(low[-1]), float(close[-1])]}
+        return np.array(values, dtype=float), state
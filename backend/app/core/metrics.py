@@ -0,0 +1,173 @@
+"""In-process metrics: per-run stage timing and Prometheus-format aggregation."""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds. Covers sub-millisecond cached stages up to multi-minute universe runs.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """A cumulative-bucket histogram matching the Prometheus data model."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms and counters, rendered as Prometheus text."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[LabelSet, Histogram]] = {}
+        self._counters: dict[str, dict[LabelSet, float]] = {}
+        self._help: dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def counter_value(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    def reset(self) -> None:
+        """Drop all recorded values (used in tests)."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (v0.0.4)."""
+        lines: list[str] = []
+        with self._lock:
+            for name in sorted(self._counters):
+                self._header(lines, name, "counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+            for name in sorted(self._histograms):
+                self._header(lines, name, "histogram")
+                for labels, hist in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        le = labels + (("le", _fmt_value(bound)),)
+                        lines.append(f"{name}_bucket{_fmt_labels(le)} {cumulative}")
+                    inf = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_fmt_labels(inf)} {hist.count}")
+                    lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(hist.total)}")
+                    lines.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: list[str], name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _fmt_labels(labels: LabelSet) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        k + '="' + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+registry = MetricsRegistry()
+registry.describe("retrocast_stage_duration_seconds", "Duration of each analysis pipeline stage.")
+registry.describe("retrocast_http_request_duration_seconds", "HTTP request latency per endpoint.")
+registry.describe("retrocast_data_source_latency_seconds", "Time spent fetching raw data per source.")
+registry.describe("retrocast_analysis_runs_total", "Completed analysis runs.")
+registry.describe("retrocast_signals_total", "Signals found across all analysis runs.")
+registry.describe("retrocast_indicators_computed_total", "Indicator series computed.")
+registry.describe("retrocast_indicators_extended_total", "Indicator series extended from a snapshot over new bars.")
+registry.describe("retrocast_cache_hits_total", "Cache hits by cache name.")
+registry.describe("retrocast_cache_misses_total", "Cache misses by cache name.")
+registry.describe("retrocast_cache_evictions_total", "Entries evicted to stay within the byte budget, by cache name.")
+registry.describe("retrocast_cache_coalesced_total", "Loads that joined an identical in-flight load, by cache name.")
+
+
+class RunTimer:
+    """
+    Collects monotonic stage durations and counters for a single analysis run.
+
+    Usage:
+        timer = RunTimer()
+        with timer.stage("load"):
+            ...
+        timer.count("cache_hits")
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.data_source_latency: Optional[float] = None
+        self._active: list[str] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage. Nested stages are exclusive: their time is taken off the parent."""
+        t0 = time.perf_counter()
+        self._active.append(name)
+        try:
+            yield
+        finally:
+            self._active.pop()
+            elapsed = time.perf_counter() - t0
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            if self._active:
+                parent = self._active[-1]
+                self.stages[parent] = self.stages.get(parent, 0.0) - elapsed
+
+    def check(self) -> None:
+        """Called between steps of a run; subclasses raise here to abandon it."""
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
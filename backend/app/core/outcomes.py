@@ -0,0 +1,73 @@
+"""Per-signal target outcomes, evaluated on whole forward-return arrays."""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.core.forward import OPPOSITE, ForwardReturns, hit_mask
+from app.models.results import Signal, SignalOutcome
+from app.models.scenario import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+
+def evaluate_targets(
+    df: pd.DataFrame,
+    forward: ForwardReturns,
+    signals: list[Signal],
+    signal_indices: np.ndarray,
+    targets: list[TargetConfig],
+) -> None:
+    """Append one SignalOutcome per target to every signal."""
+    if len(signals) == 0:
+        return
+
+    closes = forward.close
+    for target in targets:
+        direction = target.direction.value
+        future_idx = signal_indices + target.days_forward
+        has_future = future_idx < len(df)
+
+        changes = forward.change_pct(target.days_forward)[signal_indices]
+        excursions = forward.excursion_pct(target.days_forward, direction)[signal_indices]
+        adverse = forward.excursion_pct(target.days_forward, OPPOSITE[direction])[signal_indices]
+        days_to_hit = forward.first_passage(signal_indices, target.days_forward, target.threshold_pct, direction)
+        hits = hit_mask(changes, target.threshold_pct, direction)
+        anytime_hits = hit_mask(excursions, target.threshold_pct, direction)
+
+        valid_future = future_idx[has_future]
+        future_dates = np.full(len(signals), None, dtype=object)
+        future_dates[has_future] = df.index[valid_future].strftime("%Y-%m-%d")
+        future_prices = np.full(len(signals), np.nan)
+        future_prices[has_future] = closes[valid_future]
+
+        for i, signal in enumerate(signals):
+            if not has_future[i]:
+                # Not enough future data
+                signal.outcomes.append(
+                    SignalOutcome(
+                        target_id=target.id,
+                        days_forward=target.days_forward,
+                        threshold_pct=target.threshold_pct,
+                        direction=direction,
+                    )
+                )
+                continue
+
+            signal.outcomes.append(
+                SignalOutcome(
+                    target_id=target.id,
+                    days_forward=target.days_forward,
+                    threshold_pct=target.threshold_pct,
+                    direction=direction,
+                    future_date=future_dates[i],
+                    future_price=round(float(future_prices[i]), 4),
+                    actual_change_pct=round(float(changes[i]), 4),
+                    max_change_pct=round(float(excursions[i]), 4),
+                    hit=bool(hits[i]),
+                    anytime_hit=bool(anytime_hits[i]),
+                    days_to_hit=None if np.isnan(days_to_hit[i]) else int(days_to_hit[i]),
+                    mae_pct=round(float(adverse[i]), 4),
+                )
+            )
@@ -0,0 +1,87 @@
+"""Column-wise statistics of the close paths after (and before) a set of signals."""
+
+import logging
+import warnings
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.core.forward import ForwardReturns
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+# Cap on path-matrix cells materialised at once (8 bytes each)
+BLOCK_CELLS = 1 << 21
+
+
+@dataclass
+class PathStats:
+    """Per offset t = -lookback..horizon: counts, moments, hits and ``PERCENTILES`` of the % path (NaN if empty)."""
+
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    hits: np.ndarray  # values >= the hit threshold
+    percentiles: dict[int, np.ndarray]
+
+
+def path_stats(
+    forward: ForwardReturns, signal_indices: np.ndarray, horizon: int, lookback: int = 0, threshold_pct: float = 0.0
+) -> PathStats:
+    """
+    Stats of ``forward.path_pct`` for the signals, column by column.
+
+    The signals × offsets matrix is gathered from a strided view of the close
+    array a block of columns at a time, so memory stays bounded for tens of
+    thousands of signals. Percentiles come from one column-wise sort per
+    block; signals near either end of the data only count at offsets they reach.
+    """
+    width = lookback + horizon + 1
+    rows = np.full((4 + len(PERCENTILES), width), np.nan)  # count, mean, std, hits, percentiles
+    rows[0] = rows[3] = 0
+
+    if len(signal_indices):
+        step = max(1, BLOCK_CELLS // len(signal_indices))
+        for start in range(0, width, step):
+            block = slice(start, min(start + step, width))
+            matrix = forward.path_pct(signal_indices, horizon, lookback, columns=block)
+            rows[:, block] = _column_stats(matrix, threshold_pct)
+
+    return PathStats(
+        count=rows[0].astype(int),
+        mean=rows[1],
+        std=rows[2],
+        hits=rows[3].astype(int),
+        percentiles=dict(zip(PERCENTILES, rows[4:])),
+    )
+
+
+def series(values: np.ndarray, digits: int = 4) -> list[Optional[float]]:
+    """Rounded floats for a result model, with None for NaN."""
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+def _column_stats(matrix: np.ndarray, threshold_pct: float) -> np.ndarray:
+    """Per column: count, mean, std, hits and PERCENTILES (linear interpolation, NaNs ignored)."""
+    count = (~np.isnan(matrix)).sum(axis=0)
+    out = np.full((4 + len(PERCENTILES), matrix.shape[1]), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns past the data ends
+        out[1] = np.nanmean(matrix, axis=0)
+        out[2] = np.nanstd(matrix, axis=0, ddof=1)
+    out[0], out[3] = count, (matrix >= threshold_pct).sum(axis=0)
+
+    ordered = np.sort(matrix, axis=0)  # NaNs sort last, so each column's values fill rows 0..count-1
+    columns = np.arange(matrix.shape[1])
+    has_values = count > 0
+    for row, q in enumerate(PERCENTILES, start=4):
+        position = (np.maximum(count, 1) - 1) * (q / 100)
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, np.maximum(count - 1, 0))
+        fraction = position - lower
+        low_values = ordered[lower, columns]
+        values = low_values + (ordered[upper, columns] - low_values) * fraction
+        out[row] = np.where(has_values, values, np.nan)
+    return out
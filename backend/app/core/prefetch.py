@@ -0,0 +1,206 @@
+"""
+Background warm-up of datasets, indicators and condition masks.
+
+At startup (most recently updated scenarios) and whenever a scenario is created
+or updated, the scenario is queued for a low-priority worker thread. Warming
+it runs the same load and signal scan as a real run, which fills the dataset,
+indicator and mask caches, so the user's first run skips the data source and
+every indicator it needs.
+
+The worker never competes with foreground requests: before every step (the
+data load and each indicator) it waits until no request has been in flight
+for ``prefetch_idle_s``. ``stop`` interrupts it at the next step.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional
+
+from app.config import settings
+from app.core.data_loader import DatasetKey, dataset_key
+from app.core.datasets import load_scenario_data
+from app.core.engine import MIN_BARS
+from app.core.metrics import RunTimer, registry
+from app.core.scan import find_signal_indices
+from app.models.scenario import ScenarioCreate
+
+logger = logging.getLogger(__name__)
+
+registry.describe("retrocast_prefetch_total", "Background warm-ups by outcome.")
+
+
+class PrefetchCancelled(Exception):
+    """Raised inside a warm-up when the prefetcher is stopping."""
+
+
+class ForegroundActivity:
+    """Counts in-flight foreground requests and when the last one finished."""
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.last_finished = 0.0
+        self._condition = threading.Condition()
+
+    def begin(self) -> Callable[[], None]:
+        """Count a request as in flight until the returned callback is called (extra calls are no-ops)."""
+        with self._condition:
+            self.active += 1
+        done = threading.Event()
+
+        def finish() -> None:
+            with self._condition:
+                if done.is_set():
+                    return
+                done.set()
+                self.active -= 1
+                self.last_finished = time.monotonic()
+                self._condition.notify_all()
+
+        return finish
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        finish = self.begin()
+        try:
+            yield
+        finally:
+            finish()
+
+    def wait_idle(self, idle_s: float, stop: threading.Event) -> None:
+        """Block until nothing ran for ``idle_s`` seconds; raise if ``stop`` is set meanwhile."""
+        with self._condition:
+            while True:
+                if stop.is_set():
+                    raise PrefetchCancelled()
+                quiet_for = time.monotonic() - self.last_finished
+                if self.active == 0 and quiet_for >= idle_s:
+                    return
+                self._condition.wait(timeout=max(idle_s - quiet_for, 0.05) if self.active == 0 else 0.25)
+
+
+foreground = ForegroundActivity()
+
+
+class _ThrottledTimer(RunTimer):
+    """RunTimer that yields to foreground work before every stage."""
+
+    def __init__(self, prefetcher: "Prefetcher") -> None:
+        super().__init__()
+        self.prefetcher = prefetcher
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.prefetcher.checkpoint()
+        with super().stage(name):
+            yield
+
+
+class Prefetcher:
+    """Single daemon worker draining a de-duplicated queue of scenarios to warm."""
+
+    def __init__(self, activity: ForegroundActivity = foreground) -> None:
+        self.activity = activity
+        self.warmed = 0
+        self._queue: "queue.Queue[ScenarioCreate]" = queue.Queue()
+        self._pending: set[tuple] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retrocast-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Cancel queued and in-progress warm-ups and wait for the worker to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            self._pending.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def enqueue(self, scenarios: Iterable[ScenarioCreate]) -> int:
+        """Queue scenarios for warming (no-op unless running). Returns how many were added."""
+        if not self.running:
+            return 0
+        added = 0
+        for scenario in scenarios:
+            key = _warm_key(scenario)
+            with self._lock:
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+            self._queue.put(scenario)
+            added += 1
+        return added
+
+    def checkpoint(self) -> None:
+        """Wait for the foreground to go idle; raise PrefetchCancelled when stopping."""
+        self.activity.wait_idle(settings.prefetch_idle_s, self._stop)
+
+    def join_idle(self, timeout: float = 10.0) -> bool:
+        """Wait until the queue is drained (used in tests)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._pending:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                scenario = self._queue.get(timeout=0.25)
+            except queue.Empty:
+                continue
+            try:
+                self._warm(scenario)
+                self.warmed += 1
+                registry.inc("retrocast_prefetch_total", outcome="warmed")
+            except PrefetchCancelled:
+                registry.inc("retrocast_prefetch_total", outcome="cancelled")
+                break
+            except Exception as e:
+                # Warming is best-effort; the real run reports the error
+                logger.warning("Prefetch of %s failed: %s", scenario.underlying, e)
+                registry.inc("retrocast_prefetch_total", outcome="failed")
+            finally:
+                with self._lock:
+                    self._pending.discard(_warm_key(scenario))
+        logger.info("Prefetcher stopped after warming %d scenario(s)", self.warmed)
+
+    def _warm(self, scenario: ScenarioCreate) -> None:
+        timer = _ThrottledTimer(self)
+        with timer.stage("load"):
+            df = load_scenario_data(scenario)
+        if len(df) < MIN_BARS:
+            return
+        find_signal_indices(df, scenario, timer)
+        self.checkpoint()
+        logger.info(
+            "Prefetched %s (%d bars, %d indicators) in %.2fs",
+            scenario.underlying, len(df), timer.counters.get("indicators_computed", 0), timer.elapsed(),
+        )
+
+
+def _warm_key(scenario: ScenarioCreate) -> tuple[DatasetKey, str]:
+    """Scenarios with the same dataset and conditions warm the same cache entries."""
+    conditions = ",".join(sorted(c.model_dump_json(exclude={"id"}) for c in scenario.conditions))
+    return dataset_key(scenario), conditions
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,168 @@
+"""
+Low-latency signal preview for unsaved scenarios.
+
+The editor calls the preview on every edit. Each editor session keeps its
+last loaded frame, and every request works on its own shallow copy of it;
+indicator columns and condition masks come from the shared caches, so a
+typical edit only evaluates the changed condition.
+The session frame is dropped once the CSV file's mtime changes or, for
+network sources, after ``dataset_cache_ttl_s``.
+
+A newer request from the same session supersedes older ones, and a request
+that outlives ``preview_budget_ms`` answers ``timed_out`` without a count.
+Both are checked between steps (data load, each condition and indicator, end
+of evaluation), so work nobody will look at stops at the next step, but a
+step already running is not interrupted.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.core.data_loader import dataset_key
+from app.core.datasets import cached_copy, dataset_cache_key, is_fresh, load_scenario_data
+from app.core.engine import MIN_BARS
+from app.core.metrics import RunTimer
+from app.core.scan import find_signal_indices, scan_start
+from app.models.results import SignalPreview
+from app.models.scenario import ScenarioPreview
+
+logger = logging.getLogger(__name__)
+
+# Editor sessions whose last frame is kept in memory
+MAX_SESSIONS = 16
+
+
+class PreviewSuperseded(Exception):
+    """Raised inside a preview when a newer request from the same session arrived."""
+
+
+class _PreviewTimedOut(Exception):
+    """Raised inside a preview once it has used up ``preview_budget_ms``."""
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.generation = 0
+        self.frame_key: Optional[tuple] = None  # dataset_cache_key, so a rewritten CSV file misses
+        self.frame: Optional[pd.DataFrame] = None
+        self.loaded_at = 0.0
+
+
+class PreviewSessions:
+    """Generation counters and last frames per editor session (LRU-bounded)."""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS) -> None:
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, session_id: str) -> tuple[_Session, int]:
+        """Register a new request; every older request of the session becomes stale."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None) or _Session()
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            session.generation += 1
+            return session, session.generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+
+sessions = PreviewSessions()
+
+
+class _PreviewTimer(RunTimer):
+    """RunTimer that checks for supersession and the latency budget whenever a step starts."""
+
+    def __init__(self, session: Optional[_Session], generation: int) -> None:
+        super().__init__()
+        self.session = session
+        self.generation = generation
+        budget = settings.preview_budget_ms
+        self.deadline = self.started + budget / 1000 if budget > 0 else None
+
+    def check(self) -> None:
+        if self.session is not None and self.session.generation != self.generation:
+            raise PreviewSuperseded()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _PreviewTimedOut()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.check()
+        with super().stage(name):
+            yield
+
+
+def preview_signals(spec: ScenarioPreview, session_id: Optional[str] = None) -> SignalPreview:
+    """
+    Signal count, first/last date and a density sparkline for an unsaved
+    scenario, or a ``timed_out`` preview without them past the budget.
+    """
+    session, generation = sessions.begin(session_id) if session_id else (None, 0)
+    timer = _PreviewTimer(session, generation)
+    df: Optional[pd.DataFrame] = None
+    try:
+        df = _session_frame(spec, session, timer)
+        timer.check()
+        if len(df) < MIN_BARS:
+            raise ValueError(f"Not enough data: got {len(df)} bars, need at least {MIN_BARS}.")
+        signal_indices = find_signal_indices(df, spec, timer)
+        timer.check()
+    except _PreviewTimedOut:
+        elapsed_ms = round(timer.elapsed() * 1000, 3)
+        logger.info("Preview timed out after %.1f ms", elapsed_ms)
+        return SignalPreview(
+            total_bars=len(df) if df is not None else 0, total_signals=0, timed_out=True, elapsed_ms=elapsed_ms
+        )
+
+    start_idx = scan_start(spec)
+    bins = max(1, min(settings.preview_sparkline_bins, len(df) - start_idx))
+    sparkline, _ = np.histogram(signal_indices, bins=bins, range=(start_idx, len(df)))
+    preview = SignalPreview(
+        total_bars=len(df),
+        total_signals=len(signal_indices),
+        first_signal_date=_date(df, signal_indices[0]) if len(signal_indices) else None,
+        last_signal_date=_date(df, signal_indices[-1]) if len(signal_indices) else None,
+        sparkline=sparkline.tolist(),
+        sparkline_start=_date(df, start_idx) if start_idx < len(df) else None,
+        sparkline_end=_date(df, len(df) - 1),
+        elapsed_ms=round(timer.elapsed() * 1000, 3),
+    )
+    logger.debug("Preview: %d signals in %.1f ms", preview.total_signals, preview.elapsed_ms)
+    return preview
+
+
+def _session_frame(spec: ScenarioPreview, session: Optional[_Session], timer: _PreviewTimer) -> pd.DataFrame:
+    """
+    A copy of the session's frame for this dataset, loading it only when the
+    dataset, the CSV file's mtime or a network frame's freshness changed.
+
+    Concurrent requests of a session must not add columns to one shared
+    frame, so each gets a shallow copy that shares the frame's fingerprint.
+    """
+    key = dataset_cache_key(dataset_key(spec))
+    frame = None
+    if session is not None and session.frame_key == key and is_fresh(spec.data_source, session.loaded_at):
+        frame = session.frame
+    if frame is None:
+        with timer.stage("load"):
+            frame = load_scenario_data(spec)
+        if session is not None:
+            session.frame_key, session.frame, session.loaded_at = key, frame, time.monotonic()
+    return cached_copy(frame)
+
+
+def _date(df: pd.DataFrame, idx: int) -> str:
+    return df.index[idx].strftime("%Y-%m-%d")
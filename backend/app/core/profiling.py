@@ -0,0 +1,180 @@
+"""On-demand profiling of a single analysis run (cProfile + stack sampling + tracemalloc)."""
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from app.config import settings
+from app.core.engine import run_analysis
+from app.core.metrics import RunTimer
+from app.models.profiling import ProfileFunction, ProfileReport
+from app.models.results import AnalysisResult
+from app.models.scenario import ScenarioInDB
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL_S = 0.005
+TOP_FUNCTIONS = 40
+
+# cProfile and tracemalloc are process-global; only one profiled run at a time.
+_profile_lock = threading.Lock()
+
+
+class ProfileInProgress(Exception):
+    """Raised when a profiled run is requested while another one is running."""
+
+
+class ProfilingRunTimer(RunTimer):
+    """RunTimer that also records the tracemalloc peak inside every stage."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stage_peaks: dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        # Fold the peak so far into enclosing stages before a nested stage resets it.
+        self._fold_peak()
+        tracemalloc.reset_peak()
+        with super().stage(name):
+            yield
+            self._fold_peak()
+
+    def _fold_peak(self) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        for active in self._active:
+            self.stage_peaks[active] = max(self.stage_peaks.get(active, 0), peak)
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into folded-stack counts."""
+
+    def __init__(self, target_ident: int, interval: Optional[float] = None) -> None:
+        super().__init__(name="retrocast-stack-sampler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = SAMPLE_INTERVAL_S if interval is None else interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            stack = _fold(frame) if frame is not None else None
+            if stack is not None:
+                self.stacks[stack] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def _fold(frame) -> Optional[str]:
+    """
+    Render a frame chain root→leaf, starting at run_analysis.
+
+    Returns None for samples taken outside run_analysis (set-up and tear-down).
+    """
+    names: list[str] = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", "?")
+        names.append(f"{module}:{code.co_name}")
+        if code.co_name == "run_analysis" and module == "app.core.engine":
+            return ";".join(reversed(names))
+        frame = frame.f_back
+    return None
+
+
+def profile_analysis(scenario: ScenarioInDB) -> tuple[AnalysisResult, ProfileReport]:
+    """Run the analysis under the profilers and return the result plus its profile."""
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfileInProgress("Another profiling run is in progress. Try again when it finishes.")
+
+    try:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        timer = ProfilingRunTimer()
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident())
+
+        t0 = time.perf_counter()
+        sampler.start()
+        profiler.enable()
+        try:
+            result = run_analysis(scenario, timer=timer)
+        finally:
+            profiler.disable()
+            sampler.stop()
+            _, peak = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+        duration = time.perf_counter() - t0
+    finally:
+        _profile_lock.release()
+
+    report = ProfileReport(
+        scenario_id=scenario.id,
+        run_date=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        duration_ms=round(duration * 1000, 3),
+        sample_interval_ms=sampler.interval * 1000,
+        top_functions=_top_functions(profiler),
+        folded_stacks=[f"{stack} {count}" for stack, count in sampler.stacks.most_common()],
+        stage_peak_memory_kb={name: round(b / 1024, 1) for name, b in timer.stage_peaks.items()},
+        peak_memory_kb=round(peak / 1024, 1),
+    )
+    logger.info(
+        "Profiled scenario %s in %.2fs: %d samples, peak %.1f MB",
+        scenario.id, duration, sum(sampler.stacks.values()), peak / 1024 / 1024,
+    )
+    return result, report
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> list[ProfileFunction]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        ProfileFunction(
+            function=func,
+            file=file,
+            line=line,
+            calls=nc,
+            self_time_ms=round(tt * 1000, 3),
+            cumulative_time_ms=round(ct * 1000, 3),
+        )
+        for (file, line, func), (cc, nc, tt, ct, _callers) in rows
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Artifact storage — latest profile per scenario under <data_dir>/profiles
+# ---------------------------------------------------------------------------
+
+def _profile_path(scenario_id: str) -> str:
+    return os.path.join(settings.data_dir, "profiles", f"{scenario_id}.json")
+
+
+def save_profile(report: ProfileReport) -> str:
+    path = _profile_path(report.scenario_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(report.model_dump_json())
+    return path
+
+
+def load_profile(scenario_id: str) -> Optional[ProfileReport]:
+    path = _profile_path(scenario_id)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return ProfileReport.model_validate(json.load(f))
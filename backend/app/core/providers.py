@@ -0,0 +1,170 @@
+"""
+Pluggable data providers: where raw OHLCV bars come from.
+
+Every ``DataSource`` maps to a registered ``DataProvider``. A provider fetches
+one ticker (``fetch``) and optionally many at once (``fetch_batch``; by default
+a thread pool). Calls made through ``load`` / ``load_batch`` share the
+provider's limits, whoever makes them:
+
+- at most ``max_concurrency`` fetches in flight,
+- at most ``rate_per_s`` fetches started per second (0 = unlimited),
+- ``retryable`` errors retried ``max_retries`` times with jittered
+  exponential backoff starting at ``backoff_s``.
+
+Providers return raw frames; ``data_loader`` standardises them, and the
+dataset cache sits in front of every provider. The built-in providers
+(Yahoo, CSV, Norgate and an offline fixture directory) live in
+``app.core.builtin_providers``; ``data_loader`` registers them.
+"""
+
+import logging
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import pandas as pd
+
+from app.core.metrics import registry
+from app.models.scenario import DataSource
+
+logger = logging.getLogger(__name__)
+
+registry.describe("retrocast_provider_fetches_total", "Provider fetch attempts by provider and outcome.")
+
+FetchOutcome = Union[pd.DataFrame, Exception]
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    ticker: str
+    start: Optional[str] = None
+    end: Optional[str] = None
+    csv_path: Optional[str] = None
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second with bursts of ``burst``."""
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class DataProvider(ABC):
+    """Base provider. Subclasses implement ``fetch`` and tune the class-level limits."""
+
+    name = "provider"
+    max_concurrency = 4
+    rate_per_s = 0.0
+    max_retries = 0
+    backoff_s = 0.5
+    retryable: tuple[type[BaseException], ...] = (ConnectionError, TimeoutError)
+
+    def __init__(self) -> None:
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._limiter = RateLimiter(self.rate_per_s, burst=self.max_concurrency)
+
+    @abstractmethod
+    def fetch(self, request: FetchRequest) -> pd.DataFrame:
+        """Raw OHLCV bars of one ticker."""
+
+    def fetch_batch(self, requests: list[FetchRequest]) -> dict[FetchRequest, FetchOutcome]:
+        """Raw bars of many tickers; the default runs ``load`` on ``max_concurrency`` threads."""
+        if len(requests) <= 1:
+            return {request: fetch_outcome(self.load, request) for request in requests}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(requests))) as pool:
+            outcomes = pool.map(lambda request: fetch_outcome(self.load, request), requests)
+            return dict(zip(requests, outcomes))
+
+    def load(self, request: FetchRequest) -> pd.DataFrame:
+        """``fetch`` under this provider's concurrency, rate and retry limits."""
+        return self.call(self.fetch, request)
+
+    def load_batch(self, requests: list[FetchRequest]) -> dict[FetchRequest, FetchOutcome]:
+        """``fetch_batch`` with per-request errors returned instead of raised."""
+        unique = list(dict.fromkeys(requests))
+        try:
+            return self.fetch_batch(unique)
+        except Exception as e:
+            return {request: e for request in unique}
+
+    def call(self, fn, *args):
+        """Run one fetch call in a concurrency slot, after the rate limiter, retrying transient errors."""
+        attempt = 0
+        while True:
+            with self._slots:
+                self._limiter.acquire()
+                try:
+                    result = fn(*args)
+                except self.retryable as e:
+                    if attempt >= self.max_retries:
+                        registry.inc("retrocast_provider_fetches_total", provider=self.name, outcome="failed")
+                        raise
+                    error = e
+                except Exception:
+                    registry.inc("retrocast_provider_fetches_total", provider=self.name, outcome="failed")
+                    raise
+                else:
+                    registry.inc("retrocast_provider_fetches_total", provider=self.name, outcome="ok")
+                    return result
+            delay = self.backoff_s * (2 ** attempt) * random.uniform(0.5, 1.0)
+            logger.info("%s fetch failed (%s); retry %d in %.2fs", self.name, error, attempt + 1, delay)
+            registry.inc("retrocast_provider_fetches_total", provider=self.name, outcome="retried")
+            time.sleep(delay)
+            attempt += 1
+
+
+def fetch_outcome(fn, request: FetchRequest) -> FetchOutcome:
+    """``fn(request)``, or the exception it raised."""
+    try:
+        return fn(request)
+    except Exception as e:
+        return e
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+_providers: dict[DataSource, DataProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def register_provider(source: DataSource, provider: DataProvider, replace: bool = True) -> Optional[DataProvider]:
+    """
+    Serve ``source`` from ``provider``. Returns the provider it replaces, if
+    any; with ``replace`` off, a provider already registered is kept.
+    """
+    with _providers_lock:
+        previous = _providers.get(source)
+        if replace or previous is None:
+            _providers[source] = provider
+    return previous
+
+
+def get_provider(source: DataSource) -> DataProvider:
+    provider = _providers.get(source)
+    if provider is None:
+        raise ValueError(f"Unsupported data source: {source}")
+    return provider
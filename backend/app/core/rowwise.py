@@ -0,0 +1,138 @@
+"""
+Row-at-a-time condition evaluation.
+
+The pipeline evaluates conditions on whole columns (``evaluate_condition_mask``
+and ``app.core.expressions``); this is the straightforward per-bar version of
+the same AND/OR semantics, kept as the reference the masks are tested against.
+"""
+
+import logging
+import math
+
+import pandas as pd
+
+from app.core.conditions import build_groups, indicator_column
+from app.models.scenario import CompareTo, ConditionConfig, Operator
+
+logger = logging.getLogger(__name__)
+
+
+def evaluate_conditions(
+    df: pd.DataFrame,
+    idx: int,
+    conditions: list[ConditionConfig],
+) -> bool:
+    """
+    Evaluate all conditions for a given row index.
+
+    Logic:
+        - Split conditions into groups at OR boundaries.
+        - Example: [C1 AND, C2 AND, C3 OR, C4 AND, C5]
+          → Group 1: [C1, C2, C3], Group 2: [C4, C5]
+          → Result: (C1 AND C2 AND C3) OR (C4 AND C5)
+        - All conditions within a group must be True (AND).
+        - At least one group must be True (OR).
+    """
+    if not conditions:
+        return False
+
+    # Build groups: split at OR connectors
+    groups = build_groups(conditions)
+
+    # Evaluate: any group fully satisfied → True
+    for group in groups:
+        if all(_evaluate_single(df, idx, cond) for cond in group):
+            return True
+    return False
+
+
+def _evaluate_single(df: pd.DataFrame, idx: int, condition: ConditionConfig) -> bool:
+    """Evaluate a single condition at the given row index."""
+    # === GET LEFT SIDE VALUE ===
+    if condition.indicator == "PRICE":
+        left_col = "close"
+    else:
+        left_col = indicator_column(condition.indicator.value, condition.params, condition.timeframe)
+
+    if left_col not in df.columns:
+        logger.warning("Indicator column '%s' not found in DataFrame", left_col)
+        return False
+
+    left_val = df.iloc[idx][left_col]
+
+    # === GET RIGHT SIDE VALUE ===
+    if condition.compare_to == CompareTo.PRICE:
+        right_col = "close"
+        right_val = df.iloc[idx]["close"]
+    elif condition.compare_to == CompareTo.VALUE:
+        right_col = None  # No column, fixed value
+        right_val = condition.compare_value
+    elif condition.compare_to == CompareTo.INDICATOR:
+        if condition.compare_indicator is None or condition.compare_indicator_params is None:
+            logger.warning("compare_indicator or params missing for INDICATOR comparison")
+            return False
+        right_col = indicator_column(
+            condition.compare_indicator.value, condition.compare_indicator_params, condition.timeframe
+        )
+        if right_col not in df.columns:
+            logger.warning("Compare indicator column '%s' not found", right_col)
+            return False
+        right_val = df.iloc[idx][right_col]
+    else:
+        return False
+
+    # === CHECK FOR NaN ===
+    if _is_nan(left_val) or _is_nan(right_val):
+        return False
+
+    left_val = float(left_val)
+    right_val = float(right_val)
+
+    # === EVALUATE OPERATOR ===
+    if condition.operator == Operator.ABOVE:
+        return left_val > right_val
+
+    elif condition.operator == Operator.BELOW:
+        return left_val < right_val
+
+    elif condition.operator == Operator.CROSSES_ABOVE:
+        if idx < 1:
+            return False
+        prev_left = df.iloc[idx - 1][left_col]
+        if condition.compare_to == CompareTo.VALUE:
+            prev_right = condition.compare_value
+        elif condition.compare_to == CompareTo.PRICE:
+            prev_right = df.iloc[idx - 1]["close"]
+        else:
+            prev_right = df.iloc[idx - 1][right_col]
+
+        if _is_nan(prev_left) or _is_nan(prev_right):
+            return False
+
+        return float(prev_left) <= float(prev_right) and left_val > right_val
+
+    elif condition.operator == Operator.CROSSES_BELOW:
+        if idx < 1:
+            return False
+        prev_left = df.iloc[idx - 1][left_col]
+        if condition.compare_to == CompareTo.VALUE:
+            prev_right = condition.compare_value
+        elif condition.compare_to == CompareTo.PRICE:
+            prev_right = df.iloc[idx - 1]["close"]
+        else:
+            prev_right = df.iloc[idx - 1][right_col]
+
+        if _is_nan(prev_left) or _is_nan(prev_right):
+            return False
+
+        return float(prev_left) >= float(prev_right) and left_val < right_val
+
+    return False
+
+
+def _is_nan(val) -> bool:
+    """Check if a value is NaN (works for float and numpy types)."""
+    try:
+        return math.isnan(float(val))
+    except (ValueError, TypeError):
+        return True
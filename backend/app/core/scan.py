@@ -0,0 +1,139 @@
+"""
+Signal scan: indicator columns on demand, the condition tree over whole
+columns, and Signal records for the bars it flags.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.cache import dataset_fingerprint, indicator_cache, mask_cache
+from app.core.conditions import condition_columns
+from app.core.datasets import SignalSpec, advance_indicator
+from app.core.expressions import ExpressionEvaluator, build_expression
+from app.core.metrics import RunTimer
+from app.core.timeframes import BARS_PER_PERIOD, compute_on_timeframe
+from app.models.results import Signal
+from app.models.scenario import ConditionConfig, ConditionTimeframe, ScenarioInDB
+
+logger = logging.getLogger(__name__)
+
+
+def ensure_condition_columns(df: pd.DataFrame, condition: ConditionConfig, timer: RunTimer) -> None:
+    """
+    Compute the indicator columns a condition reads unless already on the frame
+    or in the shared indicator cache for this dataset.
+    """
+    timer.check()
+    for col_name, indicator, params in condition_columns(condition):
+        ensure_column(df, col_name, indicator, params, condition.timeframe, timer)
+
+
+def ensure_column(
+    df: pd.DataFrame,
+    col_name: str,
+    indicator: str,
+    params: dict,
+    timeframe: Optional[ConditionTimeframe],
+    timer: RunTimer,
+) -> None:
+    if col_name in df.columns:
+        timer.count("cache_hits")
+        return
+    key = (dataset_fingerprint(df), col_name)
+    cached = indicator_cache.get(key)
+    if cached is not None:
+        df[col_name] = cached
+        timer.count("cache_hits")
+        return
+    with timer.stage("indicators"):
+        if timeframe is not None:
+            values, computed = compute_on_timeframe(df, indicator, params, timeframe), len(df)
+        else:
+            values, computed = advance_indicator(df, col_name, indicator, params)
+        df[col_name] = values
+    indicator_cache.put(key, values, values.nbytes)
+    if computed == len(df):
+        timer.count("indicators_computed")
+    elif computed:
+        timer.count("indicators_extended")
+    else:  # the dataset's snapshot already covers every bar
+        timer.count("cache_hits")
+
+
+def find_signal_indices(df: pd.DataFrame, scenario: SignalSpec, timer: RunTimer) -> np.ndarray:
+    """Evaluate the scenario's condition tree on whole columns. Returns signal row positions."""
+    start_idx = scan_start(scenario)
+    expression = build_expression(scenario.conditions, scenario.condition_tree)
+    evaluator = ExpressionEvaluator(
+        df, lambda cond: ensure_condition_columns(df, cond, timer), start_idx=start_idx,
+        mask_cache=mask_cache, dataset_key=dataset_fingerprint(df),
+    )
+    mask = evaluator.evaluate(expression)
+    timer.count("conditions_evaluated", evaluator.leaves_evaluated)
+    timer.count("mask_cache_hits", evaluator.masks_reused)
+    return np.flatnonzero(mask[start_idx:]) + start_idx
+
+
+def build_signals(
+    df: pd.DataFrame, scenario: ScenarioInDB, signal_indices: np.ndarray, timer: RunTimer
+) -> list[Signal]:
+    """Build Signal records, including indicator values at each signal bar."""
+    if len(signal_indices) == 0:
+        return []
+
+    # Record indicator values for every condition, including any pruned during evaluation
+    value_columns: dict[str, np.ndarray] = {}
+    for condition in scenario.conditions:
+        if any(col not in df.columns for col, _indicator, _params in condition_columns(condition)):
+            ensure_condition_columns(df, condition, timer)
+        for col, _indicator, _params in condition_columns(condition):
+            if col not in value_columns:
+                value_columns[col] = df[col].to_numpy(dtype=float)[signal_indices]
+
+    closes = df["close"].to_numpy(dtype=float)[signal_indices]
+    dates = df.index[signal_indices].strftime("%Y-%m-%d")
+
+    signals: list[Signal] = []
+    for i, (date, close) in enumerate(zip(dates, closes)):
+        ind_values = {
+            col: round(float(values[i]), 4)
+            for col, values in value_columns.items()
+            if not np.isnan(values[i])
+        }
+        signals.append(
+            Signal(
+                date=date,
+                price=round(float(close), 4),
+                indicator_values=ind_values,
+                outcomes=[],  # Filled in step 4
+            )
+        )
+    return signals
+
+
+def scan_start(scenario: SignalSpec) -> int:
+    """First bar the scan may flag — after enough data exists for every indicator."""
+    return max(_compute_min_lookback(scenario), 1)  # At least 1 for CROSSES operators
+
+
+def _compute_min_lookback(scenario: SignalSpec) -> int:
+    """Determine the minimum lookback period across all indicators."""
+    max_period = 0
+    for cond in scenario.conditions:
+        period = cond.params.get("period", 0)
+        slow = cond.params.get("slow", 0)
+        cond_period = max(period, slow)
+
+        if cond.compare_indicator_params:
+            cp = cond.compare_indicator_params.get("period", 0)
+            cs = cond.compare_indicator_params.get("slow", 0)
+            cond_period = max(cond_period, cp, cs)
+
+        if cond.timeframe is not None:
+            cond_period *= BARS_PER_PERIOD[cond.timeframe]
+        max_period = max(max_period, cond_period)
+
+    return max_period
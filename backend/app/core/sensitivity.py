@@ -0,0 +1,49 @@
+"""Hit rate as a function of threshold, read off empirical CDFs."""
+
+import logging
+
+import numpy as np
+
+from app.models.results import ThresholdCurve
+
+logger = logging.getLogger(__name__)
+
+
+def compute_threshold_curve(
+    changes: np.ndarray, up_excursions: np.ndarray, down_excursions: np.ndarray, points: int = 101
+) -> ThresholdCurve:
+    """
+    Hit rates at ``points`` threshold magnitudes from 0 to the largest observed move.
+
+    At magnitude t: ABOVE final = P(change >= t), ABOVE anytime = P(highest high
+    move >= t), BELOW final = P(change <= -t), BELOW anytime = P(lowest low move
+    <= -t) — the same rules as target hits. Each array is sorted once and every
+    threshold is a binary search into it.
+    """
+    n = len(changes)
+    if n == 0:
+        return ThresholdCurve()
+
+    extremes = [np.max(np.abs(changes)), np.max(up_excursions), -np.min(down_excursions)]
+    top = float(max(max(extremes), 0.0))
+    thresholds = np.linspace(0.0, top if top > 0 else 1.0, points)
+
+    def at_least(values: np.ndarray) -> np.ndarray:
+        ordered = np.sort(values)
+        return (n - np.searchsorted(ordered, thresholds, side="left")) / n * 100
+
+    def at_most_negative(values: np.ndarray) -> np.ndarray:
+        ordered = np.sort(values)
+        return np.searchsorted(ordered, -thresholds, side="right") / n * 100
+
+    return ThresholdCurve(
+        thresholds=_rounded(thresholds, 4),
+        above_final_pct=_rounded(at_least(changes), 2),
+        above_anytime_pct=_rounded(at_least(up_excursions), 2),
+        below_final_pct=_rounded(at_most_negative(changes), 2),
+        below_anytime_pct=_rounded(at_most_negative(down_excursions), 2),
+    )
+
+
+def _rounded(values: np.ndarray, digits: int) -> list[float]:
+    return np.round(values, digits).tolist()
@@ -0,0 +1,100 @@
+"""Monte Carlo significance of target stats against random entry dates."""
+
+import logging
+
+import numpy as np
+
+from app.core.forward import ForwardReturns, hit_mask
+from app.models.results import TargetSignificance, TargetStats
+from app.models.scenario import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on gathered elements per batch (resamples × signals) to cap memory
+MAX_BATCH_ELEMENTS = 4_000_000
+
+
+def random_entry_distribution(
+    eligible_changes: np.ndarray,
+    sample_size: int,
+    n_resamples: int,
+    threshold_pct: float,
+    direction: str,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hit rate (%) and mean change (%) of ``n_resamples`` random entry sets.
+
+    Each set draws ``sample_size`` bars uniformly (with replacement) from the
+    eligible forward changes. Work is done in batches of whole resamples as
+    2-D gathers; there is no per-draw Python loop.
+    """
+    hit_rates = np.empty(n_resamples)
+    mean_changes = np.empty(n_resamples)
+    per_batch = max(1, MAX_BATCH_ELEMENTS // max(sample_size, 1))
+
+    for start in range(0, n_resamples, per_batch):
+        stop = min(start + per_batch, n_resamples)
+        idx = rng.integers(0, len(eligible_changes), size=(stop - start, sample_size), dtype=np.int32)
+        drawn = eligible_changes[idx]
+        hit_rates[start:stop] = hit_mask(drawn, threshold_pct, direction).mean(axis=1) * 100
+        mean_changes[start:stop] = drawn.mean(axis=1)
+
+    return hit_rates, mean_changes
+
+
+def compute_significance(
+    forward: ForwardReturns,
+    signal_indices: np.ndarray,
+    start_idx: int,
+    targets: list[TargetConfig],
+    target_stats: list[TargetStats],
+    n_resamples: int,
+    seed: int = 0,
+    confidence: float = 0.95,
+) -> None:
+    """
+    Attach a ``TargetSignificance`` to each TargetStats in place.
+
+    Eligible bars are those the scan could have flagged (from ``start_idx``)
+    that also have a complete forward window for the target. p-values are
+    one-sided: the chance that random entries do at least as well as the
+    signals (higher hit rate; higher mean change for ABOVE, lower for BELOW).
+    """
+    rng = np.random.default_rng(seed)
+    tail = (1 - confidence) / 2 * 100
+
+    for target, ts in zip(targets, target_stats):
+        changes = forward.change_pct(target.days_forward)
+        eligible = changes[start_idx:]
+        eligible = eligible[~np.isnan(eligible)]
+        observed = changes[signal_indices]
+        observed = observed[~np.isnan(observed)]
+        if len(observed) == 0 or len(eligible) == 0:
+            continue
+
+        direction = target.direction.value
+        observed_hit_rate = hit_mask(observed, target.threshold_pct, direction).mean() * 100
+        observed_mean = observed.mean()
+        null_hits, null_means = random_entry_distribution(
+            eligible, len(observed), n_resamples, target.threshold_pct, direction, rng
+        )
+
+        if direction == "BELOW":
+            mean_extreme = np.count_nonzero(null_means <= observed_mean)
+        else:
+            mean_extreme = np.count_nonzero(null_means >= observed_mean)
+
+        ts.significance = TargetSignificance(
+            resamples=n_resamples,
+            sample_size=len(observed),
+            eligible_bars=len(eligible),
+            random_hit_rate_pct=round(float(null_hits.mean()), 2),
+            random_hit_rate_ci_low_pct=round(float(np.percentile(null_hits, tail)), 2),
+            random_hit_rate_ci_high_pct=round(float(np.percentile(null_hits, 100 - tail)), 2),
+            hit_rate_p_value=round((1 + np.count_nonzero(null_hits >= observed_hit_rate)) / (1 + n_resamples), 5),
+            random_avg_change_pct=round(float(null_means.mean()), 4),
+            random_avg_change_ci_low_pct=round(float(np.percentile(null_means, tail)), 4),
+            random_avg_change_ci_high_pct=round(float(np.percentile(null_means, 100 - tail)), 4),
+            avg_change_p_value=round((1 + mean_extreme) / (1 + n_resamples), 5),
+        )
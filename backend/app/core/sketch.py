@@ -0,0 +1,139 @@
+"""
+Mergeable quantile sketch with relative-error guarantees (DDSketch-style).
+
+Values are counted in logarithmic buckets: bucket ``i`` holds magnitudes in
+(gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a), so every quantile is
+returned within relative error ``a`` of the true value. Two sketches with the
+same accuracy merge by adding bucket counts, which makes pooled percentiles
+across tickers or runs exact up to that error.
+"""
+
+import logging
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.models.results import QuantileSketchData
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Magnitudes below this are counted as zero
+MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """Signed-value DDSketch: separate bucket stores for positive and negative values."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values: Iterable[float]) -> None:
+        arr = np.asarray(values, dtype=float)
+        arr = arr[~np.isnan(arr)]
+        if len(arr) == 0:
+            return
+        self.count += len(arr)
+        self.min = min(self.min, float(arr.min()))
+        self.max = max(self.max, float(arr.max()))
+
+        magnitude = np.abs(arr)
+        small = magnitude < MIN_INDEXABLE
+        self.zero_count += int(small.sum())
+        for store, selected in ((self.positive, (arr > 0) & ~small), (self.negative, (arr < 0) & ~small)):
+            if not selected.any():
+                continue
+            keys, counts = np.unique(self._index(magnitude[selected]), return_counts=True)
+            for key, n in zip(keys.tolist(), counts.tolist()):
+                store[key] = store.get(key, 0) + n
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in other_store.items():
+                store[key] = store.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile ``q`` in [0, 1], or None for an empty sketch."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        values, counts = self.buckets()
+        position = int(np.searchsorted(np.cumsum(counts), rank, side="right"))
+        return float(min(max(values[min(position, len(values) - 1)], self.min), self.max))
+
+    def buckets(self) -> tuple[np.ndarray, np.ndarray]:
+        """Bucket representatives in ascending value order and their counts (zero included)."""
+        # Negatives (largest magnitude first), zero, positives
+        neg_keys = sorted(self.negative, reverse=True)
+        pos_keys = sorted(self.positive)
+        values = np.concatenate([
+            -self._value(np.array(neg_keys, dtype=float)),
+            [0.0],
+            self._value(np.array(pos_keys, dtype=float)),
+        ])
+        counts = np.array(
+            [self.negative[k] for k in neg_keys] + [self.zero_count] + [self.positive[k] for k in pos_keys],
+            dtype=float,
+        )
+        return values, counts
+
+    def _index(self, magnitude: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitude) / self._log_gamma).astype(np.int64)
+
+    def _value(self, index: np.ndarray) -> np.ndarray:
+        return 2 * np.power(self.gamma, index) / (self.gamma + 1)
+
+    def to_model(self) -> QuantileSketchData:
+        return QuantileSketchData(
+            relative_accuracy=self.relative_accuracy,
+            count=self.count,
+            zero_count=self.zero_count,
+            min=self.min if self.count else None,
+            max=self.max if self.count else None,
+            positive=dict(sorted(self.positive.items())),
+            negative=dict(sorted(self.negative.items())),
+        )
+
+    @classmethod
+    def from_model(cls, data: QuantileSketchData) -> "QuantileSketch":
+        sketch = cls(data.relative_accuracy)
+        sketch.positive = dict(data.positive)
+        sketch.negative = dict(data.negative)
+        sketch.zero_count = data.zero_count
+        sketch.count = data.count
+        if data.count:
+            sketch.min, sketch.max = data.min, data.max
+        return sketch
+
+
+def merge_sketches(sketches: Iterable[QuantileSketchData]) -> QuantileSketch:
+    """Pool several serialized sketches (e.g. one target across tickers) into one."""
+    merged: Optional[QuantileSketch] = None
+    for data in sketches:
+        sketch = QuantileSketch.from_model(data)
+        if merged is None:
+            merged = sketch
+        else:
+            merged.merge(sketch)
+    return merged if merged is not None else QuantileSketch()
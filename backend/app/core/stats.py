@@ -0,0 +1,215 @@
+"""Aggregate statistics over signal outcomes."""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+from app.core.sketch import QuantileSketch
+from app.models.results import Histogram, Signal, TargetStats
+from app.models.scenario import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+# Binning methods offered by the distribution chart, mapped to numpy's estimators
+NUMPY_BIN_METHODS = {"freedman-diaconis": "fd", "sturges": "sturges", "scott": "scott", "sqrt": "sqrt"}
+BIN_METHODS = (*NUMPY_BIN_METHODS, "fixed-width", "fixed-count")
+
+
+def build_histogram(
+    values: np.ndarray,
+    method: str = "freedman-diaconis",
+    bins: Optional[int] = None,
+    width: Optional[float] = None,
+    max_bins: int = 200,
+) -> Histogram:
+    """
+    Bin values with one of ``BIN_METHODS``.
+
+    ``fixed-count`` uses ``bins``, ``fixed-width`` uses ``width`` (in %). The
+    bin count is capped at ``max_bins`` so payloads stay small however many
+    values there are. A Freedman-Diaconis width of 0 (IQR of 0) falls back to
+    Sturges, like the chart always did.
+    """
+    if method not in BIN_METHODS:
+        raise ValueError(f"Unknown binning method '{method}'. Use one of {list(BIN_METHODS)}")
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return Histogram(method=method)
+
+    lo, hi = float(values.min()), float(values.max())
+    if hi == lo:
+        edges = np.array([lo, lo + 1.0])
+    elif method == "fixed-count":
+        edges = np.linspace(lo, hi, min(max(bins or 20, 1), max_bins) + 1)
+    elif method == "fixed-width":
+        count = int(np.ceil((hi - lo) / width)) if width and width > 0 else 20
+        edges = np.linspace(lo, hi, min(max(count, 1), max_bins) + 1)
+    else:
+        estimator = NUMPY_BIN_METHODS[method]
+        if estimator == "fd" and np.subtract(*np.percentile(values, [75, 25])) == 0:
+            estimator = "sturges"
+        edges = np.histogram_bin_edges(values, bins=estimator)
+        if len(edges) - 1 > max_bins:
+            edges = np.linspace(lo, hi, max_bins + 1)
+
+    counts, edges = np.histogram(values, bins=edges)
+    return Histogram(
+        method=method,
+        edges=[round(float(e), 4) for e in edges],
+        counts=counts.tolist(),
+    )
+
+
+def _path_stats(mfe: list[float], mae: list[float], days_to_hit: list[int], direction: str) -> dict:
+    """Aggregate time-to-hit and excursions. Worst MAE is the lowest low (ABOVE) or highest high (BELOW)."""
+    out: dict = {}
+    if days_to_hit:
+        out["avg_days_to_hit"] = round(float(np.mean(days_to_hit)), 2)
+        out["median_days_to_hit"] = float(np.median(days_to_hit))
+    if mfe:
+        out["avg_mfe_pct"] = round(float(np.mean(mfe)), 4)
+        out["median_mfe_pct"] = round(float(np.median(mfe)), 4)
+    if mae:
+        out["avg_mae_pct"] = round(float(np.mean(mae)), 4)
+        out["median_mae_pct"] = round(float(np.median(mae)), 4)
+        out["worst_mae_pct"] = round(float(np.max(mae) if direction == "BELOW" else np.min(mae)), 4)
+    return out
+
+
+def outcome_changes(signals: list[Signal], target_id: str) -> np.ndarray:
+    """Final % changes of every evaluable outcome for one target, in signal order."""
+    return np.array(
+        [
+            o.actual_change_pct
+            for signal in signals
+            for o in signal.outcomes
+            if o.target_id == target_id and o.actual_change_pct is not None
+        ],
+        dtype=float,
+    )
+
+
+def build_sketch(values: np.ndarray) -> QuantileSketch:
+    sketch = QuantileSketch(settings.sketch_relative_accuracy)
+    sketch.add(values)
+    return sketch
+
+
+def compute_target_stats(signals: list[Signal], targets: list[TargetConfig]) -> list[TargetStats]:
+    """Compute aggregate statistics per target from signal outcomes."""
+    return [target_stats_from_arrays(target, *outcome_arrays(signals, target.id)) for target in targets]
+
+
+def outcome_arrays(
+    signals: list[Signal], target_id: str
+) -> tuple[np.ndarray, int, int, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ``(changes, hit_count, anytime_hit_count, mfe, mae, days_to_hit)`` over
+    one target's evaluable outcomes, in the order ``target_stats_from_arrays``
+    takes them.
+    """
+    changes: list[float] = []
+    mfe: list[float] = []
+    mae: list[float] = []
+    days_to_hit: list[int] = []
+    hit_count = anytime_hit_count = 0
+    for signal in signals:
+        for outcome in signal.outcomes:
+            if outcome.target_id != target_id:
+                continue
+            if outcome.hit is None:
+                continue  # No future data
+            changes.append(outcome.actual_change_pct)
+            if outcome.hit:
+                hit_count += 1
+            if outcome.anytime_hit:
+                anytime_hit_count += 1
+            if outcome.max_change_pct is not None:
+                mfe.append(outcome.max_change_pct)
+            if outcome.mae_pct is not None:
+                mae.append(outcome.mae_pct)
+            if outcome.days_to_hit is not None:
+                days_to_hit.append(outcome.days_to_hit)
+    return (
+        np.array(changes, dtype=float),
+        hit_count,
+        anytime_hit_count,
+        np.array(mfe, dtype=float),
+        np.array(mae, dtype=float),
+        np.array(days_to_hit, dtype=np.int64),
+    )
+
+
+def target_stats_from_arrays(
+    target: TargetConfig,
+    changes: np.ndarray,
+    hit_count: int,
+    anytime_hit_count: int,
+    mfe: np.ndarray,
+    mae: np.ndarray,
+    days_to_hit: np.ndarray,
+    detail: bool = True,
+) -> TargetStats:
+    """
+    TargetStats from the evaluable outcomes' values. ``detail=False`` leaves
+    out the histogram, sketch and raw distribution (for compact sub-group stats).
+    """
+    arr = changes
+    total_evaluable = len(arr)
+    base = dict(
+        target_id=target.id,
+        days_forward=target.days_forward,
+        threshold_pct=target.threshold_pct,
+        direction=target.direction.value,
+    )
+    if total_evaluable == 0:
+        return TargetStats(
+            **base,
+            total_evaluable=0,
+            hit_count=0,
+            miss_count=0,
+            hit_rate_pct=0.0,
+            anytime_hit_count=0,
+            anytime_hit_rate_pct=0.0,
+            avg_change_pct=0.0,
+            median_change_pct=0.0,
+            max_change_pct=0.0,
+            min_change_pct=0.0,
+            std_dev=0.0,
+            percentile_5=0.0,
+            percentile_25=0.0,
+            percentile_75=0.0,
+            percentile_95=0.0,
+        )
+
+    if detail:
+        extras = dict(
+            histogram=build_histogram(arr, settings.histogram_method, max_bins=settings.histogram_max_bins),
+            sketch=build_sketch(arr).to_model(),
+            distribution=[round(float(c), 4) for c in arr] if settings.include_raw_distribution else [],
+        )
+    else:
+        extras = {}
+    return TargetStats(
+        **base,
+        total_evaluable=total_evaluable,
+        hit_count=hit_count,
+        miss_count=total_evaluable - hit_count,
+        hit_rate_pct=round(hit_count / total_evaluable * 100, 2),
+        anytime_hit_count=anytime_hit_count,
+        anytime_hit_rate_pct=round(anytime_hit_count / total_evaluable * 100, 2),
+        avg_change_pct=round(float(np.mean(arr)), 4),
+        median_change_pct=round(float(np.median(arr)), 4),
+        max_change_pct=round(float(np.max(arr)), 4),
+        min_change_pct=round(float(np.min(arr)), 4),
+        std_dev=round(float(np.std(arr, ddof=1)) if total_evaluable > 1 else 0.0, 4),
+        percentile_5=round(float(np.percentile(arr, 5)), 4),
+        percentile_25=round(float(np.percentile(arr, 25)), 4),
+        percentile_75=round(float(np.percentile(arr, 75)), 4),
+        percentile_95=round(float(np.percentile(arr, 95)), 4),
+        **extras,
+        **_path_stats(mfe.tolist(), mae.tolist(), days_to_hit.tolist(), target.direction.value),
+    )
@@ -0,0 +1,78 @@
+"""
+Higher-timeframe indicators aligned to the base (daily) bars.
+
+A weekly or monthly indicator is computed on a resampled view of the frame
+(open first, high max, low min, close last, volume summed per period) and
+mapped back onto the base index without look-ahead: a period's value becomes
+visible on its bar that falls on the period's last trading day (or, if that
+day has no bar, on the first bar of a later period) and is carried forward
+until the next period completes. Completion depends only on the calendar and
+bars up to the current one, so truncating the data never changes a past value;
+the still-open last period of the data is left out.
+
+The resampled view is memoised per frame; aligned series are cached by the
+engine in the shared indicator cache under their ``@WEEKLY`` / ``@MONTHLY``
+column name, i.e. per (dataset, timeframe, indicator).
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.core.cache import frame_memo
+from app.core.indicators import compute_indicator
+from app.models.scenario import ConditionTimeframe
+
+# pandas period frequencies; weeks end on Friday like the trading week
+PERIOD_FREQ = {
+    ConditionTimeframe.WEEKLY: "W-FRI",
+    ConditionTimeframe.MONTHLY: "M",
+}
+# Approximate base bars per period, for warm-up lookbacks
+BARS_PER_PERIOD = {
+    ConditionTimeframe.WEEKLY: 5,
+    ConditionTimeframe.MONTHLY: 21,
+}
+
+
+def resampled_view(df: pd.DataFrame, timeframe: ConditionTimeframe) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Completed higher-timeframe bars of ``df`` and, per base bar, the index of
+    the latest bar completed at its close (-1 before the first). Memoised per frame.
+    """
+    return frame_memo(df, f"resample:{timeframe.value}", lambda frame: _resample(frame, timeframe))
+
+
+def _resample(df: pd.DataFrame, timeframe: ConditionTimeframe) -> tuple[pd.DataFrame, np.ndarray]:
+    freq = PERIOD_FREQ[timeframe]
+    codes, periods = pd.factorize(df.index.to_period(freq), sort=True)
+    if len(codes) == 0:
+        return df.iloc[:0], np.array([], dtype=np.int64)
+    # A bar on the period's last trading day completes it; otherwise the previous period is the latest.
+    # Data with weekend bars (e.g. crypto) trades every calendar day.
+    next_day = pd.offsets.Day(1) if (df.index.dayofweek >= 5).any() else pd.offsets.BDay(1)
+    on_last_day = (df.index + next_day).to_period(freq) != df.index.to_period(freq)
+    completed = np.maximum.accumulate(np.where(on_last_day, codes, codes - 1))
+
+    grouped = df.groupby(codes, sort=True)
+    bars = pd.DataFrame({
+        "open": grouped["open"].first().to_numpy(dtype=float),
+        "high": grouped["high"].max().to_numpy(dtype=float),
+        "low": grouped["low"].min().to_numpy(dtype=float),
+        "close": grouped["close"].last().to_numpy(dtype=float),
+        "volume": grouped["volume"].sum().to_numpy(dtype=float),
+    }, index=pd.Index(periods.to_timestamp(how="end").normalize(), name="date"))
+    return bars.iloc[:completed[-1] + 1], completed
+
+
+def compute_on_timeframe(
+    df: pd.DataFrame, indicator: str, params: dict, timeframe: ConditionTimeframe
+) -> np.ndarray:
+    """``indicator`` computed on ``timeframe`` bars, forward-filled onto ``df``'s index."""
+    bars, completed = resampled_view(df, timeframe)
+    aligned = np.full(len(df), np.nan)
+    if len(bars) == 0:
+        return aligned
+    values = compute_indicator(bars, indicator, params).to_numpy(dtype=float)
+    has_value = completed >= 0
+    aligned[has_value] = values[completed[has_value]]
+    return aligned
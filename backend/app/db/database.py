@@ -60,6 +60,42 @@ def init_database() -> None:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS run_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scenario_id TEXT NOT NULL,
+                run_date TEXT NOT NULL,
+                data_start TEXT NOT NULL,
+                data_end TEXT NOT NULL,
+                total_bars INTEGER NOT NULL,
+                total_signals INTEGER NOT NULL,
+                signals_added INTEGER NOT NULL,
+                signals_removed INTEGER NOT NULL,
+                signals_changed INTEGER NOT NULL,
+                snapshot INTEGER NOT NULL,
+                summary TEXT NOT NULL,
+                stats TEXT NOT NULL,
+                signals TEXT NOT NULL,
+                FOREIGN KEY (scenario_id) REFERENCES scenarios(id) ON DELETE CASCADE
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS result_chunks (
+                scenario_id TEXT NOT NULL,
+                chunk_set TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (scenario_id, chunk_set, seq),
+                FOREIGN KEY (scenario_id) REFERENCES scenarios(id) ON DELETE CASCADE
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_run_history_scenario ON run_history (scenario_id, id)"
+        )
     logger.info("Database initialized at %s", _get_db_path())
 
 
@@ -0,0 +1,264 @@
+"""
+Append-only run history with delta-encoded signals.
+
+Every saved result appends a ``run_history`` row holding the run's summary
+(everything but the signals) in full, a compact per-target copy of the scalar
+stats for time-series queries, and the signals as a delta against the
+previous run: signals keyed by date that were added or changed, plus the dates
+that disappeared. Appending bars usually leaves old signals untouched, so a
+delta is a handful of signals instead of the whole list.
+
+Every ``history_snapshot_interval`` runs (or when a delta would be larger than
+half the signals) the full signal list is stored instead, which bounds the
+chain replayed to rebuild any run. Streamed runs (signals persisted in chunks)
+keep their summary only; they are listed with ``signals_available`` false and
+cannot be rebuilt. Retention drops the oldest runs, first turning the oldest
+kept run into a snapshot so its successors stay readable.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import settings
+from app.db.database import get_connection
+from app.models.history import RunHistoryEntry, StatSeries
+from app.models.results import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+SignalMap = dict[str, dict]
+
+# Summary-only rows of streamed runs: an empty snapshot of a run that had signals
+_SIGNALS_AVAILABLE = "NOT (snapshot = 1 AND total_signals > 0 AND json_array_length(signals, '$.upserted') = 0)"
+
+
+class SignalsNotStored(Exception):
+    """Raised when a run's signals were never stored in the history (streamed runs)."""
+
+
+# ---------------------------------------------------------------------------
+# Signal deltas
+# ---------------------------------------------------------------------------
+
+def signal_delta(previous: SignalMap, current: SignalMap) -> dict:
+    """Delta turning ``previous`` into ``current`` (both keyed by signal date)."""
+    upserted = [signal for date, signal in current.items() if previous.get(date) != signal]
+    removed = [date for date in previous if date not in current]
+    return {"upserted": upserted, "removed": removed}
+
+
+def apply_delta(signals: SignalMap, delta: dict) -> None:
+    for date in delta["removed"]:
+        signals.pop(date, None)
+    for signal in delta["upserted"]:
+        signals[signal["date"]] = signal
+
+
+def _replay(conn: sqlite3.Connection, scenario_id: str, run_id: int) -> SignalMap:
+    """Rebuild a run's signals from its latest snapshot forward."""
+    rows = conn.execute(
+        "SELECT signals FROM run_history WHERE scenario_id = ? AND id <= ? AND id >= "
+        "(SELECT MAX(id) FROM run_history WHERE scenario_id = ? AND id <= ? AND snapshot = 1) ORDER BY id",
+        (scenario_id, run_id, scenario_id, run_id),
+    ).fetchall()
+    signals: SignalMap = {}
+    for row in rows:
+        apply_delta(signals, json.loads(row["signals"]))
+    return signals
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+def record_runs(conn: sqlite3.Connection, results: list[AnalysisResult]) -> None:
+    """Append history rows for ``results`` on an open connection (the caller's transaction)."""
+    for result in results:
+        _append(conn, result)
+        _prune(conn, result.scenario_id)
+
+
+def _append(conn: sqlite3.Connection, result: AnalysisResult) -> None:
+    if result.signal_store is not None:
+        _append_summary_only(conn, result)
+        return
+    current = {signal.date: signal.model_dump(mode="json") for signal in result.signals}
+    latest = conn.execute(
+        "SELECT id, (SELECT COUNT(*) FROM run_history h WHERE h.scenario_id = r.scenario_id AND h.id > "
+        "(SELECT MAX(id) FROM run_history WHERE scenario_id = r.scenario_id AND snapshot = 1)) AS since_snapshot "
+        "FROM run_history r WHERE scenario_id = ? ORDER BY id DESC LIMIT 1",
+        (result.scenario_id,),
+    ).fetchone()
+
+    previous = _replay(conn, result.scenario_id, latest["id"]) if latest else {}
+    delta = signal_delta(previous, current)
+    changed = sum(signal["date"] in previous for signal in delta["upserted"])
+    snapshot = (
+        latest is None
+        or latest["since_snapshot"] + 1 >= max(settings.history_snapshot_interval, 1)
+        or len(delta["upserted"]) + len(delta["removed"]) > len(current) / 2
+    )
+    stored = {"upserted": list(current.values()), "removed": []} if snapshot else delta
+
+    conn.execute(
+        "INSERT INTO run_history (scenario_id, run_date, data_start, data_end, total_bars, total_signals, "
+        "signals_added, signals_removed, signals_changed, snapshot, summary, stats, signals) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            result.scenario_id, result.run_date, result.data_start, result.data_end,
+            result.total_bars, result.total_signals,
+            len(delta["upserted"]) - changed, len(delta["removed"]), changed, int(snapshot),
+            result.model_dump_json(exclude={"signals", "signal_store"}),
+            json.dumps(_scalar_stats(result)),
+            json.dumps(stored, separators=(",", ":")),
+        ),
+    )
+
+
+def _append_summary_only(conn: sqlite3.Connection, result: AnalysisResult) -> None:
+    """
+    Streamed runs never hold all their signals in memory, so history keeps
+    only their summary: an empty snapshot that the next run's delta starts from.
+    """
+    conn.execute(
+        "INSERT INTO run_history (scenario_id, run_date, data_start, data_end, total_bars, total_signals, "
+        "signals_added, signals_removed, signals_changed, snapshot, summary, stats, signals) "
+        "VALUES (?, ?, ?, ?, ?, ?, 0, 0, 0, 1, ?, ?, ?)",
+        (
+            result.scenario_id, result.run_date, result.data_start, result.data_end,
+            result.total_bars, result.total_signals,
+            result.model_dump_json(exclude={"signals", "signal_store"}),
+            json.dumps(_scalar_stats(result)),
+            json.dumps({"upserted": [], "removed": []}),
+        ),
+    )
+
+
+def _scalar_stats(result: AnalysisResult) -> dict[str, dict[str, float]]:
+    """Numeric TargetStats fields per target, plus the baseline hit rate."""
+    stats: dict[str, dict[str, float]] = {}
+    for ts in result.target_stats:
+        values = {
+            name: value for name, value in ts.model_dump(exclude={"target_id", "direction"}).items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+        if ts.baseline is not None:
+            values["baseline_hit_rate_pct"] = ts.baseline.hit_rate_pct
+        if ts.significance is not None:
+            values["hit_rate_p_value"] = ts.significance.hit_rate_p_value
+        stats[ts.target_id] = values
+    return stats
+
+
+def _prune(conn: sqlite3.Connection, scenario_id: str) -> None:
+    """Apply the retention policy; the newest run is always kept."""
+    conditions, params = [], []
+    if settings.history_max_runs > 0:
+        conditions.append(
+            "id <= (SELECT id FROM run_history WHERE scenario_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)"
+        )
+        params += [scenario_id, settings.history_max_runs]
+    if settings.history_max_age_days > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.history_max_age_days)
+        conditions.append("run_date < ?")
+        params.append(cutoff.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    if not conditions:
+        return
+
+    expired = conn.execute(
+        f"SELECT MAX(id) AS last FROM run_history WHERE scenario_id = ? AND ({' OR '.join(conditions)})",
+        [scenario_id, *params],
+    ).fetchone()["last"]
+    first_kept = conn.execute(
+        "SELECT id, snapshot FROM run_history WHERE scenario_id = ? AND id > ? ORDER BY id LIMIT 1",
+        (scenario_id, expired),
+    ).fetchone() if expired is not None else None
+    if first_kept is None:
+        return  # nothing expired, or it would drop the newest run
+
+    if not first_kept["snapshot"]:
+        signals = _replay(conn, scenario_id, first_kept["id"])
+        conn.execute(
+            "UPDATE run_history SET snapshot = 1, signals = ? WHERE id = ?",
+            (json.dumps({"upserted": list(signals.values()), "removed": []}, separators=(",", ":")),
+             first_kept["id"]),
+        )
+    deleted = conn.execute(
+        "DELETE FROM run_history WHERE scenario_id = ? AND id < ?", (scenario_id, first_kept["id"])
+    ).rowcount
+    logger.info("Pruned %d history runs of scenario %s", deleted, scenario_id)
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def list_runs(scenario_id: str) -> list[RunHistoryEntry]:
+    """Stored runs of a scenario, oldest first."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT id, run_date, data_start, data_end, total_bars, total_signals, signals_added, "
+            f"signals_removed, signals_changed, snapshot, {_SIGNALS_AVAILABLE} AS signals_available "
+            "FROM run_history WHERE scenario_id = ? ORDER BY id",
+            (scenario_id,),
+        ).fetchall()
+    return [
+        RunHistoryEntry(run_id=row["id"], **{k: row[k] for k in row.keys() if k != "id"})
+        for row in rows
+    ]
+
+
+def get_run(scenario_id: str, run_id: int) -> Optional[AnalysisResult]:
+    """
+    A stored run as a full result, with its signals rebuilt from the delta chain.
+    Raises ``SignalsNotStored`` for streamed runs, whose history keeps the summary only.
+    """
+    with get_connection() as conn:
+        row = conn.execute(
+            f"SELECT summary, {_SIGNALS_AVAILABLE} AS signals_available FROM run_history "
+            "WHERE scenario_id = ? AND id = ?",
+            (scenario_id, run_id),
+        ).fetchone()
+        if row is None:
+            return None
+        if not row["signals_available"]:
+            raise SignalsNotStored(f"Run {run_id} was streamed; its history keeps the summary only")
+        signals = _replay(conn, scenario_id, run_id)
+    summary = json.loads(row["summary"])
+    summary["signals"] = [signals[date] for date in sorted(signals)]
+    return AnalysisResult.model_validate(summary)
+
+
+def stat_series(scenario_id: str, target_id: Optional[str], stats: list[str]) -> list[StatSeries]:
+    """
+    Time series of TargetStats fields across runs, one per target (or only
+    ``target_id``). Reads only the compact stats column, never summaries or signals.
+    """
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT id, run_date, data_end, total_signals, stats FROM run_history "
+            "WHERE scenario_id = ? ORDER BY id",
+            (scenario_id,),
+        ).fetchall()
+
+    series: dict[str, StatSeries] = {}
+    for row in rows:
+        for tid, values in json.loads(row["stats"]).items():
+            if target_id is not None and tid != target_id:
+                continue
+            entry = series.get(tid)
+            if entry is None:
+                entry = series[tid] = StatSeries(
+                    target_id=tid, run_ids=[], run_dates=[], data_end=[], total_signals=[],
+                    values={name: [] for name in stats},
+                )
+            entry.run_ids.append(row["id"])
+            entry.run_dates.append(row["run_date"])
+            entry.data_end.append(row["data_end"])
+            entry.total_signals.append(row["total_signals"])
+            for name in stats:
+                entry.values[name].append(values.get(name))
+    return list(series.values())
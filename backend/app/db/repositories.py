@@ -1,17 +1,21 @@
-"""CRUD repository functions for scenarios and analysis results."""
+"""CRUD repository functions for scenarios (cached results live in ``result_store``)."""
 
-import json
 import logging
+import sqlite3
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from uuid import uuid4
 
 from app.db.database import get_connection
+from app.db.result_store import inline_chunks
 from app.models.results import AnalysisResult
 from app.models.scenario import ScenarioCreate, ScenarioInDB, ScenarioSummary, ScenarioUpdate
 
 logger = logging.getLogger(__name__)
 
+# Bound parameters per IN (...) query; SQLite builds before 3.32 cap a statement at 999
+_MAX_SQL_PARAMS = 900
+
 
 # ---------------------------------------------------------------------------
 # Scenarios
@@ -51,6 +55,27 @@ def get_scenario(scenario_id: str) -> Optional[ScenarioInDB]:
     return ScenarioInDB.model_validate_json(row["data"])
 
 
+def get_scenarios(scenario_ids: list[str]) -> list[ScenarioInDB]:
+    """Fetch several scenarios, ``_MAX_SQL_PARAMS`` IDs per query. Unknown IDs are skipped; order follows the input."""
+    by_id: dict[str, ScenarioInDB] = {}
+    with get_connection() as conn:
+        for start in range(0, len(scenario_ids), _MAX_SQL_PARAMS):
+            chunk = scenario_ids[start:start + _MAX_SQL_PARAMS]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = conn.execute(f"SELECT id, data FROM scenarios WHERE id IN ({placeholders})", chunk).fetchall()
+            by_id.update((row["id"], ScenarioInDB.model_validate_json(row["data"])) for row in rows)
+    return [by_id[sid] for sid in scenario_ids if sid in by_id]
+
+
+def recent_scenarios(limit: int) -> list[ScenarioInDB]:
+    """The ``limit`` most recently updated scenarios."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT data FROM scenarios ORDER BY updated_at DESC LIMIT ?", (limit,)
+        ).fetchall()
+    return [ScenarioInDB.model_validate_json(row["data"]) for row in rows]
+
+
 def list_scenarios() -> list[ScenarioSummary]:
     """Return lightweight summaries of all scenarios."""
     with get_connection() as conn:
@@ -125,29 +150,81 @@ def delete_scenario(scenario_id: str) -> bool:
     return deleted
 
 
-# ---------------------------------------------------------------------------
-# Analysis Results
-# ---------------------------------------------------------------------------
-
-def save_result(result: AnalysisResult) -> None:
-    """Upsert a cached analysis result for a scenario."""
+def existing_scenario_ids(scenario_ids: Iterable[str]) -> set[str]:
+    """The subset of ``scenario_ids`` already in the database."""
+    ids = list(scenario_ids)
+    found: set[str] = set()
     with get_connection() as conn:
-        conn.execute(
-            "INSERT OR REPLACE INTO analysis_results (scenario_id, data, run_date) "
-            "VALUES (?, ?, ?)",
-            (result.scenario_id, result.model_dump_json(), result.run_date),
+        for start in range(0, len(ids), _MAX_SQL_PARAMS):
+            chunk = ids[start:start + _MAX_SQL_PARAMS]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = conn.execute(f"SELECT id FROM scenarios WHERE id IN ({placeholders})", chunk).fetchall()
+            found.update(row["id"] for row in rows)
+    return found
+
+
+def import_scenarios(
+    scenarios: list[ScenarioInDB], results: list[AnalysisResult], replace: bool = False
+) -> None:
+    """
+    Insert scenarios (and optional cached results) in one transaction.
+
+    With ``replace``, existing scenarios with the same ID are overwritten
+    (timestamps included) and their cached results, streamed signal chunks and
+    run history dropped; a supplied result becomes the new cached result.
+    """
+    if not scenarios:
+        return
+    rows = [(s.id, s.model_dump_json(), s.created_at, s.updated_at) for s in scenarios]
+    with get_connection() as conn:
+        if replace:
+            conn.executemany(
+                "INSERT INTO scenarios (id, data, created_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET data = excluded.data, created_at = excluded.created_at, "
+                "updated_at = excluded.updated_at",
+                rows,
+            )
+            ids = [(s.id,) for s in scenarios]
+            for table in ("analysis_results", "result_chunks", "run_history"):
+                conn.executemany(f"DELETE FROM {table} WHERE scenario_id = ?", ids)
+        else:
+            conn.executemany(
+                "INSERT INTO scenarios (id, data, created_at, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO analysis_results (scenario_id, data, run_date) VALUES (?, ?, ?)",
+            [(r.scenario_id, r.model_dump_json(), r.run_date) for r in results],
         )
-    logger.info("Saved analysis result for scenario %s", result.scenario_id)
-
-
-def get_result(scenario_id: str) -> Optional[AnalysisResult]:
-    """Get the cached analysis result for a scenario, or None."""
+    logger.info("Imported %d scenarios and %d results", len(scenarios), len(results))
+
+
+def iter_scenario_rows(
+    scenario_ids: Optional[list[str]] = None, include_results: bool = True
+) -> Iterator[tuple[str, Optional[str]]]:
+    """
+    Yield raw ``(scenario_json, result_json)`` rows, oldest first, without
+    parsing them. ``result_json`` is None when not requested or not cached.
+    A streamed run's chunks are spliced into its ``signals`` (and its
+    ``signal_store`` cleared), so the result stands on its own.
+    """
+    result_columns = "ar.data, json_extract(ar.data, '$.signal_store')" if include_results else "NULL, NULL"
+    query = (
+        f"SELECT s.id, s.data, {result_columns} FROM scenarios s "
+        "LEFT JOIN analysis_results ar ON s.id = ar.scenario_id"
+    )
+    order = " ORDER BY s.created_at, s.rowid"
     with get_connection() as conn:
-        row = conn.execute(
-            "SELECT data FROM analysis_results WHERE scenario_id = ?",
-            (scenario_id,),
-        ).fetchone()
-
-    if row is None:
-        return None
-    return AnalysisResult.model_validate_json(row["data"])
+        if scenario_ids is None:
+            yield from _export_rows(conn, conn.execute(query + order))
+            return
+        for start in range(0, len(scenario_ids), _MAX_SQL_PARAMS):
+            chunk = scenario_ids[start:start + _MAX_SQL_PARAMS]
+            placeholders = ",".join("?" for _ in chunk)
+            yield from _export_rows(conn, conn.execute(query + f" WHERE s.id IN ({placeholders})" + order, chunk))
+
+
+def _export_rows(conn: sqlite3.Connection, rows: Iterable[sqlite3.Row]) -> Iterator[tuple[str, Optional[str]]]:
+    for scenario_id, scenario_json, result_json, chunk_set in rows:
+        if chunk_set is not None:
+            result_json = inline_chunks(conn, scenario_id, chunk_set, result_json)
+        yield scenario_json, result_json
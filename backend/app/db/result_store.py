@@ -0,0 +1,181 @@
+"""
+Persistence of analysis results.
+
+Each scenario has one cached result (``analysis_results``); saving it also
+appends the run to the history (see ``app.db.history``). Streamed runs keep
+their signals in ``result_chunks`` rows written by ``ResultChunkWriter``, and
+the cached result names the chunk set in ``signal_store``.
+"""
+
+import json
+import logging
+import sqlite3
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from app.db.database import get_connection
+from app.db.history import record_runs
+from app.models.results import AnalysisResult, Signal
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Analysis Results
+# ---------------------------------------------------------------------------
+
+def save_result(result: AnalysisResult) -> None:
+    """Upsert a cached analysis result for a scenario and append it to the run history."""
+    with get_connection() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO analysis_results (scenario_id, data, run_date) "
+            "VALUES (?, ?, ?)",
+            (result.scenario_id, result.model_dump_json(), result.run_date),
+        )
+        conn.execute(
+            "DELETE FROM result_chunks WHERE scenario_id = ? AND chunk_set IS NOT ?",
+            (result.scenario_id, result.signal_store),
+        )
+        record_runs(conn, [result])
+    logger.info("Saved analysis result for scenario %s", result.scenario_id)
+
+
+def save_results(results: list[AnalysisResult]) -> None:
+    """Upsert many cached analysis results (and their history rows) in a single transaction."""
+    if not results:
+        return
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO analysis_results (scenario_id, data, run_date) "
+            "VALUES (?, ?, ?)",
+            [(r.scenario_id, r.model_dump_json(), r.run_date) for r in results],
+        )
+        conn.executemany(
+            "DELETE FROM result_chunks WHERE scenario_id = ? AND chunk_set IS NOT ?",
+            [(r.scenario_id, r.signal_store) for r in results],
+        )
+        record_runs(conn, results)
+    logger.info("Saved %d analysis results", len(results))
+
+
+def has_result(scenario_id: str) -> bool:
+    """Whether a cached analysis result exists, without loading it."""
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT 1 FROM analysis_results WHERE scenario_id = ?",
+            (scenario_id,),
+        ).fetchone()
+    return row is not None
+
+
+def get_result(scenario_id: str, include_signals: bool = True) -> Optional[AnalysisResult]:
+    """
+    Get the cached analysis result for a scenario, or None.
+
+    Without ``include_signals`` the signals are dropped in SQL, so neither the
+    stored signal array nor a streamed run's chunks are parsed.
+    """
+    column = "data" if include_signals else "json_set(data, '$.signals', json('[]')) AS data"
+    with get_connection() as conn:
+        row = conn.execute(
+            f"SELECT {column} FROM analysis_results WHERE scenario_id = ?",
+            (scenario_id,),
+        ).fetchone()
+
+    if row is None:
+        return None
+    result = AnalysisResult.model_validate_json(row["data"])
+    if include_signals and result.signal_store is not None:
+        result.signals = list(iter_result_signals(scenario_id, result.signal_store))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Chunked signals of streamed runs
+# ---------------------------------------------------------------------------
+
+class ResultChunkWriter:
+    """
+    Persists a streamed run's signals chunk by chunk, each in its own short
+    transaction, under a fresh chunk set. The run becomes visible only when
+    ``commit`` saves its summary; that also drops the previous run's chunks.
+    """
+
+    def __init__(self, scenario_id: str) -> None:
+        self.scenario_id = scenario_id
+        self.chunk_set = str(uuid4())
+        self.chunks = 0
+
+    def write(self, signals: list[Signal]) -> None:
+        data = "[" + ",".join(signal.model_dump_json() for signal in signals) + "]"
+        with get_connection() as conn:
+            conn.execute(
+                "INSERT INTO result_chunks (scenario_id, chunk_set, seq, data) VALUES (?, ?, ?, ?)",
+                (self.scenario_id, self.chunk_set, self.chunks, data),
+            )
+        self.chunks += 1
+
+    def commit(self, result: AnalysisResult) -> AnalysisResult:
+        """Save the signal-less summary as the scenario's current result."""
+        result.signal_store = self.chunk_set
+        save_result(result)
+        return result
+
+    def abort(self) -> None:
+        with get_connection() as conn:
+            conn.execute(
+                "DELETE FROM result_chunks WHERE scenario_id = ? AND chunk_set = ?",
+                (self.scenario_id, self.chunk_set),
+            )
+
+
+def iter_result_signals(scenario_id: str, chunk_set: str) -> Iterator[Signal]:
+    """Signals of a streamed run, read one chunk at a time."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT data FROM result_chunks WHERE scenario_id = ? AND chunk_set = ? ORDER BY seq",
+            (scenario_id, chunk_set),
+        )
+        for row in rows:
+            yield from (Signal.model_validate(signal) for signal in json.loads(row["data"]))
+
+
+def inline_chunks(conn: sqlite3.Connection, scenario_id: str, chunk_set: str, result_json: str) -> str:
+    """``result_json`` with its streamed chunks as ``signals`` and no ``signal_store``."""
+    rows = conn.execute(
+        "SELECT data FROM result_chunks WHERE scenario_id = ? AND chunk_set = ? ORDER BY seq",
+        (scenario_id, chunk_set),
+    )
+    signals = "[" + ",".join(row["data"][1:-1] for row in rows if row["data"] != "[]") + "]"
+    return conn.execute(
+        "SELECT json_set(?, '$.signals', json(?), '$.signal_store', NULL)", (result_json, signals)
+    ).fetchone()[0]
+
+
+def indicator_columns(scenario_ids: list[str]) -> list[str]:
+    """
+    Names of the indicator values recorded on the stored results' signals
+    (streamed chunks included), in first-seen order. Read with SQLite's JSON
+    functions, so no result is parsed in Python.
+    """
+    columns: dict[str, None] = {}
+    with get_connection() as conn:
+        for scenario_id in scenario_ids:
+            rows = conn.execute(
+                "SELECT key FROM ("
+                "  SELECT j.key AS key, s.key * 1000000 + j.id AS position"
+                "  FROM analysis_results ar, json_each(ar.data, '$.signals') s,"
+                "       json_each(s.value, '$.indicator_values') j"
+                "  WHERE ar.scenario_id = :sid"
+                "  UNION ALL"
+                "  SELECT j.key, (rc.seq + 1) * 1000000000000 + s.key * 1000000 + j.id"
+                "  FROM analysis_results ar"
+                "  JOIN result_chunks rc ON rc.scenario_id = ar.scenario_id"
+                "       AND rc.chunk_set = json_extract(ar.data, '$.signal_store'),"
+                "       json_each(rc.data) s, json_each(s.value, '$.indicator_values') j"
+                "  WHERE ar.scenario_id = :sid"
+                ") GROUP BY key ORDER BY MIN(position)",
+                {"sid": scenario_id},
+            )
+            columns.update(dict.fromkeys(row["key"] for row in rows))
+    return list(columns)
@@ -0,0 +1,156 @@
+"""
+Bulk scenario import/export as JSON Lines.
+
+One record per line::
+
+    {"scenario": {...ScenarioInDB...}, "result": {...AnalysisResult...} | null}
+
+A bare scenario object per line is accepted too. Results carry their signals
+inline, streamed runs included. Imports also take the same
+file gzip-compressed or inside a zip archive (every ``*.jsonl`` member is
+read). Every line is validated before anything is written; the valid ones are
+then inserted in a single transaction.
+"""
+
+import gzip
+import io
+import json
+import logging
+import zipfile
+import zlib
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.db import repositories as repo
+from app.models.results import AnalysisResult
+from app.models.scenario import ImportMode, ScenarioImportItem, ScenarioImportResponse, ScenarioInDB
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def export_lines(scenario_ids: Optional[list[str]] = None, include_results: bool = False) -> Iterator[str]:
+    """Yield one JSON line per scenario, reusing the stored JSON verbatim."""
+    for scenario_json, result_json in repo.iter_scenario_rows(scenario_ids, include_results):
+        yield f'{{"scenario":{scenario_json},"result":{result_json or "null"}}}\n'
+
+
+def gzip_stream(lines: Iterator[str]) -> Iterator[bytes]:
+    """Gzip-compress a line stream incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for line in lines:
+        chunk = compressor.compress(line.encode("utf-8"))
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def import_bundle(
+    data: bytes, mode: ImportMode = ImportMode.KEEP, include_results: bool = True
+) -> ScenarioImportResponse:
+    """Validate every record of a JSON Lines / gzip / zip bundle, then insert the valid ones at once."""
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    items: list[ScenarioImportItem] = []
+    scenarios: dict[str, ScenarioInDB] = {}
+    results: dict[str, AnalysisResult] = {}
+
+    for line_no, text in _lines(data):
+        item = ScenarioImportItem(line=line_no, ok=False)
+        items.append(item)
+        try:
+            scenario, result = _parse_record(text, mode, now, include_results)
+        except (ValueError, ValidationError) as e:
+            item.error = _describe(e)
+            continue
+        item.scenario_id, item.name = scenario.id, scenario.name
+        if scenario.id in scenarios:
+            item.error = f"Duplicate scenario id '{scenario.id}' in file"
+            continue
+        item.ok = True
+        scenarios[scenario.id] = scenario
+        if result is not None:
+            results[scenario.id] = result
+            item.result_imported = True
+
+    if mode == ImportMode.KEEP:
+        for existing in repo.existing_scenario_ids(scenarios):
+            del scenarios[existing]
+            results.pop(existing, None)
+            for item in items:
+                if item.ok and item.scenario_id == existing:
+                    item.ok, item.result_imported = False, False
+                    item.error = f"Scenario '{existing}' already exists"
+
+    repo.import_scenarios(list(scenarios.values()), list(results.values()), replace=mode == ImportMode.REPLACE)
+    failed = sum(not item.ok for item in items)
+    logger.info("Bulk import: %d scenarios, %d results, %d failed", len(scenarios), len(results), failed)
+    return ScenarioImportResponse(
+        imported=len(scenarios), results_imported=len(results), failed=failed, items=items
+    )
+
+
+def _parse_record(
+    text: str, mode: ImportMode, now: str, include_results: bool
+) -> tuple[ScenarioInDB, Optional[AnalysisResult]]:
+    record = json.loads(text)
+    if not isinstance(record, dict):
+        raise ValueError("Each line must be a JSON object")
+    raw = record.get("scenario", record)
+    if not isinstance(raw, dict):
+        raise ValueError("'scenario' must be a JSON object")
+
+    scenario_id = raw.get("id") if mode != ImportMode.NEW else None
+    scenario = ScenarioInDB.model_validate({
+        **raw,
+        "id": scenario_id or str(uuid4()),
+        "created_at": raw.get("created_at") or now,
+        "updated_at": raw.get("updated_at") or now,
+    })
+
+    result = None
+    raw_result = record.get("result") if "scenario" in record else None
+    if include_results and raw_result:
+        result = AnalysisResult.model_validate(raw_result)
+        if result.signal_store is not None and not result.signals and result.total_signals:
+            # Exported before chunks were inlined: the signals live in the source database only
+            raise ValueError(
+                "Result of a streamed run was exported without its signals; "
+                "re-export it, or import with include_results=false"
+            )
+        result = result.model_copy(update={"scenario_id": scenario.id, "signal_store": None})
+    return scenario, result
+
+
+def _lines(data: bytes) -> Iterator[tuple[int, str]]:
+    """(line number, text) of every non-blank line, unpacking gzip or zip bundles."""
+    if data.startswith(ZIP_MAGIC):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            members = [n for n in archive.namelist() if n.endswith((".jsonl", ".jsonl.gz"))]
+            if not members:
+                raise ValueError("Archive contains no .jsonl files")
+            offset = 0
+            for name in sorted(members):
+                count = 0
+                for count, text in _lines(archive.read(name)):
+                    yield offset + count, text
+                offset += count
+        return
+    if data.startswith(GZIP_MAGIC):
+        data = gzip.decompress(data)
+    for line_no, text in enumerate(data.decode("utf-8-sig").splitlines(), start=1):
+        if text.strip():
+            yield line_no, text
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        suffix = f" (+{error.error_count() - 1} more)" if error.error_count() > 1 else ""
+        return f"{location}: {first['msg']}{suffix}"
+    return str(error)
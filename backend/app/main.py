@@ -2,16 +2,22 @@
 
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.routes_analysis import router as analysis_router
 from app.api.routes_data import router as data_router
 from app.api.routes_export import router as export_router
 from app.api.routes_scenarios import router as scenarios_router
 from app.config import settings
+from app.core.metrics import registry
+from app.core.prefetch import foreground, prefetcher
+from app.db import repositories as repo
 from app.db.database import init_database
 
 logging.basicConfig(
@@ -40,8 +46,12 @@ async def lifespan(app: FastAPI):
     _detect_norgate()
     os.makedirs(settings.data_dir, exist_ok=True)
     os.makedirs(settings.csv_import_dir, exist_ok=True)
+    if settings.prefetch_enabled:
+        prefetcher.start()
+        prefetcher.enqueue(repo.recent_scenarios(settings.prefetch_startup_scenarios))
     yield
     logger.info("Shutting down...")
+    prefetcher.stop()
 
 
 app = FastAPI(
@@ -63,6 +73,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_duration(request: Request, call_next):
+    """
+    Observe per-endpoint latency, labelled by route template rather than raw path.
+
+    The request counts as foreground activity (see ``app.core.prefetch``)
+    until its body has been sent, so long streamed exports hold off warm-ups.
+    """
+    t0 = time.perf_counter()
+    finish = foreground.begin()
+    try:
+        response = await call_next(request)
+    except BaseException:
+        finish()
+        raise
+    route = request.scope.get("route")
+    registry.observe(
+        "retrocast_http_request_duration_seconds",
+        time.perf_counter() - t0,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+    response.body_iterator = _finish_after(response.body_iterator, finish)
+    return response
+
+
+async def _finish_after(body: AsyncIterator[bytes], finish: Callable[[], None]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        finish()
+
+
 # Include route modules
 app.include_router(scenarios_router)
 app.include_router(analysis_router)
@@ -74,3 +120,9 @@ app.include_router(export_router)
 async def health():
     """Health check endpoint."""
     return {"status": "ok", "version": "1.0.0"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text-format metrics (stage and endpoint histograms, counters)."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
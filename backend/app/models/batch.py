@@ -0,0 +1,27 @@
+"""Pydantic models for batch analysis runs."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchRunRequest(BaseModel):
+    """Scenarios to run together; those sharing a dataset load it once."""
+
+    scenario_ids: list[str] = Field(min_length=1)
+
+
+class BatchRunItem(BaseModel):
+    """Per-scenario outcome of a batch run."""
+
+    scenario_id: str
+    ok: bool
+    total_signals: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchRunResponse(BaseModel):
+    """Summary of a batch run. Full results are fetched via ``/{id}/last``."""
+
+    datasets_loaded: int
+    items: list[BatchRunItem]
@@ -0,0 +1,32 @@
+"""Pydantic models for the stored run history of a scenario."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RunHistoryEntry(BaseModel):
+    """One stored run of a scenario; signal counts describe the change vs the previous run."""
+
+    run_id: int
+    run_date: str
+    data_start: str
+    data_end: str
+    total_bars: int
+    total_signals: int
+    signals_added: int = 0
+    signals_removed: int = 0
+    signals_changed: int = 0
+    snapshot: bool = False  # Signals stored in full rather than as a delta
+    signals_available: bool = True  # False for streamed runs: only the summary is kept
+
+
+class StatSeries(BaseModel):
+    """Selected TargetStats fields of one target across the stored runs, oldest first."""
+
+    target_id: str
+    run_ids: list[int]
+    run_dates: list[str]
+    data_end: list[str]
+    total_signals: list[int]
+    values: dict[str, list[Optional[float]]]
@@ -0,0 +1,27 @@
+"""Pydantic models for profiled analysis runs."""
+
+from pydantic import BaseModel
+
+
+class ProfileFunction(BaseModel):
+    """One row of the deterministic profiler's function table."""
+
+    function: str
+    file: str
+    line: int
+    calls: int
+    self_time_ms: float
+    cumulative_time_ms: float
+
+
+class ProfileReport(BaseModel):
+    """Profile artifact captured for a single analysis run (``profile=true``)."""
+
+    scenario_id: str
+    run_date: str
+    duration_ms: float
+    sample_interval_ms: float
+    top_functions: list[ProfileFunction]
+    folded_stacks: list[str]  # "frame;frame;frame count" — flamegraph.pl / speedscope input
+    stage_peak_memory_kb: dict[str, float]
+    peak_memory_kb: float
@@ -2,7 +2,7 @@
 
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SignalOutcome(BaseModel):
@@ -15,9 +15,11 @@ class SignalOutcome(BaseModel):
     future_date: Optional[str] = None
     future_price: Optional[float] = None
     actual_change_pct: Optional[float] = None
-    max_change_pct: Optional[float] = None  # Max favourable % move during the window
+    max_change_pct: Optional[float] = None  # Max favourable % move during the window (MFE)
     hit: Optional[bool] = None
     anytime_hit: Optional[bool] = None
+    days_to_hit: Optional[int] = None  # Bars until the threshold was first touched; None if never
+    mae_pct: Optional[float] = None  # Max adverse % move during the window (lowest low for ABOVE)
 
 
 class Signal(BaseModel):
@@ -29,6 +31,67 @@ class Signal(BaseModel):
     outcomes: list[SignalOutcome]
 
 
+class Histogram(BaseModel):
+    """Pre-binned distribution: ``len(edges) == len(counts) + 1``."""
+
+    method: str
+    edges: list[float] = Field(default_factory=list)
+    counts: list[int] = Field(default_factory=list)
+
+
+class QuantileSketchData(BaseModel):
+    """Serialized relative-error quantile sketch (see ``app.core.sketch``)."""
+
+    relative_accuracy: float
+    count: int = 0
+    zero_count: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    positive: dict[int, int] = Field(default_factory=dict)
+    negative: dict[int, int] = Field(default_factory=dict)
+
+
+class ThresholdCurve(BaseModel):
+    """Hit rate (%) at each threshold magnitude, for both directions, final and anytime."""
+
+    thresholds: list[float] = Field(default_factory=list)
+    above_final_pct: list[float] = Field(default_factory=list)
+    above_anytime_pct: list[float] = Field(default_factory=list)
+    below_final_pct: list[float] = Field(default_factory=list)
+    below_anytime_pct: list[float] = Field(default_factory=list)
+
+
+class TargetBaseline(BaseModel):
+    """Unconditional ("all days") stats for a target over every bar of the dataset."""
+
+    total_bars: int
+    hit_rate_pct: float = 0.0
+    anytime_hit_rate_pct: float = 0.0
+    avg_change_pct: float = 0.0
+    median_change_pct: float = 0.0
+    std_dev: float = 0.0
+    percentile_5: float = 0.0
+    percentile_25: float = 0.0
+    percentile_75: float = 0.0
+    percentile_95: float = 0.0
+
+
+class TargetSignificance(BaseModel):
+    """Target stats compared against random entry dates (Monte Carlo resampling)."""
+
+    resamples: int
+    sample_size: int
+    eligible_bars: int
+    random_hit_rate_pct: float
+    random_hit_rate_ci_low_pct: float
+    random_hit_rate_ci_high_pct: float
+    hit_rate_p_value: float
+    random_avg_change_pct: float
+    random_avg_change_ci_low_pct: float
+    random_avg_change_ci_high_pct: float
+    avg_change_p_value: float
+
+
 class TargetStats(BaseModel):
     """Aggregate statistics for a single target across all signals."""
 
@@ -51,7 +114,123 @@ class TargetStats(BaseModel):
     percentile_25: float
     percentile_75: float
     percentile_95: float
-    distribution: list[float]
+    avg_days_to_hit: Optional[float] = None
+    median_days_to_hit: Optional[float] = None
+    avg_mfe_pct: Optional[float] = None
+    median_mfe_pct: Optional[float] = None
+    avg_mae_pct: Optional[float] = None
+    median_mae_pct: Optional[float] = None
+    worst_mae_pct: Optional[float] = None
+    histogram: Optional[Histogram] = None
+    threshold_curve: Optional[ThresholdCurve] = None
+    sketch: Optional[QuantileSketchData] = None
+    # Raw changes are only included when settings.include_raw_distribution is on;
+    # fetch them on demand from /api/analysis/{id}/distribution?raw=true.
+    distribution: list[float] = Field(default_factory=list)
+    baseline: Optional[TargetBaseline] = None
+    significance: Optional[TargetSignificance] = None
+
+
+class HorizonCurve(BaseModel):
+    """Forward-change statistics of the signal set at every horizon 1..N (index i is horizon i + 1)."""
+
+    horizons: list[int]
+    threshold_pct: float
+    count: list[int]
+    mean_pct: list[Optional[float]]
+    median_pct: list[Optional[float]]
+    hit_rate_pct: list[Optional[float]]  # % of signals with change >= threshold_pct
+    percentile_5: list[Optional[float]]
+    percentile_25: list[Optional[float]]
+    percentile_75: list[Optional[float]]
+    percentile_95: list[Optional[float]]
+
+
+class EventStudy(BaseModel):
+    """
+    Average close path around the signals, relative to the signal close, at
+    t = -lookback..horizon bars (index i is t = offsets[i]; t = 0 is the signal bar).
+    """
+
+    offsets: list[int]
+    count: list[int]
+    mean_pct: list[Optional[float]]
+    median_pct: list[Optional[float]]
+    # 95% confidence band of the mean path (normal approximation)
+    mean_ci_low_pct: list[Optional[float]]
+    mean_ci_high_pct: list[Optional[float]]
+    percentile_5: list[Optional[float]]
+    percentile_25: list[Optional[float]]
+    percentile_75: list[Optional[float]]
+    percentile_95: list[Optional[float]]
+
+
+class RegimeBucket(BaseModel):
+    """Target stats of the signals whose breakdown indicator fell in [lower, upper)."""
+
+    label: str
+    lower: Optional[float] = None  # None = unbounded
+    upper: Optional[float] = None
+    signal_count: int
+    target_stats: list[TargetStats]
+
+
+class RegimeBreakdown(BaseModel):
+    """Target stats split by a secondary indicator's value at each signal."""
+
+    column: str
+    edges: list[float]
+    buckets: list[RegimeBucket]
+    unassigned_signals: int = 0  # indicator undefined (warm-up) at the signal bar
+
+
+class RunMetadata(BaseModel):
+    """Structured timing and counters captured during a single analysis run."""
+
+    stage_durations_ms: dict[str, float] = Field(default_factory=dict)
+    total_duration_ms: float = 0.0
+    bars: int = 0
+    signals: int = 0
+    indicators_computed: int = 0
+    indicators_extended: int = 0  # Carried forward from a snapshot over newly appended bars only
+    cache_hits: int = 0
+    mask_cache_hits: int = 0
+    data_source_latency_ms: Optional[float] = None
+
+
+class CalendarBucket(BaseModel):
+    """Hit counts for one calendar group (e.g. year "2024", month "2024-03", weekday "Mon")."""
+
+    label: str
+    count: int
+    hits: int
+    anytime_hits: int
+    hit_rate_pct: float
+    anytime_hit_rate_pct: float
+    avg_change_pct: float
+
+
+class SignalSeries(BaseModel):
+    """Per-signal outcome columns for one target, for time-resolution charts."""
+
+    dates: list[str] = Field(default_factory=list)
+    prices: list[float] = Field(default_factory=list)
+    actual_change_pct: list[Optional[float]] = Field(default_factory=list)
+    max_change_pct: list[Optional[float]] = Field(default_factory=list)
+    hit: list[Optional[bool]] = Field(default_factory=list)
+
+
+class TargetCalendarStats(BaseModel):
+    """Grouped stats per calendar resolution for one target; evaluable signals only."""
+
+    target_id: str
+    days_forward: int
+    by_year: list[CalendarBucket]
+    by_quarter: list[CalendarBucket]
+    by_month: list[CalendarBucket]
+    by_weekday: list[CalendarBucket]
+    # Per-signal columns, only when the calendar endpoint is asked for them
+    series: Optional[SignalSeries] = None
 
 
 class AnalysisResult(BaseModel):
@@ -67,3 +246,34 @@ class AnalysisResult(BaseModel):
     total_signals: int
     target_stats: list[TargetStats]
     signals: list[Signal]
+    horizon_curve: Optional[HorizonCurve] = None
+    event_study: Optional[EventStudy] = None
+    breakdown: Optional[RegimeBreakdown] = None
+    calendar: list[TargetCalendarStats] = Field(default_factory=list)
+    metadata: Optional[RunMetadata] = None
+    # Set for streamed runs: signals are stored in chunks under this id, not in the result row
+    signal_store: Optional[str] = None
+
+
+class DistributionResponse(BaseModel):
+    """A target's change distribution re-binned on request, optionally with raw values."""
+
+    target_id: str
+    total: int
+    histogram: Histogram
+    values: Optional[list[float]] = None
+
+
+class SignalPreview(BaseModel):
+    """Quick signal count and density for an unsaved scenario."""
+
+    total_bars: int
+    total_signals: int
+    first_signal_date: Optional[str] = None
+    last_signal_date: Optional[str] = None
+    # Signal counts in equal-width bins of bars from sparkline_start to sparkline_end
+    sparkline: list[int] = Field(default_factory=list)
+    sparkline_start: Optional[str] = None
+    sparkline_end: Optional[str] = None
+    elapsed_ms: float = 0.0
+    timed_out: bool = False  # Over preview_budget_ms; no count, dates or sparkline
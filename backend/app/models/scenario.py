@@ -1,10 +1,10 @@
 """Pydantic models for scenario configuration."""
 
 from enum import Enum
-from typing import Optional
+from typing import Optional, Union
 from uuid import uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class Indicator(str, Enum):
@@ -55,6 +55,7 @@ class DataSource(str, Enum):
     CSV = "CSV"
     YAHOO = "YAHOO"
     NORGATE = "NORGATE"
+    FIXTURE = "FIXTURE"  # Offline <TICKER>.csv files in FIXTURE_DATA_DIR
 
 
 class Timeframe(str, Enum):
@@ -64,6 +65,13 @@ class Timeframe(str, Enum):
     # INTRADAY = "INTRADAY"   # Future
 
 
+class ConditionTimeframe(str, Enum):
+    """Higher timeframe a condition's indicators are computed on."""
+
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+
+
 class ConditionConfig(BaseModel):
     """A single condition comparing an indicator to a value/price/indicator."""
 
@@ -76,6 +84,34 @@ class ConditionConfig(BaseModel):
     compare_indicator: Optional[Indicator] = None
     compare_indicator_params: Optional[dict] = None
     connector: Connector = Connector.AND
+    # Compute this condition's indicators on weekly/monthly bars (None = the scenario's bars).
+    # PRICE sides always read the base bar's close.
+    timeframe: Optional[ConditionTimeframe] = None
+
+
+class ConditionGroup(BaseModel):
+    """
+    A boolean node of the condition expression tree.
+
+    Children are condition IDs (leaves, referring to ``ScenarioCreate.conditions``)
+    or nested groups, e.g. ``(A AND B) OR (C AND D)``:
+        {"operator": "OR", "children": [
+            {"operator": "AND", "children": ["A", "B"]},
+            {"operator": "AND", "children": ["C", "D"]}]}
+    """
+
+    operator: Connector = Connector.AND
+    children: list[Union[str, "ConditionGroup"]] = Field(min_length=1)
+
+    def condition_ids(self) -> list[str]:
+        """All leaf condition IDs in the subtree, in order of appearance."""
+        ids: list[str] = []
+        for child in self.children:
+            if isinstance(child, str):
+                ids.append(child)
+            else:
+                ids.extend(child.condition_ids())
+        return ids
 
 
 class TargetConfig(BaseModel):
@@ -87,6 +123,42 @@ class TargetConfig(BaseModel):
     direction: Direction
 
 
+class BreakdownConfig(BaseModel):
+    """
+    Split target stats by the regime a secondary indicator is in at each signal,
+    e.g. ADX(14) at ``edges=[25]`` or volatility terciles with ``quantiles=3``.
+    """
+
+    indicator: Indicator
+    params: dict = Field(default_factory=dict)
+    timeframe: Optional[ConditionTimeframe] = None
+    # Ascending bucket boundaries; bucket i holds edges[i-1] <= value < edges[i]
+    edges: Optional[list[float]] = Field(None, min_length=1)
+    # Or: this many equal-population buckets of the indicator over every scanned bar
+    quantiles: Optional[int] = Field(None, ge=2, le=10)
+
+    @model_validator(mode="after")
+    def _check_buckets(self) -> "BreakdownConfig":
+        if (self.edges is None) == (self.quantiles is None):
+            raise ValueError("Set exactly one of 'edges' or 'quantiles'")
+        if self.edges is not None and any(b <= a for a, b in zip(self.edges, self.edges[1:])):
+            raise ValueError("'edges' must be strictly ascending")
+        return self
+
+
+class AnalysisOptions(BaseModel):
+    """Optional extra analyses run alongside the targets. All off by default."""
+
+    # Horizon curve: stats of the forward change at every horizon 1..N bars
+    horizon_curve_max: Optional[int] = Field(None, ge=1, le=504)
+    horizon_curve_threshold_pct: float = 0.0
+    # Event study: mean/median close path from t = -lookback to t = horizon bars around each signal
+    event_study_horizon: Optional[int] = Field(None, ge=1, le=504)
+    event_study_lookback: int = Field(0, ge=0, le=252)
+    # Regime breakdown: per-bucket target stats by a secondary indicator
+    breakdown: Optional[BreakdownConfig] = None
+
+
 class ScenarioCreate(BaseModel):
     """Payload for creating a new scenario."""
 
@@ -99,7 +171,58 @@ class ScenarioCreate(BaseModel):
     date_range_start: Optional[str] = None
     date_range_end: Optional[str] = None
     conditions: list[ConditionConfig] = Field(min_length=1)
+    # Optional nested grouping. When None, the flat AND/OR connectors are used.
+    condition_tree: Optional[ConditionGroup] = None
     targets: list[TargetConfig] = Field(min_length=1)
+    analysis: AnalysisOptions = Field(default_factory=AnalysisOptions)
+
+    @model_validator(mode="after")
+    def _check_condition_tree(self) -> "ScenarioCreate":
+        _check_condition_tree(self.conditions, self.condition_tree)
+        return self
+
+
+def _check_condition_tree(conditions: list[ConditionConfig], tree: Optional[ConditionGroup]) -> None:
+    if tree is None:
+        return
+    referenced = set(tree.condition_ids())
+    defined = {c.id for c in conditions}
+    unknown = referenced - defined
+    if unknown:
+        raise ValueError(f"condition_tree references unknown condition ids: {sorted(unknown)}")
+    unused = defined - referenced
+    if unused:
+        raise ValueError(f"condition_tree does not reference conditions: {sorted(unused)}")
+
+
+class ScenarioPreview(BaseModel):
+    """
+    The parts of an unsaved scenario that decide where signals fire.
+
+    A full ``ScenarioCreate`` payload is accepted as is; name, targets and
+    other fields are ignored, so the editor can preview before they are filled in.
+    """
+
+    underlying: str = Field(min_length=1, max_length=20)
+    data_source: DataSource = DataSource.YAHOO
+    csv_path: Optional[str] = None
+    timeframe: Timeframe = Timeframe.DAILY
+    date_range_start: Optional[str] = None
+    date_range_end: Optional[str] = None
+    conditions: list[ConditionConfig] = Field(min_length=1)
+    condition_tree: Optional[ConditionGroup] = None
+
+    @model_validator(mode="after")
+    def _check_condition_tree(self) -> "ScenarioPreview":
+        _check_condition_tree(self.conditions, self.condition_tree)
+        return self
+
+
+class PreviewRequest(BaseModel):
+    """Preview payload. Requests sharing a ``session_id`` supersede each other."""
+
+    session_id: Optional[str] = Field(None, max_length=100)
+    scenario: ScenarioPreview
 
 
 class ScenarioUpdate(ScenarioCreate):
@@ -130,3 +253,29 @@ class ScenarioSummary(BaseModel):
     last_run_total_signals: Optional[int] = None
     created_at: str
     updated_at: str
+
+
+class ImportMode(str, Enum):
+    KEEP = "keep"        # keep IDs from the file; IDs that already exist are reported as errors
+    REPLACE = "replace"  # keep IDs; overwrite existing scenarios (their stale results are dropped)
+    NEW = "new"          # assign fresh IDs, e.g. to duplicate a library
+
+
+class ScenarioImportItem(BaseModel):
+    """Outcome of one line of a bulk import."""
+
+    line: int
+    ok: bool
+    scenario_id: Optional[str] = None
+    name: Optional[str] = None
+    result_imported: bool = False
+    error: Optional[str] = None
+
+
+class ScenarioImportResponse(BaseModel):
+    """Summary of a bulk import; every input line has an item."""
+
+    imported: int
+    results_imported: int
+    failed: int
+    items: list[ScenarioImportItem]
@@ -0,0 +1,221 @@
+"""
+Benchmark runner for the analysis pipeline and main API endpoints.
+
+Usage (from backend/):
+    python -m benchmarks.runner                       # 10k + 100k, compare to baseline
+    python -m benchmarks.runner --sizes 10k,100k,1m   # include the 1M-bar dataset
+    python -m benchmarks.runner --update-baseline     # record new baseline numbers
+    python -m benchmarks.runner --threshold 0.5       # allow 50% slowdown per stage
+
+Pipeline stages are timed twice per repeat: ``cold`` right after the shared
+caches were cleared (dataset load and every indicator computed), then ``warm``
+on the caches the cold run filled, as a repeated run in the app would be.
+
+Exits with status 1 when any timed stage is slower than its baseline by more
+than the threshold (relative) AND the minimum delta (absolute, to ignore noise
+on stages that take a few milliseconds).
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from app.core.cache import clear_caches
+from app.core.engine import run_analysis
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.synthetic import SIZES, generate_ohlcv, write_csv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = float(os.environ.get("RETROCAST_BENCH_THRESHOLD", "0.25"))
+DEFAULT_MIN_DELTA_MS = float(os.environ.get("RETROCAST_BENCH_MIN_DELTA_MS", "5"))
+
+
+@dataclass
+class Regression:
+    """A benchmark key that got slower than its baseline allows."""
+
+    key: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s > 0 else float("inf")
+
+
+def run_pipeline_benchmarks(
+    csv_path: str, size: str, scenario_names: list[str], repeat: int
+) -> dict[str, float]:
+    """Time each run_analysis stage, cold and warm, for every scenario. Keeps the best of N runs."""
+    timings: dict[str, float] = {}
+    for name in scenario_names:
+        scenario = SCENARIOS[name](csv_path)
+        best: dict[str, float] = {}
+        for _ in range(repeat):
+            clear_caches()
+            for cache_state in ("cold", "warm"):
+                t0 = time.perf_counter()
+                result = run_analysis(scenario)
+                stages = {stage: ms / 1000 for stage, ms in result.metadata.stage_durations_ms.items()}
+                stages["total"] = time.perf_counter() - t0
+                for stage, elapsed in stages.items():
+                    key = f"{size}/{name}/{cache_state}/{stage}"
+                    best[key] = min(best.get(key, float("inf")), elapsed)
+        timings.update(best)
+    return timings
+
+
+def run_api_benchmarks(csv_path: str, size: str, repeat: int) -> dict[str, float]:
+    """Time the main API endpoints through FastAPI's TestClient on a throwaway DB."""
+    from fastapi.testclient import TestClient
+
+    from app.db.database import _get_db_path, init_database, set_db_path
+    from app.main import app
+
+    previous_db = _get_db_path()
+    with tempfile.TemporaryDirectory() as tmp:
+        set_db_path(os.path.join(tmp, "bench.db"))
+        init_database()
+        try:
+            client = TestClient(app)
+            scenario = SCENARIOS["single"](csv_path)
+            payload = scenario.model_dump(exclude={"id", "created_at", "updated_at"})
+
+            calls: dict[str, Callable[[], object]] = {}
+            created = client.post("/api/scenarios", json=payload).json()
+            scenario_id = created["id"]
+            calls["create_scenario"] = lambda: client.post("/api/scenarios", json=payload)
+            calls["list_scenarios"] = lambda: client.get("/api/scenarios")
+            calls["run"] = lambda: client.post(f"/api/analysis/{scenario_id}/run")  # warm after the first
+            calls["last_result"] = lambda: client.get(f"/api/analysis/{scenario_id}/last")
+            calls["ohlcv"] = lambda: client.get(
+                "/api/data/ohlcv", params={"ticker": "SYNTH", "source": "CSV", "csv_path": csv_path}
+            )
+            calls["export_csv"] = lambda: client.get(f"/api/export/{scenario_id}/csv")
+
+            # Timed after clearing the shared caches every time
+            cold = {
+                "run_cold": calls["run"],
+                "ohlcv_cold": calls["ohlcv"],
+            }
+
+            timings: dict[str, float] = {}
+            for name, call in {**calls, **cold}.items():
+                best = float("inf")
+                for _ in range(repeat):
+                    if name in cold:
+                        clear_caches()
+                    t0 = time.perf_counter()
+                    response = call()
+                    best = min(best, time.perf_counter() - t0)
+                    if response.status_code >= 400:
+                        raise RuntimeError(f"{name} returned {response.status_code}: {response.text}")
+                timings[f"{size}/api/{name}"] = best
+            return timings
+        finally:
+            set_db_path(previous_db)
+
+
+def compare_to_baseline(
+    current: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[Regression]:
+    """Return every key whose timing regressed beyond the allowed threshold."""
+    regressions: list[Regression] = []
+    for key, current_s in sorted(current.items()):
+        baseline_s = baseline.get(key)
+        if baseline_s is None:
+            continue
+        too_slow = current_s > baseline_s * (1 + threshold)
+        significant = (current_s - baseline_s) * 1000 > min_delta_ms
+        if too_slow and significant:
+            regressions.append(Regression(key=key, baseline_s=baseline_s, current_s=current_s))
+    return regressions
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    """Read baseline timings, or an empty dict if none were recorded yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["timings"]
+
+
+def save_baseline(path: str, timings: dict[str, float], merge_into: dict[str, float]) -> None:
+    """Write baseline timings, keeping keys from sizes that were not re-run."""
+    merged = {**merge_into, **{k: round(v, 6) for k, v in timings.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"timings": dict(sorted(merged.items()))}, f, indent=2)
+        f.write("\n")
+    logger.info("Baseline written to %s (%d keys)", path, len(merged))
+
+
+def _report(current: dict[str, float], baseline: dict[str, float]) -> None:
+    for key, current_s in sorted(current.items()):
+        baseline_s = baseline.get(key)
+        if baseline_s:
+            logger.info("%-40s %9.2f ms  (baseline %9.2f ms, x%.2f)",
+                        key, current_s * 1000, baseline_s * 1000, current_s / baseline_s)
+        else:
+            logger.info("%-40s %9.2f ms  (no baseline)", key, current_s * 1000)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Retrocast performance benchmarks")
+    parser.add_argument("--sizes", default="10k,100k", help=f"Comma-separated from {list(SIZES)}")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown per stage, e.g. 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--skip-api", action="store_true", help="Only benchmark the pipeline stages")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The engine and TestClient log every stage/request at INFO; keep the report readable.
+    logging.getLogger("app").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    scenario_names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES] + [s for s in scenario_names if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown sizes/scenarios: {unknown}")
+
+    current: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            csv_path = write_csv(generate_ohlcv(SIZES[size]), os.path.join(tmp, f"synthetic_{size}.csv"))
+            current.update(run_pipeline_benchmarks(csv_path, size, scenario_names, args.repeat))
+            if not args.skip_api:
+                current.update(run_api_benchmarks(csv_path, size, args.repeat))
+
+    baseline = load_baseline(args.baseline)
+    _report(current, baseline)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, current, baseline)
+        return 0
+
+    regressions = compare_to_baseline(current, baseline, args.threshold, args.min_delta_ms)
+    for r in regressions:
+        logger.error("REGRESSION %s: %.2f ms -> %.2f ms (x%.2f)",
+                     r.key, r.baseline_s * 1000, r.current_s * 1000, r.ratio)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Representative scenarios used by the benchmark suite."""
+
+from app.models.scenario import (
+    AnalysisOptions,
+    BreakdownConfig,
+    CompareTo,
+    ConditionConfig,
+    Connector,
+    DataSource,
+    Direction,
+    Indicator,
+    Operator,
+    ScenarioInDB,
+    TargetConfig,
+    Timeframe,
+)
+
+
+def _scenario(name: str, csv_path: str, conditions: list[ConditionConfig],
+              targets: list[TargetConfig]) -> ScenarioInDB:
+    return ScenarioInDB(
+        id=f"bench-{name}",
+        name=f"Benchmark {name}",
+        underlying="SYNTH",
+        data_source=DataSource.CSV,
+        csv_path=csv_path,
+        timeframe=Timeframe.DAILY,
+        conditions=conditions,
+        targets=targets,
+        created_at="",
+        updated_at="",
+    )
+
+
+def _default_targets() -> list[TargetConfig]:
+    return [
+        TargetConfig(id="t5", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE),
+        TargetConfig(id="t20", days_forward=20, threshold_pct=3.0, direction=Direction.BELOW),
+    ]
+
+
+def single_condition(csv_path: str) -> ScenarioInDB:
+    """RSI(14) below 30 — one cheap condition, moderate signal count."""
+    return _scenario(
+        "single",
+        csv_path,
+        [ConditionConfig(
+            indicator=Indicator.RSI, params={"period": 14},
+            operator=Operator.BELOW, compare_to=CompareTo.VALUE, compare_value=30.0,
+        )],
+        _default_targets(),
+    )
+
+
+def crosses(csv_path: str) -> ScenarioInDB:
+    """Golden cross: SMA(50) crosses above SMA(200) — previous-bar lookups."""
+    return _scenario(
+        "crosses",
+        csv_path,
+        [ConditionConfig(
+            indicator=Indicator.SMA, params={"period": 50},
+            operator=Operator.CROSSES_ABOVE, compare_to=CompareTo.INDICATOR,
+            compare_indicator=Indicator.SMA, compare_indicator_params={"period": 200},
+        )],
+        _default_targets(),
+    )
+
+
+def many_or_groups(csv_path: str) -> ScenarioInDB:
+    """Six OR-ed AND-pairs over different indicators, including ADX."""
+    conditions: list[ConditionConfig] = []
+    specs = [
+        (Indicator.RSI, {"period": 14}, Operator.BELOW, 35.0),
+        (Indicator.ADX, {"period": 14}, Operator.ABOVE, 25.0),
+        (Indicator.PRICE_CHANGE, {"period": 5}, Operator.BELOW, -4.0),
+        (Indicator.VOLUME_RATIO, {"period": 20}, Operator.ABOVE, 1.5),
+        (Indicator.STOCH_K, {"k": 14, "d": 3}, Operator.BELOW, 10.0),
+        (Indicator.MACD_HIST, {"fast": 12, "slow": 26, "signal": 9}, Operator.CROSSES_ABOVE, 0.0),
+    ]
+    for i, (indicator, params, operator, value) in enumerate(specs):
+        conditions.append(ConditionConfig(
+            indicator=indicator, params=params, operator=operator,
+            compare_to=CompareTo.VALUE, compare_value=value, connector=Connector.AND,
+        ))
+        conditions.append(ConditionConfig(
+            indicator=Indicator.PRICE, operator=Operator.ABOVE,
+            compare_to=CompareTo.INDICATOR, compare_indicator=Indicator.SMA,
+            compare_indicator_params={"period": 20 * (i + 1)},
+            connector=Connector.OR if i < len(specs) - 1 else Connector.AND,
+        ))
+    return _scenario("many_or", csv_path, conditions, _default_targets())
+
+
+def many_targets(csv_path: str) -> ScenarioInDB:
+    """One condition evaluated against twelve targets across horizons."""
+    targets = [
+        TargetConfig(id=f"t{days}_{direction.value}", days_forward=days,
+                     threshold_pct=threshold, direction=direction)
+        for days, threshold in [(1, 0.5), (5, 1.0), (10, 2.0), (20, 3.0), (60, 5.0), (120, 8.0)]
+        for direction in (Direction.ABOVE, Direction.BELOW)
+    ]
+    return _scenario(
+        "many_targets",
+        csv_path,
+        [ConditionConfig(
+            indicator=Indicator.PRICE_CHANGE, params={"period": 1},
+            operator=Operator.ABOVE, compare_to=CompareTo.VALUE, compare_value=1.0,
+        )],
+        targets,
+    )
+
+
+def extras(csv_path: str) -> ScenarioInDB:
+    """The single-condition scenario with the horizon curve, event study and an ADX regime breakdown."""
+    scenario = single_condition(csv_path)
+    analysis = AnalysisOptions(
+        horizon_curve_max=252,
+        event_study_horizon=60,
+        event_study_lookback=20,
+        breakdown=BreakdownConfig(indicator=Indicator.ADX, params={"period": 14}, edges=[20.0, 40.0]),
+    )
+    return scenario.model_copy(update={"id": "bench-extras", "name": "Benchmark extras", "analysis": analysis})
+
+
+SCENARIOS = {
+    "single": single_condition,
+    "crosses": crosses,
+    "many_or": many_or_groups,
+    "many_targets": many_targets,
+    "extras": extras,
+}
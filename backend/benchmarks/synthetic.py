@@ -0,0 +1,63 @@
+"""Synthetic OHLCV generator for performance benchmarks."""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Named sizes accepted by the benchmark runner
+SIZES: dict[str, int] = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# Business days fit into pandas' nanosecond Timestamp range up to roughly this
+# many bars (starting 1700-01-01); longer series fall back to hourly bars.
+_MAX_DAILY_BARS = 140_000
+
+
+def generate_ohlcv(n_bars: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate a deterministic random-walk OHLCV DataFrame.
+
+    Returns lowercase columns open, high, low, close, volume and a
+    DatetimeIndex named 'date', matching the shape produced by load_data().
+    """
+    rng = np.random.default_rng(seed)
+
+    # Geometric random walk with mild drift and regime-switching volatility so
+    # that crosses, RSI extremes and ADX trends all occur at realistic rates.
+    vol = np.where(rng.random(n_bars) < 0.1, 0.025, 0.012)
+    log_returns = rng.normal(0.0003, vol)
+    close = 100.0 * np.exp(np.cumsum(log_returns))
+
+    open_ = close * (1 + rng.normal(0, 0.003, n_bars))
+    spread = np.abs(rng.normal(0, 0.008, n_bars)) * close
+    high = np.maximum(open_, close) + spread
+    low = np.minimum(open_, close) - spread
+    volume = rng.integers(500_000, 5_000_000, n_bars)
+
+    freq = "B" if n_bars <= _MAX_DAILY_BARS else "h"
+    index = pd.date_range("1700-01-01" if freq == "B" else "1900-01-01", periods=n_bars, freq=freq)
+    index.name = "date"
+
+    return pd.DataFrame(
+        {
+            "open": open_.round(4),
+            "high": high.round(4),
+            "low": low.round(4),
+            "close": close.round(4),
+            "volume": volume,
+        },
+        index=index,
+    )
+
+
+def write_csv(df: pd.DataFrame, path: str) -> str:
+    """Write a synthetic frame as a CSV that the CSV data source can load."""
+    df.to_csv(path, index=True, index_label="date")
+    logger.info("Wrote %d synthetic bars to %s", len(df), path)
+    return path
@@ -3,6 +3,7 @@ import pytest
 import pandas as pd
 from app.db.database import set_db_path, init_database
 from app.config import settings
+from app.core.cache import dataset_cache, indicator_cache, indicator_states, mask_cache
 
 # Use a test-specific database
 TEST_DB_PATH = "./test_scenarios.db"
@@ -17,6 +18,17 @@ def setup_test_db():
     if os.path.exists(TEST_DB_PATH):
         os.remove(TEST_DB_PATH)
 
+
+@pytest.fixture(autouse=True)
+def clear_shared_caches():
+    """Start every test with cold cross-run caches so counters are deterministic."""
+    mask_cache.clear()
+    indicator_cache.clear()
+    indicator_states.clear()
+    dataset_cache.clear()
+    yield
+
+
 @pytest.fixture
 def sample_data():
     """Load the synthetic 500-day OHLCV data."""
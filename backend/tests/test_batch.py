@@ -0,0 +1,89 @@
+from fastapi.testclient import TestClient
+
+from app.core import datasets
+from app.core.cache import dataset_cache
+from app.core.batch import group_by_dataset, run_batch
+from app.core.engine import run_analysis
+from app.db import repositories as repo
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator,
+    ScenarioInDB, TargetConfig, Timeframe,
+)
+
+CSV = "tests/fixtures/sample_data.csv"
+
+
+def _scenario(sid: str, operator: Operator, value: float, start=None) -> ScenarioInDB:
+    return ScenarioInDB(
+        id=sid, name=sid, underlying="TEST", data_source=DataSource.CSV, csv_path=CSV,
+        timeframe=Timeframe.DAILY, date_range_start=start,
+        conditions=[
+            ConditionConfig(indicator=Indicator.PRICE, operator=Operator.ABOVE, compare_to=CompareTo.INDICATOR,
+                            compare_indicator=Indicator.SMA, compare_indicator_params={"period": 50}),
+            ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=operator,
+                            compare_to=CompareTo.VALUE, compare_value=value),
+        ],
+        targets=[TargetConfig(id="t", days_forward=10, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_batch_loads_each_dataset_once_and_matches_single_runs(monkeypatch):
+    scenarios = [
+        _scenario("a", Operator.ABOVE, 50.0),
+        _scenario("b", Operator.BELOW, 70.0),
+        _scenario("c", Operator.ABOVE, 40.0, start="2020-03-01"),
+    ]
+    assert len(group_by_dataset(scenarios)) == 2
+
+    expected = {s.id: run_analysis(s).model_dump(exclude={"run_date", "metadata"}) for s in scenarios}
+    dataset_cache.clear()
+
+    calls = []
+    original = datasets.load_many
+    monkeypatch.setattr(
+        datasets, "load_many", lambda source, requests: calls.extend(requests) or original(source, requests)
+    )
+    results, items = run_batch(scenarios)
+
+    assert len(calls) == 2
+    assert all(item.ok for item in items)
+    for result in results:
+        assert result.model_dump(exclude={"run_date", "metadata"}) == expected[result.scenario_id]
+    # Second scenario on the shared frame reuses SMA_50 computed by the first
+    second = next(r for r in results if r.scenario_id == "b")
+    assert second.metadata.indicators_computed == 0
+
+
+def test_batch_reports_per_scenario_errors():
+    bad = _scenario("bad", Operator.ABOVE, 50.0)
+    bad.csv_path = "tests/fixtures/does_not_exist.csv"
+    with_error = _scenario("short", Operator.ABOVE, 50.0, start="2021-06-01")
+    results, items = run_batch([bad, with_error, _scenario("ok", Operator.ABOVE, 50.0)])
+    by_id = {item.scenario_id: item for item in items}
+    assert not by_id["short"].ok and "Not enough data" in by_id["short"].error
+    assert by_id["ok"].ok
+    assert [r.scenario_id for r in results] == ["ok"]
+
+
+def test_batch_endpoint_saves_results():
+    client = TestClient(app)
+    payload = _scenario("x", Operator.ABOVE, 50.0).model_dump(exclude={"id", "created_at", "updated_at"})
+    ids = [client.post("/api/scenarios", json=payload).json()["id"] for _ in range(2)]
+
+    response = client.post("/api/analysis/batch", json={"scenario_ids": ids + ["missing"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["datasets_loaded"] == 1
+    assert [i["ok"] for i in body["items"]] == [True, True, False]
+    for sid in ids:
+        assert client.get(f"/api/analysis/{sid}/last").json()["scenario_id"] == sid
+
+
+def test_get_scenarios_chunks_long_id_lists():
+    client = TestClient(app)
+    payload = _scenario("x", Operator.ABOVE, 50.0).model_dump(exclude={"id", "created_at", "updated_at"})
+    ids = [client.post("/api/scenarios", json=payload).json()["id"] for _ in range(3)]
+    requested = [f"missing-{i}" for i in range(2 * repo._MAX_SQL_PARAMS)] + ids[::-1]
+    assert [s.id for s in repo.get_scenarios(requested)] == ids[::-1]
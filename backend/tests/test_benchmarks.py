@@ -0,0 +1,42 @@
+import os
+
+from benchmarks.runner import compare_to_baseline, run_pipeline_benchmarks
+from benchmarks.synthetic import generate_ohlcv, write_csv
+
+
+def test_generate_ohlcv_is_deterministic_and_valid():
+    df1 = generate_ohlcv(1000, seed=7)
+    df2 = generate_ohlcv(1000, seed=7)
+    assert df1.equals(df2)
+    assert list(df1.columns) == ["open", "high", "low", "close", "volume"]
+    assert df1.index.is_monotonic_increasing
+    assert (df1["high"] >= df1[["open", "close"]].max(axis=1)).all()
+    assert (df1["low"] <= df1[["open", "close"]].min(axis=1)).all()
+
+
+def test_generate_ohlcv_large_sizes_fit_timestamp_range():
+    df = generate_ohlcv(200_000)
+    assert len(df) == 200_000
+    assert df.index[-1].year < 2262
+
+
+def test_compare_to_baseline_flags_only_significant_regressions():
+    baseline = {"a": 0.100, "b": 0.001, "c": 0.100}
+    current = {"a": 0.200, "b": 0.004, "c": 0.110, "new": 1.0}
+    regressions = compare_to_baseline(current, baseline, threshold=0.25, min_delta_ms=5)
+    # b is 4x slower but only 3ms, c is within 25%, "new" has no baseline
+    assert [r.key for r in regressions] == ["a"]
+    assert regressions[0].ratio == 2.0
+
+
+def test_pipeline_benchmark_times_every_stage(tmp_path):
+    csv_path = write_csv(generate_ohlcv(600), os.path.join(tmp_path, "bench.csv"))
+    timings = run_pipeline_benchmarks(csv_path, "600", ["single", "extras"], repeat=1)
+    for cache_state in ("cold", "warm"):
+        for stage in ("load", "signals", "targets", "stats", "significance", "calendar", "total"):
+            assert timings[f"600/single/{cache_state}/{stage}"] >= 0
+        for stage in ("horizons", "breakdown", "event_study"):
+            assert timings[f"600/extras/{cache_state}/{stage}"] >= 0
+    # Only the cold run computes indicators; the warm one finds them cached
+    assert timings["600/single/cold/indicators"] > 0
+    assert "600/single/warm/indicators" not in timings
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.core.datasets import load_scenario_data
+from app.core.engine import run_analysis, run_analysis_streaming
+from app.core.indicators import compute_indicator
+from app.models.scenario import (
+    AnalysisOptions, BreakdownConfig, CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator,
+    ScenarioInDB, TargetConfig, Timeframe,
+)
+
+STAT_FIELDS = (
+    "total_evaluable", "hit_count", "anytime_hit_count", "hit_rate_pct", "avg_change_pct", "median_change_pct",
+    "max_change_pct", "min_change_pct", "percentile_25", "percentile_75", "avg_days_to_hit", "avg_mae_pct",
+)
+
+
+def _scenario(breakdown: BreakdownConfig) -> ScenarioInDB:
+    return ScenarioInDB(
+        id="regime", name="Regime", underlying="TEST", data_source=DataSource.CSV,
+        csv_path="tests/fixtures/sample_data.csv", timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=50.0)],
+        targets=[TargetConfig(id="up", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE),
+                 TargetConfig(id="down", days_forward=20, threshold_pct=2.0, direction=Direction.BELOW)],
+        analysis=AnalysisOptions(breakdown=breakdown),
+        created_at="", updated_at="",
+    )
+
+
+def test_buckets_match_signals_split_by_indicator_value():
+    scenario = _scenario(BreakdownConfig(indicator=Indicator.ADX, params={"period": 14}, edges=[20, 30]))
+    result = run_analysis(scenario)
+    breakdown = result.breakdown
+    df = load_scenario_data(scenario)
+    adx = compute_indicator(df, "ADX", {"period": 14})
+    adx.index = df.index.strftime("%Y-%m-%d")
+    assert breakdown.column == "ADX_14"
+    assert [b.label for b in breakdown.buckets] == ["< 20", "20 – 30", "≥ 30"]
+    assert sum(b.signal_count for b in breakdown.buckets) + breakdown.unassigned_signals == result.total_signals
+
+    for bucket in breakdown.buckets:
+        lower = -np.inf if bucket.lower is None else bucket.lower
+        upper = np.inf if bucket.upper is None else bucket.upper
+        members = [s for s in result.signals if lower <= adx[s.date] < upper]
+        assert bucket.signal_count == len(members)
+        for ts in bucket.target_stats:
+            outcomes = [o for s in members for o in s.outcomes if o.target_id == ts.target_id and o.hit is not None]
+            assert ts.total_evaluable == len(outcomes)
+            assert ts.hit_count == sum(o.hit for o in outcomes)
+            if outcomes:
+                assert ts.avg_change_pct == pytest.approx(np.mean([o.actual_change_pct for o in outcomes]), abs=1e-4)
+            assert ts.histogram is None and ts.sketch is None
+
+
+def test_single_bucket_reproduces_overall_stats():
+    result = run_analysis(_scenario(BreakdownConfig(indicator=Indicator.PRICE, edges=[-1.0])))
+    empty, everything = result.breakdown.buckets
+    assert empty.signal_count == 0 and everything.signal_count == result.total_signals
+    for overall, bucket in zip(result.target_stats, everything.target_stats):
+        for field in STAT_FIELDS:
+            assert getattr(bucket, field) == pytest.approx(getattr(overall, field), abs=1e-4), field
+
+
+def test_quantile_buckets_split_the_scanned_bars_evenly():
+    result = run_analysis(_scenario(BreakdownConfig(indicator=Indicator.ATR, params={"period": 14}, quantiles=3)))
+    assert len(result.breakdown.edges) == 2
+    assert len(result.breakdown.buckets) == 3
+    assert result.breakdown.edges[0] < result.breakdown.edges[1]
+
+
+def test_streamed_runs_get_the_same_breakdown():
+    scenario = _scenario(BreakdownConfig(indicator=Indicator.ADX, params={"period": 14}, edges=[25]))
+    expected = run_analysis(scenario).breakdown
+    streamed = run_analysis_streaming(scenario, lambda chunk: None, chunk_size=10).breakdown
+    assert streamed == expected
+
+
+def test_config_needs_exactly_one_bucketing():
+    with pytest.raises(ValidationError):
+        BreakdownConfig(indicator=Indicator.ADX, params={"period": 14})
+    with pytest.raises(ValidationError):
+        BreakdownConfig(indicator=Indicator.ADX, params={"period": 14}, edges=[25], quantiles=3)
+    with pytest.raises(ValidationError):
+        BreakdownConfig(indicator=Indicator.ADX, params={"period": 14}, edges=[30, 20])
@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.builtin_providers import FixtureProvider
+from app.core.cache import (
+    LRUCache, SingleFlight, dataset_cache, dataset_fingerprint, dataset_loads, indicator_cache, indicator_states,
+    mask_cache,
+)
+from app.core.datasets import load_dataset, load_scenario_datasets
+from app.core.engine import run_analysis
+from app.core.metrics import RunTimer
+from app.core.providers import register_provider
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, Connector, DataSource, Direction, Indicator, Operator, ScenarioInDB,
+    TargetConfig, Timeframe,
+)
+from benchmarks.synthetic import generate_ohlcv, write_csv
+
+
+@pytest.fixture
+def slow_fixture(tmp_path):
+    write_csv(generate_ohlcv(300), str(tmp_path / "HOT.csv"))
+    provider = FixtureProvider(str(tmp_path), latency_s=0.2)
+    previous = register_provider(DataSource.FIXTURE, provider)
+    yield provider
+    register_provider(DataSource.FIXTURE, previous)
+
+
+def _scenario(rsi_level: float) -> ScenarioInDB:
+    return ScenarioInDB(
+        id="c", name="Cache", underlying="TEST", data_source=DataSource.CSV,
+        csv_path="tests/fixtures/sample_data.csv", timeframe=Timeframe.DAILY,
+        conditions=[
+            ConditionConfig(indicator=Indicator.PRICE, operator=Operator.ABOVE, compare_to=CompareTo.INDICATOR,
+                            compare_indicator=Indicator.SMA, compare_indicator_params={"period": 50}),
+            ConditionConfig(indicator=Indicator.ADX, params={"period": 14}, operator=Operator.ABOVE,
+                            compare_to=CompareTo.VALUE, compare_value=15.0, connector=Connector.AND),
+            ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                            compare_to=CompareTo.VALUE, compare_value=rsi_level, connector=Connector.AND),
+        ],
+        targets=[TargetConfig(days_forward=10, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_lru_evicts_oldest_entries_beyond_byte_budget():
+    cache = LRUCache("test", max_bytes=100)
+    cache.put("a", 1, 40)
+    cache.put("b", 2, 40)
+    assert cache.get("a") == 1  # "a" is now most recent
+    cache.put("c", 3, 40)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.current_bytes == 80
+    cache.put("huge", 4, 1000)
+    assert "huge" not in cache
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get("b") is None and cache.misses == 1
+    assert cache.peek("a") == 1 and cache.peek("b") is None and cache.misses == 1
+    assert cache.stats() == {
+        "name": "test", "entries": 2, "bytes": 80, "max_bytes": 100, "hits": 1, "misses": 1, "hit_rate": 0.5,
+    }
+
+
+def test_concurrent_identical_loads_share_one_fetch(slow_fixture):
+    coalesced = dataset_loads.coalesced
+    barrier = threading.Barrier(6)
+
+    def load(_):
+        barrier.wait()
+        return load_dataset("HOT", DataSource.FIXTURE)
+
+    with ThreadPoolExecutor(6) as pool:
+        frames = list(pool.map(load, range(6)))
+
+    assert slow_fixture.attempts == {"HOT": 1}
+    assert dataset_loads.coalesced - coalesced == 5
+    assert all(frame.equals(frames[0]) and frame is not frames[0] for frame in frames[1:])
+    assert sorted(frame.attrs["data_source_latency_s"] > 0 for frame in frames) == [False] * 5 + [True]
+    assert dataset_cache.stats()["entries"] == 1 and dataset_loads.in_flight() == 0
+
+    load_dataset("HOT", DataSource.FIXTURE)
+    assert slow_fixture.attempts == {"HOT": 1}
+    assert dataset_cache.hits >= 1
+
+
+def test_batch_load_joins_a_load_in_flight(slow_fixture):
+    scenario = ScenarioInDB(
+        id="hot", name="Hot", underlying="HOT", data_source=DataSource.FIXTURE, timeframe=Timeframe.DAILY,
+        conditions=_scenario(50.0).conditions, targets=_scenario(50.0).targets, created_at="", updated_at="",
+    )
+    with ThreadPoolExecutor(1) as pool:
+        single = pool.submit(load_dataset, "HOT", DataSource.FIXTURE)
+        while dataset_loads.in_flight() == 0:
+            time.sleep(0.001)
+        frames = load_scenario_datasets([scenario])
+        assert len(single.result()) == 300
+    assert len(next(iter(frames.values()))) == 300
+    assert slow_fixture.attempts == {"HOT": 1}
+
+
+def test_single_flight_shares_errors_without_keeping_them():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        started.set()
+        release.wait()
+        raise ConnectionError("down")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.run, "k", failing)
+        started.wait()
+        follower = pool.submit(flight.run, "k", failing)
+        while flight.coalesced == 0:
+            time.sleep(0.001)
+        release.set()
+        for future in (leader, follower):
+            with pytest.raises(ConnectionError):
+                future.result()
+    assert len(calls) == 1
+    assert flight.run("k", lambda: 42) == (42, True)
+
+
+def test_data_routes_use_the_dataset_cache(slow_fixture):
+    client = TestClient(app)
+    params = {"ticker": "HOT", "source": "FIXTURE"}
+    assert len(client.get("/api/data/ohlcv", params=params).json()) == 300
+    client.get("/api/data/indicators", params={**params, "indicators": "SMA_20,RSI_14"})
+    assert slow_fixture.attempts == {"HOT": 1}
+
+    stats = {entry["name"]: entry for entry in client.get("/api/data/cache").json()}
+    assert stats["dataset"]["entries"] == 1
+    assert (stats["dataset"]["hits"], stats["dataset"]["misses"]) == (1, 1)
+    assert {"coalesced_loads", "loads_in_flight", "bytes", "max_bytes"} <= set(stats["dataset"])
+
+
+def test_fingerprint_tracks_content_not_object(sample_data):
+    copy = sample_data.copy()
+    assert dataset_fingerprint(copy) == dataset_fingerprint(sample_data)
+    copy["RSI_14"] = 1.0  # indicator columns are not part of the dataset identity
+    assert dataset_fingerprint(copy) == dataset_fingerprint(sample_data)
+    changed = sample_data.copy()
+    changed.iloc[-1, changed.columns.get_loc("close")] += 1
+    assert dataset_fingerprint(changed) != dataset_fingerprint(sample_data)
+
+
+def test_rerun_after_edit_only_evaluates_changed_condition():
+    first = RunTimer()
+    baseline = run_analysis(_scenario(60.0), timer=first)
+    assert first.counters["conditions_evaluated"] == 3
+
+    second = RunTimer()
+    edited = run_analysis(_scenario(55.0), timer=second)
+    assert second.counters["conditions_evaluated"] == 1
+    assert second.counters["mask_cache_hits"] == 2
+    assert edited.metadata.indicators_computed == 0  # RSI_14, SMA_50 and ADX_14 come from the indicator cache
+
+    # Same answers as a cold run
+    mask_cache.clear()
+    indicator_cache.clear()
+    indicator_states.clear()
+    cold = run_analysis(_scenario(55.0))
+    assert [s.date for s in cold.signals] == [s.date for s in edited.signals]
+    assert cold.signals[0].indicator_values == edited.signals[0].indicator_values
+    assert len(baseline.signals) >= len(edited.signals)
+
+
+def test_cached_masks_are_read_only():
+    run_analysis(_scenario(60.0))
+    for key in list(mask_cache._entries):
+        mask = mask_cache.get(key)
+        assert isinstance(mask, np.ndarray) and not mask.flags.writeable
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.calendar import WEEKDAY_NAMES, compute_calendar_stats, signal_series
+from app.core.datasets import load_scenario_data
+from app.core.engine import run_analysis, run_analysis_streaming
+from app.core.forward import get_forward_returns
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig,
+    Timeframe,
+)
+
+
+def _scenario() -> ScenarioInDB:
+    return ScenarioInDB(
+        id="cal", name="Calendar", underlying="TEST", data_source=DataSource.CSV,
+        csv_path="tests/fixtures/sample_data.csv", timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=50.0)],
+        targets=[TargetConfig(id="t5", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE),
+                 TargetConfig(id="t60", days_forward=60, threshold_pct=2.0, direction=Direction.BELOW)],
+        created_at="", updated_at="",
+    )
+
+
+def test_groups_match_target_stats_and_manual_counts():
+    result = run_analysis(_scenario())
+    stats = {s.target_id: s for s in result.calendar}
+
+    for ts in result.target_stats:
+        cal = stats[ts.target_id]
+        for groups in (cal.by_year, cal.by_quarter, cal.by_month, cal.by_weekday):
+            assert sum(g.count for g in groups) == ts.total_evaluable
+            assert sum(g.hits for g in groups) == ts.hit_count
+            assert sum(g.anytime_hits for g in groups) == ts.anytime_hit_count
+        assert cal.series is None
+
+    # Manual check for one month bucket
+    month = stats["t5"].by_month[0]
+    outcomes = [
+        s.outcomes[0] for s in result.signals if s.date.startswith(month.label) and s.outcomes[0].hit is not None
+    ]
+    assert month.count == len(outcomes)
+    assert month.hits == sum(o.hit for o in outcomes)
+    assert [g.label for g in stats["t5"].by_year] == sorted(g.label for g in stats["t5"].by_year)
+    weekdays = [g.label for g in stats["t5"].by_weekday]
+    assert weekdays == [d for d in WEEKDAY_NAMES if d in weekdays]
+
+
+def test_signal_series_of_unknown_target_is_a_value_error():
+    result = run_analysis(_scenario())
+    assert signal_series(result, "t60").hit == [s.outcomes[1].hit for s in result.signals]
+    with pytest.raises(ValueError, match="'nope' not found"):
+        signal_series(result, "nope")
+
+
+def test_no_signals_gives_empty_groups():
+    scenario = _scenario()
+    df = load_scenario_data(scenario)
+    cal = compute_calendar_stats(df.index, get_forward_returns(df), np.array([], dtype=np.int64), scenario.targets)
+    assert [c.target_id for c in cal] == ["t5", "t60"] and cal[0].by_year == [] and cal[0].by_weekday == []
+
+
+def test_streamed_runs_get_the_same_calendar():
+    expected = run_analysis(_scenario()).calendar
+    assert run_analysis_streaming(_scenario(), lambda chunk: None, chunk_size=10).calendar == expected
+
+
+def test_calendar_endpoint():
+    client = TestClient(app)
+    payload = _scenario().model_dump(exclude={"id", "created_at", "updated_at"})
+    sid = client.post("/api/scenarios", json=payload).json()["id"]
+    assert client.get(f"/api/analysis/{sid}/calendar").status_code == 404
+
+    client.post(f"/api/analysis/{sid}/run")
+    body = client.get(f"/api/analysis/{sid}/calendar").json()
+    assert [t["target_id"] for t in body] == ["t5", "t60"]
+    one = client.get(f"/api/analysis/{sid}/calendar", params={"target_id": "t60"}).json()
+    assert len(one) == 1 and one[0]["days_forward"] == 60
+    assert client.get(f"/api/analysis/{sid}/calendar", params={"target_id": "nope"}).status_code == 404
+    assert all(t["series"] is None for t in body)
+
+    last = client.get(f"/api/analysis/{sid}/last").json()
+    series = client.get(f"/api/analysis/{sid}/calendar", params={"target_id": "t60", "series": True}).json()[0]
+    assert series["series"]["dates"] == [s["date"] for s in last["signals"]]
+    assert series["series"]["hit"] == [s["outcomes"][1]["hit"] for s in last["signals"]]
+
+
+def test_results_without_signals():
+    client = TestClient(app)
+    payload = _scenario().model_dump(exclude={"id", "created_at", "updated_at"})
+    sid = client.post("/api/scenarios", json=payload).json()["id"]
+    run = client.post(f"/api/analysis/{sid}/run", params={"include_signals": False}).json()
+    assert run["signals"] == [] and run["total_signals"] > 0 and run["calendar"]
+
+    last = client.get(f"/api/analysis/{sid}/last", params={"include_signals": False}).json()
+    assert last["signals"] == [] and last["target_stats"] == run["target_stats"]
+    assert len(client.get(f"/api/analysis/{sid}/last").json()["signals"]) == run["total_signals"]
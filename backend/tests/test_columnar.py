@@ -0,0 +1,125 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.testclient import TestClient
+
+from app.core.columnar import _indicator_columns, outcome_batches, outcome_schema, stream_export
+from app.core.engine import run_analysis
+from app.db import result_store
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig, Timeframe,
+)
+
+CSV = "tests/fixtures/sample_data.csv"
+
+
+def _scenario(sid: str, value: float = 45.0) -> ScenarioInDB:
+    return ScenarioInDB(
+        id=sid, name=f"Export {sid}", underlying="TEST", data_source=DataSource.CSV, csv_path=CSV,
+        timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=value)],
+        targets=[TargetConfig(id="t5", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE),
+                 TargetConfig(id="t20", days_forward=20, threshold_pct=3.0, direction=Direction.BELOW)],
+        created_at="", updated_at="",
+    )
+
+
+def _read(data: bytes, fmt: str) -> pa.Table:
+    if fmt == "parquet":
+        return pq.read_table(io.BytesIO(data))
+    return pa.ipc.open_file(io.BytesIO(data)).read_all()
+
+
+def test_outcomes_are_typed_and_complete():
+    result = run_analysis(_scenario("typed"))
+    for fmt in ("parquet", "arrow"):
+        table = _read(b"".join(stream_export(lambda: [result], fmt)), fmt)
+        assert table.num_rows == result.total_signals * 2
+        assert table.schema.field("signal_date").type == pa.date32()
+        assert table.schema.field("hit").type == pa.bool_()
+        assert table.schema.field("ind_RSI_14").type == pa.float64()
+
+        df = table.to_pandas()
+        first = result.signals[0]
+        row = df.iloc[0]
+        assert str(row["signal_date"]) == first.date
+        assert row["hit"] == first.outcomes[0].hit
+        assert row["ind_RSI_14"] == first.indicator_values["RSI_14"]
+        assert df["future_date"].isna().sum() == sum(o.future_date is None for s in result.signals for o in s.outcomes)
+
+
+def test_arrow_export_of_many_results_with_different_labels():
+    results = [run_analysis(_scenario(sid, value)) for sid, value in (("a", 45.0), ("b", 55.0))]
+    for fmt in ("arrow", "parquet"):
+        table = _read(b"".join(stream_export(lambda: results, fmt)), fmt)
+        assert table.num_rows == sum(r.total_signals * 2 for r in results)
+        assert table.column("scenario_id").to_pylist().count("b") == results[1].total_signals * 2
+        assert set(table.column("target_id").to_pylist()) == {"t5", "t20"}
+
+
+def test_outcome_batches_are_bounded():
+    result = run_analysis(_scenario("batches"))
+    schema = outcome_schema(["RSI_14"])
+    batches = list(outcome_batches(result, schema, rows_per_batch=10))
+    assert len(batches) > 1
+    assert all(b.num_rows <= 10 for b in batches)
+    assert sum(b.num_rows for b in batches) == result.total_signals * 2
+
+
+def test_stats_table_flattens_baseline_and_significance():
+    result = run_analysis(_scenario("stats"))
+    table = _read(b"".join(stream_export(lambda: [result], "parquet", "stats")), "parquet")
+    assert table.num_rows == 2
+    row = table.to_pylist()[0]
+    ts = result.target_stats[0]
+    assert row["hit_rate_pct"] == ts.hit_rate_pct
+    assert row["baseline_hit_rate_pct"] == ts.baseline.hit_rate_pct
+    assert "histogram" not in row
+
+
+def test_export_endpoints_stream_single_and_batch():
+    client = TestClient(app)
+    ids = []
+    for value in (45.0, 55.0):
+        payload = _scenario("x", value).model_dump(exclude={"id", "created_at", "updated_at"})
+        ids.append(client.post("/api/scenarios", json=payload).json()["id"])
+        assert client.post(f"/api/analysis/{ids[-1]}/run").status_code == 200
+    a, b = ids
+
+    response = client.get(f"/api/export/{a}/arrow")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.file"
+    assert _read(response.content, "arrow").num_rows > 0
+
+    for fmt in ("parquet", "arrow"):
+        response = client.get(f"/api/export/batch/{fmt}", params={"scenario_id": [a, b, "missing"]})
+        assert response.status_code == 200
+        table = _read(response.content, fmt)
+        assert set(table.column("scenario_id").to_pylist()) == {a, b}
+
+    assert client.get(f"/api/export/{a}/xml").status_code == 404
+    assert client.get(f"/api/export/{a}/parquet", params={"table": "nope"}).status_code == 400
+    assert client.get("/api/export/batch/parquet", params={"scenario_id": ["missing"]}).status_code == 404
+
+
+def test_batch_export_parses_each_result_once(monkeypatch):
+    client = TestClient(app)
+    ids = []
+    for value, stream in ((45.0, False), (55.0, True)):
+        payload = _scenario("x", value).model_dump(exclude={"id", "created_at", "updated_at"})
+        ids.append(client.post("/api/scenarios", json=payload).json()["id"])
+        assert client.post(f"/api/analysis/{ids[-1]}/run", params={"stream": stream}).status_code == 200
+
+    results = [result_store.get_result(sid) for sid in ids]
+    assert result_store.indicator_columns(ids) == _indicator_columns(results) == ["RSI_14"]
+
+    loads = []
+    get_result = result_store.get_result
+    monkeypatch.setattr(result_store, "get_result", lambda sid: loads.append(sid) or get_result(sid))
+    response = client.get("/api/export/batch/parquet", params={"scenario_id": ids})
+    assert response.status_code == 200
+    assert loads == ids
+    assert _read(response.content, "parquet").num_rows == sum(r.total_signals * 2 for r in results)
@@ -1,6 +1,7 @@
 import pandas as pd
 import pytest
-from app.core.conditions import evaluate_conditions, get_column_name
+from app.core.conditions import get_column_name
+from app.core.rowwise import evaluate_conditions
 from app.models.scenario import ConditionConfig, Indicator, Operator, CompareTo, Connector
 
 def test_get_column_name():
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.sketch import QuantileSketch, merge_sketches
+from app.core.stats import build_histogram
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioCreate, TargetConfig,
+    Timeframe,
+)
+
+
+@pytest.mark.parametrize("method", ["freedman-diaconis", "sturges", "scott", "sqrt"])
+def test_histogram_counts_every_value(method):
+    values = np.random.default_rng(0).normal(0, 3, 5000)
+    hist = build_histogram(values, method)
+    assert sum(hist.counts) == 5000
+    assert len(hist.edges) == len(hist.counts) + 1
+    assert hist.edges[0] == round(values.min(), 4)
+
+
+def test_histogram_fixed_modes_and_cap():
+    values = np.linspace(-10, 10, 1001)
+    assert len(build_histogram(values, "fixed-count", bins=8).counts) == 8
+    assert len(build_histogram(values, "fixed-width", width=2.5).counts) == 8
+    assert len(build_histogram(values, "fixed-width", width=0.001, max_bins=50).counts) == 50
+    assert build_histogram(np.array([1.0, 1.0]), "sturges").counts == [2]
+    assert build_histogram(np.array([]), "sqrt").counts == []
+    with pytest.raises(ValueError):
+        build_histogram(values, "nope")
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    values = np.random.default_rng(1).normal(0.5, 4, 20_000)
+    sketch = QuantileSketch(0.01)
+    sketch.add(values)
+    for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+        exact = np.quantile(values, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * abs(exact) + 1e-9
+    assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merged_sketches_match_pooled_values():
+    rng = np.random.default_rng(2)
+    parts = [rng.normal(mu, 2, 3000) for mu in (-1.0, 0.0, 2.0)]
+    serialized = []
+    for part in parts:
+        sketch = QuantileSketch()
+        sketch.add(part)
+        serialized.append(sketch.to_model())
+
+    merged = merge_sketches(serialized)
+    pooled = QuantileSketch()
+    pooled.add(np.concatenate(parts))
+    assert merged.count == 9000
+    for q in (0.1, 0.5, 0.9):
+        assert merged.quantile(q) == pooled.quantile(q)
+
+    other = QuantileSketch(0.05)
+    with pytest.raises(ValueError):
+        merged.merge(other)
+
+
+def test_results_ship_histogram_not_raw_values_and_distribution_endpoint():
+    client = TestClient(app)
+    payload = ScenarioCreate(
+        name="Dist", underlying="TEST", data_source=DataSource.CSV, csv_path="tests/fixtures/sample_data.csv",
+        timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=50.0)],
+        targets=[TargetConfig(id="t", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+    ).model_dump()
+    sid = client.post("/api/scenarios", json=payload).json()["id"]
+    ts = client.post(f"/api/analysis/{sid}/run").json()["target_stats"][0]
+
+    assert ts["distribution"] == []
+    assert sum(ts["histogram"]["counts"]) == ts["total_evaluable"]
+    assert ts["sketch"]["count"] == ts["total_evaluable"]
+
+    body = client.get(f"/api/analysis/{sid}/distribution",
+                      params={"target_id": "t", "method": "fixed-count", "bins": 10, "raw": True}).json()
+    assert len(body["histogram"]["counts"]) == 10
+    assert len(body["values"]) == body["total"] == ts["total_evaluable"]
+    assert client.get(f"/api/analysis/{sid}/distribution", params={"target_id": "x"}).status_code == 404
+    assert client.get(f"/api/analysis/{sid}/distribution",
+                      params={"target_id": "t", "method": "bad"}).status_code == 400
@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.core import paths
+from app.core.engine import run_analysis
+from app.core.event_study import compute_event_study
+from app.core.forward import ForwardReturns
+from app.models.scenario import (
+    AnalysisOptions, CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB,
+    TargetConfig, Timeframe,
+)
+from benchmarks.synthetic import generate_ohlcv
+
+
+def _naive(forward: ForwardReturns, signals: np.ndarray, horizon: int, lookback: int) -> dict:
+    close = forward.close
+    rows = []
+    for i in signals:
+        row = [
+            (close[i + t] - close[i]) / close[i] * 100 if 0 <= i + t < len(close) else np.nan
+            for t in range(-lookback, horizon + 1)
+        ]
+        rows.append(row)
+    matrix = np.array(rows)
+    return {
+        "mean": np.nanmean(matrix, axis=0),
+        "percentiles": np.nanpercentile(matrix, [5, 25, 50, 75, 95], axis=0),
+        "count": (~np.isnan(matrix)).sum(axis=0),
+        "std": np.nanstd(matrix, axis=0, ddof=1),
+    }
+
+
+@pytest.mark.parametrize("block_cells", [paths.BLOCK_CELLS, 7])
+def test_matches_naive_path_statistics(monkeypatch, block_cells):
+    monkeypatch.setattr(paths, "BLOCK_CELLS", block_cells)
+    forward = ForwardReturns.from_frame(generate_ohlcv(400))
+    signals = np.array([0, 3, 50, 120, 121, 250, 380, 395, 399])
+    result = compute_event_study(forward, signals, horizon=10, lookback=5)
+    expected = _naive(forward, signals, 10, 5)
+
+    assert result.offsets == list(range(-5, 11))
+    assert result.count == expected["count"].tolist()
+    assert result.mean_pct[5] == 0.0 and result.median_pct[5] == 0.0
+    np.testing.assert_allclose(result.mean_pct, expected["mean"], atol=1e-4)
+    for got, want in zip(
+        [result.percentile_5, result.percentile_25, result.median_pct, result.percentile_75, result.percentile_95],
+        expected["percentiles"],
+    ):
+        np.testing.assert_allclose(got, want, atol=1e-4)
+    half_width = 1.959964 * expected["std"] / np.sqrt(expected["count"])
+    np.testing.assert_allclose(result.mean_ci_high_pct, expected["mean"] + half_width, atol=1e-4)
+
+
+def test_columns_past_every_signal_are_empty():
+    forward = ForwardReturns.from_frame(generate_ohlcv(50))
+    result = compute_event_study(forward, np.array([47, 48]), horizon=4)
+    assert result.count == [2, 2, 1, 0, 0]
+    assert result.mean_pct[3:] == [None, None]
+    assert result.mean_ci_low_pct[2] is None  # one value: no confidence band
+
+    empty = compute_event_study(forward, np.array([], dtype=int), horizon=3, lookback=2)
+    assert empty.count == [0] * 6
+    assert empty.median_pct == [None] * 6
+
+
+def test_many_signals_stay_fast():
+    forward = ForwardReturns.from_frame(generate_ohlcv(40_000))
+    signals = np.arange(0, 40_000, 2)
+    t0 = time.perf_counter()
+    result = compute_event_study(forward, signals, horizon=252, lookback=20)
+    assert time.perf_counter() - t0 < 5.0
+    assert len(result.offsets) == 273
+    assert result.count[20] == len(signals)
+
+
+def test_event_study_in_analysis_result():
+    scenario = ScenarioInDB(
+        id="es", name="ES", underlying="TEST", data_source=DataSource.CSV,
+        csv_path="tests/fixtures/sample_data.csv", timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=40.0)],
+        targets=[TargetConfig(id="t", days_forward=10, threshold_pct=1.0, direction=Direction.ABOVE)],
+        analysis=AnalysisOptions(event_study_horizon=20, event_study_lookback=5),
+        created_at="", updated_at="",
+    )
+    result = run_analysis(scenario)
+    assert result.event_study.offsets == list(range(-5, 21))
+    assert result.event_study.count[5] == result.total_signals
+    assert "event_study" in result.metadata.stage_durations_ms
+    assert run_analysis(scenario.model_copy(update={"analysis": AnalysisOptions()})).event_study is None
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.core.conditions import condition_columns, evaluate_condition_mask
+from app.core.rowwise import evaluate_conditions
+from app.core.expressions import ExpressionEvaluator, Group, Leaf, build_expression
+from app.core.indicators import compute_indicator
+from app.models.scenario import (
+    CompareTo, ConditionConfig, ConditionGroup, Connector, Indicator, Operator, ScenarioCreate,
+    TargetConfig, Direction,
+)
+
+
+def _cond(indicator, params, operator, value=None, connector=Connector.AND, **kwargs):
+    compare_to = kwargs.pop("compare_to", CompareTo.VALUE)
+    return ConditionConfig(
+        indicator=indicator, params=params, operator=operator, compare_to=compare_to,
+        compare_value=value, connector=connector, **kwargs,
+    )
+
+
+def _with_columns(df, conditions):
+    for cond in conditions:
+        for col, indicator, params in condition_columns(cond):
+            if col not in df.columns:
+                df[col] = compute_indicator(df, indicator, params)
+    return df
+
+
+def _rowwise(df, conditions):
+    return np.array([evaluate_conditions(df, i, conditions) for i in range(len(df))])
+
+
+CONDITION_SETS = [
+    [_cond(Indicator.RSI, {"period": 14}, Operator.BELOW, 40.0)],
+    [_cond(Indicator.SMA, {"period": 10}, Operator.CROSSES_ABOVE, compare_to=CompareTo.INDICATOR,
+           compare_indicator=Indicator.SMA, compare_indicator_params={"period": 30})],
+    [_cond(Indicator.PRICE, {}, Operator.CROSSES_BELOW, compare_to=CompareTo.INDICATOR,
+           compare_indicator=Indicator.EMA, compare_indicator_params={"period": 20})],
+    [
+        _cond(Indicator.RSI, {"period": 14}, Operator.ABOVE, 55.0, Connector.AND),
+        _cond(Indicator.PRICE_CHANGE, {"period": 3}, Operator.ABOVE, 0.0, Connector.OR),
+        _cond(Indicator.ADX, {"period": 14}, Operator.ABOVE, 30.0, Connector.AND),
+        _cond(Indicator.PRICE, {}, Operator.BELOW, compare_to=CompareTo.INDICATOR,
+              compare_indicator=Indicator.BBANDS_LOWER, compare_indicator_params={"period": 20, "std": 2}),
+    ],
+]
+
+
+@pytest.mark.parametrize("conditions", CONDITION_SETS)
+def test_flat_expression_matches_rowwise_evaluation(sample_data, conditions):
+    df = _with_columns(sample_data.copy(), conditions)
+    evaluator = ExpressionEvaluator(df, lambda cond: None)
+    mask = evaluator.evaluate(build_expression(conditions))
+    np.testing.assert_array_equal(mask, _rowwise(df, conditions))
+
+
+def test_single_mask_handles_nan_and_first_bar(small_data):
+    small_data["SMA_5"] = [np.nan, 9.0, 11.0, np.nan, 12.0]
+    cond = _cond(Indicator.SMA, {"period": 5}, Operator.CROSSES_ABOVE, 10.0)
+    mask = evaluate_condition_mask(small_data, cond)
+    np.testing.assert_array_equal(mask, [False, False, True, False, False])
+
+
+def test_nested_tree_evaluates_or_of_ands(small_data):
+    small_data["SMA_5"] = [1.0, 1.0, 5.0, 5.0, 1.0]
+    small_data["RSI_14"] = [80.0, 20.0, 80.0, 20.0, 80.0]
+    a = _cond(Indicator.SMA, {"period": 5}, Operator.ABOVE, 3.0)   # F F T T F
+    b = _cond(Indicator.RSI, {"period": 14}, Operator.ABOVE, 50.0)  # T F T F T
+    c = _cond(Indicator.SMA, {"period": 5}, Operator.BELOW, 3.0)   # T T F F T
+    d = _cond(Indicator.RSI, {"period": 14}, Operator.BELOW, 50.0)  # F T F T F
+    tree = ConditionGroup(operator=Connector.OR, children=[
+        ConditionGroup(operator=Connector.AND, children=[a.id, b.id]),
+        ConditionGroup(operator=Connector.AND, children=[c.id, d.id]),
+    ])
+    mask = ExpressionEvaluator(small_data, lambda cond: None).evaluate(build_expression([a, b, c, d], tree))
+    # (A AND B) = row 2; (C AND D) = row 1
+    np.testing.assert_array_equal(mask, [False, True, True, False, False])
+
+
+def test_identical_subexpressions_are_deduplicated():
+    a1 = _cond(Indicator.RSI, {"period": 14}, Operator.BELOW, 30.0, Connector.OR)
+    a2 = _cond(Indicator.RSI, {"period": 14}, Operator.BELOW, 30.0)
+    node = build_expression([a1, a2])
+    assert isinstance(node, Leaf)
+
+    b = _cond(Indicator.SMA, {"period": 5}, Operator.ABOVE, 1.0)
+    tree = ConditionGroup(operator=Connector.OR, children=[
+        ConditionGroup(operator=Connector.AND, children=[a1.id, b.id]),
+        ConditionGroup(operator=Connector.AND, children=[b.id, a2.id]),
+    ])
+    node = build_expression([a1, a2, b], tree)
+    assert isinstance(node, Group) and node.operator == Connector.AND
+    assert len(node.children) == 2
+
+
+def test_and_short_circuits_before_expensive_indicator(sample_data):
+    impossible = _cond(Indicator.PRICE_CHANGE, {"period": 1}, Operator.ABOVE, 500.0)
+    expensive = _cond(Indicator.ADX, {"period": 14}, Operator.ABOVE, 25.0)
+    df = sample_data.copy()
+    computed: list[str] = []
+
+    def ensure(cond):
+        for col, indicator, params in condition_columns(cond):
+            if col not in df.columns:
+                computed.append(col)
+                df[col] = compute_indicator(df, indicator, params)
+
+    # ADX listed first, but the cheap condition is evaluated first and prunes it
+    mask = ExpressionEvaluator(df, ensure).evaluate(build_expression([expensive, impossible]))
+    assert not mask.any()
+    assert computed == ["PRICE_CHANGE_1"]
+
+
+def test_condition_tree_must_reference_known_conditions():
+    a = _cond(Indicator.RSI, {"period": 14}, Operator.BELOW, 30.0)
+    b = _cond(Indicator.SMA, {"period": 5}, Operator.ABOVE, 1.0)
+    base = dict(name="x", underlying="SPY", conditions=[a, b],
+                targets=[TargetConfig(days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)])
+    with pytest.raises(ValidationError, match="unknown condition"):
+        ScenarioCreate(**base, condition_tree=ConditionGroup(children=[a.id, b.id, "nope"]))
+    with pytest.raises(ValidationError, match="does not reference"):
+        ScenarioCreate(**base, condition_tree=ConditionGroup(children=[a.id]))
+    # Flat scenarios without a tree still load unchanged
+    assert ScenarioCreate(**base).condition_tree is None
@@ -0,0 +1,114 @@
+import gc
+
+import numpy as np
+import pandas as pd
+
+from app.core import cache as cache_module
+from app.core import forward as forward_module
+from app.core.engine import analyze_frame, run_analysis
+from app.core.forward import ForwardReturns, get_forward_returns
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig,
+    Timeframe,
+)
+
+
+def _scenario() -> ScenarioInDB:
+    return ScenarioInDB(
+        id="fwd", name="Forward", underlying="TEST", data_source=DataSource.CSV,
+        timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=45.0)],
+        targets=[TargetConfig(days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE),
+                 TargetConfig(days_forward=20, threshold_pct=3.0, direction=Direction.BELOW)],
+        created_at="", updated_at="",
+    )
+
+
+def test_excursion_matches_window_slices(sample_data):
+    fwd = ForwardReturns.from_frame(sample_data)
+    close, high, low = (sample_data[c].to_numpy() for c in ("close", "high", "low"))
+    up = fwd.excursion_pct(10, "ABOVE")
+    down = fwd.excursion_pct(10, "BELOW")
+    for i in (0, 17, 250, len(close) - 11):
+        assert np.isclose(up[i], (high[i + 1 : i + 11].max() - close[i]) / close[i] * 100)
+        assert np.isclose(down[i], (low[i + 1 : i + 11].min() - close[i]) / close[i] * 100)
+    assert np.isnan(up[-10:]).all()
+
+
+def test_baseline_matches_all_days_and_is_memoised(sample_data):
+    fwd = ForwardReturns.from_frame(sample_data)
+    target = TargetConfig(days_forward=5, threshold_pct=2.0, direction=Direction.BELOW)
+    baseline = fwd.baseline(target)
+
+    close = sample_data["close"].to_numpy()
+    changes = (close[5:] - close[:-5]) / close[:-5] * 100
+    assert baseline.total_bars == len(close) - 5
+    assert baseline.hit_rate_pct == round((changes <= -2.0).mean() * 100, 2)
+    assert baseline.avg_change_pct == round(changes.mean(), 4)
+    assert fwd.baseline(target.model_copy(update={"id": "other"})) is baseline
+
+
+def test_forward_returns_cached_per_frame():
+    df = pd.DataFrame({"close": np.arange(1.0, 11.0)})
+    first = get_forward_returns(df)
+    assert get_forward_returns(df) is first
+    key = id(df)
+    del df, first
+    gc.collect()
+    assert key not in cache_module._frame_memo
+
+
+def test_forward_returns_built_once_across_runs_of_a_cached_dataset(monkeypatch):
+    builds = []
+    from_frame = ForwardReturns.from_frame.__func__
+    monkeypatch.setattr(
+        ForwardReturns, "from_frame", classmethod(lambda cls, df: builds.append(len(df)) or from_frame(cls, df))
+    )
+    scenario = _scenario().model_copy(update={"csv_path": "tests/fixtures/sample_data.csv"})
+    results = [run_analysis(scenario) for _ in range(3)]
+    assert len(builds) == 1
+    assert results[0].target_stats[0].baseline is results[2].target_stats[0].baseline
+
+
+def test_result_carries_baseline_per_target(sample_data):
+    result = analyze_frame(_scenario(), sample_data)
+    for ts in result.target_stats:
+        assert ts.baseline is not None
+        assert ts.baseline.total_bars == len(sample_data) - ts.days_forward
+
+
+def test_first_passage_matches_per_signal_scan(sample_data, monkeypatch):
+    monkeypatch.setattr(forward_module, "MAX_PATH_ELEMENTS", 100)  # force several batches
+    fwd = ForwardReturns.from_frame(sample_data)
+    close, high, low = (sample_data[c].to_numpy() for c in ("close", "high", "low"))
+    signals = np.arange(0, len(close), 7)
+
+    for direction, prices, threshold in (("ABOVE", high, 2.0), ("BELOW", low, 2.0)):
+        got = fwd.first_passage(signals, 10, threshold, direction)
+        for k, i in enumerate(signals):
+            if i + 10 >= len(close):
+                assert np.isnan(got[k])
+                continue
+            moves = (prices[i + 1 : i + 11] - close[i]) / close[i] * 100
+            touched = moves >= threshold if direction == "ABOVE" else moves <= -threshold
+            expected = np.argmax(touched) + 1 if touched.any() else np.nan
+            np.testing.assert_equal(got[k], expected)
+
+
+def test_outcomes_carry_path_metrics_and_stats_aggregate_them(sample_data):
+    result = analyze_frame(_scenario(), sample_data)
+    for ts in result.target_stats:
+        outcomes = [o for s in result.signals for o in s.outcomes if o.target_id == ts.target_id and o.hit is not None]
+        for o in outcomes:
+            assert (o.days_to_hit is not None) == o.anytime_hit
+            assert o.days_to_hit is None or 1 <= o.days_to_hit <= ts.days_forward
+            # The window includes the exit bar, whose low/high brackets its close
+            if ts.direction == "ABOVE":
+                assert o.mae_pct <= o.actual_change_pct + 1e-9
+            else:
+                assert o.mae_pct >= o.actual_change_pct - 1e-9
+        hit_days = [o.days_to_hit for o in outcomes if o.days_to_hit is not None]
+        assert ts.avg_days_to_hit == round(float(np.mean(hit_days)), 2)
+        worst = min if ts.direction == "ABOVE" else max
+        assert ts.worst_mae_pct == worst(o.mae_pct for o in outcomes)
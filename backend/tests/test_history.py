@@ -0,0 +1,96 @@
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.engine import run_analysis
+from app.db import history
+from app.db import repositories as repo
+from app.db import result_store
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioCreate, TargetConfig, Timeframe,
+)
+
+CSV = "tests/fixtures/sample_data.csv"
+client = TestClient(app)
+
+
+def _create() -> str:
+    payload = ScenarioCreate(
+        name="History", underlying="TEST", data_source=DataSource.CSV, csv_path=CSV, timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=45.0)],
+        targets=[TargetConfig(id="t10", days_forward=10, threshold_pct=1.0, direction=Direction.ABOVE)],
+    )
+    return client.post("/api/scenarios", json=payload.model_dump(mode="json")).json()["id"]
+
+
+def _run(scenario_id: str, end: str):
+    """Run as if the dataset ended on ``end`` — later ends append bars."""
+    scenario = repo.get_scenario(scenario_id).model_copy(update={"date_range_end": end})
+    result = run_analysis(scenario)
+    result_store.save_result(result)
+    return result
+
+
+def _comparable(result) -> dict:
+    return result.model_dump(exclude={"metadata"})
+
+
+def test_signal_delta_round_trip():
+    previous = {"a": {"date": "a", "v": 1}, "b": {"date": "b", "v": 2}, "c": {"date": "c", "v": 3}}
+    current = {"a": {"date": "a", "v": 1}, "b": {"date": "b", "v": 9}, "d": {"date": "d", "v": 4}}
+    delta = history.signal_delta(previous, current)
+    assert delta == {"upserted": [current["b"], current["d"]], "removed": ["c"]}
+    history.apply_delta(previous, delta)
+    assert previous == current
+
+
+def test_appended_bars_store_small_deltas_and_rebuild_exactly():
+    sid = _create()
+    results = [_run(sid, end) for end in ("2021-02-01", "2021-03-01", "2021-04-01")]
+
+    runs = history.list_runs(sid)
+    assert [r.snapshot for r in runs] == [True, False, False]
+    assert runs[1].total_signals == results[1].total_signals
+    # Appending a month only touches signals near the old end (forward windows fill in) and new ones
+    assert runs[1].signals_added + runs[1].signals_changed < results[1].total_signals / 2
+    assert runs[1].signals_removed == 0
+
+    for run, result in zip(runs, results):
+        assert _comparable(history.get_run(sid, run.run_id)) == _comparable(result)
+
+
+def test_snapshot_interval_and_retention(monkeypatch):
+    monkeypatch.setattr(settings, "history_snapshot_interval", 2)
+    monkeypatch.setattr(settings, "history_max_runs", 3)
+    sid = _create()
+    ends = ("2021-01-01", "2021-01-15", "2021-02-01", "2021-02-15", "2021-03-01")
+    results = [_run(sid, end) for end in ends]
+
+    runs = history.list_runs(sid)
+    assert [r.data_end for r in runs] == [r.data_end for r in results[-3:]]
+    assert runs[0].snapshot  # oldest kept run re-based when its predecessors were dropped
+    for run, result in zip(runs, results[-3:]):
+        assert _comparable(history.get_run(sid, run.run_id)) == _comparable(result)
+
+
+def test_history_endpoints():
+    sid = _create()
+    results = [_run(sid, end) for end in ("2021-02-01", "2021-04-01")]
+
+    runs = client.get(f"/api/analysis/{sid}/history").json()
+    assert len(runs) == 2
+
+    series = client.get(
+        f"/api/analysis/{sid}/history/series", params={"stat": ["hit_rate_pct", "avg_mfe_pct"]}
+    ).json()
+    assert len(series) == 1 and series[0]["target_id"] == "t10"
+    assert series[0]["values"]["hit_rate_pct"] == [r.target_stats[0].hit_rate_pct for r in results]
+    assert series[0]["data_end"] == [r.data_end for r in results]
+
+    run = client.get(f"/api/analysis/{sid}/history/{runs[0]['run_id']}").json()
+    assert run["total_signals"] == results[0].total_signals
+    assert client.get(f"/api/analysis/{sid}/history/999999").status_code == 404
+
+    client.delete(f"/api/scenarios/{sid}")
+    assert history.list_runs(sid) == []
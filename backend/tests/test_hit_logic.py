@@ -32,9 +32,9 @@ def test_hit_logic_scenarios():
     df = pd.DataFrame({"close": prices, "open": prices, "high": prices, "low": prices, "volume": [1000]*300}, index=dates)
     
     # We need to mock load_data to return our df
-    import app.core.engine
-    original_load_data = app.core.engine.load_data
-    app.core.engine.load_data = lambda **kwargs: df
+    import app.core.datasets
+    original_load_data = app.core.datasets.load_data
+    app.core.datasets.load_data = lambda **kwargs: df
     
     try:
         cond = ConditionConfig(
@@ -81,7 +81,7 @@ def test_hit_logic_scenarios():
         assert out3.hit is True
         
     finally:
-        app.core.engine.load_data = original_load_data
+        app.core.datasets.load_data = original_load_data
 
 if __name__ == "__main__":
     # Add Signal 2 data points to the module level prices list before running
@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.core import paths
+from app.core.engine import analyze_frame
+from app.core.forward import ForwardReturns
+from app.core.horizons import compute_horizon_curve
+from app.models.scenario import (
+    AnalysisOptions, CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB,
+    TargetConfig, Timeframe,
+)
+
+
+def test_path_pct_with_lookback_and_padding():
+    close = np.array([100.0, 110.0, 121.0, 99.0])
+    paths = ForwardReturns(close).path_pct(np.array([1, 3]), horizon=2, lookback=1)
+    np.testing.assert_allclose(paths[0], [(100 - 110) / 110 * 100, 0.0, 10.0, -10.0])
+    assert paths[1][1] == 0.0 and np.isnan(paths[1][2:]).all()
+
+
+@pytest.mark.parametrize("block_cells", [paths.BLOCK_CELLS, 50])
+def test_curve_matches_per_horizon_changes(sample_data, monkeypatch, block_cells):
+    monkeypatch.setattr(paths, "BLOCK_CELLS", block_cells)
+    fwd = ForwardReturns.from_frame(sample_data)
+    signals = np.arange(10, len(sample_data), 9)
+    curve = compute_horizon_curve(fwd, signals, 60, threshold_pct=1.0)
+
+    assert curve.horizons[0] == 1 and len(curve.horizons) == 60
+    for h in (1, 17, 60):
+        changes = fwd.change_pct(h)[signals]
+        changes = changes[~np.isnan(changes)]
+        assert curve.count[h - 1] == len(changes)
+        assert curve.mean_pct[h - 1] == round(changes.mean(), 4)
+        assert curve.median_pct[h - 1] == round(float(np.median(changes)), 4)
+        assert curve.hit_rate_pct[h - 1] == round((changes >= 1.0).mean() * 100, 2)
+
+
+def test_curve_for_many_signals_is_fast():
+    rng = np.random.default_rng(0)
+    fwd = ForwardReturns(100 * np.cumprod(1 + rng.normal(0, 0.01, 30 * 252)))
+    signals = np.sort(rng.choice(len(fwd.close), 3000, replace=False))
+    t0 = time.perf_counter()
+    curve = compute_horizon_curve(fwd, signals, 504)
+    assert time.perf_counter() - t0 < 2.0
+    assert curve.count[0] <= 3000 and curve.count[-1] < curve.count[0]
+
+
+def test_engine_adds_curve_only_when_requested(sample_data):
+    scenario = ScenarioInDB(
+        id="h", name="Horizons", underlying="TEST", data_source=DataSource.CSV, timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=45.0)],
+        targets=[TargetConfig(days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+    assert analyze_frame(scenario, sample_data.copy()).horizon_curve is None
+
+    scenario.analysis = AnalysisOptions(horizon_curve_max=30)
+    result = analyze_frame(scenario, sample_data.copy())
+    assert len(result.horizon_curve.horizons) == 30
+    assert result.horizon_curve.count[4] == result.target_stats[0].total_evaluable
+    assert "horizons" in result.metadata.stage_durations_ms
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.core import kernels
+from app.core.cache import dataset_cache, indicator_cache, indicator_states, mask_cache
+from app.core.engine import run_analysis
+from app.core.incremental import advance
+from app.core.indicators import compute_indicator
+from app.models.scenario import (
+    CompareTo, ConditionConfig, Connector, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig,
+    Timeframe,
+)
+from benchmarks.synthetic import generate_ohlcv, write_csv
+
+RECURSIVE = [
+    ("EMA", {"period": 20}),
+    ("RSI", {"period": 14}),
+    ("MACD", {}),
+    ("MACD_SIGNAL", {"fast": 5, "slow": 13, "signal": 4}),
+    ("MACD_HIST", {}),
+    ("ATR", {"period": 14}),
+    ("ADX", {"period": 14}),
+]
+WINDOWED = [
+    ("SMA", {"period": 50}),
+    ("BBANDS_UPPER", {"period": 20, "std": 2}),
+    ("BBANDS_LOWER", {"period": 20}),
+    ("HIGHEST", {"period": 30}),
+    ("LOWEST", {"period": 30}),
+    ("VOLUME_RATIO", {"period": 20}),
+    ("PRICE_CHANGE", {"period": 10}),
+    ("STOCH_K", {"k": 14, "d": 3}),
+    ("STOCH_D", {"k": 14, "d": 3}),
+]
+
+
+@pytest.mark.parametrize("indicator,params", RECURSIVE + WINDOWED)
+def test_extension_matches_full_recompute(indicator, params):
+    df = generate_ohlcv(1000)
+    full = compute_indicator(df, indicator, params).to_numpy(dtype=float)
+
+    values, snapshot, computed = advance(df.iloc[:600], indicator, params)
+    assert computed == 600 and np.array_equal(values, full[:600], equal_nan=True)
+    for bars in (601, 608, 1000):
+        previous = snapshot.bars
+        values, snapshot, computed = advance(df.iloc[:bars], indicator, params, snapshot)
+        assert computed == bars - previous
+
+    assert np.array_equal(np.isnan(values), np.isnan(full))
+    if (indicator, params) in RECURSIVE:
+        assert np.array_equal(values, full, equal_nan=True)
+    else:  # rolling sums restart from the kept window, so only rounding may differ
+        np.testing.assert_allclose(values, full, rtol=1e-12, atol=1e-12)
+
+
+def test_extension_only_runs_over_the_new_bars(monkeypatch):
+    df = generate_ohlcv(2000)
+    _, snapshot, _ = advance(df.iloc[:1990], "ADX", {"period": 14})
+
+    def no_full_compute(self, data):
+        raise AssertionError("recomputed from bar 0")
+
+    seen = []
+    extend = kernels.ADXKernel.extend
+    monkeypatch.setattr(kernels.ADXKernel, "compute", no_full_compute)
+    monkeypatch.setattr(
+        kernels.ADXKernel, "extend",
+        lambda self, state, data: seen.append(len(data["close"])) or extend(self, state, data),
+    )
+    values, snapshot, computed = advance(df, "ADX", {"period": 14}, snapshot)
+    assert seen == [10] and computed == 10 and len(values) == 2000
+    assert advance(df, "ADX", {"period": 14}, snapshot)[2] == 0
+
+
+def test_revised_history_is_recomputed():
+    df = generate_ohlcv(800)
+    _, snapshot, _ = advance(df.iloc[:700], "RSI", {"period": 14})
+    revised = df.copy()
+    revised.iloc[100, revised.columns.get_loc("close")] *= 1.01  # e.g. a back-adjusted dividend
+    values, _, computed = advance(revised, "RSI", {"period": 14}, snapshot)
+    assert computed == 800
+    assert np.array_equal(values, compute_indicator(revised, "RSI", {"period": 14}).to_numpy(), equal_nan=True)
+
+
+def test_kernels_must_implement_compute_and_extend():
+    class ComputeOnly(kernels.Kernel):
+        def compute(self, data):
+            return data["close"], {}
+
+    with pytest.raises(TypeError):
+        ComputeOnly()
+
+
+def test_short_data_gets_no_snapshot():
+    df = generate_ohlcv(29)
+    values, snapshot, computed = advance(df, "ADX", {"period": 14})
+    assert snapshot is None and computed == 29
+    assert np.array_equal(values, compute_indicator(df, "ADX", {"period": 14}).to_numpy(), equal_nan=True)
+
+
+def _scenario(csv_path: str) -> ScenarioInDB:
+    return ScenarioInDB(
+        id="inc", name="Incremental", underlying="INC", data_source=DataSource.CSV, csv_path=csv_path,
+        timeframe=Timeframe.DAILY,
+        conditions=[
+            ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                            compare_to=CompareTo.VALUE, compare_value=45.0),
+            ConditionConfig(indicator=Indicator.ADX, params={"period": 14}, operator=Operator.ABOVE,
+                            compare_to=CompareTo.VALUE, compare_value=15.0, connector=Connector.AND),
+            ConditionConfig(indicator=Indicator.PRICE, operator=Operator.ABOVE, compare_to=CompareTo.INDICATOR,
+                            compare_indicator=Indicator.SMA, compare_indicator_params={"period": 50},
+                            connector=Connector.AND),
+        ],
+        targets=[TargetConfig(id="t", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_rerun_on_appended_bars_extends_cached_indicators(tmp_path):
+    path = str(tmp_path / "INC.csv")
+    bars = generate_ohlcv(1200)
+    write_csv(bars.iloc[:1195], path)
+    first = run_analysis(_scenario(path))
+    assert first.metadata.indicators_computed == 3
+
+    write_csv(bars, path)
+    os.utime(path, (os.path.getmtime(path) + 1,) * 2)
+    extended = run_analysis(_scenario(path))
+    assert extended.total_bars == 1200
+    assert extended.metadata.indicators_computed == 0
+    assert extended.metadata.indicators_extended == 3
+
+    for cache in (dataset_cache, indicator_cache, indicator_states, mask_cache):
+        cache.clear()
+    cold = run_analysis(_scenario(path))
+    assert cold.metadata.indicators_computed == 3
+    assert extended.model_dump(exclude={"run_date", "metadata"}) == cold.model_dump(exclude={"run_date", "metadata"})
@@ -0,0 +1,77 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.core.engine import run_analysis
+from app.core.metrics import MetricsRegistry, RunTimer
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator,
+    ScenarioInDB, TargetConfig, Timeframe,
+)
+
+
+def _scenario() -> ScenarioInDB:
+    return ScenarioInDB(
+        id=str(uuid4()), name="Metrics", underlying="TEST", data_source=DataSource.CSV,
+        csv_path="tests/fixtures/sample_data.csv", timeframe=Timeframe.DAILY,
+        conditions=[
+            ConditionConfig(indicator=Indicator.PRICE_CHANGE, params={"period": 1},
+                            operator=Operator.ABOVE, compare_to=CompareTo.VALUE, compare_value=0.5),
+            ConditionConfig(indicator=Indicator.PRICE_CHANGE, params={"period": 1},
+                            operator=Operator.BELOW, compare_to=CompareTo.VALUE, compare_value=3.0),
+        ],
+        targets=[TargetConfig(days_forward=5, threshold_pct=0.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_histogram_renders_cumulative_buckets():
+    reg = MetricsRegistry()
+    reg.observe("x_seconds", 0.003, stage="load")
+    reg.observe("x_seconds", 0.2, stage="load")
+    reg.inc("runs_total", 2)
+    text = reg.render()
+    assert "# TYPE x_seconds histogram" in text
+    assert 'x_seconds_bucket{stage="load",le="0.0025"} 0' in text
+    assert 'x_seconds_bucket{stage="load",le="0.005"} 1' in text
+    assert 'x_seconds_bucket{stage="load",le="+Inf"} 2' in text
+    assert 'x_seconds_count{stage="load"} 2' in text
+    assert "runs_total 2" in text
+
+
+def test_run_timer_accumulates_stages():
+    timer = RunTimer()
+    with timer.stage("a"):
+        pass
+    with timer.stage("a"):
+        pass
+    timer.count("hits", 2)
+    assert timer.stages["a"] >= 0
+    assert timer.counters == {"hits": 2}
+
+
+def test_run_metadata_attached_to_result():
+    result = run_analysis(_scenario())
+    meta = result.metadata
+    assert set(meta.stage_durations_ms) == {
+        "load", "indicators", "signals", "targets", "stats", "significance", "calendar",
+    }
+    assert meta.bars == result.total_bars
+    assert meta.signals == result.total_signals
+    # Same PRICE_CHANGE_1 column referenced twice: computed once, reused once
+    assert meta.indicators_computed == 1
+    assert meta.cache_hits == 1
+    assert meta.data_source_latency_ms is not None
+    assert meta.total_duration_ms >= sum(meta.stage_durations_ms.values()) * 0.99
+
+
+def test_metrics_endpoint_exposes_stage_and_endpoint_histograms():
+    run_analysis(_scenario())
+    client = TestClient(app)
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'retrocast_stage_duration_seconds_count{stage="signals"}' in response.text
+    assert 'route="/health"' in response.text
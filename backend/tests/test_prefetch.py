@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes_export
+from app.config import settings
+from app.core.cache import dataset_cache, indicator_cache
+from app.core.engine import run_analysis
+from app.core.prefetch import ForegroundActivity, PrefetchCancelled, Prefetcher, foreground
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig, Timeframe,
+)
+
+CSV = "tests/fixtures/sample_data.csv"
+
+
+def _scenario() -> ScenarioInDB:
+    return ScenarioInDB(
+        id="warm", name="Warm", underlying="TEST", data_source=DataSource.CSV, csv_path=CSV,
+        timeframe=Timeframe.DAILY,
+        conditions=[
+            ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                            compare_to=CompareTo.VALUE, compare_value=50.0),
+            ConditionConfig(indicator=Indicator.PRICE, operator=Operator.ABOVE, compare_to=CompareTo.INDICATOR,
+                            compare_indicator=Indicator.SMA, compare_indicator_params={"period": 50}),
+        ],
+        targets=[TargetConfig(id="t5", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+@pytest.fixture
+def prefetcher(monkeypatch):
+    monkeypatch.setattr(settings, "prefetch_idle_s", 0.0)
+    worker = Prefetcher(ForegroundActivity())
+    worker.start()
+    yield worker
+    worker.stop()
+
+
+def test_warm_up_fills_dataset_and_indicator_caches(prefetcher):
+    assert prefetcher.enqueue([_scenario(), _scenario()]) == 1  # duplicates are queued once
+    assert prefetcher.join_idle()
+    assert prefetcher.warmed == 1
+    assert len(dataset_cache) == 1
+    assert len(indicator_cache) >= 2
+
+    result = run_analysis(_scenario())
+    assert result.metadata.indicators_computed == 0
+    assert result.metadata.data_source_latency_ms == 0.0
+
+
+def test_enqueue_is_a_no_op_when_not_running():
+    assert Prefetcher(ForegroundActivity()).enqueue([_scenario()]) == 0
+
+
+def test_warm_up_waits_for_foreground_to_go_idle(prefetcher):
+    with prefetcher.activity.track():
+        prefetcher.enqueue([_scenario()])
+        time.sleep(0.3)
+        assert len(dataset_cache) == 0
+    assert prefetcher.join_idle()
+    assert len(dataset_cache) == 1
+
+
+def test_stop_cancels_a_waiting_warm_up():
+    activity = ForegroundActivity()
+    stop = threading.Event()
+    with activity.track():
+        threading.Timer(0.1, stop.set).start()
+        with pytest.raises(PrefetchCancelled):
+            activity.wait_idle(0.0, stop)
+
+    worker = Prefetcher(activity)
+    worker.start()
+    with activity.track():
+        worker.enqueue([_scenario()])
+        t0 = time.monotonic()
+        worker.stop()
+    assert time.monotonic() - t0 < 2.0
+    assert not worker.running
+    assert len(dataset_cache) == 0
+
+
+def test_streamed_response_counts_as_foreground_until_sent(monkeypatch):
+    seen = []
+
+    def body(*args):
+        for _ in range(3):
+            seen.append(foreground.active)
+            yield b"x"
+
+    monkeypatch.setattr(routes_export, "stream_export", body)
+    monkeypatch.setattr(routes_export.result_store, "has_result", lambda sid: True)
+    monkeypatch.setattr(routes_export.result_store, "indicator_columns", lambda ids: [])
+    response = TestClient(app).get("/api/export/batch/parquet", params={"scenario_id": ["a"]})
+    assert response.content == b"xxx"
+    assert seen == [1, 1, 1]
+    assert foreground.active == 0
+
+
+def test_failed_warm_up_is_logged_as_a_warning(prefetcher, caplog):
+    prefetcher.enqueue([_scenario().model_copy(update={"csv_path": "missing.csv"})])
+    assert prefetcher.join_idle()
+    assert any(r.levelname == "WARNING" and "Prefetch of" in r.message for r in caplog.records)
@@ -0,0 +1,152 @@
+import os
+import shutil
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core import datasets, scan
+from app.core import preview as preview_module
+from app.core.engine import run_analysis
+from app.core.preview import PreviewSuperseded, preview_signals
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, ScenarioPreview,
+    TargetConfig, Timeframe,
+)
+
+CSV = "tests/fixtures/sample_data.csv"
+
+
+def _scenario(value: float = 45.0) -> ScenarioInDB:
+    return ScenarioInDB(
+        id="prev", name="Preview", underlying="TEST", data_source=DataSource.CSV, csv_path=CSV,
+        timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=value)],
+        targets=[TargetConfig(days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def _spec(value: float = 45.0) -> ScenarioPreview:
+    return ScenarioPreview.model_validate(_scenario(value).model_dump())
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions():
+    preview_module.sessions.clear()
+    yield
+
+
+def test_preview_matches_full_run():
+    result = run_analysis(_scenario())
+    preview = preview_signals(_spec())
+    assert preview.total_signals == result.total_signals > 0
+    assert preview.total_bars == result.total_bars
+    assert preview.first_signal_date == result.signals[0].date
+    assert preview.last_signal_date == result.signals[-1].date
+    assert len(preview.sparkline) == settings.preview_sparkline_bins
+    assert sum(preview.sparkline) == preview.total_signals
+
+
+def test_preview_session_reuses_frame(monkeypatch):
+    calls = []
+    original = datasets.load_data
+    monkeypatch.setattr(datasets, "load_data", lambda **kw: calls.append(kw) or original(**kw))
+    preview_signals(_spec(45.0), session_id="editor")
+    second = preview_signals(_spec(55.0), session_id="editor")
+    assert len(calls) == 1
+    assert second.total_signals == run_analysis(_scenario(55.0)).total_signals
+
+
+def test_preview_requests_do_not_share_the_session_frame():
+    preview_signals(_spec(45.0), session_id="editor")
+    session, _ = preview_module.sessions.begin("editor")
+    columns = list(session.frame.columns)
+    preview_signals(_spec(55.0), session_id="editor")
+    assert list(session.frame.columns) == columns == ["open", "high", "low", "close", "volume"]
+
+
+def test_newer_request_supersedes_in_flight_preview(monkeypatch):
+    original = datasets.load_data
+
+    def load_then_edit(**kw):
+        preview_module.sessions.begin("editor")  # the user typed again mid-load
+        return original(**kw)
+
+    monkeypatch.setattr(datasets, "load_data", load_then_edit)
+    with pytest.raises(PreviewSuperseded):
+        preview_signals(_spec(), session_id="editor")
+
+
+def test_preview_endpoint_ignores_scenario_only_fields():
+    client = TestClient(app)
+    payload = _scenario().model_dump(exclude={"id", "created_at", "updated_at"})
+    response = client.post("/api/analysis/preview", json={"session_id": "abc", "scenario": payload})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_signals"] == sum(body["sparkline"])
+    assert np.isfinite(body["elapsed_ms"])
+
+    payload["date_range_start"] = "2021-06-01"
+    assert client.post("/api/analysis/preview", json={"scenario": payload}).status_code == 400
+
+
+def test_preview_past_its_budget_times_out(monkeypatch):
+    monkeypatch.setattr(settings, "preview_budget_ms", 50)
+    original = datasets.load_data
+
+    def slow_load(**kw):
+        time.sleep(0.1)
+        return original(**kw)
+
+    monkeypatch.setattr(datasets, "load_data", slow_load)
+    preview = preview_signals(_spec(), session_id="editor")
+    assert preview.timed_out and preview.total_bars > 0
+    assert preview.sparkline == [] and preview.first_signal_date is None
+    assert preview.elapsed_ms >= 50
+
+    monkeypatch.setattr(settings, "preview_budget_ms", 0)
+    assert not preview_signals(_spec(), session_id="editor").timed_out
+
+
+def test_session_frame_reloads_when_the_csv_changes(tmp_path, monkeypatch):
+    csv = tmp_path / "data.csv"
+    shutil.copy(CSV, csv)
+    spec = _spec().model_copy(update={"csv_path": str(csv)})
+    first = preview_signals(spec, session_id="editor")
+
+    lines = csv.read_text().splitlines()
+    csv.write_text("\n".join(lines[:-20]) + "\n")
+    os.utime(csv, (time.time() + 10, time.time() + 10))
+    assert preview_signals(spec, session_id="editor").total_bars == first.total_bars - 20
+
+    calls = []
+    original = datasets.load_data
+    monkeypatch.setattr(datasets, "load_data", lambda **kw: calls.append(kw) or original(**kw))
+    monkeypatch.setattr(preview_module, "is_fresh", lambda source, loaded_at: False)  # past the TTL
+    datasets.dataset_cache.clear()
+    preview_signals(spec, session_id="editor")
+    assert len(calls) == 1
+
+
+def test_budget_is_checked_between_conditions(monkeypatch):
+    monkeypatch.setattr(settings, "preview_budget_ms", 50)
+    calls = []
+    original = scan.ensure_column
+
+    def slow_column(*args):
+        calls.append(args[1])
+        time.sleep(0.1)
+        return original(*args)
+
+    monkeypatch.setattr(scan, "ensure_column", slow_column)
+    spec = _spec()
+    spec.conditions.append(ConditionConfig(indicator=Indicator.SMA, params={"period": 20}, operator=Operator.ABOVE,
+                                           compare_to=CompareTo.VALUE, compare_value=0.0))
+    spec.condition_tree = None
+    assert preview_signals(spec).timed_out
+    assert len(calls) == 1
@@ -0,0 +1,53 @@
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+
+from app.core import profiling
+from app.core.profiling import load_profile, profile_analysis, save_profile
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator,
+    ScenarioCreate, ScenarioInDB, TargetConfig, Timeframe,
+)
+
+
+def _scenario() -> ScenarioInDB:
+    return ScenarioInDB(
+        id=str(uuid4()), name="Profiled", underlying="TEST", data_source=DataSource.CSV,
+        csv_path="tests/fixtures/sample_data.csv", timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14},
+                                    operator=Operator.BELOW, compare_to=CompareTo.VALUE, compare_value=60.0)],
+        targets=[TargetConfig(days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_profile_analysis_produces_artifact(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "SAMPLE_INTERVAL_S", 0.001)
+    result, report = profile_analysis(_scenario())
+
+    assert result.total_bars == 500
+    assert report.sample_interval_ms == 1.0
+    assert report.top_functions, "expected cProfile rows"
+    assert any(f.function == "run_analysis" for f in report.top_functions)
+    assert set(report.stage_peak_memory_kb) == {
+        "load", "indicators", "signals", "targets", "stats", "significance", "calendar",
+    }
+    assert report.peak_memory_kb > 0
+    for line in report.folded_stacks:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("app.core.engine:run_analysis")
+        assert int(count) > 0
+
+    monkeypatch.setattr(profiling.settings, "data_dir", str(tmp_path))
+    save_profile(report)
+    assert load_profile(report.scenario_id) == report
+    assert load_profile("missing") is None
+
+
+def test_concurrent_profile_is_rejected_with_409():
+    client = TestClient(app)
+    payload = ScenarioCreate.model_validate(_scenario().model_dump()).model_dump(mode="json")
+    sid = client.post("/api/scenarios", json=payload).json()["id"]
+    with profiling._profile_lock:  # another profiled run holds the profilers
+        assert client.post(f"/api/analysis/{sid}/run", params={"profile": True}).status_code == 409
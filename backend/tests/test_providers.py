@@ -0,0 +1,143 @@
+import threading
+import time
+
+import pytest
+
+from app.core.batch import run_batch
+from app.core.data_loader import dataset_key, load_data
+from app.core.datasets import load_scenario_data, load_scenario_datasets
+from app.core.engine import run_analysis
+from app.core.builtin_providers import CSVProvider, FixtureProvider, register_builtin_providers
+from app.core.providers import DataProvider, FetchRequest, RateLimiter, get_provider, register_provider
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig, Timeframe,
+)
+from benchmarks.synthetic import generate_ohlcv, write_csv
+
+TICKERS = [f"T{i:02d}" for i in range(12)]
+
+
+class CountingFixtureProvider(FixtureProvider):
+    """Fixture provider recording the peak number of fetches in flight."""
+
+    max_concurrency = 4
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.in_flight = 0
+        self.peak = 0
+        self._count_lock = threading.Lock()
+
+    def fetch(self, request):
+        with self._count_lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return super().fetch(request)
+        finally:
+            with self._count_lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    for seed, ticker in enumerate(TICKERS):
+        write_csv(generate_ohlcv(300, seed=seed), str(tmp_path / f"{ticker}.csv"))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def use_provider():
+    previous = get_provider(DataSource.FIXTURE)
+    yield lambda provider: register_provider(DataSource.FIXTURE, provider)
+    register_provider(DataSource.FIXTURE, previous)
+
+
+def _scenario(ticker: str) -> ScenarioInDB:
+    return ScenarioInDB(
+        id=ticker, name=ticker, underlying=ticker, data_source=DataSource.FIXTURE, timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=40.0)],
+        targets=[TargetConfig(id="t", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_batch_fetch_runs_in_parallel_up_to_the_concurrency_limit(fixture_dir, use_provider):
+    provider = CountingFixtureProvider(fixture_dir, latency_s=0.05)
+    use_provider(provider)
+
+    t0 = time.perf_counter()
+    frames = load_scenario_datasets([_scenario(t) for t in TICKERS])
+    elapsed = time.perf_counter() - t0
+
+    assert len(frames) == len(TICKERS)
+    assert all(len(frame) == 300 for frame in frames.values())
+    assert provider.peak == 4
+    assert elapsed < len(TICKERS) * 0.05 / 2
+
+
+def test_datasets_share_the_dataset_cache(fixture_dir, use_provider):
+    provider = FixtureProvider(fixture_dir)
+    use_provider(provider)
+
+    load_scenario_datasets([_scenario(t) for t in TICKERS[:3]])
+    load_scenario_datasets([_scenario(t) for t in TICKERS[:3]])
+    load_scenario_data(_scenario(TICKERS[0]))
+    assert provider.attempts == {t: 1 for t in TICKERS[:3]}
+
+
+def test_transient_errors_are_retried_with_backoff(fixture_dir, use_provider):
+    provider = FixtureProvider(fixture_dir, fail_first=2)
+    use_provider(provider)
+    df = load_data(TICKERS[0], DataSource.FIXTURE)
+    assert len(df) == 300
+    assert provider.attempts[TICKERS[0]] == 3
+
+    use_provider(FixtureProvider(fixture_dir, fail_first=3))
+    frames = load_scenario_datasets([_scenario(TICKERS[1])])
+    assert isinstance(frames[dataset_key(_scenario(TICKERS[1]))], ConnectionError)
+
+
+def test_batch_run_reports_failed_tickers_per_scenario(fixture_dir, use_provider):
+    use_provider(FixtureProvider(fixture_dir))
+    results, items = run_batch([_scenario(TICKERS[0]), _scenario("MISSING"), _scenario(TICKERS[1])])
+
+    by_id = {item.scenario_id: item for item in items}
+    assert by_id[TICKERS[0]].ok and by_id[TICKERS[1]].ok
+    assert not by_id["MISSING"].ok and "No fixture data" in by_id["MISSING"].error
+    expected = run_analysis(_scenario(TICKERS[1]))
+    batch = next(r for r in results if r.scenario_id == TICKERS[1])
+    assert batch.model_dump(exclude={"run_date", "metadata"}) == expected.model_dump(exclude={"run_date", "metadata"})
+
+
+def test_rate_limiter_spaces_acquisitions():
+    limiter = RateLimiter(rate=50.0, burst=1)
+    t0 = time.perf_counter()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.perf_counter() - t0 >= 5 / 50.0 * 0.9
+
+
+def test_load_batch_deduplicates_requests(fixture_dir):
+    provider = FixtureProvider(fixture_dir)
+    request = FetchRequest(TICKERS[0])
+    outcomes = provider.load_batch([request, request])
+    assert list(outcomes) == [request]
+    assert provider.attempts == {TICKERS[0]: 1}
+
+
+def test_providers_must_implement_fetch():
+    class NoFetch(DataProvider):
+        name = "nofetch"
+
+    with pytest.raises(TypeError):
+        NoFetch()
+
+
+def test_builtin_registration_keeps_custom_providers(fixture_dir, use_provider):
+    custom = FixtureProvider(fixture_dir)
+    use_provider(custom)
+    register_builtin_providers()
+    assert get_provider(DataSource.FIXTURE) is custom
+    assert isinstance(get_provider(DataSource.CSV), CSVProvider)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.core.engine import analyze_frame
+from app.core.sensitivity import compute_threshold_curve
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioInDB, TargetConfig,
+    Timeframe,
+)
+
+
+def test_curve_matches_direct_counts():
+    rng = np.random.default_rng(0)
+    changes = rng.normal(0, 3, 1000)
+    up = np.abs(changes) + rng.uniform(0, 2, 1000)
+    down = -np.abs(changes) - rng.uniform(0, 2, 1000)
+    curve = compute_threshold_curve(changes, up, down, points=41)
+
+    assert len(curve.thresholds) == 41 and curve.thresholds[0] == 0.0
+    for i in (0, 7, 20, 40):
+        t = curve.thresholds[i]
+        assert curve.above_final_pct[i] == round((changes >= t).mean() * 100, 2)
+        assert curve.below_final_pct[i] == round((changes <= -t).mean() * 100, 2)
+        assert curve.above_anytime_pct[i] == round((up >= t).mean() * 100, 2)
+        assert curve.below_anytime_pct[i] == round((down <= -t).mean() * 100, 2)
+    # Monotone in the threshold; anytime is never below final
+    assert np.all(np.diff(curve.above_final_pct) <= 0)
+    assert np.all(np.array(curve.above_anytime_pct) >= np.array(curve.above_final_pct))
+
+
+def test_empty_input_gives_empty_curve():
+    curve = compute_threshold_curve(np.array([]), np.array([]), np.array([]))
+    assert curve.thresholds == []
+
+
+def test_engine_curve_agrees_with_target_hit_rates(sample_data):
+    targets = [TargetConfig(days_forward=10, threshold_pct=0.0, direction=Direction.ABOVE),
+               TargetConfig(days_forward=10, threshold_pct=0.0, direction=Direction.BELOW)]
+    scenario = ScenarioInDB(
+        id="s", name="Sensitivity", underlying="TEST", data_source=DataSource.CSV, timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=50.0)],
+        targets=targets, created_at="", updated_at="",
+    )
+    above, below = analyze_frame(scenario, sample_data).target_stats
+    assert above.threshold_curve.above_final_pct[0] == above.hit_rate_pct
+    assert above.threshold_curve.above_anytime_pct[0] == above.anytime_hit_rate_pct
+    assert below.threshold_curve.below_final_pct[0] == below.hit_rate_pct
+    assert below.threshold_curve.below_anytime_pct[0] == below.anytime_hit_rate_pct
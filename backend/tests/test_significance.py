@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+
+from app.core.forward import ForwardReturns, hit_mask
+from app.core.significance import compute_significance, random_entry_distribution
+from app.models.results import TargetStats
+from app.models.scenario import Direction, TargetConfig
+
+
+def _stats(target):
+    return TargetStats(
+        target_id=target.id, days_forward=target.days_forward, threshold_pct=target.threshold_pct,
+        direction=target.direction.value, total_evaluable=0, hit_count=0, miss_count=0,
+        hit_rate_pct=0.0, avg_change_pct=0.0, median_change_pct=0.0, max_change_pct=0.0,
+        min_change_pct=0.0, std_dev=0.0, percentile_5=0.0, percentile_25=0.0, percentile_75=0.0,
+        percentile_95=0.0, distribution=[],
+    )
+
+
+def test_forward_change_pct_matches_manual():
+    close = np.array([100.0, 110.0, 99.0, 120.0])
+    fwd = ForwardReturns(close)
+    changes = fwd.change_pct(2)
+    np.testing.assert_allclose(changes[:2], [-1.0, (120 - 110) / 110 * 100])
+    assert np.isnan(changes[2:]).all()
+    assert fwd.change_pct(2) is changes  # cached per horizon
+
+
+def test_hit_mask_below_uses_threshold_as_loss_magnitude():
+    changes = np.array([-6.0, -5.0, -4.0, np.nan])
+    assert hit_mask(changes, 5.0, "BELOW").tolist() == [True, True, False, False]
+    assert hit_mask(changes, -4.0, "ABOVE").tolist() == [False, False, True, False]
+
+
+def test_random_distribution_is_batched_and_reproducible(monkeypatch):
+    monkeypatch.setattr("app.core.significance.MAX_BATCH_ELEMENTS", 50)
+    eligible = np.linspace(-10, 10, 201)
+    a = random_entry_distribution(eligible, 20, 30, 0.0, "ABOVE", np.random.default_rng(1))
+    b = random_entry_distribution(eligible, 20, 30, 0.0, "ABOVE", np.random.default_rng(1))
+    np.testing.assert_array_equal(a[0], b[0])
+    assert len(a[0]) == 30 and ((a[0] >= 0) & (a[0] <= 100)).all()
+
+
+def test_selective_signals_get_small_p_value():
+    rng = np.random.default_rng(0)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 3000))
+    fwd = ForwardReturns(close)
+    target = TargetConfig(days_forward=5, threshold_pct=2.0, direction=Direction.ABOVE)
+    # Hindsight "signals": bars followed by the biggest 5-day gains
+    changes = fwd.change_pct(5)
+    best = np.argsort(np.nan_to_num(changes, nan=-np.inf))[-50:]
+    stats = [_stats(target)]
+
+    compute_significance(fwd, np.sort(best), 1, [target], stats, n_resamples=500)
+
+    sig = stats[0].significance
+    assert sig.sample_size == 50 and sig.resamples == 500
+    assert sig.hit_rate_p_value < 0.01 and sig.avg_change_p_value < 0.01
+    assert sig.random_hit_rate_ci_low_pct <= sig.random_hit_rate_pct <= sig.random_hit_rate_ci_high_pct
+
+
+def test_ten_thousand_resamples_on_thirty_years_is_fast():
+    rng = np.random.default_rng(0)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 30 * 252))
+    fwd = ForwardReturns(close)
+    target = TargetConfig(days_forward=20, threshold_pct=3.0, direction=Direction.ABOVE)
+    signals = np.sort(rng.choice(np.arange(200, 7000), 300, replace=False))
+    stats = [_stats(target)]
+
+    t0 = time.perf_counter()
+    compute_significance(fwd, signals, 200, [target], stats, n_resamples=10_000)
+    assert time.perf_counter() - t0 < 1.0
+    assert 0 < stats[0].significance.hit_rate_p_value <= 1
@@ -0,0 +1,129 @@
+import tracemalloc
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.accumulator import TargetStatsAccumulator
+from app.core.engine import run_analysis, run_analysis_streaming
+from app.core.sketch import QuantileSketch
+from app.db.database import get_connection
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioCreate, ScenarioInDB,
+    TargetConfig, Timeframe,
+)
+from benchmarks.synthetic import generate_ohlcv, write_csv
+
+CSV = "tests/fixtures/sample_data.csv"
+# Streamed stats read these off quantile sketches instead of the raw values
+SKETCHED = {
+    "median_change_pct", "percentile_5", "percentile_25", "percentile_75", "percentile_95",
+    "median_mfe_pct", "median_mae_pct", "histogram",
+}
+
+
+def _scenario(csv_path: str = CSV, every_bar: bool = False) -> ScenarioInDB:
+    condition = (
+        ConditionConfig(indicator=Indicator.PRICE, operator=Operator.ABOVE, compare_to=CompareTo.VALUE,
+                        compare_value=0.0)
+        if every_bar else
+        ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                        compare_to=CompareTo.VALUE, compare_value=50.0)
+    )
+    return ScenarioInDB(
+        id="stream", name="Stream", underlying="TEST", data_source=DataSource.CSV, csv_path=csv_path,
+        timeframe=Timeframe.DAILY, conditions=[condition],
+        targets=[TargetConfig(id="t5", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE),
+                 TargetConfig(id="t20", days_forward=20, threshold_pct=2.0, direction=Direction.BELOW)],
+        created_at="", updated_at="",
+    )
+
+
+def test_streaming_matches_in_memory_run():
+    expected = run_analysis(_scenario())
+    chunks = []
+    result = run_analysis_streaming(_scenario(), chunks.append, chunk_size=16)
+
+    assert len(chunks) == -(-expected.total_signals // 16)
+    assert all(len(c) <= 16 for c in chunks)
+    assert [s for chunk in chunks for s in chunk] == expected.signals
+    assert result.signals == []
+    assert result.model_dump(exclude={"run_date", "metadata", "signals", "target_stats"}) == expected.model_dump(
+        exclude={"run_date", "metadata", "signals", "target_stats"}
+    )
+    for streamed, full in zip(result.target_stats, expected.target_stats):
+        assert streamed.model_dump(exclude=SKETCHED) == full.model_dump(exclude=SKETCHED)
+        sketch = QuantileSketch.from_model(full.sketch)
+        assert streamed.median_change_pct == round(sketch.quantile(0.5), 4)
+        assert streamed.percentile_95 == round(sketch.quantile(0.95), 4)
+        assert sum(streamed.histogram.counts) == sum(full.histogram.counts) == full.total_evaluable
+    assert result.metadata.stage_durations_ms.keys() >= {"signals", "targets", "stats", "persist"}
+
+
+def test_streaming_peak_memory_depends_on_chunk_size(tmp_path, monkeypatch):
+    # Significance resampling has its own fixed memory cap; leave it out of the comparison
+    monkeypatch.setattr(settings, "significance_resamples", 0)
+    csv_path = write_csv(generate_ohlcv(5_000), str(tmp_path / "every_bar.csv"))
+    scenario = _scenario(csv_path, every_bar=True)
+    run_analysis(scenario)  # warm caches so both measurements start from the same state
+
+    def peak(run) -> int:
+        tracemalloc.start()
+        try:
+            run()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    full = peak(lambda: run_analysis(scenario))
+    streamed = peak(lambda: run_analysis_streaming(scenario, lambda chunk: None, chunk_size=250))
+    assert streamed < full / 4
+
+
+def test_streamed_stats_memory_does_not_grow_with_signal_count():
+    scenario = _scenario()
+    chunk = run_analysis(scenario).signals[:50]
+
+    def peak(chunks: int) -> int:
+        accumulator = TargetStatsAccumulator(scenario.targets)
+        tracemalloc.start()
+        try:
+            for _ in range(chunks):
+                accumulator.add(chunk)
+            accumulator.result()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(400) < peak(20) * 2  # 20x the signals, same chunk size
+
+
+def test_stream_endpoint_persists_chunks():
+    client = TestClient(app)
+    payload = ScenarioCreate.model_validate(_scenario().model_dump()).model_dump(mode="json")
+    sid = client.post("/api/scenarios", json=payload).json()["id"]
+
+    streamed = client.post(f"/api/analysis/{sid}/run", params={"stream": True}).json()
+    assert streamed["signals"] == [] and streamed["signal_store"]
+    last = client.get(f"/api/analysis/{sid}/last").json()
+    assert len(last["signals"]) == streamed["total_signals"] > 0
+
+    full = client.post(f"/api/analysis/{sid}/run").json()
+    assert [s["date"] for s in full["signals"]] == [s["date"] for s in last["signals"]]
+    with get_connection() as conn:
+        remaining = conn.execute("SELECT COUNT(*) FROM result_chunks WHERE scenario_id = ?", (sid,)).fetchone()[0]
+    assert remaining == 0
+
+
+def test_streamed_runs_in_history_have_no_signals():
+    client = TestClient(app)
+    payload = ScenarioCreate.model_validate(_scenario().model_dump()).model_dump(mode="json")
+    sid = client.post("/api/scenarios", json=payload).json()["id"]
+    assert client.post(f"/api/analysis/{sid}/run", params={"stream": True, "profile": True}).status_code == 400
+
+    client.post(f"/api/analysis/{sid}/run", params={"stream": True})
+    client.post(f"/api/analysis/{sid}/run")
+    streamed, full = client.get(f"/api/analysis/{sid}/history").json()
+    assert not streamed["signals_available"] and full["signals_available"]
+    assert client.get(f"/api/analysis/{sid}/history/{streamed['run_id']}").status_code == 409
+    assert len(client.get(f"/api/analysis/{sid}/history/{full['run_id']}").json()["signals"]) > 0
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.conditions import condition_key
+from app.core.engine import run_analysis
+from app.core.indicators import compute_indicator
+from app.core.timeframes import compute_on_timeframe, resampled_view
+from app.models.scenario import (
+    CompareTo, ConditionConfig, ConditionTimeframe, DataSource, Direction, Indicator, Operator, ScenarioInDB,
+    TargetConfig, Timeframe,
+)
+from benchmarks.synthetic import generate_ohlcv
+
+CSV = "tests/fixtures/sample_data.csv"
+
+
+def _weekly_trend(**overrides) -> ConditionConfig:
+    fields = dict(
+        indicator=Indicator.PRICE, operator=Operator.ABOVE, compare_to=CompareTo.INDICATOR,
+        compare_indicator=Indicator.SMA, compare_indicator_params={"period": 10},
+        timeframe=ConditionTimeframe.WEEKLY,
+    )
+    return ConditionConfig(**{**fields, **overrides})
+
+
+def _scenario(*conditions: ConditionConfig) -> ScenarioInDB:
+    return ScenarioInDB(
+        id="mtf", name="MTF", underlying="TEST", data_source=DataSource.CSV, csv_path=CSV,
+        timeframe=Timeframe.DAILY, conditions=list(conditions),
+        targets=[TargetConfig(id="t5", days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+        created_at="", updated_at="",
+    )
+
+
+def test_weekly_bars_complete_on_friday():
+    df = generate_ohlcv(60)  # business days
+    bars, completed = resampled_view(df, ConditionTimeframe.WEEKLY)
+
+    fridays = df.index[df.index.dayofweek == 4]
+    assert len(bars) == len(fridays)
+    assert np.allclose(bars["close"].to_numpy(), df.loc[fridays, "close"].to_numpy())
+    first_friday = df.index.get_loc(fridays[0])
+    assert (completed[:first_friday] == -1).all()
+    assert completed[first_friday] == 0
+
+
+@pytest.mark.parametrize("timeframe", list(ConditionTimeframe))
+@pytest.mark.parametrize("calendar_days", [False, True])
+def test_no_look_ahead(timeframe, calendar_days):
+    df = generate_ohlcv(400)
+    if calendar_days:
+        df.index = pd.date_range("2020-01-01", periods=len(df), freq="D", name="date")
+    full = compute_on_timeframe(df, "SMA", {"period": 4}, timeframe)
+    assert not np.isnan(full).all()
+    for end in range(1, len(df), 17):
+        truncated = compute_on_timeframe(df.iloc[:end].copy(), "SMA", {"period": 4}, timeframe)
+        assert np.array_equal(truncated, full[:end], equal_nan=True)
+
+
+def test_holiday_friday_completes_week_on_next_bar():
+    df = generate_ohlcv(30)
+    friday = df.index[df.index.dayofweek == 4][1]
+    df = df.drop(friday)
+    bars, completed = resampled_view(df, ConditionTimeframe.WEEKLY)
+
+    thursday = df.index.get_loc(friday - pd.Timedelta(days=1))
+    assert completed[thursday] == completed[thursday - 1]
+    assert completed[thursday + 1] == completed[thursday] + 1
+    assert bars["close"].iloc[completed[thursday + 1]] == df["close"].iloc[thursday]
+
+
+def test_aligned_values_match_resampled_indicator():
+    df = generate_ohlcv(300)
+    bars, completed = resampled_view(df, ConditionTimeframe.MONTHLY)
+    expected = compute_indicator(bars, "RSI", {"period": 3}).to_numpy()
+    aligned = compute_on_timeframe(df, "RSI", {"period": 3}, ConditionTimeframe.MONTHLY)
+    has_value = completed >= 0
+    assert np.array_equal(aligned[has_value], expected[completed[has_value]], equal_nan=True)
+    assert np.isnan(aligned[~has_value]).all()
+
+
+def test_timeframe_is_part_of_condition_identity():
+    daily = _weekly_trend(timeframe=None)
+    assert condition_key(daily) == "close|ABOVE|SMA_10"
+    assert condition_key(_weekly_trend()) == "close|ABOVE|SMA_10@WEEKLY"
+
+
+def test_daily_close_above_weekly_sma():
+    result = run_analysis(_scenario(_weekly_trend()))
+    assert result.total_signals > 0
+    assert all("SMA_10@WEEKLY" in s.indicator_values for s in result.signals)
+    assert all(s.price > s.indicator_values["SMA_10@WEEKLY"] for s in result.signals)
+
+    daily = run_analysis(_scenario(_weekly_trend(timeframe=None)))
+    assert [s.date for s in daily.signals] != [s.date for s in result.signals]
+
+
+def test_aligned_series_shared_across_scenarios():
+    run_analysis(_scenario(_weekly_trend()))
+    other = run_analysis(_scenario(
+        _weekly_trend(operator=Operator.CROSSES_ABOVE),
+        ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                        compare_to=CompareTo.VALUE, compare_value=70.0),
+    ))
+    assert other.metadata.indicators_computed == 1  # only the daily RSI
@@ -0,0 +1,137 @@
+import gzip
+import io
+import json
+import time
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.db import history
+from app.db import repositories as repo
+from app.db import result_store
+from app.db.database import get_connection
+from app.main import app
+from app.models.scenario import (
+    CompareTo, ConditionConfig, DataSource, Direction, Indicator, Operator, ScenarioCreate, TargetConfig, Timeframe,
+)
+
+CSV = "tests/fixtures/sample_data.csv"
+client = TestClient(app)
+
+
+def _payload(name: str = "Transfer") -> dict:
+    return ScenarioCreate(
+        name=name, underlying="TEST", data_source=DataSource.CSV, csv_path=CSV, timeframe=Timeframe.DAILY,
+        conditions=[ConditionConfig(indicator=Indicator.RSI, params={"period": 14}, operator=Operator.BELOW,
+                                    compare_to=CompareTo.VALUE, compare_value=45.0)],
+        targets=[TargetConfig(days_forward=5, threshold_pct=1.0, direction=Direction.ABOVE)],
+    ).model_dump(mode="json")
+
+
+def _import(body: bytes, **params):
+    return client.post("/api/scenarios/import", content=body, params=params)
+
+
+def test_export_import_round_trip_with_results():
+    ids = [client.post("/api/scenarios", json=_payload(f"rt{i}")).json()["id"] for i in range(2)]
+    client.post(f"/api/analysis/{ids[0]}/run")
+
+    exported = client.get("/api/scenarios/export", params={"scenario_id": ids, "include_results": True})
+    assert exported.status_code == 200
+    records = [json.loads(line) for line in exported.text.splitlines()]
+    assert [r["scenario"]["id"] for r in records] == ids
+    assert records[0]["result"]["scenario_id"] == ids[0] and records[1]["result"] is None
+
+    for sid in ids:
+        client.delete(f"/api/scenarios/{sid}")
+    body = _import(exported.content).json()
+    assert body["imported"] == 2 and body["results_imported"] == 1 and body["failed"] == 0
+    assert client.get(f"/api/scenarios/{ids[1]}").json()["name"] == "rt1"
+    assert client.get(f"/api/analysis/{ids[0]}/last").json()["scenario_id"] == ids[0]
+
+
+def test_import_reports_per_line_errors():
+    valid = {**_payload("ok"), "id": "imp-ok"}
+    missing_targets = {**_payload("bad"), "targets": []}
+    lines = [json.dumps(valid), "{not json", json.dumps({"scenario": missing_targets}), json.dumps(valid)]
+    body = _import("\n".join(lines).encode()).json()
+
+    assert body["imported"] == 1 and body["failed"] == 3
+    items = body["items"]
+    assert [i["line"] for i in items] == [1, 2, 3, 4]
+    assert items[0]["ok"] and items[0]["scenario_id"] == "imp-ok"
+    assert "targets" in items[2]["error"]
+    assert "Duplicate" in items[3]["error"]
+
+    # Importing the same ID again conflicts in keep mode, succeeds in replace mode
+    assert "already exists" in _import(json.dumps(valid).encode()).json()["items"][0]["error"]
+    renamed = {**valid, "name": "renamed"}
+    assert _import(json.dumps(renamed).encode(), mode="replace").json()["imported"] == 1
+    assert repo.get_scenario("imp-ok").name == "renamed"
+
+
+def test_replace_drops_stale_result():
+    sid = client.post("/api/scenarios", json=_payload("stale")).json()["id"]
+    client.post(f"/api/analysis/{sid}/run")
+    client.post(f"/api/analysis/{sid}/run", params={"stream": True})
+    created_at = "2020-01-02T03:04:05Z"
+    _import(json.dumps({**_payload("stale v2"), "id": sid, "created_at": created_at}).encode(), mode="replace")
+    assert result_store.get_result(sid) is None
+    assert history.list_runs(sid) == []
+    with get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM result_chunks WHERE scenario_id = ?", (sid,)).fetchone()[0] == 0
+        row = conn.execute("SELECT data, created_at FROM scenarios WHERE id = ?", (sid,)).fetchone()
+    assert row["created_at"] == json.loads(row["data"])["created_at"] == created_at
+
+
+def test_streamed_result_round_trips_with_its_signals():
+    sid = client.post("/api/scenarios", json=_payload("streamed")).json()["id"]
+    streamed = client.post(f"/api/analysis/{sid}/run", params={"stream": True}).json()
+    assert streamed["signal_store"] and streamed["total_signals"] > 0
+    expected = client.get(f"/api/analysis/{sid}/last").json()["signals"]
+
+    exported = client.get("/api/scenarios/export", params={"scenario_id": [sid], "include_results": True})
+    record = json.loads(exported.text)
+    assert record["result"]["signal_store"] is None and record["result"]["signals"] == expected
+
+    for mode in ("new", "replace"):
+        body = _import(exported.content, mode=mode).json()
+        assert body["results_imported"] == 1
+        imported_id = body["items"][0]["scenario_id"]
+        assert (imported_id == sid) == (mode == "replace")
+        result = result_store.get_result(imported_id)
+        assert result.signal_store is None
+        assert [s.model_dump(mode="json") for s in result.signals] == expected
+
+    record["result"].update(signals=[], signal_store="lost-chunks")  # an export from before chunks were inlined
+    body = _import(json.dumps(record).encode(), mode="new").json()
+    assert body["failed"] == 1 and "exported without its signals" in body["items"][0]["error"]
+
+
+def test_bulk_import_of_compressed_and_zipped_bundles():
+    lines = "\n".join(json.dumps(_payload(f"bulk{i}")) for i in range(1000)).encode()
+
+    t0 = time.perf_counter()
+    body = _import(gzip.compress(lines), mode="new").json()
+    elapsed = time.perf_counter() - t0
+    assert body["imported"] == 1000 and body["failed"] == 0
+    assert len(repo.existing_scenario_ids(i["scenario_id"] for i in body["items"])) == 1000
+    assert elapsed < 5.0
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("a.jsonl", json.dumps(_payload("z1")))
+        zf.writestr("b.jsonl", json.dumps(_payload("z2")))
+    body = _import(archive.getvalue(), mode="new").json()
+    assert [i["name"] for i in body["items"]] == ["z1", "z2"]
+    assert [i["line"] for i in body["items"]] == [1, 2]
+
+    assert _import(b"PK\x03\x04garbage").status_code == 400
+
+
+def test_compressed_export():
+    sid = client.post("/api/scenarios", json=_payload("gz")).json()["id"]
+    response = client.get("/api/scenarios/export", params={"scenario_id": sid, "compress": True})
+    assert response.headers["content-type"] == "application/gzip"
+    record = json.loads(gzip.decompress(response.content))
+    assert record["scenario"]["id"] == sid and record["result"] is None
@@ -1,9 +1,11 @@
 import { useMemo } from "react";
-import type { Signal } from "@/types";
+import { useCalendarStats } from "@/hooks/useCalendarStats";
+import type { CalendarBucket } from "@/types";
 
 interface CalendarStatsTableProps {
-    signals: Signal[];
+    scenarioId: string | undefined;
     targetId: string | null;
+    runDate?: string;
     hitRateMode: "final" | "anytime";
 }
 
@@ -19,6 +21,28 @@ const MONTH_NAMES = [
     "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
 ];
 
+// "2024-03" -> "Mar 2024"
+function formatMonth(label: string): string {
+    const [year, month] = label.split("-");
+    return `${MONTH_NAMES[parseInt(month, 10) - 1]} ${year}`;
+}
+
+function toRows(
+    buckets: CalendarBucket[],
+    hitRateMode: "final" | "anytime",
+    formatLabel: (label: string) => string = label => label,
+): StatRow[] {
+    return buckets.map(b => {
+        const hits = hitRateMode === "anytime" ? b.anytime_hits : b.hits;
+        return {
+            label: formatLabel(b.label),
+            count: b.count,
+            hits,
+            rate: b.count > 0 ? (hits / b.count) * 100 : 0,
+        };
+    });
+}
+
 function getRateColor(rate: number): string {
     if (rate >= 60) return "text-emerald-400";
     if (rate >= 40) return "text-amber-400";
@@ -87,63 +111,19 @@ function StatsTable({ title, rows }: { title: string; rows: StatRow[] }) {
     );
 }
 
-export function CalendarStatsTable({ signals, targetId, hitRateMode }: CalendarStatsTableProps) {
-    const { monthlyRows, yearlyRows } = useMemo(() => {
-        if (!targetId || signals.length === 0) return { monthlyRows: [], yearlyRows: [] };
-
-        const monthMap = new Map<string, { count: number; hits: number }>();
-        const yearMap = new Map<string, { count: number; hits: number }>();
-
-        for (const signal of signals) {
-            const outcome = signal.outcomes.find(o => o.target_id === targetId);
-            if (!outcome) continue;
-
-            const [yearStr, monthStr] = signal.date.split("-");
-            const year = yearStr;
-            const monthIdx = parseInt(monthStr, 10) - 1;
-            const monthLabel = `${MONTH_NAMES[monthIdx]} ${year}`;
-
-            const hit = hitRateMode === "anytime" ? outcome.anytime_hit === true : outcome.hit === true;
-
-            // month
-            const mEntry = monthMap.get(monthLabel) ?? { count: 0, hits: 0 };
-            mEntry.count += 1;
-            if (hit) mEntry.hits += 1;
-            monthMap.set(monthLabel, mEntry);
-
-            // year
-            const yEntry = yearMap.get(year) ?? { count: 0, hits: 0 };
-            yEntry.count += 1;
-            if (hit) yEntry.hits += 1;
-            yearMap.set(year, yEntry);
-        }
-
-        const toRows = (map: Map<string, { count: number; hits: number }>, sortFn: (a: [string, any], b: [string, any]) => number): StatRow[] =>
-            Array.from(map.entries())
-                .sort(sortFn)
-                .map(([label, { count, hits }]) => ({
-                    label,
-                    count,
-                    hits,
-                    rate: count > 0 ? (hits / count) * 100 : 0,
-                }));
-
-        // Sort months chronologically: newest first
-        const sortMonths = (a: [string, any], b: [string, any]) => {
-            // Label is "Jan 2024"
-            const [m1, y1] = a[0].split(" ");
-            const [m2, y2] = b[0].split(" ");
-            if (y1 !== y2) return y2.localeCompare(y1);
-            return MONTH_NAMES.indexOf(m2) - MONTH_NAMES.indexOf(m1);
-        };
-
-        const sortYears = (a: [string, any], b: [string, any]) => b[0].localeCompare(a[0]);
+export function CalendarStatsTable({ scenarioId, targetId, runDate, hitRateMode }: CalendarStatsTableProps) {
+    const { stats, isLoading, error } = useCalendarStats(scenarioId, targetId, runDate);
 
+    const { monthlyRows, yearlyRows, quarterlyRows, weekdayRows } = useMemo(() => {
+        if (!stats) return { monthlyRows: [], yearlyRows: [], quarterlyRows: [], weekdayRows: [] };
+        // Newest period first; weekdays keep their Mon–Sun order
         return {
-            monthlyRows: toRows(monthMap, sortMonths),
-            yearlyRows: toRows(yearMap, sortYears)
+            monthlyRows: toRows(stats.by_month, hitRateMode, formatMonth).reverse(),
+            yearlyRows: toRows(stats.by_year, hitRateMode).reverse(),
+            quarterlyRows: toRows(stats.by_quarter, hitRateMode).reverse(),
+            weekdayRows: toRows(stats.by_weekday, hitRateMode),
         };
-    }, [signals, targetId, hitRateMode]);
+    }, [stats, hitRateMode]);
 
     if (!targetId) {
         return (
@@ -153,6 +133,22 @@ export function CalendarStatsTable({ signals, targetId, hitRateMode }: CalendarS
         );
     }
 
+    if (isLoading && !stats) {
+        return (
+            <div className="flex items-center justify-center h-full text-sm text-muted-foreground">
+                Loading statistics...
+            </div>
+        );
+    }
+
+    if (error) {
+        return (
+            <div className="flex items-center justify-center h-full text-sm text-rose-400">
+                {error}
+            </div>
+        );
+    }
+
     if (monthlyRows.length === 0) {
         return (
             <div className="flex items-center justify-center h-full text-sm text-muted-foreground">
@@ -166,6 +162,8 @@ export function CalendarStatsTable({ signals, targetId, hitRateMode }: CalendarS
             <div className="grid grid-cols-1 lg:grid-cols-2 gap-6 pb-4">
                 <StatsTable title="By Month" rows={monthlyRows} />
                 <StatsTable title="By Year" rows={yearlyRows} />
+                <StatsTable title="By Quarter" rows={quarterlyRows} />
+                <StatsTable title="By Weekday" rows={weekdayRows} />
             </div>
         </div>
     );
@@ -1,11 +1,12 @@
-import { useMemo, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 import { ResponsiveContainer, BarChart, Bar, XAxis, YAxis, Tooltip, Label } from "recharts";
 import { CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Popover, PopoverContent, PopoverTrigger } from "@/components/ui/popover";
 import { Input } from "@/components/ui/input";
 import { Settings2 } from "lucide-react";
-import type { TargetStats } from "@/types";
+import { analysisApi } from "@/services/api";
+import type { Histogram, TargetStats } from "@/types";
 
 // --- Binning method types and helpers ---
 
@@ -21,61 +22,17 @@ const BIN_METHOD_LABELS: Record<BinMethod, string> = {
     "fixed-count": "Fixed Count",
 };
 
-function computeBinCount(data: number[], method: BinMethod, fixedWidth: number, fixedCount: number): number {
-    const n = data.length;
-    if (n === 0) return 1;
-
-    const sorted = [...data].sort((a, b) => a - b);
-    const min = sorted[0];
-    const max = sorted[n - 1];
-    const range = max - min;
-    if (range === 0) return 1;
-
-    switch (method) {
-        case "sturges":
-            return Math.max(1, Math.ceil(Math.log2(n) + 1));
-
-        case "scott": {
-            const mean = data.reduce((s, v) => s + v, 0) / n;
-            const variance = data.reduce((s, v) => s + (v - mean) ** 2, 0) / n;
-            const stdDev = Math.sqrt(variance);
-            if (stdDev === 0) return 1;
-            const width = 3.5 * stdDev * n ** (-1 / 3);
-            return Math.max(1, Math.ceil(range / width));
-        }
-
-        case "freedman-diaconis": {
-            const q1Index = Math.floor(n * 0.25);
-            const q3Index = Math.floor(n * 0.75);
-            const iqr = sorted[q3Index] - sorted[q1Index];
-            if (iqr === 0) return Math.max(1, Math.ceil(Math.log2(n) + 1)); // fallback to Sturges
-            const width = 2 * iqr * n ** (-1 / 3);
-            return Math.max(1, Math.ceil(range / width));
-        }
-
-        case "sqrt":
-            return Math.max(1, Math.ceil(Math.sqrt(n)));
-
-        case "fixed-width": {
-            if (fixedWidth <= 0) return 20;
-            return Math.max(1, Math.ceil(range / fixedWidth));
-        }
-
-        case "fixed-count":
-            return Math.max(1, Math.min(fixedCount, 200));
-
-        default:
-            return 20;
-    }
-}
+// The histogram shipped with TargetStats uses the server default; other settings are re-binned server-side.
+const DEFAULT_BIN_METHOD: BinMethod = "freedman-diaconis";
 
 interface DistributionChartProps {
+    scenarioId: string | undefined;
     target: TargetStats;
     targets: TargetStats[];
     onTargetChange: (id: string) => void;
 }
 
-export function DistributionChart({ target, targets, onTargetChange }: DistributionChartProps) {
+export function DistributionChart({ scenarioId, target, targets, onTargetChange }: DistributionChartProps) {
     // Binning settings (local state, persists across timeframe switches)
     const [binMethod, setBinMethod] = useState<BinMethod>("freedman-diaconis");
     const [fixedWidth, setFixedWidth] = useState(1.0);
@@ -92,43 +49,47 @@ export function DistributionChart({ target, targets, onTargetChange }: Distribut
         }).sort((a, b) => a.days_forward - b.days_forward);
     }, [targets]);
 
-    // Create histogram bins from raw distribution (returns)
-    const chartData = useMemo(() => {
-        if (!target.distribution || target.distribution.length === 0) return [];
+    const [rebinned, setRebinned] = useState<Histogram | null>(null);
 
-        const returns = target.distribution;
-        const min = Math.min(...returns);
-        const max = Math.max(...returns);
+    useEffect(() => {
+        if (binMethod === DEFAULT_BIN_METHOD || !scenarioId) {
+            setRebinned(null);
+            return;
+        }
+        let cancelled = false;
+        analysisApi
+            .getDistribution(scenarioId, target.target_id, {
+                method: binMethod,
+                bins: binMethod === "fixed-count" ? fixedCount : undefined,
+                width: binMethod === "fixed-width" ? fixedWidth : undefined,
+            })
+            .then(response => {
+                if (!cancelled) setRebinned(response.data.histogram);
+            })
+            .catch(err => console.error("Failed to re-bin distribution", err));
+        return () => {
+            cancelled = true;
+        };
+    }, [scenarioId, target.target_id, binMethod, fixedWidth, fixedCount]);
 
-        const binCount = computeBinCount(returns, binMethod, fixedWidth, fixedCount);
-        const range = max - min;
-        const binWidth = range / binCount || 1;
+    // Chart rows from pre-binned edges/counts
+    const chartData = useMemo(() => {
+        const histogram = binMethod === DEFAULT_BIN_METHOD ? target.histogram : rebinned;
+        if (!histogram || histogram.counts.length === 0) return [];
 
-        const bins = Array.from({ length: binCount }, (_, i) => {
-            const start = min + i * binWidth;
-            const end = start + binWidth;
+        const total = histogram.counts.reduce((sum, c) => sum + c, 0);
+        return histogram.counts.map((count, i) => {
+            const start = histogram.edges[i];
+            const end = histogram.edges[i + 1];
             return {
                 start,
                 end,
-                count: 0,
-                name: `${start.toFixed(1)}% to ${end.toFixed(1)}%`
+                count,
+                name: `${start.toFixed(1)}% to ${end.toFixed(1)}%`,
+                percent: total > 0 ? (count / total) * 100 : 0,
             };
         });
-
-        returns.forEach(r => {
-            const binIndex = Math.min(Math.floor((r - min) / binWidth), binCount - 1);
-            if (bins[binIndex]) {
-                bins[binIndex].count++;
-            }
-        });
-
-        // Add percentage values
-        const total = returns.length;
-        return bins.map(b => ({
-            ...b,
-            percent: total > 0 ? (b.count / total) * 100 : 0,
-        }));
-    }, [target.distribution, binMethod, fixedWidth, fixedCount]);
+    }, [target.histogram, rebinned, binMethod]);
 
     const yDataKey = yAxisMode === "percent" ? "percent" : "count";
     const yLabel = yAxisMode === "percent" ? "Frequency (%)" : "Signals";
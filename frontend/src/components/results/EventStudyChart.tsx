@@ -0,0 +1,62 @@
+import { useMemo } from "react";
+import { ResponsiveContainer, ComposedChart, Area, Line, XAxis, YAxis, Tooltip, ReferenceLine } from "recharts";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import type { EventStudy } from "@/types";
+
+interface EventStudyChartProps {
+    study: EventStudy;
+}
+
+const range = (low: number | null, high: number | null) => (low != null && high != null ? [low, high] : null);
+
+export function EventStudyChart({ study }: EventStudyChartProps) {
+    const chartData = useMemo(
+        () =>
+            study.offsets.map((t, i) => ({
+                t,
+                mean: study.mean_pct[i],
+                median: study.median_pct[i],
+                outer: range(study.percentile_5[i], study.percentile_95[i]),
+                inner: range(study.percentile_25[i], study.percentile_75[i]),
+                ci: range(study.mean_ci_low_pct[i], study.mean_ci_high_pct[i]),
+            })),
+        [study],
+    );
+    const lookback = -study.offsets[0];
+    const horizon = study.offsets[study.offsets.length - 1];
+
+    return (
+        <Card>
+            <CardHeader className="pb-2">
+                <CardTitle>
+                    Event Study ({lookback > 0 ? `−${lookback}…` : "0…"}+{horizon} bars)
+                </CardTitle>
+            </CardHeader>
+            <CardContent className="h-[300px]">
+                <ResponsiveContainer width="100%" height="100%">
+                    <ComposedChart data={chartData} margin={{ bottom: 8, left: 10, right: 16, top: 8 }}>
+                        <XAxis dataKey="t" stroke="#888888" fontSize={11} tickLine={false} axisLine={false} />
+                        <YAxis
+                            stroke="#888888"
+                            fontSize={11}
+                            tickLine={false}
+                            axisLine={false}
+                            tickFormatter={v => `${v.toFixed(1)}%`}
+                        />
+                        <Tooltip
+                            contentStyle={{ backgroundColor: "#1f2937", borderRadius: "4px", color: "#f3f4f6", fontSize: "12px" }}
+                            labelFormatter={t => `t = ${t} bars`}
+                        />
+                        <ReferenceLine y={0} stroke="#6b7280" strokeDasharray="4 4" />
+                        <ReferenceLine x={0} stroke="#6b7280" />
+                        <Area dataKey="outer" name="5–95th pct" fill="#3b82f6" fillOpacity={0.08} stroke="none" />
+                        <Area dataKey="inner" name="25–75th pct" fill="#3b82f6" fillOpacity={0.15} stroke="none" />
+                        <Area dataKey="ci" name="95% CI of mean" fill="#f59e0b" fillOpacity={0.25} stroke="none" />
+                        <Line dataKey="mean" name="Mean %" stroke="#3b82f6" dot={false} strokeWidth={2} />
+                        <Line dataKey="median" name="Median %" stroke="#a855f7" dot={false} strokeWidth={1.5} />
+                    </ComposedChart>
+                </ResponsiveContainer>
+            </CardContent>
+        </Card>
+    );
+}
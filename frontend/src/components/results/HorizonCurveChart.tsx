@@ -0,0 +1,73 @@
+import { useMemo } from "react";
+import { ResponsiveContainer, ComposedChart, Area, Line, XAxis, YAxis, Tooltip, ReferenceLine } from "recharts";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import type { HorizonCurve } from "@/types";
+
+interface HorizonCurveChartProps {
+    curve: HorizonCurve;
+}
+
+export function HorizonCurveChart({ curve }: HorizonCurveChartProps) {
+    const chartData = useMemo(
+        () =>
+            curve.horizons.map((h, i) => ({
+                horizon: h,
+                mean: curve.mean_pct[i],
+                median: curve.median_pct[i],
+                hitRate: curve.hit_rate_pct[i],
+                band: curve.percentile_25[i] != null && curve.percentile_75[i] != null
+                    ? [curve.percentile_25[i], curve.percentile_75[i]]
+                    : null,
+            })),
+        [curve],
+    );
+
+    return (
+        <Card>
+            <CardHeader className="pb-2">
+                <CardTitle>Horizon Curve (1–{curve.horizons.length} bars)</CardTitle>
+            </CardHeader>
+            <CardContent className="h-[300px]">
+                <ResponsiveContainer width="100%" height="100%">
+                    <ComposedChart data={chartData} margin={{ bottom: 8, left: 10, right: 16, top: 8 }}>
+                        <XAxis dataKey="horizon" stroke="#888888" fontSize={11} tickLine={false} axisLine={false} />
+                        <YAxis
+                            yAxisId="pct"
+                            stroke="#888888"
+                            fontSize={11}
+                            tickLine={false}
+                            axisLine={false}
+                            tickFormatter={v => `${v.toFixed(1)}%`}
+                        />
+                        <YAxis
+                            yAxisId="rate"
+                            orientation="right"
+                            domain={[0, 100]}
+                            stroke="#888888"
+                            fontSize={11}
+                            tickLine={false}
+                            axisLine={false}
+                            tickFormatter={v => `${v}%`}
+                        />
+                        <Tooltip
+                            contentStyle={{ backgroundColor: "#1f2937", borderRadius: "4px", color: "#f3f4f6", fontSize: "12px" }}
+                            labelFormatter={h => `${h} bars`}
+                        />
+                        <ReferenceLine yAxisId="pct" y={0} stroke="#6b7280" strokeDasharray="4 4" />
+                        <Area yAxisId="pct" dataKey="band" name="25–75th pct" fill="#3b82f6" fillOpacity={0.15} stroke="none" />
+                        <Line yAxisId="pct" dataKey="mean" name="Mean %" stroke="#3b82f6" dot={false} strokeWidth={2} />
+                        <Line yAxisId="pct" dataKey="median" name="Median %" stroke="#a855f7" dot={false} strokeWidth={1.5} />
+                        <Line
+                            yAxisId="rate"
+                            dataKey="hitRate"
+                            name={`Hit rate (≥ ${curve.threshold_pct}%)`}
+                            stroke="#22c55e"
+                            dot={false}
+                            strokeDasharray="3 3"
+                        />
+                    </ComposedChart>
+                </ResponsiveContainer>
+            </CardContent>
+        </Card>
+    );
+}
@@ -0,0 +1,50 @@
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import type { RegimeBreakdown } from "@/types";
+
+interface RegimeBreakdownTableProps {
+    breakdown: RegimeBreakdown;
+    targetId: string | null;
+    hitRateMode: "final" | "anytime";
+}
+
+const pct = (v: number | null | undefined) => (v == null ? "—" : `${v.toFixed(2)}%`);
+
+export function RegimeBreakdownTable({ breakdown, targetId, hitRateMode }: RegimeBreakdownTableProps) {
+    return (
+        <Card>
+            <CardHeader className="pb-2">
+                <CardTitle>Regime Breakdown by {breakdown.column}</CardTitle>
+            </CardHeader>
+            <CardContent>
+                <div className="rounded-lg border border-border/50 overflow-hidden text-sm">
+                    <div className="grid grid-cols-5 bg-gradient-to-r from-primary/15 to-primary/5 border-b border-border/50 px-3 py-2">
+                        <span className="font-semibold text-foreground/80 text-xs">Bucket</span>
+                        <span className="font-semibold text-foreground/80 text-xs text-right">Signals</span>
+                        <span className="font-semibold text-foreground/80 text-xs text-right">Hit Rate</span>
+                        <span className="font-semibold text-foreground/80 text-xs text-right">Avg Change</span>
+                        <span className="font-semibold text-foreground/80 text-xs text-right">Median Change</span>
+                    </div>
+                    {breakdown.buckets.map(bucket => {
+                        const stats = bucket.target_stats.find(ts => ts.target_id === targetId) ?? bucket.target_stats[0];
+                        const rate = hitRateMode === "anytime" ? stats?.anytime_hit_rate_pct : stats?.hit_rate_pct;
+                        const evaluable = stats?.total_evaluable ?? 0;
+                        return (
+                            <div key={bucket.label} className="grid grid-cols-5 px-3 py-1.5 odd:bg-card even:bg-accent/10">
+                                <span className="text-xs text-foreground/70">{bucket.label}</span>
+                                <span className="text-xs text-right text-foreground/70">{bucket.signal_count}</span>
+                                <span className="text-xs text-right font-semibold">{evaluable ? pct(rate) : "—"}</span>
+                                <span className="text-xs text-right text-foreground/70">{evaluable ? pct(stats?.avg_change_pct) : "—"}</span>
+                                <span className="text-xs text-right text-foreground/70">{evaluable ? pct(stats?.median_change_pct) : "—"}</span>
+                            </div>
+                        );
+                    })}
+                </div>
+                {breakdown.unassigned_signals > 0 && (
+                    <p className="text-xs text-muted-foreground mt-2">
+                        {breakdown.unassigned_signals} signal(s) fall in the indicator's warm-up and are not bucketed.
+                    </p>
+                )}
+            </CardContent>
+        </Card>
+    );
+}
@@ -2,12 +2,18 @@ import { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import { PageHeader } from "@/components/layout/PageHeader";
 import { useAnalysis } from "@/hooks/useAnalysis";
+import { useResultSignals } from "@/hooks/useResultSignals";
 import { StatCards } from "./StatCards";
 import { TargetBars } from "./TargetBars";
 import { DistributionChart } from "./DistributionChart";
 import { TimeResolutionChart } from "./TimeResolutionChart";
 import { SignalsTable } from "./SignalsTable";
 import { CalendarStatsTable } from "./CalendarStatsTable";
+import { HorizonCurveChart } from "./HorizonCurveChart";
+import { EventStudyChart } from "./EventStudyChart";
+import { RegimeBreakdownTable } from "./RegimeBreakdownTable";
+import { RunHistoryChart } from "./RunHistoryChart";
+import { ThresholdSensitivity } from "./ThresholdSensitivity";
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import { Loader2, Download } from "lucide-react";
@@ -19,6 +25,7 @@ export default function ResultsDashboard() {
     const { id } = useParams();
     const navigate = useNavigate();
     const { fetchLastResult, result, isLoadingResult, error } = useAnalysis();
+    const { signals, isLoading: isLoadingSignals } = useResultSignals(id, result?.run_date);
     const [activeTargetId, setActiveTargetId] = useState<string | null>(null);
     const [activeChartTab, setActiveChartTab] = useState<ChartTab>("distribution");
     type HitRateMode = "final" | "anytime";
@@ -26,7 +33,7 @@ export default function ResultsDashboard() {
 
     useEffect(() => {
         if (id) {
-            fetchLastResult(id);
+            fetchLastResult(id, false); // the signals table fetches its signals separately
         }
     }, [id, fetchLastResult]);
 
@@ -37,14 +44,14 @@ export default function ResultsDashboard() {
         }
     }, [result, activeTargetId]);
 
-    const handleExportCSV = async () => {
+    const handleExport = async (format: "csv" | "parquet") => {
         if (!id) return;
         try {
-            const response = await exportApi.csv(id);
+            const response = format === "csv" ? await exportApi.csv(id) : await exportApi.columnar(id, format);
             const url = window.URL.createObjectURL(new Blob([response.data]));
             const link = document.createElement('a');
             link.href = url;
-            link.setAttribute('download', `scenario_${id}_results.csv`);
+            link.setAttribute('download', `scenario_${id}_results.${format}`);
             document.body.appendChild(link);
             link.click();
         } catch (e) {
@@ -75,10 +82,14 @@ export default function ResultsDashboard() {
     return (
         <div className="h-full flex flex-col">
             <PageHeader title={`Results: ${result.scenario_name}`}>
-                <Button variant="outline" size="sm" onClick={handleExportCSV}>
+                <Button variant="outline" size="sm" onClick={() => handleExport("csv")}>
                     <Download className="mr-2 h-4 w-4" />
                     Export CSV
                 </Button>
+                <Button variant="outline" size="sm" onClick={() => handleExport("parquet")}>
+                    <Download className="mr-2 h-4 w-4" />
+                    Parquet
+                </Button>
                 <div className="flex rounded-md border overflow-hidden text-xs ml-2">
                     <button
                         onClick={() => setHitRateMode("final")}
@@ -108,12 +119,15 @@ export default function ResultsDashboard() {
 
                     <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
                         {/* Left: Target Bars */}
-                        <div className="lg:col-span-1">
+                        <div className="lg:col-span-1 space-y-6">
                             <TargetBars
                                 stats={result.target_stats}
                                 onTargetClick={setActiveTargetId}
                                 hitRateMode={hitRateMode}
                             />
+                            {activeTargetStats && (
+                                <ThresholdSensitivity target={activeTargetStats} hitRateMode={hitRateMode} />
+                            )}
                         </div>
 
                         {/* Right: Chart Panel with Tabs */}
@@ -154,6 +168,7 @@ export default function ResultsDashboard() {
                                     {/* Chart content */}
                                     {activeChartTab === "distribution" ? (
                                         <DistributionChart
+                                            scenarioId={id}
                                             target={activeTargetStats}
                                             targets={result.target_stats}
                                             onTargetChange={setActiveTargetId}
@@ -162,13 +177,15 @@ export default function ResultsDashboard() {
                                         <TimeResolutionChart
                                             target={activeTargetStats}
                                             targets={result.target_stats}
-                                            signals={result.signals}
+                                            scenarioId={id}
+                                            runDate={result.run_date}
                                             onTargetChange={setActiveTargetId}
                                         />
                                     ) : (
                                         <CalendarStatsTable
-                                            signals={result.signals}
+                                            scenarioId={id}
                                             targetId={activeTargetId}
+                                            runDate={result.run_date}
                                             hitRateMode={hitRateMode}
                                         />
                                     )}
@@ -181,17 +198,33 @@ export default function ResultsDashboard() {
                         </div>
                     </div>
 
+                    {result.horizon_curve && <HorizonCurveChart curve={result.horizon_curve} />}
+                    {result.event_study && <EventStudyChart study={result.event_study} />}
+                    {result.breakdown && (
+                        <RegimeBreakdownTable breakdown={result.breakdown} targetId={activeTargetId} hitRateMode={hitRateMode} />
+                    )}
+
+                    {id && activeTargetId && (
+                        <RunHistoryChart scenarioId={id} targetId={activeTargetId} runDate={result.run_date} />
+                    )}
+
                     {/* Bottom: Signals Table */}
                     <div className="bg-card rounded-lg border shadow-sm p-4">
                         <h3 className="tex-lg font-semibold mb-4">Signal History</h3>
-                        <SignalsTable
-                            signals={result.signals}
-                            hitRateMode={hitRateMode}
-                            onSignalClick={(signal) => {
-                                // Navigate to chart view with query param specific to this signal date
-                                navigate(`/scenarios/${id}/chart?signal=${signal.date}${activeTargetId ? `&target=${activeTargetId}` : ''}`);
-                            }}
-                        />
+                        {isLoadingSignals || !signals ? (
+                            <div className="flex items-center justify-center py-8 text-muted-foreground">
+                                <Loader2 className="h-5 w-5 animate-spin" />
+                            </div>
+                        ) : (
+                            <SignalsTable
+                                signals={signals}
+                                hitRateMode={hitRateMode}
+                                onSignalClick={(signal) => {
+                                    // Navigate to chart view with query param specific to this signal date
+                                    navigate(`/scenarios/${id}/chart?signal=${signal.date}${activeTargetId ? `&target=${activeTargetId}` : ''}`);
+                                }}
+                            />
+                        )}
                     </div>
                 </div>
             </div>
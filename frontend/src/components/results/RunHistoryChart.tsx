@@ -0,0 +1,72 @@
+import { useEffect, useMemo, useState } from "react";
+import { ResponsiveContainer, ComposedChart, Line, XAxis, YAxis, Tooltip } from "recharts";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import { analysisApi } from "@/services/api";
+import type { StatSeries } from "@/types";
+
+interface RunHistoryChartProps {
+    scenarioId: string;
+    targetId: string;
+    runDate: string;
+}
+
+const STATS = ["hit_rate_pct", "avg_change_pct"];
+
+/** Hit rate and average change of one target across stored runs; hidden until there are two runs. */
+export function RunHistoryChart({ scenarioId, targetId, runDate }: RunHistoryChartProps) {
+    const [series, setSeries] = useState<StatSeries | null>(null);
+
+    useEffect(() => {
+        let cancelled = false;
+        analysisApi
+            .getStatSeries(scenarioId, targetId, STATS)
+            .then(response => {
+                if (!cancelled) setSeries(response.data[0] ?? null);
+            })
+            .catch(() => {
+                if (!cancelled) setSeries(null);
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [scenarioId, targetId, runDate]);
+
+    const chartData = useMemo(
+        () =>
+            series?.run_ids.map((runId, i) => ({
+                run: runId,
+                label: `${series.run_dates[i].slice(0, 10)} (data to ${series.data_end[i]})`,
+                hitRate: series.values.hit_rate_pct[i],
+                avgChange: series.values.avg_change_pct[i],
+                signals: series.total_signals[i],
+            })) ?? [],
+        [series],
+    );
+
+    if (chartData.length < 2) return null;
+
+    return (
+        <Card>
+            <CardHeader className="pb-2">
+                <CardTitle>Run History ({chartData.length} runs)</CardTitle>
+            </CardHeader>
+            <CardContent className="h-[240px]">
+                <ResponsiveContainer width="100%" height="100%">
+                    <ComposedChart data={chartData} margin={{ bottom: 8, left: 10, right: 16, top: 8 }}>
+                        <XAxis dataKey="run" stroke="#888888" fontSize={11} tickLine={false} axisLine={false} />
+                        <YAxis yAxisId="rate" domain={[0, 100]} stroke="#888888" fontSize={11} tickLine={false}
+                            axisLine={false} tickFormatter={v => `${v}%`} />
+                        <YAxis yAxisId="pct" orientation="right" stroke="#888888" fontSize={11} tickLine={false}
+                            axisLine={false} tickFormatter={v => `${v.toFixed(1)}%`} />
+                        <Tooltip
+                            contentStyle={{ backgroundColor: "#1f2937", borderRadius: "4px", color: "#f3f4f6", fontSize: "12px" }}
+                            labelFormatter={(_, payload) => payload?.[0]?.payload.label ?? ""}
+                        />
+                        <Line yAxisId="rate" dataKey="hitRate" name="Hit rate %" stroke="#22c55e" strokeWidth={2} />
+                        <Line yAxisId="pct" dataKey="avgChange" name="Avg change %" stroke="#3b82f6" strokeWidth={1.5} />
+                    </ComposedChart>
+                </ResponsiveContainer>
+            </CardContent>
+        </Card>
+    );
+}
@@ -0,0 +1,71 @@
+import { useEffect, useMemo, useState } from "react";
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
+import type { TargetStats } from "@/types";
+
+interface ThresholdSensitivityProps {
+    target: TargetStats;
+    hitRateMode: "final" | "anytime";
+}
+
+// Linear interpolation between the curve's grid points
+function rateAt(thresholds: number[], rates: number[], t: number): number {
+    if (thresholds.length === 0) return 0;
+    if (t <= thresholds[0]) return rates[0];
+    for (let i = 1; i < thresholds.length; i++) {
+        if (t <= thresholds[i]) {
+            const span = thresholds[i] - thresholds[i - 1] || 1;
+            const w = (t - thresholds[i - 1]) / span;
+            return rates[i - 1] + w * (rates[i] - rates[i - 1]);
+        }
+    }
+    return rates[rates.length - 1];
+}
+
+/** Threshold slider over the precomputed hit-rate curve — no backend round trip. */
+export function ThresholdSensitivity({ target, hitRateMode }: ThresholdSensitivityProps) {
+    const curve = target.threshold_curve;
+    const [threshold, setThreshold] = useState(Math.abs(target.threshold_pct));
+
+    useEffect(() => setThreshold(Math.abs(target.threshold_pct)), [target.target_id, target.threshold_pct]);
+
+    const rates = useMemo(() => {
+        if (!curve || curve.thresholds.length === 0) return null;
+        const above = hitRateMode === "anytime" ? curve.above_anytime_pct : curve.above_final_pct;
+        const below = hitRateMode === "anytime" ? curve.below_anytime_pct : curve.below_final_pct;
+        return {
+            above: rateAt(curve.thresholds, above, threshold),
+            below: rateAt(curve.thresholds, below, threshold),
+        };
+    }, [curve, hitRateMode, threshold]);
+
+    if (!curve || !rates) return null;
+    const max = curve.thresholds[curve.thresholds.length - 1];
+
+    return (
+        <Card>
+            <CardHeader className="pb-2">
+                <CardTitle className="text-base">Threshold Sensitivity ({target.days_forward}d)</CardTitle>
+            </CardHeader>
+            <CardContent className="space-y-3 text-sm">
+                <input
+                    type="range"
+                    min={0}
+                    max={max}
+                    step={max / 200 || 0.01}
+                    value={Math.min(threshold, max)}
+                    onChange={e => setThreshold(parseFloat(e.target.value))}
+                    className="w-full accent-primary"
+                />
+                <div className="flex justify-between text-muted-foreground">
+                    <span>Threshold: <strong className="text-foreground">{threshold.toFixed(2)}%</strong></span>
+                    <span>
+                        ≥ +{threshold.toFixed(1)}%: <strong className="text-green-500">{rates.above.toFixed(1)}%</strong>
+                    </span>
+                    <span>
+                        ≤ −{threshold.toFixed(1)}%: <strong className="text-red-500">{rates.below.toFixed(1)}%</strong>
+                    </span>
+                </div>
+            </CardContent>
+        </Card>
+    );
+}
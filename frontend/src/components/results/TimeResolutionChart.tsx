@@ -12,14 +12,16 @@ import {
 } from "recharts";
 import { CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
-import type { Signal, TargetStats } from "@/types";
+import { useCalendarStats } from "@/hooks/useCalendarStats";
+import type { TargetStats } from "@/types";
 
 type YMode = "final" | "max";
 
 interface TimeResolutionChartProps {
     target: TargetStats;
     targets: TargetStats[];
-    signals: Signal[];
+    scenarioId: string | undefined;
+    runDate?: string;
     onTargetChange: (id: string) => void;
 }
 
@@ -88,9 +90,10 @@ function CustomTooltip({ active, payload }: any) {
 }
 
 export function TimeResolutionChart({
-    target, targets, signals, onTargetChange,
+    target, targets, scenarioId, runDate, onTargetChange,
 }: TimeResolutionChartProps) {
     const [yMode, setYMode] = useState<YMode>("final");
+    const { stats } = useCalendarStats(scenarioId, target.target_id, runDate, true);
 
     const uniqueTargets = useMemo(() => {
         const seen = new Set<number>();
@@ -100,26 +103,25 @@ export function TimeResolutionChart({
     }, [targets]);
 
     const chartData = useMemo<DataPoint[]>(() => {
-        return signals
-            .map(sig => {
-                const outcome = sig.outcomes.find(o => o.target_id === target.target_id);
-                if (!outcome) return null;
-                const finalPct = outcome.actual_change_pct ?? null;
-                const maxPct = outcome.max_change_pct ?? null;
+        if (!stats?.series) return [];
+        const { dates, prices, actual_change_pct, max_change_pct, hit } = stats.series;
+        return dates
+            .map((date, i) => {
+                const finalPct = actual_change_pct[i];
+                const maxPct = max_change_pct[i];
                 const y = (yMode === "max" ? maxPct : finalPct) ?? 0;
                 return {
-                    x: new Date(sig.date).getTime(),
+                    x: new Date(date).getTime(),
                     y,
-                    date: sig.date,
-                    price: sig.price,
+                    date,
+                    price: prices[i],
                     finalPct,
                     maxPct,
-                    hit: outcome.hit ?? null,
+                    hit: hit[i],
                 } as DataPoint;
             })
-            .filter((d): d is DataPoint => d !== null)
             .sort((a, b) => a.x - b.x);
-    }, [signals, target.target_id, yMode]);
+    }, [stats, yMode]);
 
     const formatDate = (ms: number) =>
         new Date(ms).toLocaleDateString("en-US", { month: "short", year: "2-digit" });
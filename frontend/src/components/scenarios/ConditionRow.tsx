@@ -213,6 +213,32 @@ export default function ConditionRow({ index, onRemove }: ConditionRowProps) {
                 </>
             )}
 
+            {/* TIMEFRAME: indicators on weekly/monthly bars, forward-filled onto the scenario's bars */}
+            <div className="flex flex-col gap-1.5">
+                <span className="text-xs font-medium text-muted-foreground ml-1">Bars</span>
+                <FormField
+                    control={control}
+                    name={`conditions.${index}.timeframe`}
+                    render={({ field }) => (
+                        <FormItem>
+                            <Select
+                                onValueChange={v => field.onChange(v === "BASE" ? null : v)}
+                                value={field.value ?? "BASE"}
+                            >
+                                <FormControl>
+                                    <SelectTrigger className="h-9 w-24 px-2"><SelectValue /></SelectTrigger>
+                                </FormControl>
+                                <SelectContent>
+                                    <SelectItem value="BASE">Daily</SelectItem>
+                                    <SelectItem value="WEEKLY">Weekly</SelectItem>
+                                    <SelectItem value="MONTHLY">Monthly</SelectItem>
+                                </SelectContent>
+                            </Select>
+                        </FormItem>
+                    )}
+                />
+            </div>
+
             {/* CONNECTOR (AND/OR) */}
             <div className="flex flex-col gap-1.5 ml-auto">
                 <span className="text-xs font-medium text-muted-foreground ml-1">Next</span>
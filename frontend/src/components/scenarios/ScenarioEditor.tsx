@@ -24,16 +24,18 @@ import {
 } from "@/components/ui/select";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { useScenarios } from "@/hooks/useScenarios";
+import { useSignalPreview } from "@/hooks/useSignalPreview";
 import type { ScenarioCreate } from "@/types";
 import { Loader2, Save } from "lucide-react";
 import ConditionBuilder from "./ConditionBuilder";
 import TargetBuilder from "./TargetBuilder";
+import SignalPreviewPanel from "./SignalPreviewPanel";
 
 const formSchema = z.object({
     name: z.string().min(2, "Name must be at least 2 characters"),
     description: z.string().optional(),
     underlying: z.string().min(1, "Underlying symbol is required"),
-    data_source: z.enum(["CSV", "YAHOO", "NORGATE"] as const),
+    data_source: z.enum(["CSV", "YAHOO", "NORGATE", "FIXTURE"] as const),
     csv_path: z.string().optional(),
     conditions: z.array(z.any()).min(1, "At least one condition is required"),
     targets: z.array(z.any()).min(1, "At least one target is required"),
@@ -41,13 +43,28 @@ const formSchema = z.object({
     date_range_end: z.string().optional(),
 });
 
+type FormValues = z.infer<typeof formSchema>;
+
+function toScenarioCreate(values: FormValues): ScenarioCreate {
+    return {
+        ...values,
+        csv_path: values.data_source === "CSV" ? values.csv_path : undefined,
+        description: values.description || "",
+        timeframe: "1d",
+        conditions: values.conditions as any,
+        targets: values.targets as any,
+        date_range_start: values.date_range_start || undefined,
+        date_range_end: values.date_range_end || undefined,
+    };
+}
+
 export default function ScenarioEditor() {
     const { id } = useParams();
     const navigate = useNavigate();
     const { fetchScenario, scenario, createScenario, updateScenario, isLoading } = useScenarios();
     const isEditMode = !!id;
 
-    const form = useForm<z.infer<typeof formSchema>>({
+    const form = useForm<FormValues>({
         resolver: zodResolver(formSchema),
         defaultValues: {
             name: "",
@@ -84,17 +101,12 @@ export default function ScenarioEditor() {
         }
     }, [scenario, isEditMode, form]);
 
-    const onSubmit = async (values: z.infer<typeof formSchema>) => {
-        const data: ScenarioCreate = {
-            ...values,
-            csv_path: values.data_source === "CSV" ? values.csv_path : undefined,
-            description: values.description || "",
-            timeframe: "1d",
-            conditions: values.conditions as any,
-            targets: values.targets as any,
-            date_range_start: values.date_range_start || undefined,
-            date_range_end: values.date_range_end || undefined,
-        };
+    const watched = form.watch();
+    const previewable = !!watched.underlying && (watched.conditions?.length ?? 0) > 0;
+    const signalPreview = useSignalPreview(previewable ? toScenarioCreate(watched) : null);
+
+    const onSubmit = async (values: FormValues) => {
+        const data = toScenarioCreate(values);
 
         let result;
         if (isEditMode && id) {
@@ -193,6 +205,7 @@ export default function ScenarioEditor() {
                                                             <SelectItem value="YAHOO">Yahoo Finance</SelectItem>
                                                             <SelectItem value="CSV">CSV File</SelectItem>
                                                             <SelectItem value="NORGATE">Norgate Data</SelectItem>
+                                                            <SelectItem value="FIXTURE">Fixtures (offline)</SelectItem>
                                                         </SelectContent>
                                                     </Select>
                                                     <FormMessage />
@@ -247,6 +260,14 @@ export default function ScenarioEditor() {
                                 </CardContent>
                             </Card>
 
+                            {/* Live signal preview */}
+                            <Card>
+                                <CardHeader><CardTitle>Signal Preview</CardTitle></CardHeader>
+                                <CardContent>
+                                    <SignalPreviewPanel {...signalPreview} />
+                                </CardContent>
+                            </Card>
+
                             {/* Target Builder */}
                             <Card>
                                 <CardHeader><CardTitle>Targets</CardTitle></CardHeader>
@@ -1,6 +1,6 @@
-import { useEffect } from "react";
+import { useEffect, useRef } from "react";
 import { Link, useNavigate } from "react-router-dom";
-import { PlusCircle, Search } from "lucide-react";
+import { Download, PlusCircle, Search, Upload } from "lucide-react";
 import { PageHeader } from "@/components/layout/PageHeader";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
@@ -8,6 +8,7 @@ import { useScenarios } from "@/hooks/useScenarios";
 import { ScenarioCard } from "./ScenarioCard";
 import { useAnalysis } from "@/hooks/useAnalysis";
 import { toast } from "sonner";
+import { scenarioApi } from "@/services/api";
 
 export default function ScenarioList() {
     const { scenarios, isLoading, error, fetchScenarios, deleteScenario } = useScenarios();
@@ -24,10 +25,44 @@ export default function ScenarioList() {
         }
     };
 
+    const importInput = useRef<HTMLInputElement>(null);
+
+    const handleExport = async () => {
+        try {
+            const response = await scenarioApi.exportBundle({ include_results: true });
+            const url = window.URL.createObjectURL(new Blob([response.data]));
+            const link = document.createElement('a');
+            link.href = url;
+            link.setAttribute('download', 'retrocast_scenarios.jsonl');
+            document.body.appendChild(link);
+            link.click();
+        } catch (e) {
+            toast.error("Export failed");
+        }
+    };
+
+    const handleImport = async (e: React.ChangeEvent<HTMLInputElement>) => {
+        const file = e.target.files?.[0];
+        e.target.value = "";
+        if (!file) return;
+        try {
+            const { data } = await scenarioApi.importBundle(file);
+            const firstError = data.items.find(item => !item.ok);
+            if (firstError) {
+                toast.warning(`Imported ${data.imported}, ${data.failed} failed (line ${firstError.line}: ${firstError.error})`);
+            } else {
+                toast.success(`Imported ${data.imported} scenarios`);
+            }
+            await fetchScenarios();
+        } catch (err: any) {
+            toast.error(err.response?.data?.detail || "Import failed");
+        }
+    };
+
     const handleRun = async (id: string, e: React.MouseEvent) => {
         e.stopPropagation();
         toast.info("Starting analysis...");
-        await runAnalysis(id);
+        await runAnalysis(id, false); // the results page loads what it shows
         toast.success("Analysis started");
         navigate(`/scenarios/${id}/results`);
     };
@@ -35,6 +70,15 @@ export default function ScenarioList() {
     return (
         <div className="h-full flex flex-col">
             <PageHeader title="Scenarios">
+                <input ref={importInput} type="file" accept=".jsonl,.gz,.zip" className="hidden" onChange={handleImport} />
+                <Button variant="outline" onClick={() => importInput.current?.click()}>
+                    <Upload className="mr-2 h-4 w-4" />
+                    Import
+                </Button>
+                <Button variant="outline" onClick={handleExport}>
+                    <Download className="mr-2 h-4 w-4" />
+                    Export
+                </Button>
                 <Link to="/scenarios/new">
                     <Button>
                         <PlusCircle className="mr-2 h-4 w-4" />
@@ -0,0 +1,59 @@
+import { Loader2 } from "lucide-react";
+import type { SignalPreview } from "@/types";
+
+interface SignalPreviewPanelProps {
+    preview: SignalPreview | null;
+    isLoading: boolean;
+    error: string | null;
+}
+
+const WIDTH = 240;
+const HEIGHT = 32;
+
+export default function SignalPreviewPanel({ preview, isLoading, error }: SignalPreviewPanelProps) {
+    if (error) {
+        return <p className="text-sm text-destructive">{error}</p>;
+    }
+    if (!preview) {
+        return (
+            <p className="text-sm text-muted-foreground">
+                {isLoading ? "Computing preview..." : "Add an underlying and at least one condition to preview signals."}
+            </p>
+        );
+    }
+
+    if (preview.timed_out) {
+        return (
+            <p className="text-sm text-muted-foreground">
+                Preview took longer than {preview.elapsed_ms.toFixed(0)} ms. Run the analysis for the signal count.
+            </p>
+        );
+    }
+
+    const peak = Math.max(1, ...preview.sparkline);
+    const barWidth = WIDTH / Math.max(1, preview.sparkline.length);
+
+    return (
+        <div className="flex items-center gap-6 text-sm">
+            <div>
+                <div className="text-2xl font-semibold">{preview.total_signals}</div>
+                <div className="text-muted-foreground">signals in {preview.total_bars} bars</div>
+            </div>
+            <div className="text-muted-foreground">
+                {preview.first_signal_date
+                    ? <>{preview.first_signal_date} → {preview.last_signal_date}</>
+                    : "No signals"}
+            </div>
+            <svg width={WIDTH} height={HEIGHT} className="text-primary" aria-label="Signal density">
+                {preview.sparkline.map((count, i) => {
+                    const h = (count / peak) * HEIGHT;
+                    return <rect key={i} x={i * barWidth} y={HEIGHT - h} width={Math.max(1, barWidth - 1)} height={h} fill="currentColor" />;
+                })}
+            </svg>
+            <span className="text-xs text-muted-foreground flex items-center gap-1">
+                {isLoading && <Loader2 className="h-3 w-3 animate-spin" />}
+                {preview.elapsed_ms.toFixed(0)} ms
+            </span>
+        </div>
+    );
+}
@@ -8,8 +8,8 @@ interface UseAnalysisReturn {
     isAnalyzing: boolean;
     isLoadingResult: boolean;
     error: string | null;
-    runAnalysis: (scenarioId: string) => Promise<void>;
-    fetchLastResult: (scenarioId: string) => Promise<void>;
+    runAnalysis: (scenarioId: string, includeSignals?: boolean) => Promise<void>;
+    fetchLastResult: (scenarioId: string, includeSignals?: boolean) => Promise<void>;
 }
 
 export function useAnalysis(): UseAnalysisReturn {
@@ -18,11 +18,11 @@ export function useAnalysis(): UseAnalysisReturn {
     const [isLoadingResult, setIsLoadingResult] = useState(false);
     const [error, setError] = useState<string | null>(null);
 
-    const runAnalysis = useCallback(async (scenarioId: string) => {
+    const runAnalysis = useCallback(async (scenarioId: string, includeSignals = true) => {
         setIsAnalyzing(true);
         setError(null);
         try {
-            const response = await analysisApi.run(scenarioId);
+            const response = await analysisApi.run(scenarioId, { include_signals: includeSignals });
             setResult(response.data);
         } catch (err: any) {
             const msg = err.response?.data?.detail || err.message || "Analysis failed";
@@ -34,11 +34,11 @@ export function useAnalysis(): UseAnalysisReturn {
         }
     }, []);
 
-    const fetchLastResult = useCallback(async (scenarioId: string) => {
+    const fetchLastResult = useCallback(async (scenarioId: string, includeSignals = true) => {
         setIsLoadingResult(true);
         setError(null);
         try {
-            const response = await analysisApi.getLast(scenarioId);
+            const response = await analysisApi.getLast(scenarioId, includeSignals);
             setResult(response.data);
         } catch (err: any) {
             // If 404, just means no result yet, maybe don't loop error?
@@ -0,0 +1,50 @@
+import { useEffect, useState } from "react";
+import { analysisApi } from "@/services/api";
+import type { TargetCalendarStats } from "@/types";
+
+interface UseCalendarStatsReturn {
+    stats: TargetCalendarStats | null;
+    isLoading: boolean;
+    error: string | null;
+}
+
+/**
+ * Server-side calendar groups for one target, plus the per-signal outcome
+ * columns when `series` is set. `runDate` is part of the key so a re-run refetches.
+ */
+export function useCalendarStats(
+    scenarioId: string | undefined,
+    targetId: string | null,
+    runDate?: string,
+    series = false,
+): UseCalendarStatsReturn {
+    const [stats, setStats] = useState<TargetCalendarStats | null>(null);
+    const [isLoading, setIsLoading] = useState(false);
+    const [error, setError] = useState<string | null>(null);
+
+    useEffect(() => {
+        if (!scenarioId || !targetId) {
+            setStats(null);
+            return;
+        }
+        let cancelled = false;
+        setIsLoading(true);
+        setError(null);
+        analysisApi
+            .getCalendar(scenarioId, targetId, series)
+            .then(response => {
+                if (!cancelled) setStats(response.data[0] ?? null);
+            })
+            .catch((err: any) => {
+                if (!cancelled) setError(err.response?.data?.detail || err.message || "Failed to load statistics");
+            })
+            .finally(() => {
+                if (!cancelled) setIsLoading(false);
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [scenarioId, targetId, runDate, series]);
+
+    return { stats, isLoading, error };
+}
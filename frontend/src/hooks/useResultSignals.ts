@@ -0,0 +1,46 @@
+import { useEffect, useState } from "react";
+import { analysisApi } from "@/services/api";
+import type { Signal } from "@/types";
+
+interface UseResultSignalsReturn {
+    signals: Signal[] | null;
+    isLoading: boolean;
+    error: string | null;
+}
+
+/**
+ * Signals of the last result, fetched separately so the dashboard can render
+ * the stats from a result loaded without them. `runDate` is part of the key
+ * so a re-run refetches.
+ */
+export function useResultSignals(scenarioId: string | undefined, runDate?: string): UseResultSignalsReturn {
+    const [signals, setSignals] = useState<Signal[] | null>(null);
+    const [isLoading, setIsLoading] = useState(false);
+    const [error, setError] = useState<string | null>(null);
+
+    useEffect(() => {
+        if (!scenarioId || !runDate) {
+            setSignals(null);
+            return;
+        }
+        let cancelled = false;
+        setIsLoading(true);
+        setError(null);
+        analysisApi
+            .getLast(scenarioId)
+            .then(response => {
+                if (!cancelled) setSignals(response.data?.signals ?? []);
+            })
+            .catch((err: any) => {
+                if (!cancelled) setError(err.response?.data?.detail || err.message || "Failed to load signals");
+            })
+            .finally(() => {
+                if (!cancelled) setIsLoading(false);
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [scenarioId, runDate]);
+
+    return { signals, isLoading, error };
+}
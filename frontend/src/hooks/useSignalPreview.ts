@@ -0,0 +1,55 @@
+import { useEffect, useRef, useState } from "react";
+import { analysisApi } from "@/services/api";
+import type { ScenarioCreate, SignalPreview } from "@/types";
+
+const DEBOUNCE_MS = 300;
+
+interface UseSignalPreviewReturn {
+    preview: SignalPreview | null;
+    isLoading: boolean;
+    error: string | null;
+}
+
+/**
+ * Debounced signal preview of the scenario being edited. Every request carries
+ * the editor's session id, so the server drops work for edits that were
+ * superseded; the stale response (409 or aborted) is ignored here.
+ */
+export function useSignalPreview(scenario: ScenarioCreate | null): UseSignalPreviewReturn {
+    const sessionId = useRef(crypto.randomUUID());
+    const [preview, setPreview] = useState<SignalPreview | null>(null);
+    const [isLoading, setIsLoading] = useState(false);
+    const [error, setError] = useState<string | null>(null);
+    const key = scenario ? JSON.stringify(scenario) : null;
+
+    useEffect(() => {
+        if (!scenario) {
+            setPreview(null);
+            return;
+        }
+        const controller = new AbortController();
+        const timer = setTimeout(() => {
+            setIsLoading(true);
+            analysisApi
+                .preview(scenario, sessionId.current, controller.signal)
+                .then(response => {
+                    setPreview(response.data);
+                    setError(null);
+                })
+                .catch((err: any) => {
+                    if (controller.signal.aborted || err.response?.status === 409) return;
+                    setError(err.response?.data?.detail || err.message || "Preview failed");
+                })
+                .finally(() => {
+                    if (!controller.signal.aborted) setIsLoading(false);
+                });
+        }, DEBOUNCE_MS);
+        return () => {
+            clearTimeout(timer);
+            controller.abort();
+        };
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [key]);
+
+    return { preview, isLoading, error };
+}
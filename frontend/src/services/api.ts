@@ -1,5 +1,9 @@
 import axios from 'axios';
-import type { AnalysisResult, Scenario, ScenarioCreate, ScenarioSummary } from '@/types';
+import type {
+    AnalysisResult, BatchRunResponse, RunHistoryEntry, StatSeries, DistributionResponse, Scenario, ScenarioCreate, ScenarioImportResponse, ScenarioSummary, SignalPreview,
+    ImportMode,
+    TargetCalendarStats,
+} from '@/types';
 
 const api = axios.create({
     baseURL: 'http://localhost:8000/api',
@@ -13,11 +17,38 @@ export const scenarioApi = {
     create: (data: ScenarioCreate) => api.post<Scenario>('/scenarios', data),
     update: (id: string, data: ScenarioCreate) => api.put<Scenario>(`/scenarios/${id}`, data),
     delete: (id: string) => api.delete(`/scenarios/${id}`),
+    exportBundle: (params: { scenario_id?: string[]; include_results?: boolean; compress?: boolean } = {}) =>
+        api.get('/scenarios/export', { params, paramsSerializer: { indexes: null }, responseType: 'blob' }),
+    importBundle: (file: Blob, mode: ImportMode = 'keep', includeResults = true) =>
+        api.post<ScenarioImportResponse>('/scenarios/import', file, {
+            params: { mode, include_results: includeResults },
+            headers: { 'Content-Type': 'application/octet-stream' },
+        }),
 };
 
 export const analysisApi = {
-    run: (scenarioId: string) => api.post<AnalysisResult>(`/analysis/${scenarioId}/run`),
-    getLast: (scenarioId: string) => api.get<AnalysisResult>(`/analysis/${scenarioId}/last`),
+    run: (scenarioId: string, options: { stream?: boolean; include_signals?: boolean } = {}) =>
+        api.post<AnalysisResult>(`/analysis/${scenarioId}/run`, null, { params: options }),
+    getLast: (scenarioId: string, includeSignals = true) =>
+        api.get<AnalysisResult>(`/analysis/${scenarioId}/last`, { params: { include_signals: includeSignals } }),
+    preview: (scenario: ScenarioCreate, sessionId: string, signal?: AbortSignal) =>
+        api.post<SignalPreview>('/analysis/preview', { session_id: sessionId, scenario }, { signal }),
+    getHistory: (scenarioId: string) => api.get<RunHistoryEntry[]>(`/analysis/${scenarioId}/history`),
+    getStatSeries: (scenarioId: string, targetId: string, stats: string[]) =>
+        api.get<StatSeries[]>(`/analysis/${scenarioId}/history/series`, {
+            params: { target_id: targetId, stat: stats },
+            paramsSerializer: { indexes: null },
+        }),
+    getHistoryRun: (scenarioId: string, runId: number) =>
+        api.get<AnalysisResult>(`/analysis/${scenarioId}/history/${runId}`),
+    runBatch: (scenarioIds: string[]) => api.post<BatchRunResponse>('/analysis/batch', { scenario_ids: scenarioIds }),
+    getCalendar: (scenarioId: string, targetId: string, series = false) =>
+        api.get<TargetCalendarStats[]>(`/analysis/${scenarioId}/calendar`, { params: { target_id: targetId, series } }),
+    getDistribution: (
+        scenarioId: string,
+        targetId: string,
+        params: { method: string; bins?: number; width?: number; raw?: boolean },
+    ) => api.get<DistributionResponse>(`/analysis/${scenarioId}/distribution`, { params: { target_id: targetId, ...params } }),
 };
 
 export const dataApi = {
@@ -32,4 +63,6 @@ export const dataApi = {
 export const exportApi = {
     csv: (scenarioId: string) => api.get(`/export/${scenarioId}/csv`, { responseType: 'blob' }),
     excel: (scenarioId: string) => api.get(`/export/${scenarioId}/excel`, { responseType: 'blob' }),
+    columnar: (scenarioId: string, format: 'parquet' | 'arrow', table: 'outcomes' | 'stats' = 'outcomes') =>
+        api.get(`/export/${scenarioId}/${format}`, { params: { table }, responseType: 'blob' }),
 };
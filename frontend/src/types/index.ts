@@ -23,7 +23,8 @@ export type Operator = "ABOVE" | "BELOW" | "CROSSES_ABOVE" | "CROSSES_BELOW";
 export type CompareTo = "PRICE" | "VALUE" | "INDICATOR";
 export type Connector = "AND" | "OR";
 export type Direction = "ABOVE" | "BELOW";
-export type DataSource = "CSV" | "YAHOO" | "NORGATE";
+export type DataSource = "CSV" | "YAHOO" | "NORGATE" | "FIXTURE";
+export type ConditionTimeframe = "WEEKLY" | "MONTHLY";
 
 export interface ConditionConfig {
     id: string;
@@ -35,6 +36,12 @@ export interface ConditionConfig {
     compare_indicator?: Indicator;
     compare_indicator_params?: Record<string, number>;
     connector: Connector;
+    timeframe?: ConditionTimeframe | null; // indicators on weekly/monthly bars; unset = scenario bars
+}
+
+export interface ConditionGroup {
+    operator: Connector;
+    children: (string | ConditionGroup)[]; // condition ids or nested groups
 }
 
 export interface TargetConfig {
@@ -44,6 +51,22 @@ export interface TargetConfig {
     direction: Direction;
 }
 
+export interface BreakdownConfig {
+    indicator: Indicator;
+    params: Record<string, number>;
+    timeframe?: ConditionTimeframe | null;
+    edges?: number[] | null; // ascending bucket boundaries...
+    quantiles?: number | null; // ...or this many equal-population buckets
+}
+
+export interface AnalysisOptions {
+    horizon_curve_max?: number | null;
+    horizon_curve_threshold_pct?: number;
+    event_study_horizon?: number | null;
+    event_study_lookback?: number;
+    breakdown?: BreakdownConfig | null;
+}
+
 export interface ScenarioCreate {
     name: string;
     description: string;
@@ -54,7 +77,9 @@ export interface ScenarioCreate {
     date_range_start?: string;
     date_range_end?: string;
     conditions: ConditionConfig[];
+    condition_tree?: ConditionGroup | null;
     targets: TargetConfig[];
+    analysis?: AnalysisOptions;
 }
 
 export interface Scenario extends ScenarioCreate {
@@ -90,6 +115,8 @@ export interface SignalOutcome {
     max_change_pct?: number;
     hit?: boolean;
     anytime_hit?: boolean;
+    days_to_hit?: number | null;
+    mae_pct?: number | null;
 }
 
 export interface Signal {
@@ -99,6 +126,99 @@ export interface Signal {
     outcomes: SignalOutcome[];
 }
 
+export interface Histogram {
+    method: string;
+    edges: number[];
+    counts: number[];
+}
+
+export interface QuantileSketchData {
+    relative_accuracy: number;
+    count: number;
+    zero_count: number;
+    min: number | null;
+    max: number | null;
+    positive: Record<string, number>;
+    negative: Record<string, number>;
+}
+
+export interface DistributionResponse {
+    target_id: string;
+    total: number;
+    histogram: Histogram;
+    values?: number[] | null;
+}
+
+export interface SignalPreview {
+    total_bars: number;
+    total_signals: number;
+    first_signal_date: string | null;
+    last_signal_date: string | null;
+    sparkline: number[];
+    sparkline_start: string | null;
+    sparkline_end: string | null;
+    elapsed_ms: number;
+    timed_out: boolean;
+}
+
+export interface RunHistoryEntry {
+    run_id: number;
+    run_date: string;
+    data_start: string;
+    data_end: string;
+    total_bars: number;
+    total_signals: number;
+    signals_added: number;
+    signals_removed: number;
+    signals_changed: number;
+    snapshot: boolean;
+    signals_available: boolean; // false for streamed runs: only the summary is kept
+}
+
+export interface StatSeries {
+    target_id: string;
+    run_ids: number[];
+    run_dates: string[];
+    data_end: string[];
+    total_signals: number[];
+    values: Record<string, (number | null)[]>;
+}
+
+export interface ThresholdCurve {
+    thresholds: number[];
+    above_final_pct: number[];
+    above_anytime_pct: number[];
+    below_final_pct: number[];
+    below_anytime_pct: number[];
+}
+
+export interface TargetBaseline {
+    total_bars: number;
+    hit_rate_pct: number;
+    anytime_hit_rate_pct: number;
+    avg_change_pct: number;
+    median_change_pct: number;
+    std_dev: number;
+    percentile_5: number;
+    percentile_25: number;
+    percentile_75: number;
+    percentile_95: number;
+}
+
+export interface TargetSignificance {
+    resamples: number;
+    sample_size: number;
+    eligible_bars: number;
+    random_hit_rate_pct: number;
+    random_hit_rate_ci_low_pct: number;
+    random_hit_rate_ci_high_pct: number;
+    hit_rate_p_value: number;
+    random_avg_change_pct: number;
+    random_avg_change_ci_low_pct: number;
+    random_avg_change_ci_high_pct: number;
+    avg_change_p_value: number;
+}
+
 export interface TargetStats {
     target_id: string;
     days_forward: number;
@@ -119,7 +239,100 @@ export interface TargetStats {
     percentile_25: number;
     percentile_75: number;
     percentile_95: number;
-    distribution: number[];
+    avg_days_to_hit?: number | null;
+    median_days_to_hit?: number | null;
+    avg_mfe_pct?: number | null;
+    median_mfe_pct?: number | null;
+    avg_mae_pct?: number | null;
+    median_mae_pct?: number | null;
+    worst_mae_pct?: number | null;
+    histogram?: Histogram | null;
+    threshold_curve?: ThresholdCurve | null;
+    sketch?: QuantileSketchData | null;
+    distribution: number[];  // empty unless the server ships raw values
+    baseline?: TargetBaseline | null;
+    significance?: TargetSignificance | null;
+}
+
+export interface CalendarBucket {
+    label: string;
+    count: number;
+    hits: number;
+    anytime_hits: number;
+    hit_rate_pct: number;
+    anytime_hit_rate_pct: number;
+    avg_change_pct: number;
+}
+
+export interface SignalSeries {
+    dates: string[];
+    prices: number[];
+    actual_change_pct: (number | null)[];
+    max_change_pct: (number | null)[];
+    hit: (boolean | null)[];
+}
+
+export interface TargetCalendarStats {
+    target_id: string;
+    days_forward: number;
+    by_year: CalendarBucket[];
+    by_quarter: CalendarBucket[];
+    by_month: CalendarBucket[];
+    by_weekday: CalendarBucket[];
+    series?: SignalSeries | null; // only when requested with series=true
+}
+
+export interface HorizonCurve {
+    horizons: number[];
+    threshold_pct: number;
+    count: number[];
+    mean_pct: (number | null)[];
+    median_pct: (number | null)[];
+    hit_rate_pct: (number | null)[];
+    percentile_5: (number | null)[];
+    percentile_25: (number | null)[];
+    percentile_75: (number | null)[];
+    percentile_95: (number | null)[];
+}
+
+export interface EventStudy {
+    offsets: number[]; // bars relative to the signal; 0 = signal bar
+    count: number[];
+    mean_pct: (number | null)[];
+    median_pct: (number | null)[];
+    mean_ci_low_pct: (number | null)[];
+    mean_ci_high_pct: (number | null)[];
+    percentile_5: (number | null)[];
+    percentile_25: (number | null)[];
+    percentile_75: (number | null)[];
+    percentile_95: (number | null)[];
+}
+
+export interface RegimeBucket {
+    label: string;
+    lower?: number | null;
+    upper?: number | null;
+    signal_count: number;
+    target_stats: TargetStats[];
+}
+
+export interface RegimeBreakdown {
+    column: string;
+    edges: number[];
+    buckets: RegimeBucket[];
+    unassigned_signals: number; // indicator undefined at the signal bar
+}
+
+export interface RunMetadata {
+    stage_durations_ms: Record<string, number>;
+    total_duration_ms: number;
+    bars: number;
+    signals: number;
+    indicators_computed: number;
+    indicators_extended?: number; // carried forward over newly appended bars only
+    cache_hits: number;
+    mask_cache_hits?: number;
+    data_source_latency_ms?: number;
 }
 
 export interface AnalysisResult {
@@ -133,6 +346,24 @@ export interface AnalysisResult {
     total_signals: number;
     target_stats: TargetStats[];
     signals: Signal[];
+    horizon_curve?: HorizonCurve | null;
+    event_study?: EventStudy | null;
+    breakdown?: RegimeBreakdown | null;
+    calendar?: TargetCalendarStats[];
+    metadata?: RunMetadata;
+    signal_store?: string | null; // streamed runs: signals live in chunks, fetched via /last
+}
+
+export interface BatchRunItem {
+    scenario_id: string;
+    ok: boolean;
+    total_signals?: number;
+    error?: string;
+}
+
+export interface BatchRunResponse {
+    datasets_loaded: number;
+    items: BatchRunItem[];
 }
 
 // Indicator metadata for UI dropdowns
@@ -158,3 +389,21 @@ export const INDICATORS: IndicatorMeta[] = [
     { value: "HIGHEST", label: "Highest High", category: "Price", params: [{ name: "period", label: "Period", default: 252 }] },
     { value: "LOWEST", label: "Lowest Low", category: "Price", params: [{ name: "period", label: "Period", default: 252 }] },
 ];
+
+export type ImportMode = 'keep' | 'replace' | 'new';
+
+export interface ScenarioImportItem {
+    line: number;
+    ok: boolean;
+    scenario_id?: string | null;
+    name?: string | null;
+    result_imported: boolean;
+    error?: string | null;
+}
+
+export interface ScenarioImportResponse {
+    imported: number;
+    results_imported: number;
+    failed: number;
+    items: ScenarioImportItem[];
+}